@@ -0,0 +1,410 @@
+"""
+오프라인 분석 (헤드리스)
+녹화 파일·합성 소스를 GUI 없이 디코딩 가능한 최대 속도로 재생하면서 실제 감지 경로
+(Detector 블랙/스틸/레벨미터 → SignoffManager 정파 상태 → 알림 발생/복구 판정)를 그대로 실행하고
+이상 구간(incident) 타임라인과 처리 성능 통계를 출력한다.
+
+시간 판정은 벽시계 대신 프레임 타임스탬프를 사용한다 (Detector/SignoffManager의 clock 교체).
+따라서 감지 기준 시간(예: 스틸 60초)과 정파 스케줄은 파일 속 시간 기준으로 재현되며,
+감지 주기(performance.detection_interval)도 미디어 시간 기준으로 프레임을 골라 적용한다.
+임베디드 오디오(캡처 장치 오디오 입력) 감지는 실시간 장치 전용이므로 분석 대상이 아니다.
+
+명령행:
+  python -m kbs_monitor.analyze rec.mp4 --config kbs_monitor/config/kbs_config.json   # 저장소 루트에서
+  python analyze.py rec.mp4 --format csv --out timeline.csv                          # kbs_monitor 폴더에서
+  python analyze.py "synthetic://4x4?fps=30" --duration 300                          # 합성 소스
+출력: 타임라인(JSONL 기본 / CSV) — --out 미지정 시 표준출력. 처리 통계는 표준에러 (+ --stats JSON)
+종료 코드: 0 정상, 2 입력/설정 오류
+"""
+import os
+import sys
+
+# 패키지 루트가 없는 구조(core/ui/utils 최상위 import) — 어느 위치에서 실행해도 import 가능하도록
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+if _BASE_DIR not in sys.path:
+    sys.path.insert(0, _BASE_DIR)
+
+import argparse
+import csv
+import datetime
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import cv2
+
+from core.frame_pyramid import FramePyramid
+from core.input_channel import InputChannel
+from core.signoff_manager import SignoffManager
+from core.synthetic_source import SyntheticCapture, is_synthetic_source
+from utils.config_manager import ConfigManager, migrate_inputs
+
+_log = logging.getLogger(__name__)
+
+TIMELINE_FIELDS = ["event", "type", "label", "media", "start", "alarm", "end",
+                   "duration", "start_at", "end_at", "note"]
+
+
+class MediaClock:
+    """미디어 시각(초) → 가상 벽시계 epoch. Detector/SignoffManager의 clock으로 주입."""
+
+    def __init__(self, base_epoch: float):
+        self.base_epoch = base_epoch
+        self.media_ts = 0.0
+
+    def __call__(self) -> float:
+        return self.base_epoch + self.media_ts
+
+    def at(self, media_ts: Optional[float]) -> str:
+        if media_ts is None:
+            return ""
+        dt = datetime.datetime.fromtimestamp(self.base_epoch + media_ts)
+        return dt.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+@dataclass
+class Incident:
+    """이상 구간 1건 (블랙/스틸/오디오 무음)"""
+    kind: str                  # "블랙" / "스틸" / "오디오"
+    label: str                 # 전역 레이블 (InputChannel.qualify)
+    media: str
+    start: float               # 이상 상태 시작 (미디어 초, 감지 기준 시간 이전부터 포함)
+    alarm: float               # 알림 발생 시각 (미디어 초)
+    end: Optional[float] = None
+    note: str = ""             # 복구 외 종료 사유 (정파 억제 등)
+
+    def to_row(self, clock: MediaClock) -> dict:
+        return {
+            "event": "incident",
+            "type": self.kind,
+            "label": self.label,
+            "media": self.media,
+            "start": round(self.start, 3),
+            "alarm": round(self.alarm, 3),
+            "end": round(self.end, 3) if self.end is not None else None,
+            "duration": round(self.end - self.start, 3) if self.end is not None else None,
+            "start_at": clock.at(self.start),
+            "end_at": clock.at(self.end),
+            "note": self.note or ("진행중" if self.end is None else ""),
+        }
+
+
+class OfflineAnalyzer:
+    """
+    감지 1회분 결과 → 알림 상태 판정 (MainWindow._process_detection_results와 같은 규칙).
+    알림음/텔레그램/녹화 대신 incident 타임라인을 기록한다.
+    """
+
+    def __init__(self, config: dict, input_index: int = 0, base_epoch: Optional[float] = None):
+        inputs = migrate_inputs(config)
+        if not 0 <= input_index < len(inputs):
+            raise ValueError(f"입력 번호 범위 밖: {input_index + 1} (입력 {len(inputs)}개)")
+        self.clock = MediaClock(time.time() if base_epoch is None else base_epoch)
+
+        perf = config.get("performance", {})
+        det_cfg = config.get("detection", {})
+        self.channel = InputChannel.from_dict(input_index, inputs[input_index])
+        self.channel.detector.clock = self.clock
+        self.channel.detector.apply_config(det_cfg)
+        self.channel.detector.apply_performance(perf)
+        self.audio_enabled = perf.get("audio_detection_enabled", True)
+        self.detection_interval = max(0.01, perf.get("detection_interval", 200) / 1000.0)
+
+        # 정파 상태 관리 — 입력 1 기준 (실시간 감시와 동일). 타이머 대신 tick()을 1초(미디어 시간)마다 호출
+        self.signoff: Optional[SignoffManager] = None
+        if self.channel.is_primary:
+            self.signoff = SignoffManager(auto_tick=False)
+            self.signoff.clock = self.clock
+            self.signoff.state_changed.connect(self._on_signoff_state_changed)
+            self.signoff.configure_from_dict(
+                config.get("signoff", {}), float(det_cfg.get("still_duration", 60.0))
+            )
+            self.signoff.update_media_names(
+                {r.label: r.media_name for r in self.channel.roi_manager.video_rois}
+            )
+        self._next_tick = 0.0
+
+        self._open: Dict[tuple, Incident] = {}     # (kind, glabel) → 진행 중 incident
+        self.rows: List[dict] = []
+
+        # 처리 통계
+        self.frames_decoded = 0
+        self.detections = 0
+        self.media_seconds = 0.0
+        self._detect_ms: List[float] = []
+
+    # ── 정파 ──────────────────────────────────────────────────────────────────
+
+    def _on_signoff_state_changed(self, group_id: int, state_str: str):
+        group = self.signoff.get_groups().get(group_id)
+        ts = self.clock.media_ts
+        self.rows.append({
+            "event": "signoff",
+            "type": state_str,
+            "label": group.name if group else str(group_id),
+            "media": "",
+            "start": round(ts, 3),
+            "alarm": None, "end": None, "duration": None,
+            "start_at": self.clock.at(ts),
+            "end_at": "", "note": "",
+        })
+
+    def _signoff_enter_labels(self) -> set:
+        if self.signoff is None:
+            return set()
+        return {
+            group.enter_roi.get("video_label", "")
+            for group in self.signoff.get_groups().values()
+            if group.enter_roi.get("video_label")
+        }
+
+    def advance_signoff(self, ts: float):
+        """미디어 시각 ts까지 1초 주기 정파 상태 점검 실행"""
+        if self.signoff is None:
+            return
+        while self._next_tick <= ts:
+            self.clock.media_ts = self._next_tick
+            self.signoff.tick()
+            self._next_tick += 1.0
+
+    # ── 감지 1회 ──────────────────────────────────────────────────────────────
+
+    def process_frame(self, frame, ts: float):
+        """감지 주기에 해당하는 프레임 1장 처리"""
+        ch = self.channel
+        if ch.latest_frame is None or ch.latest_frame.shape[:2] != frame.shape[:2]:
+            h, w = frame.shape[:2]
+            ch.roi_manager.set_frame_size(w, h)
+        ch.latest_frame = frame
+        ch.latest_pyramid = FramePyramid(frame)    # 감지는 피라미드 기준 (실시간 감시와 동일)
+        self.advance_signoff(ts)
+        self.clock.media_ts = ts
+        self.media_seconds = ts
+
+        enter_labels = self._signoff_enter_labels()
+        force = enter_labels if (enter_labels and ch.roi_manager.video_rois) else None
+        t0 = time.perf_counter()
+        video_results, audio_results = ch.detect(self.audio_enabled, force)
+        self._detect_ms.append((time.perf_counter() - t0) * 1000.0)
+        self.detections += 1
+
+        if self.signoff is not None:
+            if ch.detector.still_detection_enabled:
+                still = {lbl: st.get("still", False) for lbl, st in video_results.items()}
+            else:
+                still = {lbl: st.get("still", False) for lbl, st in video_results.items()
+                         if lbl in enter_labels}
+            self.signoff.update_detection(still_results=still)
+
+        video_names = {r.label: r.media_name for r in ch.roi_manager.video_rois}
+        for label, state in video_results.items():
+            media = video_names.get(label, "")
+            if self._is_signoff(label):
+                self._close("블랙", label, ts, note="정파 억제")
+                self._close("스틸", label, ts, note="정파 억제")
+                continue
+            self._update("블랙", label, media, ts, state.get("black_alerting", False),
+                         state.get("black_duration", 0.0), state.get("black_resolved", False))
+            if self._is_prep(label):
+                self._close("스틸", label, ts, note="정파준비 억제")
+            else:
+                self._update("스틸", label, media, ts, state.get("still_alerting", False),
+                             state.get("still_duration", 0.0), state.get("still_resolved", False))
+
+        if self.audio_enabled:
+            audio_names = {r.label: r.media_name for r in ch.roi_manager.audio_rois}
+            for label, state in audio_results.items():
+                if self._is_signoff(label):
+                    self._close("오디오", label, ts, note="정파 억제")
+                    continue
+                self._update("오디오", label, audio_names.get(label, ""), ts,
+                             state.get("alerting", False), state.get("duration", 0.0),
+                             state.get("resolved", False))
+
+    def _is_signoff(self, label: str) -> bool:
+        return self.signoff is not None and self.signoff.is_signoff_label(label)
+
+    def _is_prep(self, label: str) -> bool:
+        return self.signoff is not None and self.signoff.is_prep_label(label)
+
+    def _update(self, kind: str, label: str, media: str, ts: float,
+                alerting: bool, duration: float, resolved: bool):
+        glabel = self.channel.qualify(label)
+        key = (kind, glabel)
+        if alerting:
+            if key not in self._open:
+                self._open[key] = Incident(kind, glabel, media, start=max(0.0, ts - duration), alarm=ts)
+        elif key in self._open:
+            self._close(kind, label, ts, note="" if resolved else "상태 초기화")
+
+    def _close(self, kind: str, label: str, ts: float, note: str = ""):
+        inc = self._open.pop((kind, self.channel.qualify(label)), None)
+        if inc is not None:
+            inc.end = ts
+            inc.note = note
+            self.rows.append(inc.to_row(self.clock))
+
+    def finish(self) -> List[dict]:
+        """파일 끝 — 진행 중 incident를 열린 상태로 기록하고 시간순 타임라인 반환"""
+        for inc in self._open.values():
+            self.rows.append(inc.to_row(self.clock))
+        self._open.clear()
+        return sorted(self.rows, key=lambda r: (r["start"], r["event"], r["label"]))
+
+    def stats(self, wall_seconds: float) -> dict:
+        times = sorted(self._detect_ms)
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))] if times else 0.0
+        return {
+            "frames_decoded": self.frames_decoded,
+            "detections": self.detections,
+            "media_seconds": round(self.media_seconds, 3),
+            "wall_seconds": round(wall_seconds, 3),
+            "decode_fps": round(self.frames_decoded / wall_seconds, 1) if wall_seconds > 0 else 0.0,
+            "realtime_factor": round(self.media_seconds / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+            "detect_avg_ms": round(sum(times) / len(times), 2) if times else 0.0,
+            "detect_p95_ms": round(p95, 2),
+            "incidents": sum(1 for r in self.rows if r["event"] == "incident") + len(self._open),
+        }
+
+
+# ── 입력 / 출력 ────────────────────────────────────────────────────────────────
+
+def open_source(source: str):
+    """파일 경로 또는 synthetic:// 지정 → (capture, fps)"""
+    if is_synthetic_source(source):
+        cap = SyntheticCapture(source)
+    else:
+        if not os.path.isfile(source):
+            raise FileNotFoundError(f"입력 파일 없음: {source}")
+        cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG)
+    if not cap.isOpened():
+        raise IOError(f"입력 열기 실패: {source}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+    if fps <= 0 or fps > 240:
+        fps = 30.0
+    return cap, fps
+
+
+def _frame_timestamp(cap, index: int, fps: float) -> float:
+    """프레임 타임스탬프(초). 컨테이너 PTS 우선, 없으면 프레임 번호/fps"""
+    if isinstance(cap, SyntheticCapture):
+        return index / fps
+    pos = cap.get(cv2.CAP_PROP_POS_MSEC) or 0.0
+    if pos <= 0.0 and index > 0:
+        return index / fps
+    return pos / 1000.0
+
+
+def run_analysis(analyzer: OfflineAnalyzer, source: str,
+                 duration: Optional[float] = None) -> dict:
+    """
+    입력을 끝까지(또는 duration 초까지) 디코딩하며 감지 주기마다 분석.
+    감지 주기 사이 프레임은 grab()만 수행하여 디코딩 외 비용(색변환/복사)을 생략한다.
+    반환: 처리 통계 dict
+    """
+    cap, fps = open_source(source)
+    if duration is None and isinstance(cap, SyntheticCapture):
+        duration = cap.source.loop or 60.0   # 합성 소스는 끝이 없으므로 이벤트 주기 1회분
+    t_start = time.perf_counter()
+    next_detect = 0.0
+    index = 0
+    try:
+        while cap.grab():
+            ts = _frame_timestamp(cap, index, fps)
+            index += 1
+            analyzer.frames_decoded = index
+            if duration is not None and ts >= duration:
+                break
+            if ts + 1e-6 < next_detect:
+                continue
+            ok, frame = cap.retrieve()
+            if not ok or frame is None:
+                continue
+            next_detect = max(next_detect + analyzer.detection_interval, ts)
+            analyzer.process_frame(frame, ts)
+    finally:
+        cap.release()
+    return analyzer.stats(time.perf_counter() - t_start)
+
+
+def write_timeline(rows: List[dict], fmt: str, out):
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=TIMELINE_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: ("" if row.get(k) is None else row.get(k)) for k in TIMELINE_FIELDS})
+    else:
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def load_config(path: Optional[str]) -> dict:
+    cm = ConfigManager()
+    if not path:
+        return cm.load()
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"설정 파일 없음: {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        json.load(f)   # 형식 오류는 기본값으로 대체하지 않고 즉시 보고
+    return cm.load_from_path(os.path.abspath(path))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="녹화 파일 오프라인 감지 분석 (헤드리스)")
+    parser.add_argument("source", help="영상 파일 경로 또는 synthetic://... 합성 소스")
+    parser.add_argument("--config", help="설정 JSON (기본: config/kbs_config.json)")
+    parser.add_argument("--input", type=int, default=1, help="사용할 입력 번호의 ROI 세트 (기본 1)")
+    parser.add_argument("--out", help="타임라인 출력 파일 (기본: 표준출력)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default=None,
+                        help="타임라인 형식 (기본: --out 확장자 .csv면 csv, 그 외 jsonl)")
+    parser.add_argument("--stats", help="처리 통계 JSON 출력 파일")
+    parser.add_argument("--duration", type=float, default=None, help="분석할 최대 미디어 시간(초)")
+    parser.add_argument("--start-time", default=None,
+                        help="파일 0초에 해당하는 시각 'YYYY-MM-DD HH:MM:SS' (정파 스케줄 판정용, 기본: 현재)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="감지 디버그 로그 출력")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+        stream=sys.stderr,
+    )
+
+    try:
+        config = load_config(args.config)
+        base_epoch = None
+        if args.start_time:
+            base_epoch = datetime.datetime.strptime(
+                args.start_time, "%Y-%m-%d %H:%M:%S").timestamp()
+        analyzer = OfflineAnalyzer(config, input_index=args.input - 1, base_epoch=base_epoch)
+        stats = run_analysis(analyzer, args.source, args.duration)
+    except (OSError, ValueError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+
+    rows = analyzer.finish()
+    fmt = args.format or ("csv" if (args.out or "").lower().endswith(".csv") else "jsonl")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8", newline="") as f:
+            write_timeline(rows, fmt, f)
+    else:
+        write_timeline(rows, fmt, sys.stdout)
+
+    if args.stats:
+        with open(args.stats, "w", encoding="utf-8") as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+    print(
+        f"프레임 {stats['frames_decoded']} / 감지 {stats['detections']}회 | "
+        f"미디어 {stats['media_seconds']:.1f}s / 처리 {stats['wall_seconds']:.1f}s "
+        f"(x{stats['realtime_factor']:.1f}, {stats['decode_fps']:.0f}fps) | "
+        f"감지 평균 {stats['detect_avg_ms']:.1f}ms / p95 {stats['detect_p95_ms']:.1f}ms | "
+        f"incident {stats['incidents']}건",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+녹화용 오디오 순환 버퍼
+사고 전 구간 길이만큼 미리 할당한 int16 배열(샘플 × 채널)에 PCM을 이어 쓰고,
+청크별 (타임스탬프, 누적 샘플 위치)를 같은 크기의 배열에 따로 기록한다.
+
+- push(): 배열 슬라이스 복사뿐 — 청크마다 bytes/튜플 객체를 만들지 않는다.
+- snapshot(): 시작 시각 이후 구간을 연속 배열 1개로 복사해 (시작 타임스탬프, PCM) 반환.
+  녹화 워커는 이 배열을 한 번에 기록한다.
+"""
+import threading
+from typing import Optional
+
+import numpy as np
+
+
+class AudioRing:
+    """고정 크기 int16 PCM 순환 버퍼 + 청크 타임스탬프 색인 (스레드 안전)"""
+
+    def __init__(self, seconds: float, sample_rate: int = 44100, channels: int = 2,
+                 chunk: int = 1024):
+        self.seconds = float(seconds)
+        self._sr = int(sample_rate)
+        self._ch = int(channels)
+        self._chunk = int(chunk)
+        self._cap = int(self.seconds * self._sr) + self._chunk * 4
+        self._buf = np.zeros((self._cap, self._ch), dtype=np.int16)
+        # 청크 색인 — 청크가 기본 크기의 1/4까지 작아져도 버퍼 전체를 덮도록 여유 있게
+        n_idx = self._cap // max(1, self._chunk // 4) + 8
+        self._idx_ts = np.zeros(n_idx, dtype=np.float64)
+        self._idx_pos = np.zeros(n_idx, dtype=np.int64)
+        self._idx_n = 0            # 누적 청크 수
+        self._total = 0            # 누적 샘플 수
+        self._lock = threading.Lock()
+
+    def push(self, samples: np.ndarray, ts: float):
+        """청크 1개 기록 (오디오 스레드). samples: int16 (샘플, 채널) 또는 인터리브 1차원"""
+        if samples.ndim == 1 or samples.shape[1] != self._ch:
+            samples = samples.reshape(-1, self._ch)
+        n = samples.shape[0]
+        if n == 0:
+            return
+        if n > self._cap:
+            ts += (n - self._cap) / self._sr
+            samples = samples[-self._cap:]
+            n = self._cap
+        with self._lock:
+            start = self._total % self._cap
+            first = min(n, self._cap - start)
+            self._buf[start:start + first] = samples[:first]
+            if first < n:
+                self._buf[:n - first] = samples[first:]
+            i = self._idx_n % len(self._idx_ts)
+            self._idx_ts[i] = ts
+            self._idx_pos[i] = self._total
+            self._idx_n += 1
+            self._total += n
+
+    def snapshot(self, since: Optional[float] = None) -> Optional[tuple]:
+        """since 이후(없으면 보관 중인 전체) PCM을 연속 배열로 복사.
+        반환: (첫 샘플 타임스탬프, int16 (샘플, 채널) 배열) / 기록이 없으면 None"""
+        with self._lock:
+            if self._total == 0:
+                return None
+            n_idx = len(self._idx_ts)
+            lo = max(0, self._idx_n - n_idx)
+            hi = self._idx_n
+            oldest = max(0, self._total - self._cap)
+            # 버퍼에 남아 있는 첫 청크 (누적 위치는 청크 순번에 대해 단조 증가 → 이진 탐색)
+            lo = self._search(lo, hi, lambda j: self._idx_pos[j % n_idx] >= oldest)
+            if since is not None:
+                lo = self._search(lo, hi, lambda j: self._idx_ts[j % n_idx] >= since)
+            if lo >= hi:
+                return None
+            ts = float(self._idx_ts[lo % n_idx])
+            pos = int(self._idx_pos[lo % n_idx])
+            n = self._total - pos
+            out = np.empty((n, self._ch), dtype=np.int16)
+            start = pos % self._cap
+            first = min(n, self._cap - start)
+            out[:first] = self._buf[start:start + first]
+            if first < n:
+                out[first:] = self._buf[:n - first]
+        return ts, out
+
+    @staticmethod
+    def _search(lo: int, hi: int, pred) -> int:
+        """[lo, hi)에서 pred가 처음 참이 되는 위치 (pred는 단조: 거짓…거짓 참…참)"""
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if pred(mid):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
@@ -2,10 +2,24 @@
 자동 녹화 모듈
 알림 발생 시 사고 전 N초 + 사고 후 M초를 지정 해상도/FPS로 MP4 자동 저장.
 순환 버퍼(JPEG 압축)로 "사고 전" 구간 구현, 오래된 파일 자동 삭제.
-오디오(임베디드)를 WAV로 동시 버퍼링하여 ffmpeg로 영상과 합성.
+사고 전 버퍼 JPEG 인코딩은 전용 인코더 스레드에서 수행 (GUI 스레드는 최신 프레임 전달만).
+사고 후 프레임은 소형 고정 크기 큐로 녹화 워커에 바로 흘려보냄 (post_seconds와 무관하게 메모리 고정).
+인코딩 방식:
+  pipe    : raw 프레임 + PCM을 ffmpeg 1개 프로세스로 보내 H.264/AAC 단일 패스 생성 (기본)
+  twopass : mp4v 영상 + WAV 임시 파일 기록 후 ffmpeg로 합성 (pipe 실패 시 폴백)
 ffmpeg 미설치 시 영상만 저장(폴백).
+ffmpeg 출력은 fragmented MP4 — 기록 중 비정상 종료돼도 남은 *_ptmp.mp4를 다음 시작 시 최종 파일로 복구한다.
+
+상시 세그먼트 녹화(continuous) 사용 시 출력 프레임/PCM을 디스크 세그먼트 링에도 계속 기록하고,
+사고 클립은 링에서 재인코딩 없이 잘라낸다 (사고 전 구간을 수 분까지 확보).
+링을 쓸 수 없으면(ffmpeg 없음/세션 실패) 위 방식으로 자동 전환.
+
+감지영역 크롭 클립(roi_clip): 비디오 감지영역 알림이면 그 영역만 원본 해상도로 잘라 별도 클립(*.roi.mp4)을
+함께(also) 또는 전체 화면 대신(only) 기록한다. 사고 후 구간은 원본 프레임에서 자르고,
+사고 전 구간은 사고 전 버퍼(출력 해상도)에서 같은 영역을 잘라 확대한다. 카탈로그에서 사고 키로 연결.
 """
 import os
+import queue
 import subprocess
 import threading
 import time
@@ -19,89 +33,262 @@ import logging
 import cv2
 import numpy as np
 
+from core.audio_ring import AudioRing
+from core.ffmpeg_pipe import FRAGMENTED_MP4_ARGS, FfmpegPipeWriter
+from core.frame_pyramid import FramePyramid
+from core.preroll_ring import MmapPrerollRing
+from core.recording_catalog import ROI_CLIP_SUFFIX, RecordingCatalog
+from core.recording_jobs import RecordingJob, RecordingScheduler
+from core.segment_ring import SegmentRing
+
 _log = logging.getLogger(__name__)
 
 _JPEG_QUALITY = 85
-_MAX_RECORD_FRAMES = 9000  # 녹화 큐 최대 프레임 수 (30fps × 300초 = 5분 상한, 메모리 보호)
+# 사고 후 프레임 큐 크기 — 960×540 기준 프레임당 약 1.5MB → 최대 약 6MB.
+# 워커(인코더)가 밀리면 새 프레임을 버리고(드롭 계수) 캡처/GUI는 기다리지 않는다.
+_RECORD_QUEUE_FRAMES = 4
+_ENCODE_STATS_WINDOW = 600  # 인코딩 시간 통계 표본 수 (10fps 기준 약 1분)
 
 # AudioMonitorThread 와 동일한 오디오 파라미터
 _AUDIO_SR    = 44100   # 샘플레이트 (Hz)
 _AUDIO_CH    = 2       # 채널 수 (스테레오)
 _AUDIO_CHUNK = 1024    # 청크 크기 (AudioMonitorThread.CHUNK 와 동일)
+_AUDIO_FRAME_BYTES = _AUDIO_CH * 2   # 샘플 1개(전 채널) 바이트 수
+
+ENCODER_PIPE = "pipe"        # ffmpeg 단일 패스 (H.264/AAC)
+ENCODER_TWOPASS = "twopass"  # mp4v + WAV → ffmpeg 합성
+
+PREROLL_MEMORY = "memory"    # 사고 전 JPEG를 RAM deque에 보관 (기본)
+PREROLL_DISK = "disk"        # 메모리 맵 파일 슬롯에 보관 — 긴 사고 전 구간/고해상도용, 재시작 후에도 유지
+
+ROI_CLIP_OFF = "off"         # 전체 화면 클립만 (기본)
+ROI_CLIP_ALSO = "also"       # 전체 화면 + 감지영역 크롭 클립
+ROI_CLIP_ONLY = "only"       # 감지영역 알림은 크롭 클립만 (오디오/시스템 알림은 전체 화면)
+_ROI_CLIP_MIN = 32           # 크롭 클립 최소 변 길이 (원본 픽셀)
+
+# 녹화 임시 파일 접미사 (파이프 기록 / 2단계 영상·오디오 / concat 목록) — 모두 같은 길이
+_TEMP_SUFFIXES = ("_ptmp.mp4", "_vtmp.mp4", "_atmp.wav", "_ctmp.txt")
+_TEMP_SUFFIX_LEN = 9
+
+
+def _temp_owner(path: str) -> str:
+    """임시 파일 → 해당 녹화 작업의 최종 파일 경로 (세그먼트 클립 concat 목록은 <이름>_ptmp_ctmp.txt)"""
+    base = path[:-_TEMP_SUFFIX_LEN]
+    if base.endswith("_ptmp"):
+        base = base[:-len("_ptmp")]
+    return base + ".mp4"
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    """정렬된 목록의 q(0~1) 분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class _FpsGrid:
+    """
+    캡처 타임스탬프 → 출력 FPS 프레임 번호 (t0 기준 격자).
+    place(ts)는 이 프레임이 차지할 출력 프레임 수를 돌려준다:
+    0 = 이미 채운 슬롯(출력 FPS보다 빠른 입력 — 버림), 2 이상 = 입력이 늦어 빈 슬롯이 생김(직전 프레임으로 채움).
+    """
+
+    def __init__(self, t0: float, fps: float):
+        self.t0 = t0
+        self.fps = fps
+        self.slot = 0                 # 다음에 기록할 출력 프레임 번호
+
+    def place(self, ts: float) -> int:
+        target = int((ts - self.t0) * self.fps + 0.5)
+        if target < self.slot:
+            return 0
+        n = target - self.slot + 1
+        self.slot = target + 1
+        return n
 
 
 class AutoRecorder:
     """
     순환 버퍼 기반 자동 녹화기.
-    - push_frame(): frame_ready 신호마다 호출, 비디오 버퍼에 JPEG 압축 저장
+    - push_frame(): frame_ready 신호마다 호출, out_fps 간격으로 최신 프레임을 인코더 스레드에 전달
+    - _encode_loop(): 인코더 스레드, 축소 + JPEG 압축 후 비디오 버퍼에 저장
     - push_audio(): audio_chunk 신호마다 호출, 오디오 버퍼에 raw PCM 저장
-    - trigger(): 알림 발생 시 호출, 별도 스레드에서 MP4(+오디오) 생성
-    - _cleanup_loop(): 1시간마다 오래된 파일 자동 삭제
+    - trigger(): 알림 발생 시 호출, 녹화 작업 생성(사고 후 구간 중이면 병합) → 작업별 스레드에서 MP4(+오디오) 생성
+    - _cleanup_loop(): 1시간마다 카탈로그 기준 보관 정책(일수/총 용량) 적용 — 전 입력 공유 스레드 1개
+
+    입력별 인스턴스는 사고 전 버퍼/인코더/세그먼트 링(입력마다 다른 프레임)만 갖고,
+    작업 스케줄러·카탈로그·보관 정책 스레드·고아 파일 복구는 클래스 수준에서 전 입력이 공유한다.
     """
 
+    scheduler = RecordingScheduler()     # 녹화 작업 상태 + 합성/추출 작업자 풀 (전 입력 공유)
+    catalog = RecordingCatalog()         # 녹화 파일 색인 + 보관 정책 (저장 폴더 공유)
+
+    # 보관 정책 스레드 (전 입력 공유 1개): 실행 중 녹화기 수가 0이 되면 종료
+    _cleanup_lock = threading.Lock()
+    _cleanup_thread: Optional[threading.Thread] = None
+    _live_recorders: int = 0
+    _retention: tuple = ("recordings", 7, 0)    # 마지막 configure()의 (저장 폴더, 보관 일수, 총 용량 바이트)
+
     def __init__(self):
         self._enabled: bool = False
         self._save_dir: str = "recordings"
         self._pre_seconds: float = 5.0
         self._post_seconds: float = 15.0
         self._max_keep_days: int = 7
+        self._max_total_bytes: int = 0       # 녹화 총 용량 한도 (0 = 제한 없음)
 
         # 녹화 출력 해상도/FPS
         self._out_w: int = 960
         self._out_h: int = 540
         self._out_fps: int = 10
         self._buf_interval: float = 1.0 / self._out_fps
+        self._encoder: str = ENCODER_PIPE
 
         # ── 비디오 순환 버퍼: deque[(timestamp, jpeg_bytes)] ──────────────
         maxlen = int(self._pre_seconds * self._out_fps) + 5
         self._buffer: deque = deque(maxlen=maxlen)
         self._buffer_lock = threading.Lock()
-        self._last_buf_time: float = 0.0
-
-        # ── 오디오 순환 버퍼: deque[(timestamp, bytes)] ──────────────────
-        # 청크 수 = pre_seconds * 샘플레이트 / 청크크기
-        audio_maxlen = int(self._pre_seconds * _AUDIO_SR / _AUDIO_CHUNK) + 10
-        self._audio_buffer: deque = deque(maxlen=audio_maxlen)
-        self._audio_lock = threading.Lock()
-
-        # 녹화 상태
-        self._recording: bool = False
-        self._record_end: float = 0.0
-        self._record_queue: deque = deque()          # 사고 후 비디오 프레임 큐
-        self._audio_record_queue: deque = deque()    # 사고 후 오디오 청크 큐
-        self._record_thread: Optional[threading.Thread] = None
-
-        # 자동 삭제 스레드
+        self._buffer_bytes: int = 0          # 버퍼 JPEG 총 바이트 (heartbeat 로그용)
+        self._next_buf_time: float = 0.0    # 다음 사고 전 버퍼 프레임 시각 (출력 FPS 격자)
+        # 디스크 사고 전 버퍼 (PREROLL_DISK일 때만 — 이때 RAM deque는 비워 둔다)
+        self._pre_ring: Optional[MmapPrerollRing] = None
+
+        # ── 사고 전 버퍼 인코더 스레드 ─────────────────────────────────────
+        # 최신 프레임 1장 슬롯: 인코더가 꺼내기 전에 새 프레임이 오면 이전 프레임을 교체(드롭 계수)
+        self._enc_cond = threading.Condition()
+        self._enc_pending: Optional[tuple] = None    # (timestamp, frame)
+        self._enc_thread: Optional[threading.Thread] = None
+        self._enc_count: int = 0
+        self._enc_dropped: int = 0
+        self._enc_times: deque = deque(maxlen=_ENCODE_STATS_WINDOW)   # 인코딩 시간(ms)
+
+        # ── 오디오 순환 버퍼: 사고 전 구간만큼 미리 할당한 int16 배열 + 청크 타임스탬프 색인 ──
+        self._audio_ring = AudioRing(self._pre_seconds, _AUDIO_SR, _AUDIO_CH, _AUDIO_CHUNK)
+
+        # 녹화 상태: 사고 후 구간을 수집 중인 작업 (구간 중 알림은 병합, 구간이 끝나면 None)
+        self._job_lock = threading.Lock()
+        self._capture_job: Optional[RecordingJob] = None
+        self._crop_jobs: dict = {}                   # 크롭 영역 (x1, y1, x2, y2) → 수집 중인 크롭 클립 작업
+        self._incident: Optional[tuple] = None       # (사고 키, 사고 후 구간 종료) — 구간 중 알림은 같은 사고
+        self._owner: str = ""                        # 작업 상태 표시용 입력 이름
+        self._roi_clip: str = ROI_CLIP_OFF
+        self._src_size: tuple = (0, 0)               # 마지막 입력 프레임 해상도 (크롭 영역 보정용)
+
+        # ── 상시 세그먼트 녹화 링 ────────────────────────────────────────
+        self._ring = SegmentRing()
+        self._ring_pre_seconds: float = 60.0
+
         self._running: bool = False
-        self._cleanup_thread = threading.Thread(
-            target=self._cleanup_loop, daemon=True, name="RecorderCleanup"
-        )
 
     # ── 생명주기 ──────────────────────────────────────────────────────────────
 
     def start(self):
-        """자동 삭제 스레드 시작 (프로그램 시작 시 1회 호출)"""
-        self._cleanup_orphan_temp_files()
+        """사고 전 버퍼 인코더 스레드 시작 + 공유 보관 정책 스레드 참여 (프로그램 시작 시 1회 호출)"""
         self._running = True
-        self._cleanup_thread.start()
+        cls = AutoRecorder
+        with cls._cleanup_lock:
+            cls._live_recorders += 1
+            if cls._cleanup_thread is None or not cls._cleanup_thread.is_alive():
+                cls._cleanup_thread = threading.Thread(
+                    target=cls._cleanup_loop, daemon=True, name="RecorderCleanup"
+                )
+                cls._cleanup_thread.start()
+        self._enc_thread = threading.Thread(
+            target=self._encode_loop, daemon=True, name="RecorderEncoder"
+        )
+        self._enc_thread.start()
+
+    _recover_lock = threading.Lock()
+    _recovered_dirs: set = set()        # 고아 임시 파일을 정리한 저장 폴더 (전 입력 공유 — 폴더당 1회)
 
-    def _cleanup_orphan_temp_files(self):
-        """이전 비정상 종료로 남은 임시 파일(*_vtmp.mp4, *_atmp.wav) 삭제"""
-        if not os.path.isdir(self._save_dir):
+    @classmethod
+    def _recover_orphan_files(cls, save_dir: str):
+        """
+        이전 비정상 종료(강제 종료/예약 재시작)로 남은 임시 파일 정리 — 정리 스레드에서 저장 폴더당 1회.
+        *_ptmp.mp4 : fragmented MP4라 마지막 조각까지 재생 가능 → 최종 파일로 마무리하고 카탈로그에 등록
+        *_vtmp.mp4 : 2단계 방식 mp4v 임시 영상 — 스트림 복사 복구를 시도하고 실패하면(moov 없음) 삭제
+        *_atmp.wav, *_ctmp.txt : 삭제
+        실행 중 저장 폴더를 바꾼 경우에도 진행 중인 작업(스케줄러 미종료 작업)의 임시 파일은 건드리지 않는다.
+        """
+        save_dir = os.path.abspath(save_dir)
+        with AutoRecorder._recover_lock:
+            if save_dir in AutoRecorder._recovered_dirs:
+                return
+            AutoRecorder._recovered_dirs.add(save_dir)
+        try:
+            names = os.listdir(save_dir)
+        except OSError:
             return
+        live = cls.scheduler.active_files()     # 목록을 읽은 뒤 조회 — 그 전에 시작한 작업을 모두 포함
+        recovered = 0
+        for fname in names:
+            path = os.path.join(save_dir, fname)
+            if fname.endswith(_TEMP_SUFFIXES) and _temp_owner(path) in live:
+                continue
+            if fname.endswith(("_ptmp.mp4", "_vtmp.mp4")):
+                final = path[:-len("_ptmp.mp4")] + ".mp4"
+                if cls._finalize_orphan(path, final):
+                    cls.catalog.add_file(final)
+                    recovered += 1
+            elif fname.endswith(("_atmp.wav", "_ctmp.txt")):
+                cls._remove_quietly(path)
+        if recovered:
+            _log.info("비정상 종료로 남은 녹화 %d개 복구 (%s)", recovered, save_dir)
+
+    @classmethod
+    def _finalize_orphan(cls, tmp: str, final: str) -> bool:
+        """고아 임시 녹화 → 최종 파일. ffmpeg가 있으면 스트림 복사로 잘린 마지막 조각을 정리하고,
+        없거나 실패하면 fragmented MP4는 그대로 이름만 바꾼다. 반환: 최종 파일 생성 여부"""
         try:
-            for fname in os.listdir(self._save_dir):
-                if fname.endswith("_vtmp.mp4") or fname.endswith("_atmp.wav"):
-                    try:
-                        os.remove(os.path.join(self._save_dir, fname))
-                    except OSError:
-                        pass
-        except Exception:
-            pass
+            empty = os.path.getsize(tmp) == 0
+        except OSError:
+            return False
+        if empty or os.path.exists(final):
+            cls._remove_quietly(tmp)
+            return False
+        if cls._ffmpeg_available():
+            cmd = [
+                cls._find_ffmpeg(), "-y", "-hide_banner", "-loglevel", "error",
+                "-i", tmp, "-map", "0", "-c", "copy", *FRAGMENTED_MP4_ARGS, final,
+            ]
+            try:
+                result = subprocess.run(
+                    cmd, capture_output=True, timeout=120,
+                    creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+                )
+                ok = result.returncode == 0 and os.path.isfile(final) and os.path.getsize(final) > 0
+            except (OSError, subprocess.SubprocessError):
+                ok = False
+            if ok:
+                cls._remove_quietly(tmp)
+                return True
+            cls._remove_quietly(final)
+        if tmp.endswith("_ptmp.mp4"):
+            try:
+                os.replace(tmp, final)
+                return True
+            except OSError:
+                return False
+        _log.warning("녹화 임시 파일 복구 실패 — 삭제: %s", os.path.basename(tmp))
+        cls._remove_quietly(tmp)
+        return False
 
     def stop(self):
         """정지 (프로그램 종료 시 호출)"""
+        if self._running:
+            with AutoRecorder._cleanup_lock:
+                AutoRecorder._live_recorders -= 1
         self._running = False
+        with self._enc_cond:
+            self._enc_cond.notify_all()
+        self._ring.stop()
+        if self._pre_ring is not None:
+            self._pre_ring.flush()       # 재시작 후 이어 쓰도록 디스크에 반영
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
 
     # ── 설정 ──────────────────────────────────────────────────────────────────
 
@@ -115,96 +302,299 @@ class AutoRecorder:
         output_width: int = 960,
         output_height: int = 540,
         output_fps: int = 10,
+        encoder: str = ENCODER_PIPE,
+        continuous: bool = False,
+        continuous_dir: str = "",
+        segment_seconds: int = 10,
+        ring_minutes: float = 10.0,
+        continuous_pre_seconds: float = 60.0,
+        mux_workers: int = 2,
+        owner: str = "",
+        max_total_gb: float = 0.0,
+        preroll_store: str = PREROLL_MEMORY,
+        preroll_path: str = "",
+        roi_clip: str = ROI_CLIP_OFF,
     ):
-        """설정 반영 및 버퍼 크기 재계산"""
+        """설정 반영 및 버퍼 크기 재계산.
+        continuous_dir: 상시 세그먼트 링 폴더 (입력별로 달라야 함, 비우면 save_dir/.ring)
+        mux_workers: ffmpeg 합성/클립 추출 동시 작업 수 (전 입력 공유 풀)
+        max_total_gb: 녹화 총 용량 한도 (GB, 0 = 제한 없음) — 넘으면 오래된 녹화부터 삭제
+        preroll_store: 사고 전 버퍼 저장 위치 (PREROLL_MEMORY / PREROLL_DISK)
+        preroll_path: 디스크 사고 전 버퍼 파일 (입력별로 달라야 함, 비우면 save_dir/.preroll/buffer.ring)
+        roi_clip: 감지영역 크롭 클립 (ROI_CLIP_OFF / ROI_CLIP_ALSO / ROI_CLIP_ONLY)"""
         self._enabled = enabled
         self._save_dir = save_dir or "recordings"
         self._pre_seconds = max(1.0, float(pre_seconds))
         self._post_seconds = max(1.0, float(post_seconds))
         self._max_keep_days = max(1, int(max_keep_days))
+        self._max_total_bytes = max(0, int(float(max_total_gb) * 1024 ** 3))
+        AutoRecorder._retention = (self._save_dir, self._max_keep_days, self._max_total_bytes)
+        if enabled:
+            self.catalog.open(self._save_dir)
         self._out_w = max(160, int(output_width))
         self._out_h = max(90, int(output_height))
         self._out_fps = max(1, int(output_fps))
         self._buf_interval = 1.0 / self._out_fps
+        self._encoder = encoder if encoder in (ENCODER_PIPE, ENCODER_TWOPASS) else ENCODER_PIPE
+        self._owner = owner
+        self._roi_clip = roi_clip if roi_clip in (ROI_CLIP_ALSO, ROI_CLIP_ONLY) else ROI_CLIP_OFF
+        self.scheduler.set_max_workers(mux_workers)
 
         # 비디오 버퍼 크기 재계산
         new_maxlen = int(self._pre_seconds * self._out_fps) + 5
+        use_disk = bool(enabled) and preroll_store == PREROLL_DISK
         with self._buffer_lock:
-            old = list(self._buffer)[-new_maxlen:]
+            old = [] if use_disk else list(self._buffer)[-new_maxlen:]
             self._buffer = deque(old, maxlen=new_maxlen)
+            self._buffer_bytes = sum(len(jpeg) for _ts, jpeg in self._buffer)
+        self._configure_pre_ring(
+            use_disk,
+            preroll_path or os.path.join(self._save_dir, ".preroll", "buffer.ring"),
+            new_maxlen,
+        )
 
         # 오디오 버퍼 크기 재계산
-        new_audio_maxlen = int(self._pre_seconds * _AUDIO_SR / _AUDIO_CHUNK) + 10
-        with self._audio_lock:
-            old_audio = list(self._audio_buffer)[-new_audio_maxlen:]
-            self._audio_buffer = deque(old_audio, maxlen=new_audio_maxlen)
+        # (길이가 같으면 기존 버퍼 유지 — 설정 저장마다 사고 전 오디오를 잃지 않도록)
+        if self._audio_ring.seconds != self._pre_seconds:
+            self._audio_ring = AudioRing(self._pre_seconds, _AUDIO_SR, _AUDIO_CH, _AUDIO_CHUNK)
+
+        # 상시 세그먼트 링 (ffmpeg 필요 — 없으면 메모리 버퍼 방식만 사용)
+        self._ring_pre_seconds = max(1.0, float(continuous_pre_seconds))
+        ring_on = bool(enabled and continuous)
+        if ring_on and not self._ffmpeg_available():
+            ring_on = False
+        self._ring.configure(
+            ring_on,
+            continuous_dir or os.path.join(self._save_dir, ".ring"),
+            int(segment_seconds),
+            # 링은 최소한 사고 전/후 구간 + 세그먼트 2개를 담아야 한다
+            max(float(ring_minutes) * 60.0,
+                self._ring_pre_seconds + self._post_seconds + 2 * int(segment_seconds)),
+            self._out_w, self._out_h, self._out_fps,
+            _AUDIO_SR, _AUDIO_CH, self._find_ffmpeg(),
+        )
+
+    def _configure_pre_ring(self, use_disk: bool, path: str, slots: int):
+        """디스크 사고 전 버퍼 열기/교체/닫기. 구조가 같으면 기존 파일(재시작 전 내용 포함)을 이어 쓴다.
+        슬롯 크기: JPEG 85% 평균(약 1/8)의 3배 여유 — 복잡한 장면도 대부분 들어간다"""
+        old = self._pre_ring
+        if not use_disk:
+            self._pre_ring = None
+            if old is not None:
+                old.close()
+            return
+        slot_bytes = max(64 * 1024, self._out_w * self._out_h * 3 * 3 // 8)
+        if old is not None and (old.path, old.slots, old.slot_bytes) == (path, slots, slot_bytes):
+            return
+        ring = MmapPrerollRing(path, slots, slot_bytes)
+        self._pre_ring = None
+        if old is not None:
+            old.close()
+        if ring.open():
+            self._pre_ring = ring
+        else:
+            _log.warning("디스크 사고 전 버퍼 사용 불가 — 메모리 버퍼로 전환")
+
+    @staticmethod
+    def _iter_pre_frames(pre_frames: list):
+        """사고 전 스냅샷 → (ts, BGR 프레임). 항목: RAM 버퍼는 (ts, jpeg), 디스크 버퍼는 (ts, (ring, slot, seq))"""
+        for ts, ref in pre_frames:
+            if not isinstance(ref, tuple):
+                frm = cv2.imdecode(np.frombuffer(ref, dtype=np.uint8), cv2.IMREAD_COLOR)
+            else:
+                ring, slot, seq = ref
+                view = ring.view(slot, seq)
+                if view is None:
+                    continue                  # 스냅샷 이후 덮어써짐 (가장 오래된 프레임)
+                frm = cv2.imdecode(np.frombuffer(view, dtype=np.uint8), cv2.IMREAD_COLOR)
+                del view
+                if not ring.valid(slot, seq):
+                    continue                  # 디코딩 중 덮어써짐 — 깨진 프레임일 수 있어 버림
+            if frm is not None:
+                yield ts, frm
 
     # ── 프레임 수신 ───────────────────────────────────────────────────────────
 
-    def push_frame(self, frame: np.ndarray):
+    def push_frame(self, frame: np.ndarray, pyramid: Optional[FramePyramid] = None):
         """
-        frame_ready 신호마다 호출.
-        _out_fps 간격으로 JPEG 인코딩 후 순환 버퍼에 저장.
-        녹화 중이면 출력 해상도로 리사이즈한 프레임을 녹화 큐에도 추가.
+        frame_ready 신호마다 호출 (GUI 스레드).
+        pyramid: frame의 해상도 피라미드 — 사고 전 버퍼/사고 후 큐가 같은 출력 해상도 축소본을 공유.
+        _out_fps 간격으로 최신 프레임을 인코더 스레드 슬롯에 넘기기만 한다 (축소/JPEG는 인코더 스레드).
+        캡처 스레드는 매 프레임 새 배열을 만들므로 참조 전달만으로 안전.
+        사고 후 구간을 수집 중인 작업이 있으면 출력 해상도로 리사이즈한 프레임(크롭 클립은 원본 영역)을
+        작업의 고정 크기 큐에 넣는다. 큐가 가득 차면(워커 지연) 기다리지 않고 해당 프레임을 버린다 — 메모리 상한 고정.
         """
         if not self._enabled:
             return
 
         now = time.time()
+        self._src_size = (frame.shape[1], frame.shape[0])
+
+        # 출력 FPS 격자에 맞춰 전달 — 입력 지터로 한 프레임씩 늦어져 실제 FPS가 떨어지지 않도록 1/4 간격 허용
+        if now >= self._next_buf_time - self._buf_interval * 0.25:
+            nxt = self._next_buf_time + self._buf_interval
+            self._next_buf_time = nxt if nxt > now else now + self._buf_interval   # 입력 끊김 후 재동기
+            with self._enc_cond:
+                if self._enc_pending is not None:
+                    self._enc_dropped += 1     # 인코더 지연 — 이전 프레임 대신 최신 프레임
+                self._enc_pending = (now, frame, pyramid)
+                self._enc_cond.notify()
+
+        job = self._capture_job
+        if job is not None:
+            self._offer_frame(job, now, frame, pyramid)
+        if self._crop_jobs:
+            for job in list(self._crop_jobs.values()):
+                self._offer_frame(job, now, frame, pyramid)
+
+    def _offer_frame(self, job: RecordingJob, now: float, frame: np.ndarray,
+                     pyramid: Optional[FramePyramid]):
+        """사고 후 프레임 1장을 작업 큐에 (GUI 스레드)"""
+        if job.frames is None or now >= job.end:
+            return
+        # 캡처 시각 기준 출력 FPS 격자: 이미 채운 슬롯의 프레임은 축소/큐 적재 없이 버림
+        # (빈 슬롯은 워커가 직전 프레임을 반복해 채우므로 오디오 싱크 유지)
+        slot = int((now - job.start) * self._out_fps + 0.5)
+        if slot < job.next_slot:
+            job.decimated += 1
+            return
+        if job.frames.full():
+            job.dropped += 1               # 리사이즈 전에 판단 — 버릴 프레임은 축소도 생략
+            return
+        try:
+            if job.crop is None:
+                frm = self._downscale(frame, pyramid)
+            else:
+                # 원본 해상도 영역 복사 (뷰를 큐에 두면 원본 프레임 전체가 해제되지 않음)
+                x1, y1, x2, y2 = job.crop
+                frm = np.ascontiguousarray(frame[y1:y2, x1:x2])
+                if frm.size == 0:
+                    return                 # 입력 해상도가 바뀌어 영역이 프레임 밖
+            job.frames.put_nowait((now, frm))
+            job.next_slot = slot + 1
+        except queue.Full:
+            job.dropped += 1
+        except Exception:
+            pass
 
-        if now - self._last_buf_time >= self._buf_interval:
-            self._last_buf_time = now
+    def _encode_loop(self):
+        """인코더 스레드: 슬롯의 최신 프레임을 축소 + JPEG 압축하여 사고 전 순환 버퍼에 저장"""
+        while self._running:
+            with self._enc_cond:
+                while self._enc_pending is None and self._running:
+                    self._enc_cond.wait(0.5)
+                item = self._enc_pending
+                self._enc_pending = None
+            if item is None:
+                continue
+            ts, frame, pyramid = item
+            t0 = time.perf_counter()
             try:
-                small = cv2.resize(frame, (self._out_w, self._out_h))
+                small = self._downscale(frame, pyramid)
+                self._ring.push_frame(ts, small)
                 ok, buf = cv2.imencode(
                     ".jpg", small,
                     [cv2.IMWRITE_JPEG_QUALITY, _JPEG_QUALITY],
                 )
-                if ok:
-                    with self._buffer_lock:
-                        self._buffer.append((now, buf.tobytes()))
-            except Exception:
-                pass
+            except Exception as e:
+                _log.debug("사고 전 버퍼 JPEG 인코딩 오류: %s", e)
+                continue
+            self._enc_times.append((time.perf_counter() - t0) * 1000.0)
+            self._enc_count += 1
+            ring = self._pre_ring
+            if ok and ring is not None:
+                # 디스크 슬롯에 바로 기록 (bytes 복사 없음)
+                if not ring.append(ts, buf.data) and ring.oversize == 1:
+                    _log.warning("디스크 사고 전 버퍼 슬롯(%dKB)보다 큰 프레임 — 해당 프레임 제외",
+                                 ring.slot_bytes // 1024)
+            elif ok:
+                jpeg = buf.tobytes()
+                with self._buffer_lock:
+                    if len(self._buffer) == self._buffer.maxlen:
+                        self._buffer_bytes -= len(self._buffer[0][1])
+                    self._buffer.append((ts, jpeg))
+                    self._buffer_bytes += len(jpeg)
 
-        if self._recording:
-            if now < self._record_end and len(self._record_queue) < _MAX_RECORD_FRAMES:
-                try:
-                    small = cv2.resize(frame, (self._out_w, self._out_h))
-                    self._record_queue.append((now, small))
-                except Exception:
-                    pass
-            else:
-                if len(self._record_queue) >= _MAX_RECORD_FRAMES:
-                    _log.warning(
-                        "녹화 큐 상한 도달 (%d프레임) — 녹화 종료 (메모리 보호)",
-                        _MAX_RECORD_FRAMES,
-                    )
-                self._recording = False
+    def get_ring_stats(self, reset: bool = False) -> Optional[dict]:
+        """상시 세그먼트 링 통계 (heartbeat 로그용). 링 미사용이면 None"""
+        if not self._ring.active:
+            return None
+        return self._ring.get_stats(reset)
+
+    def get_encoder_stats(self, reset: bool = False) -> dict:
+        """사고 전 버퍼 인코더 통계 (heartbeat 로그용). reset=True이면 인코딩/드롭 수·시간 표본 초기화
+        반환: {"encoded", "dropped", "p50_ms", "p95_ms", "max_ms", "buffer_frames", "buffer_bytes"}
+        """
+        times = sorted(self._enc_times)
+        ring = self._pre_ring
+        if ring is not None:
+            buffer_frames, buffer_bytes = ring.usage(time.time() - self._pre_seconds)
+        else:
+            with self._buffer_lock:
+                buffer_frames = len(self._buffer)
+                buffer_bytes = self._buffer_bytes
+        stats = {
+            "encoded": self._enc_count,
+            "dropped": self._enc_dropped,
+            "p50_ms": _percentile(times, 0.50),
+            "p95_ms": _percentile(times, 0.95),
+            "max_ms": times[-1] if times else 0.0,
+            "buffer_frames": buffer_frames,
+            "buffer_bytes": buffer_bytes,
+        }
+        if reset:
+            self._enc_count = 0
+            self._enc_dropped = 0
+            self._enc_times.clear()
+        return stats
+
+    def _downscale(self, frame: np.ndarray, pyramid: Optional[FramePyramid] = None) -> np.ndarray:
+        """입력 프레임 → 녹화 출력 해상도 (큰 축소비는 INTER_AREA로 계단 현상 방지).
+        pyramid가 있으면 같은 프레임의 출력 해상도 축소본을 1회만 만들어 공유한다."""
+        h, w = frame.shape[:2]
+        if (w, h) == (self._out_w, self._out_h):
+            return frame
+        if pyramid is not None and pyramid.frame is frame:
+            return pyramid.resized(self._out_w, self._out_h)
+        interp = cv2.INTER_AREA if w > self._out_w * 2 else cv2.INTER_LINEAR
+        return cv2.resize(frame, (self._out_w, self._out_h), interpolation=interp)
 
     # ── 오디오 청크 수신 ──────────────────────────────────────────────────────
 
     def push_audio(self, samples: np.ndarray, timestamp: float):
         """
         audio_chunk 신호마다 호출 (AudioMonitorThread → MainWindow → 여기).
-        int16 raw PCM을 순환 버퍼에 저장.
-        녹화 중이면 녹화 큐에도 추가.
+        int16 PCM을 미리 할당한 순환 버퍼에 복사 (청크별 객체 생성 없음).
+        상시 세그먼트 녹화/사고 후 구간 수집 중일 때만 원본 배열의 바이트 뷰를 넘긴다
+        (AudioMonitorThread가 청크마다 새 배열을 만들어 보내므로 복사 없이 참조해도 안전).
         """
         if not self._enabled:
             return
 
-        raw = samples.tobytes()
-        with self._audio_lock:
-            self._audio_buffer.append((timestamp, raw))
+        ring = self._audio_ring
+        ring.push(samples, timestamp)
 
-        if self._recording and timestamp < self._record_end:
-            self._audio_record_queue.append((timestamp, raw))
+        job = self._capture_job
+        capture = job is not None and job.frames is not None and timestamp < job.end
+        crops = list(self._crop_jobs.values()) if self._crop_jobs else ()
+        if capture or crops or self._ring.running:
+            raw = memoryview(np.ascontiguousarray(samples)).cast("B")
+            self._ring.push_audio(timestamp, raw)
+            if capture:
+                job.audio.append((timestamp, raw))
+            for crop_job in crops:
+                if timestamp < crop_job.end:
+                    crop_job.audio.append((timestamp, raw))
 
     # ── 알림 발생 트리거 ──────────────────────────────────────────────────────
 
-    def trigger(self, alarm_type: str, label: str, media_name: str = ""):
+    def trigger(self, alarm_type: str, label: str, media_name: str = "",
+                region: Optional[tuple] = None):
         """
-        알림 발생 시 호출. 이미 녹화 중이면 종료 시간만 연장.
-        그렇지 않으면 새 녹화 스레드 시작.
+        알림 발생 시 호출. 사고 후 구간을 수집 중인 작업이 있으면 그 작업에 병합(종료 시간 연장),
+        없으면 새 녹화 작업 시작. 이전 작업이 합성/추출 중이어도 건너뛰지 않는다.
+        region: 알림 감지영역의 원본 좌표 (x, y, w, h) — roi_clip 사용 시 그 영역의 크롭 클립도(또는 대신) 기록.
+        크롭 클립은 영역별로 병합하며, 같은 사고 구간의 클립은 카탈로그에서 사고 키로 연결된다.
         """
         if not self._enabled:
             return
@@ -212,32 +602,121 @@ class AutoRecorder:
         now = time.time()
         new_end = now + self._post_seconds
 
-        if self._recording:
-            if new_end > self._record_end:
-                self._record_end = new_end
-            return
+        starts = []
+        with self._job_lock:
+            filepath = self._make_filepath(alarm_type, label, media_name)
+            meta = dict(label=label, alarm_type=alarm_type, media=media_name,
+                        incident=self._incident_locked(now, new_end, filepath))
+            crop = None
+            if region is not None and self._roi_clip != ROI_CLIP_OFF:
+                crop = self._crop_rect(region)
+            if crop is None or self._roi_clip == ROI_CLIP_ALSO:
+                starts.append(self._trigger_full_locked(now, new_end, filepath, meta))
+            if crop is not None:
+                crop_path = filepath[:-4] + ROI_CLIP_SUFFIX + ".mp4"
+                starts.append(self._trigger_crop_locked(now, new_end, crop_path, crop, meta))
 
-        # 이전 스레드 alive 체크 — 상태 변경(_recording=True) 이전에 배치
-        # _MAX_RECORD_FRAMES 도달 시 push_frame()이 _recording=False로 전환하지만,
-        # 그 이후에도 _record_worker는 ffmpeg 합성(최대 120초)을 계속 실행 중일 수 있음.
-        # → 이 체크가 없으면 ffmpeg 합성 중에 새 스레드가 시작되어 동시 실행 가능
-        if self._record_thread is not None and self._record_thread.is_alive():
-            _log.warning("이전 녹화 스레드 실행 중 (ffmpeg 합성) — 새 녹화 스킵 (%s %s)", alarm_type, label)
-            return
+        for item in starts:
+            if item is not None:
+                target, args, name = item
+                threading.Thread(target=target, args=args, daemon=True, name=name).start()
 
-        # 새 녹화 시작
-        self._recording = True
-        self._record_end = new_end
-        self._record_queue.clear()
-        self._audio_record_queue.clear()
+    def _incident_locked(self, now: float, new_end: float, filepath: str) -> str:
+        """사고 키: 사고 후 구간 중 알림은 같은 사고(구간 연장), 아니면 첫 클립 파일명으로 새 사고"""
+        inc = self._incident
+        if inc is not None and now < inc[1]:
+            self._incident = (inc[0], max(inc[1], new_end))
+            return inc[0]
+        key = os.path.basename(filepath)[:-4]
+        self._incident = (key, new_end)
+        return key
 
-        # 사고 전 버퍼 스냅샷
-        with self._buffer_lock:
-            pre_frames = list(self._buffer)
-        with self._audio_lock:
-            pre_audio = list(self._audio_buffer)
+    def _crop_rect(self, region: tuple) -> Optional[tuple]:
+        """감지영역 (x, y, w, h) → 프레임 안으로 자른 (x1, y1, x2, y2). H.264(yuv420p)용 짝수 크기.
+        입력 프레임이 아직 없거나 영역이 너무 작으면 None"""
+        sw, sh = self._src_size
+        if not sw or not sh:
+            return None
+        x, y, w, h = (int(v) for v in region)
+        x1, y1 = max(0, x), max(0, y)
+        x2, y2 = min(sw, x + w), min(sh, y + h)
+        x2 -= (x2 - x1) % 2
+        y2 -= (y2 - y1) % 2
+        if x2 - x1 < _ROI_CLIP_MIN or y2 - y1 < _ROI_CLIP_MIN:
+            return None
+        return x1, y1, x2, y2
+
+    def _snapshot_pre_locked(self, now: float) -> tuple:
+        """사고 전 버퍼 스냅샷 (디스크 버퍼는 슬롯 위치만 — 데이터는 워커가 복사 없이 읽음).
+        반환: (pre_frames, pre_audio)"""
+        ring = self._pre_ring
+        if ring is not None:
+            pre_frames = [
+                (ts, (ring, slot, seq))
+                for ts, slot, seq in ring.snapshot(now - self._pre_seconds)
+            ]
+        else:
+            with self._buffer_lock:
+                pre_frames = list(self._buffer)
+        pre_audio = self._audio_ring.snapshot(now - self._pre_seconds - 0.5)
+        return pre_frames, pre_audio
+
+    def _new_capture_job_locked(self, now: float, new_end: float, filepath: str,
+                                pre_frames: list, **meta) -> RecordingJob:
+        """사고 후 프레임을 큐로 받는 녹화 작업 생성 (출력 FPS 격자는 사고 전 구간 다음 슬롯부터)"""
+        job = self.scheduler.new_job(
+            self._owner, filepath, now, new_end,
+            queue.Queue(maxsize=_RECORD_QUEUE_FRAMES),
+            start=pre_frames[0][0] if pre_frames else now, **meta,
+        )
+        if pre_frames:
+            job.next_slot = int((pre_frames[-1][0] - job.start) * self._out_fps + 0.5) + 1
+        return job
 
-        # 파일 경로 생성
+    def _trigger_full_locked(self, now: float, new_end: float, filepath: str,
+                             meta: dict) -> Optional[tuple]:
+        """전체 화면 클립: 수집 중인 작업에 병합하거나 새 작업 생성. 반환: 시작할 (스레드 함수, 인자, 이름) 또는 None"""
+        job = self._capture_job
+        if job is not None and job.capturing and now < job.end:
+            self.scheduler.merge(job, new_end)
+            return None
+
+        if self._ring.active:
+            # 상시 세그먼트 링 사용 중: 프레임 수집 없이 링에서 잘라내는 클립
+            clip_start = max(now - self._ring_pre_seconds, self._ring.covered_range()[0])
+            job = self.scheduler.new_job(
+                self._owner, filepath, now, new_end, None, start=clip_start, **meta,
+            )
+            item = (self._ring_clip_worker, (job,), "RecorderRingClip")
+        else:
+            pre_frames, pre_audio = self._snapshot_pre_locked(now)
+            job = self._new_capture_job_locked(
+                now, new_end, filepath, pre_frames,
+                width=self._out_w, height=self._out_h, **meta,
+            )
+            item = (self._record_worker, (job, pre_frames, pre_audio), "RecorderWriter")
+        self._capture_job = job
+        return item
+
+    def _trigger_crop_locked(self, now: float, new_end: float, filepath: str,
+                             crop: tuple, meta: dict) -> Optional[tuple]:
+        """감지영역 크롭 클립: 같은 영역을 수집 중이면 병합, 아니면 원본 해상도 크롭 작업 생성"""
+        job = self._crop_jobs.get(crop)
+        if job is not None and job.capturing and now < job.end:
+            self.scheduler.merge(job, new_end)
+            return None
+
+        pre_frames, pre_audio = self._snapshot_pre_locked(now)
+        x1, y1, x2, y2 = crop
+        job = self._new_capture_job_locked(
+            now, new_end, filepath, pre_frames,
+            crop=crop, src_size=self._src_size, width=x2 - x1, height=y2 - y1, **meta,
+        )
+        self._crop_jobs[crop] = job
+        return self._record_worker, (job, pre_frames, pre_audio), "RecorderCropWriter"
+
+    def _make_filepath(self, alarm_type: str, label: str, media_name: str) -> str:
+        """녹화 파일 경로 생성 (저장 폴더가 없으면 만든다)"""
         os.makedirs(self._save_dir, exist_ok=True)
         now_dt = datetime.datetime.now()
         ts = now_dt.strftime("%Y%m%d_%H%M%S") + f"_{now_dt.microsecond // 1000:03d}"
@@ -248,38 +727,261 @@ class AutoRecorder:
             filename = f"{ts}_{safe_label}_{safe_media}_{safe_type}.mp4"
         else:
             filename = f"{ts}_{safe_label}_{safe_type}.mp4"
-        filepath = os.path.join(self._save_dir, filename)
+        return os.path.join(self._save_dir, filename)
+
+    # ── 녹화 워커 ─────────────────────────────────────────────────────────────
+
+    def _close_capture_locked(self, job: RecordingJob):
+        """사고 후 구간 수집 종료 (_job_lock 보유 상태에서 호출) — 이후 알림은 새 작업으로"""
+        job.capturing = False
+        if self._capture_job is job:
+            self._capture_job = None
+        elif job.crop is not None and self._crop_jobs.get(job.crop) is job:
+            del self._crop_jobs[job.crop]
 
-        self._record_thread = threading.Thread(
-            target=self._record_worker,
-            args=(pre_frames, pre_audio, filepath),
-            daemon=True,
-            name="RecorderWriter",
+    def _capture_ended(self, job: RecordingJob) -> bool:
+        """post 구간이 지나고 큐가 비었으면 수집 종료. 병합(구간 연장)과 같은 잠금으로 판정"""
+        with self._job_lock:
+            # 입력이 끊겨 push_frame이 오지 않아도 post 구간이 지나면 종료
+            if time.time() >= job.end + 1.0 and job.frames.empty():
+                self._close_capture_locked(job)
+                return True
+        return False
+
+    def _register(self, job: RecordingJob, ok: bool) -> bool:
+        """완성된 녹화를 카탈로그에 등록하고 용량 한도 적용 (삭제 건수만큼만 처리). 반환: ok 그대로"""
+        if ok:
+            crop = ""
+            if job.crop is not None:
+                x1, y1, x2, y2 = job.crop
+                crop = f"{x1},{y1},{x2 - x1},{y2 - y1}"
+            self.catalog.add(job.filepath, job.owner, job.label, job.alarm_type, job.media,
+                             job.start, job.end, incident=job.incident, crop=crop)
+            if self._max_total_bytes > 0:
+                self.catalog.enforce(self._max_keep_days, self._max_total_bytes)
+        return ok
+
+    def _ring_clip_worker(self, job: RecordingJob):
+        """
+        상시 세그먼트 링 클립: post 구간을 덮는 세그먼트가 닫힐 때까지 기다린 뒤
+        재인코딩 없이 [start, job.end] 구간 추출을 작업자 풀에 등록.
+        대기 중 들어온 알림은 trigger()가 job.end를 연장한다.
+        """
+        seg_wait = self._ring.segment_seconds * 2 + 10.0   # 마지막 세그먼트가 닫히기까지 여유
+        while True:
+            with self._job_lock:
+                covered = self._ring.covered_range()[1]
+                if covered >= job.end or time.time() > job.end + seg_wait or not self._running:
+                    self._close_capture_locked(job)
+                    break
+            time.sleep(0.5)
+        self.scheduler.submit(job, lambda: self._register(job, self._extract_ring_clip(job)))
+
+    def _extract_ring_clip(self, job: RecordingJob) -> bool:
+        """작업자 풀에서 실행: 세그먼트 링 → 임시 파일 → 최종 파일"""
+        filepath = job.filepath
+        base = filepath[:-4] if filepath.endswith(".mp4") else filepath
+        ptmp = base + "_ptmp.mp4"
+        if not self._ring.extract(job.start, job.end, ptmp):
+            self._remove_quietly(ptmp)
+            return False
+        os.replace(ptmp, filepath)
+        return True
+
+    def _record_worker(self, job: RecordingJob, pre_frames: list, pre_audio: Optional[tuple]):
+        """녹화 워커 스레드: 단일 패스(pipe) 우선, 시작 실패 시 2단계 방식으로 폴백.
+        pre_audio: AudioRing.snapshot() 결과 (시작 타임스탬프, int16 PCM 배열) 또는 None"""
+        try:
+            if self._encoder == ENCODER_PIPE and self._ffmpeg_available():
+                if self._record_worker_pipe(job, pre_frames, pre_audio):
+                    return
+                _log.warning("ffmpeg 파이프 녹화 시작 실패 — 2단계 녹화로 전환 (%s)",
+                             os.path.basename(job.filepath))
+            self._record_worker_twopass(job, pre_frames, pre_audio)
+        except Exception as e:
+            with self._job_lock:
+                self._close_capture_locked(job)
+            self.scheduler.finish(job, False, str(e))
+
+    def _record_worker_pipe(self, job: RecordingJob, pre_frames: list,
+                            pre_audio: Optional[tuple]) -> bool:
+        """
+        단일 패스 녹화: 프레임/PCM을 ffmpeg에 바로 흘려 H.264/AAC MP4 생성.
+        프레임은 캡처 시각 기준으로 출력 FPS 격자에 배치 (빠르면 버림, 늦으면 직전 프레임 반복)하여
+        오디오와 타임스탬프가 맞도록 한다. 오디오는 영상 첫 프레임 시각에 맞춰 앞을 자르거나 무음으로 채움.
+        인코딩이 실시간으로 끝나므로 합성 단계(작업자 풀) 없이 이 스레드에서 작업을 종료한다.
+        반환: False = 사고 전 구간 기록 전에 실패 (호출 측이 2단계 방식으로 재시도), 그 외 True
+        """
+        filepath = job.filepath
+        base = filepath[:-4] if filepath.endswith(".mp4") else filepath
+        ptmp = base + "_ptmp.mp4"
+        with_audio = pre_audio is not None
+        pipe = FfmpegPipeWriter(
+            self._find_ffmpeg(), ptmp, job.width, job.height, self._out_fps,
+            with_audio, _AUDIO_SR, _AUDIO_CH,
         )
-        self._record_thread.start()
+        if not pipe.open():
+            return False
+        job.partial = ptmp            # 기록 중에도 재생 가능한 fragmented MP4 (다른 소비자가 이어 읽기 가능)
 
-    # ── 녹화 워커 ─────────────────────────────────────────────────────────────
+        t0 = job.start                # push_frame 큐 격자와 같은 기준
+        grid = _FpsGrid(t0, self._out_fps)
+        last = None
+
+        def emit(ts: float, frm: np.ndarray) -> bool:
+            nonlocal last
+            n = grid.place(ts)
+            if n == 0:
+                return True           # 출력 FPS보다 빠른 입력 — 이 슬롯은 이미 채움
+            if frm.shape[1] != job.width or frm.shape[0] != job.height:
+                frm = cv2.resize(frm, (job.width, job.height))
+            fill = last if last is not None else frm
+            for _ in range(n - 1):
+                if not pipe.write_video(fill):
+                    return False
+            if not pipe.write_video(frm):
+                return False
+            last = frm
+            return True
+
+        # 오디오 정렬: 첫 청크가 영상보다 늦으면 무음 삽입, 빠르면 앞부분 버림
+        audio_skip = 0
+        if with_audio:
+            offset = pre_audio[0] - t0
+            nbytes = int(abs(offset) * _AUDIO_SR) * _AUDIO_FRAME_BYTES
+            if offset > 0:
+                pipe.write_audio(bytes(nbytes))
+            else:
+                audio_skip = nbytes
+
+        def emit_audio(raw: bytes):
+            nonlocal audio_skip
+            if audio_skip:
+                cut = min(audio_skip, len(raw))
+                audio_skip -= cut
+                raw = raw[cut:]
+            if raw:
+                pipe.write_audio(raw)
+
+        ok = True
+        error = ""
+        try:
+            if with_audio:
+                emit_audio(memoryview(pre_audio[1]).cast("B"))   # 사고 전 오디오 — 연속 배열 1회 전달
+            for ts, frm in self._iter_pre_frames(pre_frames):
+                if not emit(ts, self._pre_crop(job, frm)):
+                    break
+            if pipe.failed:
+                pipe.abort()
+                self._remove_quietly(ptmp)
+                return False
+
+            # 사고 후 구간: 고정 크기 큐에서 받는 즉시 인코더로 전달
+            while not pipe.failed:
+                try:
+                    ts, frm = job.frames.get(timeout=0.02)
+                    emit(ts, frm)
+                except queue.Empty:
+                    pass
+                while job.audio:
+                    _ts, raw = job.audio.popleft()
+                    emit_audio(raw)
+                if self._capture_ended(job):
+                    break
+
+            # post 구간 끝까지 영상 길이 채움 (입력 끊김 구간은 마지막 프레임 유지)
+            if last is not None and not pipe.failed:
+                emit(job.end, last)
+        except Exception as e:
+            _log.error("파이프 녹화 오류: %s", e)
+            ok = False
+            error = str(e)
+        finally:
+            with self._job_lock:
+                self._close_capture_locked(job)
+            if not ok:
+                pipe.abort()
+            else:
+                ok = pipe.close()
+                if not ok:
+                    error = "ffmpeg 인코딩 실패"
+
+        job.partial = ""
+        if ok:
+            try:
+                os.replace(ptmp, filepath)
+            except OSError as e:
+                ok = False
+                error = f"파일 이름 변경 실패: {e}"
+        else:
+            self._remove_quietly(ptmp)
+        if job.dropped:
+            _log.warning(
+                "녹화 인코딩 지연 — 사고 후 프레임 %d개 드롭 (%s)",
+                job.dropped, os.path.basename(filepath),
+            )
+        self.scheduler.finish(job, self._register(job, ok), error)
+        return True
+
+    @staticmethod
+    def _pre_crop(job: RecordingJob, frm: np.ndarray) -> np.ndarray:
+        """사고 전 프레임(출력 해상도 전체 화면) → 크롭 클립 영역. 클립 해상도로의 확대는 emit에서"""
+        if job.crop is None or not job.src_size[0]:
+            return frm
+        fh, fw = frm.shape[:2]
+        sx, sy = fw / job.src_size[0], fh / job.src_size[1]
+        x1, y1, x2, y2 = job.crop
+        cx1, cy1 = int(x1 * sx), int(y1 * sy)
+        return frm[cy1:max(cy1 + 1, int(y2 * sy)), cx1:max(cx1 + 1, int(x2 * sx))]
 
-    def _record_worker(self, pre_frames: list, pre_audio: list, filepath: str):
+    @staticmethod
+    def _remove_quietly(path: str):
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
+
+    def _record_worker_twopass(self, job: RecordingJob, pre_frames: list,
+                               pre_audio: Optional[tuple]):
         """
-        MP4 녹화 워커 스레드.
-        1) 비디오(mp4v)와 오디오(WAV)를 임시 파일로 동시 기록
-        2) ffmpeg로 합성 → 최종 MP4
+        2단계 MP4 녹화 (pipe 방식 폴백).
+        1) 비디오(mp4v)와 오디오(WAV)를 임시 파일로 동시 기록 (이 스레드)
+        2) ffmpeg로 합성 → 최종 MP4 (작업자 풀)
         3) ffmpeg 미설치 시 비디오만 저장(폴백)
         """
+        filepath = job.filepath
         base = filepath[:-4] if filepath.endswith(".mp4") else filepath
         vtmp = base + "_vtmp.mp4"
         atmp = base + "_atmp.wav"
 
         # ── 비디오 Writer ──────────────────────────────────────────────────
         fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-        writer = cv2.VideoWriter(vtmp, fourcc, self._out_fps, (self._out_w, self._out_h))
+        writer = cv2.VideoWriter(vtmp, fourcc, self._out_fps, (job.width, job.height))
         if not writer.isOpened():
+            with self._job_lock:
+                self._close_capture_locked(job)
+            self.scheduler.finish(job, False, "VideoWriter 열기 실패")
             return
 
         has_audio = False
         wav_file = None
-        merged = False
+        # 캡처 시각 기준 출력 FPS 격자 — 입력 끊김/지연 구간은 직전 프레임 반복으로 채워 WAV와 길이를 맞춤
+        grid = _FpsGrid(job.start, self._out_fps)
+        last = None
+
+        def emit(ts: float, frm: np.ndarray):
+            nonlocal last
+            n = grid.place(ts)
+            if n == 0:
+                return
+            if frm.shape[1] != job.width or frm.shape[0] != job.height:
+                frm = cv2.resize(frm, (job.width, job.height))
+            fill = last if last is not None else frm
+            for _ in range(n - 1):
+                writer.write(fill)
+            writer.write(frm)
+            last = frm
 
         try:
             try:
@@ -293,59 +995,76 @@ class AutoRecorder:
                     wav_file = None                   # 오디오 없이 비디오만 기록
 
                 # 1) 사고 전 비디오 버퍼 기록
-                for _ts, jpeg_bytes in pre_frames:
-                    arr = np.frombuffer(jpeg_bytes, dtype=np.uint8)
-                    frm = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-                    if frm is not None:
-                        writer.write(frm)
+                for ts, frm in self._iter_pre_frames(pre_frames):
+                    emit(ts, self._pre_crop(job, frm))
 
-                # 2) 사고 전 오디오 버퍼 기록
-                if wav_file is not None:
-                    for _ts, raw in pre_audio:
-                        wav_file.writeframes(raw)
-                        has_audio = True
+                # 2) 사고 전 오디오 버퍼 기록 (연속 배열 1회 기록)
+                if wav_file is not None and pre_audio is not None:
+                    wav_file.writeframes(memoryview(pre_audio[1]).cast("B"))
+                    has_audio = True
 
-                # 3) 사고 후 실시간 프레임/오디오 기록 (녹화 플래그 해제까지)
+                # 3) 사고 후 실시간 프레임/오디오 기록 (post 구간 종료 + 큐 소진까지)
+                #    프레임 큐는 고정 크기 — 받는 즉시 인코딩하여 메모리에 쌓지 않음
                 while True:
-                    while self._record_queue:
-                        _ts, frm = self._record_queue.popleft()
-                        writer.write(frm)
+                    try:
+                        ts, frm = job.frames.get(timeout=0.02)
+                        emit(ts, frm)
+                    except queue.Empty:
+                        pass
 
                     if wav_file is not None:
-                        while self._audio_record_queue:
-                            _ts, raw = self._audio_record_queue.popleft()
+                        while job.audio:
+                            _ts, raw = job.audio.popleft()
                             wav_file.writeframes(raw)
                             has_audio = True
 
-                    if not self._recording:
-                        # 남은 큐 모두 기록 후 종료
-                        while self._record_queue:
-                            _ts, frm = self._record_queue.popleft()
-                            writer.write(frm)
-                        if wav_file is not None:
-                            while self._audio_record_queue:
-                                _ts, raw = self._audio_record_queue.popleft()
-                                wav_file.writeframes(raw)
-                                has_audio = True
+                    if self._capture_ended(job):
                         break
-                    else:
-                        time.sleep(0.02)
+
+                # post 구간 끝까지 영상 길이 채움 (입력 끊김 구간은 마지막 프레임 유지)
+                if last is not None:
+                    emit(job.end, last)
+
+                if job.dropped:
+                    _log.warning(
+                        "녹화 인코딩 지연 — 사고 후 프레임 %d개 드롭 (%s)",
+                        job.dropped, os.path.basename(filepath),
+                    )
             finally:
                 writer.release()
                 if wav_file is not None:
                     wav_file.close()
+        except Exception as e:
+            _log.error("2단계 녹화 오류: %s", e)
+            has_audio = False                         # 합성 없이 기록된 영상만 보존
+        finally:
+            with self._job_lock:
+                self._close_capture_locked(job)
 
-            # 4) ffmpeg 합성 (오디오가 있을 때만 시도)
-            if has_audio:
-                # 비디오/오디오 시작 타임스탬프 기반 싱크 오프셋 계산
-                v_start = pre_frames[0][0] if pre_frames else None
-                a_start = pre_audio[0][0] if pre_audio else None
-                audio_offset = (a_start - v_start) if (v_start and a_start) else 0.0
+        if not has_audio:
+            ok = self._finish_twopass(vtmp, atmp, filepath, False, 0.0)
+            self.scheduler.finish(job, self._register(job, ok))
+            return
 
-                merged = self._merge_with_ffmpeg(vtmp, atmp, filepath, audio_offset)
+        # 4) ffmpeg 합성은 작업자 풀에서 (비디오/오디오 시작 타임스탬프 기반 싱크 오프셋)
+        v_start = pre_frames[0][0] if pre_frames else None
+        a_start = pre_audio[0] if pre_audio is not None else None
+        audio_offset = (a_start - v_start) if (v_start and a_start) else 0.0
+        self.scheduler.submit(
+            job, lambda: self._register(
+                job, self._finish_twopass(vtmp, atmp, filepath, True, audio_offset)
+            )
+        )
 
+    def _finish_twopass(self, vtmp: str, atmp: str, filepath: str,
+                        has_audio: bool, audio_offset: float) -> bool:
+        """2단계 녹화 마무리: ffmpeg 합성(오디오가 있을 때만) → 임시 파일 정리. 반환: 최종 파일 생성 여부"""
+        merged = False
+        try:
+            if has_audio:
+                merged = self._merge_with_ffmpeg(vtmp, atmp, filepath, audio_offset)
         finally:
-            # 5) 정리: 임시 파일 삭제, 폴백 처리 (예외 시에도 반드시 실행)
+            # 정리: 임시 파일 삭제, 폴백 처리 (예외 시에도 반드시 실행)
             if merged:
                 # 합성 성공 → vtmp 삭제 (atmp는 아래에서 삭제)
                 try:
@@ -365,9 +1084,28 @@ class AutoRecorder:
                     os.remove(atmp)
             except Exception:
                 pass
+        return os.path.exists(filepath)
 
     # ── ffmpeg 합성 ───────────────────────────────────────────────────────────
 
+    _ffmpeg_ok: Optional[bool] = None   # ffmpeg 실행 가능 여부 캐시 (프로세스 전체 공유)
+
+    @classmethod
+    def _ffmpeg_available(cls) -> bool:
+        """ffmpeg 실행 가능 여부 (최초 1회 -version 실행으로 확인)"""
+        if cls._ffmpeg_ok is None:
+            try:
+                result = subprocess.run(
+                    [cls._find_ffmpeg(), "-hide_banner", "-version"],
+                    capture_output=True, timeout=5,
+                )
+                cls._ffmpeg_ok = result.returncode == 0
+            except Exception:
+                cls._ffmpeg_ok = False
+            if not cls._ffmpeg_ok:
+                _log.warning("ffmpeg 없음 — 2단계 녹화(mp4v, 오디오 합성 불가 시 영상만) 사용")
+        return cls._ffmpeg_ok
+
     @staticmethod
     def _find_ffmpeg() -> str:
         """
@@ -418,6 +1156,7 @@ class AutoRecorder:
             "-map", "0:v:0",
             "-map", "1:a:0",
             "-shortest",
+            *FRAGMENTED_MP4_ARGS,
             output,
         ]
 
@@ -438,30 +1177,17 @@ class AutoRecorder:
 
     # ── 자동 삭제 ─────────────────────────────────────────────────────────────
 
-    def _cleanup_loop(self):
-        """1시간마다 max_keep_days 초과 파일 및 고아 임시파일 자동 삭제"""
-        while self._running:
-            self._delete_old_files()
-            self._cleanup_orphan_temp_files()
+    @classmethod
+    def _cleanup_loop(cls):
+        """1시간마다 카탈로그 기준으로 보관 일수/총 용량 초과 녹화 삭제 + 저장 폴더의 고아 임시 파일 복구(폴더당 1회).
+        전 입력 공유 스레드 1개 — 입력 수와 무관하게 저장 폴더당 한 번만 적용한다."""
+        while cls._live_recorders > 0:
+            save_dir, keep_days, max_total_bytes = cls._retention
+            cls._recover_orphan_files(save_dir)
+            removed = cls.catalog.enforce(keep_days, max_total_bytes)
+            if removed:
+                _log.info("녹화 보관 정책 적용 — %d개 삭제", removed)
             for _ in range(3600):
-                if not self._running:
+                if cls._live_recorders <= 0:
                     return
                 time.sleep(1)
-
-    def _delete_old_files(self):
-        """max_keep_days보다 오래된 MP4 파일 삭제"""
-        if not os.path.isdir(self._save_dir):
-            return
-        cutoff = time.time() - self._max_keep_days * 86400
-        try:
-            for fname in os.listdir(self._save_dir):
-                if not fname.lower().endswith(".mp4"):
-                    continue
-                fpath = os.path.join(self._save_dir, fname)
-                try:
-                    if os.path.getmtime(fpath) < cutoff:
-                        os.remove(fpath)
-                except Exception:
-                    pass
-        except Exception:
-            pass
@@ -0,0 +1,113 @@
+"""
+감지 성능 벤치마크
+실제 감지 경로(Detector.detect_frame / detect_audio_roi)를 지정 해상도 프레임으로 반복 실행하여
+감지 1회 처리 시간(ms)을 측정. 설정창 '성능 측정' 버튼과 명령행에서 공용으로 사용.
+
+명령행 (kbs_monitor 폴더에서 실행):
+  python -m core.benchmark            # UHD 3840×2160, 16분할 비디오+오디오 ROI, 200ms 예산 판정
+  python -m core.benchmark --hd       # 1920×1080 기준
+종료 코드: 평균 처리 시간이 예산 이내면 0, 초과하면 1
+"""
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from core.detector import Detector
+from core.roi_manager import ROI
+from core.synthetic_source import SyntheticMultiview
+
+HD_SIZE = (1920, 1080)
+UHD_SIZE = (3840, 2160)
+DETECTION_BUDGET_MS = 200.0   # 기본 감지 주기 (performance.detection_interval)
+
+
+def make_grid_rois(frame_w: int, frame_h: int, cols: int = 4, rows: int = 4) -> tuple:
+    """
+    멀티뷰 N×M 분할 화면 기준 ROI 생성 (원본 해상도 좌표, 합성 소스 레이아웃과 동일).
+    타일마다 비디오 ROI(화면 영역) 1개 + 오디오 ROI(우측 레벨미터 띠) 1개.
+    반환: (video_rois, audio_rois)
+    """
+    return SyntheticMultiview(frame_w, frame_h, cols, rows, events=[]).tile_rois()
+
+
+def make_bench_frames(frame_w: int, frame_h: int, count: int = 2, cols: int = 4,
+                      rows: int = 4, seed: int = 0) -> list:
+    """
+    측정용 합성 멀티뷰 프레임 목록 (움직이는 영상 + 레벨미터 — 실제 화면과 같은 감지 경로 실행).
+    감지 주기(200ms) 간격 프레임이므로 스틸 감지 diff도 실제처럼 변화가 있는 상태로 계산된다.
+    """
+    src = SyntheticMultiview(frame_w, frame_h, cols, rows, events=[], seed=seed)
+    step = max(1, int(src.fps * DETECTION_BUDGET_MS / 1000.0))
+    return [src.frame_at(i * step) for i in range(count)]
+
+
+def run_benchmark(detector: Detector, frames: list, video_rois: List[ROI],
+                  audio_rois: List[ROI], iterations: int = 10,
+                  audio_enabled: bool = True) -> dict:
+    """
+    감지 1회(비디오 블랙/스틸 + 오디오 레벨미터) 처리 시간 측정.
+    detector는 측정 전용 인스턴스를 넘길 것 (감지 상태가 누적됨).
+    반환: {"avg_ms", "max_ms", "iterations", "frame_size"}
+    """
+    times = []
+    # 1회 예열 (이전 프레임 버퍼 생성 — 이후 반복은 diff 경로 포함)
+    warm = frames[0]
+    if video_rois:
+        detector.detect_frame(warm, video_rois)
+    if audio_rois and audio_enabled:
+        detector.detect_audio_roi(warm, audio_rois)
+
+    for i in range(iterations):
+        frame = frames[(i + 1) % len(frames)]
+        t0 = time.perf_counter()
+        if video_rois and (detector.black_detection_enabled or detector.still_detection_enabled):
+            detector.detect_frame(frame, video_rois)
+        if audio_rois and audio_enabled:
+            detector.detect_audio_roi(frame, audio_rois)
+        times.append((time.perf_counter() - t0) * 1000.0)
+
+    h, w = frames[0].shape[:2]
+    return {
+        "avg_ms": sum(times) / len(times) if times else 0.0,
+        "max_ms": max(times) if times else 0.0,
+        "iterations": len(times),
+        "frame_size": (w, h),
+    }
+
+
+def run_grid_benchmark(frame_size: tuple = UHD_SIZE, cols: int = 4, rows: int = 4,
+                       iterations: int = 10, detector: Optional[Detector] = None) -> dict:
+    """N×M 분할 기준 벤치마크 (기본: UHD 16분할 — 비디오 16 + 오디오 16 ROI)"""
+    fw, fh = frame_size
+    video_rois, audio_rois = make_grid_rois(fw, fh, cols, rows)
+    result = run_benchmark(
+        detector or Detector(), make_bench_frames(fw, fh),
+        video_rois, audio_rois, iterations=iterations,
+    )
+    result["video_rois"] = len(video_rois)
+    result["audio_rois"] = len(audio_rois)
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="감지 성능 벤치마크 (16분할 멀티뷰 기준)")
+    parser.add_argument("--hd", action="store_true", help="1920×1080 기준 측정 (기본: UHD)")
+    parser.add_argument("--iterations", type=int, default=20, help="반복 횟수 (기본 20)")
+    parser.add_argument("--budget", type=float, default=DETECTION_BUDGET_MS,
+                        help="감지 주기 예산 ms (기본 200)")
+    args = parser.parse_args(argv)
+
+    size = HD_SIZE if args.hd else UHD_SIZE
+    r = run_grid_benchmark(size, iterations=args.iterations)
+    ok = r["avg_ms"] <= args.budget
+    print(
+        f"{size[0]}×{size[1]} | 비디오 {r['video_rois']} + 오디오 {r['audio_rois']} ROI | "
+        f"평균 {r['avg_ms']:.1f}ms / 최대 {r['max_ms']:.1f}ms | "
+        f"예산 {args.budget:.0f}ms → {'통과' if ok else '초과'}"
+    )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
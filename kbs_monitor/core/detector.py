@@ -3,28 +3,37 @@
 블랙/스틸/레벨미터/임베디드오디오 감지 로직
 """
 import logging
+import math
 import time
 import cv2
 import numpy as np
 from collections import deque
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from core.roi_manager import ROI
+from core.frame_pyramid import FramePyramid
 
 _log = logging.getLogger(__name__)
 
+# ROI 1개당 감지 연산 픽셀 상한 — 1080p 16분할 타일 1칸(480×270) 기준.
+# UHD(3840×2160) 입력의 타일(960×540)은 자동으로 1/2 축소되어 1080p와 동일한 연산량 유지.
+# 1080p 이하 입력에는 적용하지 않는다 (기존 입력의 감지 감도 유지).
+DEFAULT_ROI_PIXEL_BUDGET = 480 * 270
+_BUDGET_MIN_FRAME_PIXELS = 1920 * 1080   # 이 크기를 넘는 프레임에만 픽셀 상한 적용
+
 
 class DetectionState:
     """단일 감지영역의 상태 추적"""
 
-    def __init__(self, roi: ROI):
+    def __init__(self, roi: ROI, clock: Callable[[], float] = time.time):
         self.roi = roi
+        self._clock = clock            # 시각 공급 함수 (오프라인 분석 시 프레임 타임스탬프)
         self.is_alerting = False       # 현재 알림 발생 중
         self.alert_start_time: Optional[float] = None  # 이상 시작 시간
         self.alert_duration = 0.0     # 이상 지속 시간(초)
         self.last_alert_duration = 0.0  # 직전 알림의 지속 시간(복구 시 참조)
         self.just_resolved = False      # 이번 업데이트에서 정상 복구됨
         self.recovery_start_time: Optional[float] = None  # 복구 대기 시작 시간
-        self.last_check_time = time.time()
+        self.last_check_time = clock()
         # 히스테리시스: 연속 N프레임 정상이어야 타이머 리셋
         self._not_still_count: int = 0
         self._last_reset_time: float = 0.0   # 타이머 리셋 발생 시각
@@ -41,7 +50,7 @@ class DetectionState:
                           0이면 reset_frames 히스테리시스 적용
         reset_frames: 연속 정상 프레임 수 임계값 (경보 전/후 동일 적용)
         """
-        now = time.time()
+        now = self._clock()
         was_alerting = self.is_alerting
 
         if is_abnormal:
@@ -100,7 +109,7 @@ class DetectionState:
     def _do_resolve(self, now: float = None):
         """알림 → 정상 전환 처리"""
         if now is None:
-            now = time.time()
+            now = self._clock()
         self._resolve_count += 1
         self._last_reset_from = self.alert_duration
         self._last_reset_time = now
@@ -129,8 +138,12 @@ class Detector:
     """
 
     def __init__(self):
+        # 시각 공급 함수 — 실시간 감시는 time.time, 오프라인 분석(analyze.py)은 미디어 타임스탬프로 교체
+        self.clock: Callable[[], float] = time.time
+
         # 성능 설정
         self.scale_factor = 1.0              # 감지 해상도 스케일 (1.0 / 0.5 / 0.25)
+        self.roi_pixel_budget = DEFAULT_ROI_PIXEL_BUDGET  # ROI별 감지 픽셀 상한 (0=제한 없음)
         self.black_detection_enabled = True  # 블랙 감지 활성화 여부
         self.still_detection_enabled = True  # 스틸 감지 활성화 여부
 
@@ -184,6 +197,50 @@ class Detector:
         # near-miss 추적 (임계값 근접 상태 지속 시간)
         self._near_miss_start: Dict[str, float] = {}
 
+    # ── 설정 적용 ──────────────────────────────────────────────────────────────
+
+    def apply_config(self, det: dict):
+        """config["detection"] dict에서 감지 파라미터 적용"""
+        self.black_threshold = det.get("black_threshold", 5)
+        self.black_dark_ratio = det.get("black_dark_ratio", 98.0)
+        self.black_duration = det.get("black_duration", 20)
+        self.black_alarm_duration = det.get("black_alarm_duration", 60)
+        self.black_motion_suppress_ratio = det.get("black_motion_suppress_ratio", 0.2)
+        self.still_threshold = det.get("still_threshold", 4)
+        self.still_block_threshold = det.get("still_block_threshold", 15.0)
+        self.still_duration = det.get("still_duration", 60.0)
+        self.still_alarm_duration = det.get("still_alarm_duration", 60)
+        self.still_reset_frames = int(det.get("still_reset_frames", 3))
+        # 오디오 레벨미터 HSV
+        self.audio_hsv_h_min = det.get("audio_hsv_h_min", 40)
+        self.audio_hsv_h_max = det.get("audio_hsv_h_max", 95)
+        self.audio_hsv_s_min = det.get("audio_hsv_s_min", 80)
+        self.audio_hsv_s_max = det.get("audio_hsv_s_max", 255)
+        self.audio_hsv_v_min = det.get("audio_hsv_v_min", 60)
+        self.audio_hsv_v_max = det.get("audio_hsv_v_max", 255)
+        self.audio_pixel_ratio = det.get("audio_pixel_ratio", 5.0)
+        self.audio_level_duration = det.get("audio_level_duration", 20.0)
+        self.audio_level_alarm_duration = det.get("audio_level_alarm_duration", 60)
+        self.audio_level_recovery_seconds = det.get("audio_level_recovery_seconds", 2.0)
+        # 임베디드 오디오
+        self.embedded_silence_threshold = det.get("embedded_silence_threshold", -50)
+        self.embedded_silence_duration = det.get("embedded_silence_duration", 20.0)
+        self.embedded_alarm_duration = det.get("embedded_alarm_duration", 60)
+        # 정파용 오디오 톤 감지
+        self.audio_tone_std_threshold = det.get("audio_tone_std_threshold", 3.0)
+        self.audio_tone_duration      = det.get("audio_tone_duration", 60.0)
+        self.audio_tone_min_level     = det.get("audio_tone_min_level", 5.0)
+
+    def apply_performance(self, perf: dict):
+        """config["performance"] dict에서 감지 해상도/감지 종류 활성화 적용"""
+        self.scale_factor = perf.get("scale_factor", 1.0)
+        self.black_detection_enabled = perf.get("black_detection_enabled", True)
+        self.still_detection_enabled = perf.get("still_detection_enabled", True)
+
+    def _now(self) -> float:
+        """DetectionState용 시각 (clock 교체가 기존 상태에도 반영되도록 간접 호출)"""
+        return self.clock()
+
     def _check_still_by_blocks(self, changed_mask: np.ndarray) -> bool:
         """5×5 블록 기반 스틸 판정. 블록 중 하나라도 움직임 임계값 초과 시 False(스틸 아님) 반환."""
         bh, bw = changed_mask.shape[:2]
@@ -205,21 +262,41 @@ class Detector:
                     return False  # 이 블록에 움직임 있음 → 스틸 아님
         return True  # 모든 블록이 정적 → 스틸
 
-    def _apply_scale_factor(self, frame: np.ndarray) -> np.ndarray:
-        """해상도 스케일 적용 (scale_factor < 1.0 인 경우에만 축소)"""
-        if self.scale_factor < 1.0:
-            return cv2.resize(frame, None, fx=self.scale_factor, fy=self.scale_factor,
-                              interpolation=cv2.INTER_AREA)
-        return frame
-
-    def _get_scaled_bounds(self, roi: ROI, frame_h: int, frame_w: int) -> tuple:
-        """scale_factor 보정된 ROI 경계 좌표 반환 (x1, y1, x2, y2)"""
-        sf = self.scale_factor
-        x1 = max(0, int(roi.x * sf))
-        y1 = max(0, int(roi.y * sf))
-        x2 = min(frame_w, int((roi.x + roi.w) * sf))
-        y2 = min(frame_h, int((roi.y + roi.h) * sf))
-        return x1, y1, x2, y2
+    def _crop_roi(self, frame: np.ndarray, roi: ROI,
+                  pyramid: Optional[FramePyramid] = None) -> Optional[np.ndarray]:
+        """
+        원본 해상도 좌표로 ROI crop 후 감지용 해상도로 축소 (전체 프레임 리사이즈 없음).
+        축소 비율 = min(scale_factor, 픽셀 상한 비율) — 1080p를 넘는 입력(UHD 등)의 큰 ROI만 자동으로 더 축소된다.
+        픽셀 상한 비율은 1/k(정수 k)로 내림하고 영역을 k의 배수로 맞춘다 — 정수배 INTER_AREA는
+        OpenCV 고속 경로(블록 평균)를 타지만 비정수 비율은 일반 경로로 10배 이상 느리다.
+        pyramid가 있으면 같은 프레임의 같은 영역 축소본을 재사용한다 (입력 정지로 같은 프레임 반복 감지 등).
+        ROI가 프레임 밖이면 None 반환.
+        """
+        fh, fw = frame.shape[:2]
+        x1 = max(0, roi.x)
+        y1 = max(0, roi.y)
+        x2 = min(fw, roi.x + roi.w)
+        y2 = min(fh, roi.y + roi.h)
+        if x2 <= x1 or y2 <= y1:
+            return None
+        crop = frame[y1:y2, x1:x2]
+        cw, ch = x2 - x1, y2 - y1
+        sf = min(1.0, self.scale_factor)
+        budget = self.roi_pixel_budget
+        if budget > 0 and fw * fh > _BUDGET_MIN_FRAME_PIXELS and cw * ch * sf * sf > budget:
+            k = min(math.ceil((cw * ch / float(budget)) ** 0.5), cw, ch)
+            tw, th = cw // k, ch // k
+            x2, y2 = x1 + tw * k, y1 + th * k     # 나머지(k-1 픽셀 이하) 가장자리 제외 → 정확한 정수배
+            if pyramid is not None and pyramid.frame is frame:
+                return pyramid.region(x1, y1, x2, y2, tw, th)
+            return cv2.resize(frame[y1:y2, x1:x2], (tw, th), interpolation=cv2.INTER_AREA)
+        if sf < 1.0:
+            tw = max(1, int(cw * sf))
+            th = max(1, int(ch * sf))
+            if pyramid is not None and pyramid.frame is frame:
+                return pyramid.region(x1, y1, x2, y2, tw, th)
+            crop = cv2.resize(crop, (tw, th), interpolation=cv2.INTER_AREA)
+        return crop
 
     def update_roi_list(self, rois: List[ROI]):
         """감지영역 목록 변경 시 상태 초기화 및 오래된 버퍼 정리"""
@@ -252,41 +329,34 @@ class Detector:
                 del self._tone_states[label]
         for roi in rois:
             if roi.label not in self._black_states:
-                self._black_states[roi.label] = DetectionState(roi)
+                self._black_states[roi.label] = DetectionState(roi, self._now)
             else:
                 self._black_states[roi.label].roi = roi
             if roi.label not in self._still_states:
-                self._still_states[roi.label] = DetectionState(roi)
+                self._still_states[roi.label] = DetectionState(roi, self._now)
             else:
                 self._still_states[roi.label].roi = roi
 
     def detect_frame(self, frame: np.ndarray, rois: List[ROI],
-                     force_still_labels: Optional[set] = None) -> Dict[str, dict]:
+                     force_still_labels: Optional[set] = None,
+                     pyramid: Optional[FramePyramid] = None) -> Dict[str, dict]:
         """
         프레임을 분석하여 각 감지영역의 블랙/스틸 상태 반환.
         반환값: {label: {"black": bool, "still": bool, "black_alerting": bool, "still_alerting": bool}}
-        scale_factor 적용 시 감지용 프레임 축소 후 ROI 좌표 보정.
+        ROI 좌표는 원본 해상도 기준. ROI별로 crop 후 감지 해상도로 축소한다 (_crop_roi).
 
         force_still_labels: still_detection_enabled=False이어도 스틸 계산을 강제할 label 집합.
                             SignoffManager의 enter_roi label에 대해 정파 감지 목적으로 사용.
+        pyramid: frame의 해상도 피라미드 (있으면 ROI 축소본 캐시 공유)
         """
         results = {}
 
-        # 해상도 스케일 적용 (감지 연산 픽셀 수 감소)
-        frame = self._apply_scale_factor(frame)
-
-        h, w = frame.shape[:2]
         for roi in rois:
             label = roi.label
             try:
-                # scale_factor 보정된 ROI 좌표 (공통 메서드)
-                x1, y1, x2, y2 = self._get_scaled_bounds(roi, h, w)
-
-                if x2 <= x1 or y2 <= y1:
-                    continue
-
-                crop = frame[y1:y2, x1:x2]
-                if crop.size == 0:
+                # 원본 좌표 crop + ROI별 감지 해상도 축소 (공통 메서드)
+                crop = self._crop_roi(frame, roi, pyramid)
+                if crop is None or crop.size == 0:
                     continue
 
                 # 블랙 감지 (어두운 픽셀 비율 방식 — 비활성화 시 계산 생략)
@@ -336,10 +406,10 @@ class Detector:
 
                 # 상태 업데이트
                 if label not in self._black_states:
-                    self._black_states[label] = DetectionState(roi)
+                    self._black_states[label] = DetectionState(roi, self._now)
                 black_state = self._black_states[label]
                 if label not in self._still_states:
-                    self._still_states[label] = DetectionState(roi)
+                    self._still_states[label] = DetectionState(roi, self._now)
                 still_state = self._still_states[label]
 
                 black_alerting = black_state.update(is_black, self.black_duration)
@@ -356,7 +426,7 @@ class Detector:
 
                 # near-miss 추적: 임계값에 근접한 상태가 30초 이상 지속 시 진단 로그
                 # dark_ratio > 80%: 블랙 기준(98%)에 실질적으로 근접한 경우만 추적
-                now_nm = time.time()
+                now_nm = self.clock()
                 is_near_miss = (dark_ratio > 80.0) or (changed_ratio >= 0 and changed_ratio < 3.0)
                 if is_near_miss:
                     if label not in self._near_miss_start:
@@ -387,34 +457,25 @@ class Detector:
 
         return results
 
-    def detect_audio_roi(self, frame: np.ndarray, audio_rois: List[ROI]) -> Dict[str, dict]:
+    def detect_audio_roi(self, frame: np.ndarray, audio_rois: List[ROI],
+                         pyramid: Optional[FramePyramid] = None) -> Dict[str, dict]:
         """
         오디오 ROI에서 HSV 기반 레벨미터 색상 감지.
         반환값: {label: {"active": bool, "ratio": float, "alerting": bool, "duration": float,
                          "resolved": bool, "last_duration": float}}
         레벨미터가 일정 시간 비활성(색 없음)이면 알림 발생.
-        전체 프레임 HSV 변환 대신 ROI별 crop 후 변환하여 처리 픽셀 수 대폭 감소.
+        전체 프레임 HSV 변환 대신 ROI별 crop(+감지 해상도 축소) 후 변환하여 처리 픽셀 수 대폭 감소.
         """
         results = {}
         lower = np.array([self.audio_hsv_h_min, self.audio_hsv_s_min, self.audio_hsv_v_min])
         upper = np.array([self.audio_hsv_h_max, self.audio_hsv_s_max, self.audio_hsv_v_max])
 
-        # 해상도 스케일 적용 (공통 메서드 사용)
-        frame = self._apply_scale_factor(frame)
-        fh, fw = frame.shape[:2]
-
         for roi in audio_rois:
             label = roi.label
             try:
-                # scale_factor 보정된 ROI 좌표 (공통 메서드)
-                x1, y1, x2, y2 = self._get_scaled_bounds(roi, fh, fw)
-
-                if x2 <= x1 or y2 <= y1:
-                    continue
-
-                # BGR crop 후 HSV 변환 (전체 프레임 변환 제거)
-                crop_bgr = frame[y1:y2, x1:x2]
-                if crop_bgr.size == 0:
+                # BGR crop(+감지 해상도 축소) 후 HSV 변환 (전체 프레임 변환 제거)
+                crop_bgr = self._crop_roi(frame, roi, pyramid)
+                if crop_bgr is None or crop_bgr.size == 0:
                     continue
                 crop = cv2.cvtColor(crop_bgr, cv2.COLOR_BGR2HSV)
                 mask = cv2.inRange(crop, lower, upper)
@@ -436,7 +497,7 @@ class Detector:
                 is_abnormal = not is_active
 
                 if label not in self._audio_level_states:
-                    self._audio_level_states[label] = DetectionState(roi)
+                    self._audio_level_states[label] = DetectionState(roi, self._now)
                 state = self._audio_level_states[label]
                 state.roi = roi
 
@@ -463,8 +524,8 @@ class Detector:
         """
         if silence_seconds > 0:
             if self._embedded_alert_start is None:
-                self._embedded_alert_start = time.time() - silence_seconds
-            elapsed = time.time() - self._embedded_alert_start
+                self._embedded_alert_start = self.clock() - silence_seconds
+            elapsed = self.clock() - self._embedded_alert_start
             if elapsed >= self.embedded_silence_duration and not self.embedded_alerting:
                 self.embedded_alerting = True
         else:
@@ -0,0 +1,252 @@
+"""
+ffmpeg 파이프 녹화기
+raw BGR 프레임(stdin)과 s16le PCM(로컬 TCP)을 ffmpeg 프로세스 1개에 흘려보내
+H.264/AAC MP4를 단일 패스로 생성한다. 녹화 종료 시점에 바로 최종 파일이 된다.
+기본 출력은 fragmented MP4 (moov를 맨 앞에 두고 약 1초 조각마다 moof+mdat을 바로 기록) —
+녹화 도중 프로세스가 죽어도 마지막 조각까지 재생 가능하고, 기록 중인 파일을 다른 소비자가 이어 읽을 수 있다.
+
+오디오 입력은 Windows에서도 동작하도록 파이프 대신 127.0.0.1 임시 포트를 사용:
+  이 모듈이 listen → ffmpeg가 tcp://127.0.0.1:port 로 접속 → 송신 스레드가 PCM 전달.
+ffmpeg는 입력을 순서대로 열면서 스트림 정보를 읽으므로, 영상(stdin) 기록과 오디오 접속 수락을
+별도 스레드로 분리해 서로 기다리며 멈추지 않게 한다.
+"""
+import logging
+import queue
+import socket
+import subprocess
+import threading
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+_log = logging.getLogger(__name__)
+
+_ACCEPT_TIMEOUT = 10.0      # ffmpeg 오디오 입력 접속 대기 (초)
+_CLOSE_TIMEOUT = 30.0       # 입력 종료 후 ffmpeg 마무리(인코딩 flush + moov 기록) 대기 (초)
+_AUDIO_QUEUE_CHUNKS = 2000  # 오디오 송신 대기열 상한 (1024샘플 청크 기준 약 46초)
+_AUDIO_MAX_LAG = 1.0        # 오디오가 영상보다 이만큼(초) 늦으면 무음으로 채움 (기본 출력만)
+
+# Windows 콘솔 창 숨김 (다른 OS는 0)
+_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+# fragmented MP4 출력 옵션 — 키프레임마다 조각을 닫고(1초 간격 강제 키프레임과 함께 사용) 바로 디스크에 기록
+FRAGMENTED_MP4_ARGS = [
+    "-movflags", "+frag_keyframe+empty_moov+default_base_moof",
+    "-flush_packets", "1",
+]
+_FRAGMENT_KEYFRAME_ARGS = ["-force_key_frames", "expr:gte(t,n_forced*1)"]
+
+
+class FfmpegPipeWriter:
+    """raw 프레임 + PCM → ffmpeg 단일 패스 H.264/AAC 인코더"""
+
+    def __init__(self, ffmpeg: str, output: str, width: int, height: int, fps: int,
+                 with_audio: bool, sample_rate: int = 44100, channels: int = 2,
+                 output_args: Optional[list] = None):
+        """output_args: 출력 형식 옵션 (None이면 fragmented MP4 — 1초 조각).
+        상시 세그먼트 녹화처럼 다른 먹서를 쓸 때 지정한다.
+        기본 출력에서는 오디오 입력이 끊기거나 먼저 끝나면 무음으로 영상 길이만큼 채운다
+        (-shortest로 영상을 자르지 않음). output_args를 지정한 호출 측은 직접 맞춘다."""
+        self._ffmpeg = ffmpeg
+        self._output = output
+        self._w = int(width)
+        self._h = int(height)
+        self._fps = int(fps)
+        self._with_audio = with_audio
+        self._sr = int(sample_rate)
+        self._ch = int(channels)
+        self._output_args = output_args
+        self._pad_audio = output_args is None
+        self._audio_bytes = 0                       # 송신 대기열에 넣은 PCM 바이트 수
+        self._bytes_per_sec = self._sr * self._ch * 2
+
+        self._proc: Optional[subprocess.Popen] = None
+        self._listener: Optional[socket.socket] = None
+        self._audio_queue: queue.Queue = queue.Queue(maxsize=_AUDIO_QUEUE_CHUNKS)
+        self._audio_thread: Optional[threading.Thread] = None
+        self._stderr_tail: deque = deque(maxlen=20)
+        self.failed = False
+        self.frames_written = 0
+
+    # ── 생명주기 ──────────────────────────────────────────────────────────────
+
+    def open(self) -> bool:
+        """ffmpeg 프로세스 시작. 실패 시 False (호출 측은 2단계 녹화로 폴백)"""
+        cmd = [
+            self._ffmpeg, "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "bgr24",
+            "-s", f"{self._w}x{self._h}", "-framerate", str(self._fps),
+            "-i", "pipe:0",
+        ]
+        if self._with_audio:
+            try:
+                self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                self._listener.bind(("127.0.0.1", 0))
+                self._listener.listen(1)
+                self._listener.settimeout(_ACCEPT_TIMEOUT)
+            except OSError as e:
+                _log.warning("파이프 녹화 오디오 포트 열기 실패 — 영상만 기록: %s", e)
+                self._listener = None
+                self._with_audio = False
+        if self._with_audio:
+            port = self._listener.getsockname()[1]
+            cmd += [
+                "-f", "s16le", "-ar", str(self._sr), "-ac", str(self._ch),
+                "-i", f"tcp://127.0.0.1:{port}",
+            ]
+        cmd += ["-map", "0:v:0"]
+        if self._with_audio:
+            cmd += ["-map", "1:a:0"]
+        cmd += [
+            "-c:v", "libx264", "-preset", "veryfast", "-crf", "23", "-pix_fmt", "yuv420p",
+        ]
+        if self._with_audio:
+            cmd += ["-c:a", "aac", "-b:a", "128k"]
+        if self._output_args is None:
+            cmd += _FRAGMENT_KEYFRAME_ARGS + FRAGMENTED_MP4_ARGS + [self._output]
+        else:
+            cmd += list(self._output_args) + [self._output]
+
+        try:
+            self._proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                creationflags=_NO_WINDOW,
+            )
+        except (OSError, ValueError) as e:
+            _log.warning("ffmpeg 파이프 녹화 시작 실패: %s", e)
+            self._close_listener()
+            return False
+
+        threading.Thread(target=self._read_stderr, daemon=True, name="FfmpegPipeStderr").start()
+        if self._with_audio:
+            self._audio_thread = threading.Thread(
+                target=self._audio_sender, daemon=True, name="FfmpegPipeAudio"
+            )
+            self._audio_thread.start()
+        return True
+
+    def close(self) -> bool:
+        """입력 종료 → ffmpeg 마무리 대기. 반환: 최종 파일 생성 성공 여부"""
+        if self._proc is None:
+            return False
+        try:
+            if self._proc.stdin:
+                self._proc.stdin.close()
+        except OSError:
+            pass
+        if self._audio_thread is not None:
+            if self._pad_audio and not self.failed:
+                self._pad_audio_to(self.frames_written / self._fps, timeout=_CLOSE_TIMEOUT)
+            try:
+                self._audio_queue.put(None, timeout=1.0)   # 송신 스레드 종료 신호
+            except queue.Full:
+                pass
+            self._audio_thread.join(timeout=_CLOSE_TIMEOUT)
+        try:
+            rc = self._proc.wait(timeout=_CLOSE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            rc = -1
+        self._close_listener()
+        if rc != 0:
+            _log.warning(
+                "ffmpeg 파이프 녹화 실패 (rc=%s): %s", rc, " | ".join(self._stderr_tail) or "-"
+            )
+        return rc == 0 and not self.failed
+
+    def abort(self):
+        """오류 시 강제 종료 (부분 파일은 호출 측에서 정리)"""
+        self.failed = True
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.kill()
+        self._close_listener()
+
+    # ── 입력 ──────────────────────────────────────────────────────────────────
+
+    def write_video(self, frame: np.ndarray) -> bool:
+        """BGR 프레임 1장 기록 (출력 해상도와 같아야 함). 실패 시 False"""
+        if self.failed or self._proc is None:
+            return False
+        try:
+            self._proc.stdin.write(memoryview(np.ascontiguousarray(frame)).cast("B"))
+            self.frames_written += 1
+        except (OSError, ValueError) as e:
+            self.failed = True
+            _log.warning("ffmpeg 파이프 영상 기록 실패: %s | %s", e, " | ".join(self._stderr_tail) or "-")
+            return False
+        # 오디오 입력이 끊기면 무음으로 채워 영상과 같은 속도로 진행되게 한다
+        if self._pad_audio and self._with_audio:
+            video_sec = self.frames_written / self._fps
+            if video_sec - self._audio_bytes / self._bytes_per_sec > _AUDIO_MAX_LAG:
+                self._pad_audio_to(video_sec - 0.2)
+        return True
+
+    def write_audio(self, raw: bytes):
+        """s16le PCM 청크 전달 (송신 스레드가 ffmpeg 접속 후 순서대로 전송)"""
+        if not self._with_audio or self.failed or not raw:
+            return
+        try:
+            self._audio_queue.put_nowait(raw)
+            self._audio_bytes += len(raw)
+        except queue.Full:
+            pass   # ffmpeg 오디오 입력 지연 — 영상 기록을 막지 않도록 버림
+
+    def _pad_audio_to(self, seconds: float, timeout: float = 0.0):
+        """오디오 누적 길이가 seconds가 되도록 무음 PCM 추가 (1초 단위 청크).
+        timeout > 0이면 대기열이 빌 때까지 기다린다 (종료 시 마지막 무음이 버려지지 않게)"""
+        frame_bytes = self._ch * 2
+        missing = int(seconds * self._sr) * frame_bytes - self._audio_bytes
+        while missing > 0:
+            chunk = bytes(min(missing, self._bytes_per_sec))
+            try:
+                if timeout > 0:
+                    self._audio_queue.put(chunk, timeout=timeout)
+                else:
+                    self._audio_queue.put_nowait(chunk)
+            except queue.Full:
+                return
+            self._audio_bytes += len(chunk)
+            missing -= len(chunk)
+
+    # ── 내부 ──────────────────────────────────────────────────────────────────
+
+    def _audio_sender(self):
+        conn = None
+        try:
+            conn, _addr = self._listener.accept()
+            while True:
+                raw = self._audio_queue.get()
+                if raw is None:
+                    break
+                conn.sendall(raw)
+        except OSError as e:
+            if not self.failed:
+                _log.warning("ffmpeg 파이프 오디오 전송 중단: %s", e)
+        finally:
+            if conn is not None:
+                try:
+                    conn.shutdown(socket.SHUT_WR)
+                except OSError:
+                    pass
+                conn.close()
+
+    def _read_stderr(self):
+        try:
+            for line in self._proc.stderr:
+                text = line.decode("utf-8", "replace").strip()
+                if text:
+                    self._stderr_tail.append(text)
+        except (OSError, ValueError):
+            pass
+
+    def _close_listener(self):
+        if self._listener is not None:
+            try:
+                self._listener.close()
+            except OSError:
+                pass
+            self._listener = None
@@ -0,0 +1,107 @@
+"""
+프레임 해상도 피라미드
+캡처 프레임 1장마다 FramePyramid 1개를 만들어 감지/표시/녹화가 함께 쓴다.
+소비자가 요청한 크기(전체 프레임) 또는 ROI 영역 축소본을 처음 요청될 때 1회만 리사이즈하고
+같은 프레임(frame_id)에 같은 크기를 다시 요청하면 캐시된 배열을 그대로 돌려준다.
+
+- 캐시는 프레임 객체에 붙어 있으므로 다음 프레임이 오면 함께 버려진다 (별도 만료 불필요).
+- 입력이 멈춰 같은 프레임이 반복 감지/표시되는 경우에도 리사이즈를 다시 하지 않는다.
+- 반환 배열은 소비자 간에 공유되므로 읽기 전용으로 다룬다 (원본 프레임과 동일한 규칙).
+- 리사이즈 수/재사용 수는 전역 누적 — DIAG 로그용 get_stats().
+"""
+import itertools
+import threading
+from typing import Optional
+
+import cv2
+import numpy as np
+
+_REGION_CACHE_MAX = 64          # 프레임당 ROI 영역 캐시 상한 (ROI 수보다 충분히 크게)
+
+_ids = itertools.count(1)
+_stats_lock = threading.Lock()
+_resizes = 0                    # 실제 리사이즈 수
+_reused = 0                     # 캐시 재사용으로 생략한 리사이즈 수
+
+
+def _count(resized: bool):
+    global _resizes, _reused
+    with _stats_lock:
+        if resized:
+            _resizes += 1
+        else:
+            _reused += 1
+
+
+def get_stats(reset: bool = False) -> dict:
+    """heartbeat 로그용: {"resizes", "reused"} (전 입력 합계)"""
+    global _resizes, _reused
+    with _stats_lock:
+        stats = {"resizes": _resizes, "reused": _reused}
+        if reset:
+            _resizes = _reused = 0
+    return stats
+
+
+def _interp(src_w: int, dst_w: int) -> int:
+    """축소는 INTER_AREA (계단 현상 방지), 확대는 INTER_LINEAR"""
+    return cv2.INTER_AREA if dst_w < src_w else cv2.INTER_LINEAR
+
+
+class FramePyramid:
+    """캡처 프레임 1장 + 해상도별 리사이즈 캐시 (스레드 안전 — 감지 워커/녹화 인코더/GUI 공용)"""
+
+    __slots__ = ("frame", "frame_id", "_levels", "_regions", "_lock")
+
+    def __init__(self, frame: np.ndarray):
+        self.frame = frame
+        self.frame_id = next(_ids)
+        self._levels: dict = {}          # (w, h) → 전체 프레임 리사이즈
+        self._regions: dict = {}         # (x1, y1, x2, y2, w, h) → ROI 영역 리사이즈
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> tuple:
+        """원본 (w, h)"""
+        h, w = self.frame.shape[:2]
+        return w, h
+
+    def resized(self, w: int, h: int) -> np.ndarray:
+        """전체 프레임을 (w, h)로. 원본 크기면 원본 그대로"""
+        fw, fh = self.size
+        if (w, h) == (fw, fh):
+            return self.frame
+        key = (w, h)
+        with self._lock:
+            level = self._levels.get(key)
+        if level is not None:
+            _count(False)
+            return level
+        level = cv2.resize(self.frame, (w, h), interpolation=_interp(fw, w))
+        with self._lock:
+            # 다른 스레드가 먼저 만들었으면 그 배열을 공유 (소비자 간 동일 배열 보장)
+            level = self._levels.setdefault(key, level)
+        _count(True)
+        return level
+
+    def region(self, x1: int, y1: int, x2: int, y2: int,
+               w: Optional[int] = None, h: Optional[int] = None) -> np.ndarray:
+        """원본 좌표 영역 [x1:x2, y1:y2]를 (w, h)로 축소. 크기 생략/원본 크기면 잘라낸 뷰 (복사 없음)"""
+        crop = self.frame[y1:y2, x1:x2]
+        cw, ch = x2 - x1, y2 - y1
+        if w is None or h is None or (w, h) == (cw, ch):
+            return crop
+        key = (x1, y1, x2, y2, w, h)
+        with self._lock:
+            out = self._regions.get(key)
+        if out is not None:
+            _count(False)
+            return out
+        out = cv2.resize(crop, (w, h), interpolation=_interp(cw, w))
+        with self._lock:
+            if key in self._regions:
+                out = self._regions[key]
+            elif len(self._regions) < _REGION_CACHE_MAX:
+                self._regions[key] = out
+        _count(True)
+        return out
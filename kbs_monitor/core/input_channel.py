@@ -0,0 +1,97 @@
+"""
+입력 채널 모듈
+캡처 소스 1개 + 감지영역(ROI) 세트 + 감지 상태(Detector) + 자동 녹화기를 하나로 묶어 관리.
+MainWindow는 N개의 InputChannel을 보유하고 알림/텔레그램/로그 백엔드를 공유한다.
+
+레이블 규칙:
+  입력 1(index 0)은 기존 단일 입력과 동일하게 "V1", "A1" 레이블을 그대로 사용 (설정·정파 호환).
+  입력 2 이상은 알림/로그/녹화 파일명에서 "{입력명}-V1" 형태로 구분한다.
+"""
+from typing import Optional
+
+import numpy as np
+
+from core.roi_manager import ROIManager
+from core.detector import Detector
+from core.auto_recorder import AutoRecorder
+from core.frame_pyramid import FramePyramid
+
+
+class InputChannel:
+    """단일 캡처 입력 (소스 설정 + ROI 세트 + 감지기 + 녹화기)"""
+
+    def __init__(self, index: int, name: str = "", port: int = 0,
+                 stream_url: str = "", rois: Optional[dict] = None):
+        self.index = index
+        self.name = name or f"IN{index + 1}"
+        self.port = port
+        self.stream_url = stream_url
+        self.roi_manager = ROIManager()
+        self.roi_manager.from_dict(rois or {})
+        self.detector = Detector()
+        self.recorder = AutoRecorder()
+        self.capture_thread = None          # VideoCaptureThread (MainWindow._start_threads에서 생성)
+        self.latest_frame: Optional[np.ndarray] = None
+        self.latest_pyramid: Optional[FramePyramid] = None   # latest_frame의 해상도 피라미드 (소비자 공유)
+
+    # ── 직렬화 ────────────────────────────────────────────────────────────────
+
+    @classmethod
+    def from_dict(cls, index: int, d: dict) -> "InputChannel":
+        return cls(
+            index=index,
+            name=d.get("name", ""),
+            port=int(d.get("port", 0)),
+            stream_url=d.get("stream_url", ""),
+            rois=d.get("rois", {}),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "port": self.port,
+            "stream_url": self.stream_url,
+            "rois": self.roi_manager.to_dict(),
+        }
+
+    # ── 레이블 ────────────────────────────────────────────────────────────────
+
+    @property
+    def is_primary(self) -> bool:
+        return self.index == 0
+
+    def qualify(self, label: str) -> str:
+        """알림/로그/녹화용 전역 레이블 (입력 1은 원래 레이블 유지)"""
+        return label if self.is_primary else f"{self.name}-{label}"
+
+    # ── 감지 ──────────────────────────────────────────────────────────────────
+
+    def detect(self, audio_enabled: bool,
+               force_still_labels: Optional[set] = None) -> tuple:
+        """
+        최신 프레임에 대해 비디오(블랙/스틸) + 오디오 레벨미터 감지 수행.
+        감지 워커 스레드에서 호출 — 입력별 Detector 상태는 이 채널에서만 접근하므로 스레드 간 공유 없음.
+        반환: (video_results, audio_results)
+        """
+        pyramid = self.latest_pyramid
+        if pyramid is None:
+            if self.latest_frame is None:
+                return {}, {}
+            pyramid = FramePyramid(self.latest_frame)   # 피라미드 없이 프레임만 넣는 호출 측 대비
+        frame = pyramid.frame
+        det = self.detector
+        video_rois = self.roi_manager.video_rois
+        audio_rois = self.roi_manager.audio_rois
+
+        audio_results = {}
+        if audio_rois and audio_enabled:
+            audio_results = det.detect_audio_roi(frame, audio_rois, pyramid)
+
+        video_results = {}
+        if video_rois and (det.black_detection_enabled
+                           or det.still_detection_enabled
+                           or force_still_labels):
+            video_results = det.detect_frame(
+                frame, video_rois, force_still_labels=force_still_labels, pyramid=pyramid,
+            )
+        return video_results, audio_results
@@ -0,0 +1,239 @@
+"""
+알림 아웃박스 (디스크 영속 전송 대기열)
+텔레그램 알림을 전송하기 전에 디스크에 먼저 기록해 네트워크 장애·예약 재시작에도 잃지 않는다.
+
+- 기록 파일 outbox.jsonl: 한 줄 = 알림 1건(JSON, 스냅샷은 파일 이름만) 또는 처리 완료 표시 {"ack": seq}.
+  추가 쓰기만 하며, 완료 표시가 쌓이면 미처리 항목만 새 파일로 옮겨 쓰고 교체한다 (compaction).
+- 스냅샷 JPEG는 내용 해시 이름의 별도 파일 — 같은 프레임을 쓰는 알림들은 파일 1개를 공유 (참조 수 관리).
+- 시작 시 기록을 다시 읽어 미처리 항목을 순서대로 복원. 끝이 잘린 줄(기록 중 종료)은 건너뛴다.
+- 상한: 항목 수 / 스냅샷 총 용량 — 넘으면 가장 오래된 항목부터 버린다. 보관 시간을 넘긴 항목도 버린다.
+- 디스크 쓰기가 실패하면 메모리 목록만으로 계속 동작 (오류 로그 1회).
+- 텔레그램 워커 스레드 전용 — GUI 스레드는 메모리 큐에 넣기만 하고 워커가 여기로 옮긴다.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+_log = logging.getLogger(__name__)
+
+OUTBOX_FILE = "outbox.jsonl"
+_COMPACT_ACKS = 200        # 완료 표시가 이만큼 쌓이면 기록 파일 재작성
+_FIELDS = ("ts", "alarm_type", "label", "media_name", "is_recovery")
+
+
+class NotificationOutbox:
+    """순서 보존 디스크 영속 알림 대기열 (단일 스레드 사용)"""
+
+    def __init__(self, directory: str, max_items: int = 500,
+                 max_bytes: int = 100 * 1024 * 1024, max_age: float = 86400.0):
+        self._dir = directory
+        self._path = os.path.join(directory, OUTBOX_FILE)
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._records: OrderedDict = OrderedDict()   # seq → 기록 dict (추가 순서)
+        self._sidecars: dict = {}                    # 스냅샷 파일 이름 → [참조 수, 크기]
+        self._bytes = 0
+        self._seq = 0
+        self._acks = 0                               # 마지막 재작성 이후 완료 표시 수
+        self._fh = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    # ── 열기/닫기 ─────────────────────────────────────────────────────────────
+
+    def open(self) -> int:
+        """기록 파일에서 미처리 항목 복원 후 추가 쓰기용으로 연다. 반환: 복원한 항목 수"""
+        try:
+            os.makedirs(self._dir, exist_ok=True)
+            if os.path.exists(self._path):
+                with open(self._path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        self._replay_line(line)
+        except OSError as e:
+            _log.error("아웃박스 읽기 실패 (%s): %s", self._path, e)
+        # 스냅샷 파일 참조 수 재구성 — 파일이 없어진 항목은 텍스트만 전송
+        for rec in self._records.values():
+            name = rec.get("jpeg", "")
+            if not name:
+                continue
+            if name in self._sidecars:
+                self._sidecars[name][0] += 1
+                continue
+            try:
+                size = os.path.getsize(os.path.join(self._dir, name))
+            except OSError:
+                rec["jpeg"] = ""
+                continue
+            self._sidecars[name] = [1, size]
+            self._bytes += size
+        self._remove_unreferenced_sidecars()
+        self._rewrite()
+        return len(self._records)
+
+    def close(self):
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except OSError:
+                pass
+            self._fh = None
+
+    def _replay_line(self, line: str):
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            return      # 기록 중 종료로 잘린 줄
+        if not isinstance(rec, dict):
+            return
+        if "ack" in rec:
+            self._records.pop(rec["ack"], None)
+            return
+        seq = rec.get("seq")
+        if not isinstance(seq, int):
+            return
+        self._records[seq] = rec
+        self._seq = max(self._seq, seq)
+
+    def _remove_unreferenced_sidecars(self):
+        try:
+            names = os.listdir(self._dir)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(".jpg") and name not in self._sidecars:
+                try:
+                    os.remove(os.path.join(self._dir, name))
+                except OSError:
+                    pass
+
+    # ── 기록 ─────────────────────────────────────────────────────────────────
+
+    def add(self, item: dict, jpeg: Optional[bytes] = None) -> int:
+        """알림 1건 추가 (스냅샷은 별도 파일). 반환: 상한 초과로 버린 오래된 항목 수"""
+        self._seq += 1
+        rec = {"seq": self._seq}
+        for key in _FIELDS:
+            rec[key] = item.get(key)
+        rec["jpeg"] = self._store_sidecar(jpeg) if jpeg else ""
+        self._records[self._seq] = rec
+        self._append(rec)
+        return self._enforce_limits()
+
+    def _store_sidecar(self, jpeg: bytes) -> str:
+        name = hashlib.sha1(jpeg).hexdigest()[:20] + ".jpg"
+        entry = self._sidecars.get(name)
+        if entry is not None:
+            entry[0] += 1
+            return name
+        try:
+            with open(os.path.join(self._dir, name), "wb") as f:
+                f.write(jpeg)
+        except OSError as e:
+            _log.error("아웃박스 스냅샷 저장 실패 — 텍스트만 전송: %s", e)
+            return ""
+        self._sidecars[name] = [1, len(jpeg)]
+        self._bytes += len(jpeg)
+        return name
+
+    def _release_sidecar(self, name: str):
+        entry = self._sidecars.get(name)
+        if entry is None:
+            return
+        entry[0] -= 1
+        if entry[0] > 0:
+            return
+        del self._sidecars[name]
+        self._bytes -= entry[1]
+        try:
+            os.remove(os.path.join(self._dir, name))
+        except OSError:
+            pass
+
+    def _append(self, obj: dict):
+        """기록 1줄 추가 + 디스크 동기화. 실패하면 파일을 닫고 메모리 전용으로 전환"""
+        if self._fh is None:
+            return
+        try:
+            self._fh.write(json.dumps(obj, ensure_ascii=False) + "\n")
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+        except OSError as e:
+            _log.error("아웃박스 기록 실패 — 메모리 대기열로 계속: %s", e)
+            self.close()
+
+    def _rewrite(self):
+        """미처리 항목만 새 파일에 기록 후 교체하고 추가 쓰기용으로 다시 연다"""
+        self.close()
+        tmp = self._path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                for rec in self._records.values():
+                    f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self._path)
+            self._fh = open(self._path, "a", encoding="utf-8")
+        except OSError as e:
+            _log.error("아웃박스 파일 재작성 실패 — 메모리 대기열로 계속: %s", e)
+        self._acks = 0
+
+    # ── 조회/완료 ─────────────────────────────────────────────────────────────
+
+    def pending(self, limit: int) -> list:
+        """가장 오래된 미처리 항목부터 최대 limit건 (복사본)"""
+        out = []
+        for rec in self._records.values():
+            if len(out) >= limit:
+                break
+            out.append(dict(rec))
+        return out
+
+    def load_jpeg(self, rec: dict) -> Optional[bytes]:
+        name = rec.get("jpeg", "")
+        if not name:
+            return None
+        try:
+            with open(os.path.join(self._dir, name), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def ack(self, seqs: Iterable[int]):
+        """처리 완료(전송 성공 또는 폐기) 표시 — 스냅샷 파일 참조 해제"""
+        for seq in seqs:
+            rec = self._records.pop(seq, None)
+            if rec is None:
+                continue
+            if rec.get("jpeg"):
+                self._release_sidecar(rec["jpeg"])
+            self._append({"ack": seq})
+            self._acks += 1
+        if self._acks >= _COMPACT_ACKS:
+            self._rewrite()
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """보관 시간(max_age)을 넘긴 항목 폐기. 반환: 폐기 수"""
+        if not self.max_age:
+            return 0
+        cutoff = (now if now is not None else time.time()) - self.max_age
+        old = []
+        for seq, rec in self._records.items():
+            if (rec.get("ts") or 0) >= cutoff:
+                break
+            old.append(seq)
+        self.ack(old)
+        return len(old)
+
+    def _enforce_limits(self) -> int:
+        """항목 수/스냅샷 용량 상한을 넘으면 가장 오래된 항목부터 폐기. 반환: 폐기 수"""
+        dropped = 0
+        while self._records and (len(self._records) > self.max_items or self._bytes > self.max_bytes):
+            self.ack([next(iter(self._records))])
+            dropped += 1
+        return dropped
@@ -0,0 +1,456 @@
+"""
+알림 분배기 (notifier hub)
+감지 루프는 알림 1건당 AlarmEvent 1개를 publish()로 넣기만 하고, 전용 스레드의 asyncio 루프가
+등록된 모든 알림 채널(sink)로 나눠 보낸다.
+
+- sink 종류: 텔레그램(기존 TelegramNotifier에 위임), 웹훅(JSON POST), syslog(UDP), 파일 드롭(JSON 파일).
+  텔레그램 외 sink는 설정의 "notifiers" 섹션으로 켜고 끈다 — SINK_TYPES 레지스트리에 종류를 추가하면 확장.
+- sink마다 동시 전송 수(세마포어), 대기 상한, 전송 시간 제한을 따로 둔다.
+  이벤트 × sink마다 작업을 따로 만들어 느린 sink가 다른 sink를 늦추지 않는다.
+- publish()는 루프에 넣기만 한다 (call_soon_threadsafe, O(1)) — GUI 스레드는 네트워크/디스크 I/O를 하지 않는다.
+- sink별 전송/실패/시간 초과/폐기 수와 지연 백분위 — DIAG 로그용 get_stats().
+"""
+import asyncio
+import datetime
+import json
+import logging
+import os
+import socket
+import ssl
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+_log = logging.getLogger(__name__)
+
+_QUEUE_MAX = 500           # 분배 대기 이벤트 상한 (넘으면 폐기)
+_LATENCY_SAMPLES = 200     # sink별 지연 백분위 표본 수
+_STOP_GRACE = 2.0          # 종료 시 진행 중 전송 대기(초)
+
+# syslog 심각도 (RFC 5424): 시스템 중단=critical, 알림=warning, 복구=notice
+_SYSLOG_CRIT, _SYSLOG_WARNING, _SYSLOG_NOTICE = 2, 4, 5
+
+
+@dataclass
+class AlarmEvent:
+    """감지 알림/복구 1건 — 모든 sink가 공유 (frame은 ndarray 또는 FramePyramid, 읽기 전용)"""
+    alarm_type: str
+    label: str
+    media_name: str = ""
+    frame: Any = None
+    is_recovery: bool = False
+    ts: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict:
+        """원격 sink용 JSON 본문 (스냅샷 제외)"""
+        return {
+            "source": "KBS Peacock",
+            "ts": self.ts,
+            "time": datetime.datetime.fromtimestamp(self.ts).isoformat(timespec="seconds"),
+            "alarm_type": self.alarm_type,
+            "label": self.label,
+            "media_name": self.media_name or self.label,
+            "recovery": self.is_recovery,
+        }
+
+    def summary(self) -> str:
+        kind = "복구" if self.is_recovery else "알림"
+        channel = self.label
+        if self.media_name and self.media_name != self.label:
+            channel += f" ({self.media_name})"
+        return f"[{kind}] {self.alarm_type} {channel}"
+
+
+# ── sink ─────────────────────────────────────────────────────────────────────
+
+class NotifierSink:
+    """알림 채널 기본 클래스. send()는 분배기 루프에서 실행되며 블로킹 I/O 금지 (필요하면 executor)"""
+
+    kind = ""
+
+    def __init__(self, name: str, cfg: Optional[dict] = None):
+        cfg = cfg or {}
+        self.name = name
+        self.cfg = dict(cfg)                           # 생성 설정 — 재구성 시 바뀌지 않았으면 sink 유지
+        self.concurrency = max(1, int(cfg.get("concurrency", 2)))
+        self.timeout = max(0.1, float(cfg.get("timeout", 5)))
+        self.max_pending = max(1, int(cfg.get("max_pending", 100)))
+        self.types = set(cfg.get("types") or [])      # 빈 목록 = 모든 종류
+        self.recoveries = bool(cfg.get("recoveries", True))
+
+    def accepts(self, event: AlarmEvent) -> bool:
+        if event.is_recovery and not self.recoveries:
+            return False
+        return not self.types or event.alarm_type in self.types
+
+    async def send(self, event: AlarmEvent):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class TelegramSink(NotifierSink):
+    """기존 TelegramNotifier에 위임 — 쿨다운/종류별 플래그/묶음/아웃박스는 notifier가 처리 (notify()는 큐 삽입뿐)"""
+
+    kind = "telegram"
+
+    def __init__(self, notifier):
+        super().__init__("telegram", {"concurrency": 1, "max_pending": 1000})
+        self._notifier = notifier
+
+    async def send(self, event: AlarmEvent):
+        self._notifier.notify(event.alarm_type, event.label, event.media_name, event.frame,
+                              is_recovery=event.is_recovery)
+
+
+class WebhookSink(NotifierSink):
+    """JSON POST (http/https). 2xx가 아니면 실패. 요청마다 연결 1개 (Connection: close)"""
+
+    kind = "webhook"
+
+    def __init__(self, name: str, cfg: dict):
+        super().__init__(name, cfg)
+        self.url = cfg.get("url", "")
+        self.headers = dict(cfg.get("headers") or {})
+        self._ssl = None
+
+    async def send(self, event: AlarmEvent):
+        if not self.url:
+            raise ValueError("URL 미설정")
+        body = json.dumps(event.to_dict(), ensure_ascii=False).encode("utf-8")
+        status = await self._post(body)
+        if not 200 <= status < 300:
+            raise RuntimeError(f"HTTP {status}")
+
+    async def _post(self, body: bytes) -> int:
+        u = urlsplit(self.url)
+        https = u.scheme == "https"
+        if https and self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        reader, writer = await asyncio.open_connection(
+            u.hostname, u.port or (443 if https else 80), ssl=self._ssl if https else None
+        )
+        try:
+            path = (u.path or "/") + (f"?{u.query}" if u.query else "")
+            host = u.hostname if u.port is None else f"{u.hostname}:{u.port}"
+            lines = [
+                f"POST {path} HTTP/1.1",
+                f"Host: {host}",
+                "Content-Type: application/json; charset=utf-8",
+                f"Content-Length: {len(body)}",
+                "Connection: close",
+            ]
+            lines += [f"{k}: {v}" for k, v in self.headers.items()]
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+            await writer.drain()
+            status_line = await reader.readline()
+            parts = status_line.split()
+            if len(parts) < 2 or not parts[1].isdigit():
+                raise RuntimeError(f"잘못된 응답: {status_line[:60]!r}")
+            return int(parts[1])
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+
+class SyslogSink(NotifierSink):
+    """RFC 5424 syslog 메시지를 UDP로 전송 (facility 기본 local0)"""
+
+    kind = "syslog"
+
+    def __init__(self, name: str, cfg: dict):
+        super().__init__(name, cfg)
+        self.host = cfg.get("host", "127.0.0.1")
+        self.port = int(cfg.get("port", 514))
+        self.facility = int(cfg.get("facility", 16))
+        self._hostname = socket.gethostname() or "-"
+        self._transport = None
+
+    async def send(self, event: AlarmEvent):
+        if self._transport is None or self._transport.is_closing():
+            loop = asyncio.get_running_loop()
+            self._transport, _ = await loop.create_datagram_endpoint(
+                asyncio.DatagramProtocol, remote_addr=(self.host, self.port)
+            )
+        if event.alarm_type == "시스템" and not event.is_recovery:
+            severity = _SYSLOG_CRIT
+        else:
+            severity = _SYSLOG_NOTICE if event.is_recovery else _SYSLOG_WARNING
+        stamp = datetime.datetime.fromtimestamp(event.ts).astimezone().isoformat(timespec="milliseconds")
+        msg = f"<{self.facility * 8 + severity}>1 {stamp} {self._hostname} kbs_monitor - - - {event.summary()}"
+        self._transport.sendto(msg.encode("utf-8"))
+
+    async def close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+class FileDropSink(NotifierSink):
+    """폴더에 이벤트당 JSON 파일 1개 (임시 파일 후 교체 — 수집기가 쓰다 만 파일을 읽지 않음). max_files 초과 시 오래된 것 삭제"""
+
+    kind = "file_drop"
+
+    def __init__(self, name: str, cfg: dict):
+        super().__init__(name, cfg)
+        self.directory = cfg.get("directory", "notifications")
+        self.max_files = max(1, int(cfg.get("max_files", 1000)))
+        self._written = 0
+
+    async def send(self, event: AlarmEvent):
+        await asyncio.get_running_loop().run_in_executor(None, self._write, event)
+
+    def _write(self, event: AlarmEvent):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.datetime.fromtimestamp(event.ts).strftime("%Y%m%d_%H%M%S_%f")
+        safe_label = "".join(c if c.isalnum() or c in "-_" else "_" for c in event.label)
+        kind = "recovery" if event.is_recovery else "alarm"
+        path = os.path.join(self.directory, f"{stamp}_{event.alarm_type}_{safe_label}_{kind}.json")
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(event.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self._written += 1
+        if self._written % 50 == 0:
+            self._prune()
+
+    def _prune(self):
+        names = sorted(n for n in os.listdir(self.directory) if n.endswith(".json"))
+        for name in names[:max(0, len(names) - self.max_files)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+# 설정 "notifiers" 섹션의 종류 이름 → sink 클래스 (텔레그램은 기존 "telegram" 섹션 사용, add_sink로 등록)
+SINK_TYPES = {
+    WebhookSink.kind: WebhookSink,
+    SyslogSink.kind: SyslogSink,
+    FileDropSink.kind: FileDropSink,
+}
+
+
+# ── 분배기 ───────────────────────────────────────────────────────────────────
+
+class _SinkState:
+    """sink 1개의 실행 상태 + 통계 (통계는 GUI 스레드에서도 읽으므로 잠금)"""
+
+    def __init__(self, sink: NotifierSink):
+        self.sink = sink
+        self.semaphore = asyncio.Semaphore(sink.concurrency)
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.sent = self.failed = self.timeouts = self.dropped = 0
+        self.latency: list = []
+        self.last_error = ""
+
+    def record(self, outcome: str, latency: float = 0.0, error: str = ""):
+        with self.lock:
+            if outcome == "sent":
+                self.sent += 1
+                self.latency.append(latency)
+                if len(self.latency) > _LATENCY_SAMPLES:
+                    del self.latency[0]
+            elif outcome == "timeout":
+                self.timeouts += 1
+            elif outcome == "dropped":
+                self.dropped += 1
+            else:
+                self.failed += 1
+            if error:
+                self.last_error = error
+
+    def snapshot(self, reset: bool) -> dict:
+        with self.lock:
+            ordered = sorted(self.latency)
+            n = len(ordered)
+            stats = {
+                "sent": self.sent, "failed": self.failed, "timeouts": self.timeouts,
+                "dropped": self.dropped, "pending": self.pending, "last_error": self.last_error,
+                "p50": ordered[(n - 1) // 2] if n else None,
+                "p95": ordered[min(n - 1, -(-95 * n // 100) - 1)] if n else None,
+            }
+            if reset:
+                self.sent = self.failed = self.timeouts = self.dropped = 0
+                self.latency.clear()
+                self.last_error = ""
+        return stats
+
+
+class NotifierHub:
+    """알림 sink 레지스트리 + asyncio 분배 스레드. publish()/configure()/get_stats()는 어느 스레드에서나 호출 가능"""
+
+    def __init__(self):
+        self._fixed: list = []                # add_sink()로 등록한 sink (설정 변경과 무관 — 텔레그램)
+        self._states: dict = {}               # sink 이름 → _SinkState (루프 스레드에서만 교체)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._tasks: set = set()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._queue_dropped = 0
+        self._cfg: dict = {}
+
+    # ── 생명주기 ──────────────────────────────────────────────────────────────
+
+    def add_sink(self, sink: NotifierSink):
+        """고정 sink 등록 (start() 전에 호출)"""
+        self._fixed.append(sink)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True, name="NotifierHub")
+        self._thread.start()
+        self._ready.wait(timeout=5.0)
+
+    def stop(self):
+        """진행 중 전송을 _STOP_GRACE초까지 기다린 뒤 루프 종료 (프로그램 종료 시 호출)"""
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=_STOP_GRACE + 3.0)
+        except Exception as e:
+            _log.warning("알림 분배기 종료 대기 실패: %s", e)
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=_QUEUE_MAX)
+        self._rebuild(self._cfg)
+        self._dispatcher = loop.create_task(self._dispatch_loop())
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    async def _shutdown(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()     # 새 이벤트 분배 중단 (루프를 닫기 전에 정리)
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+        if self._tasks:
+            await asyncio.wait(list(self._tasks), timeout=_STOP_GRACE)
+        for state in self._states.values():
+            try:
+                await state.sink.close()
+            except Exception:
+                pass
+
+    # ── 설정 ──────────────────────────────────────────────────────────────────
+
+    def configure(self, notifiers_cfg: dict):
+        """설정의 "notifiers" 섹션 반영: {"webhook": {...}, "syslog": {...}, "file_drop": {...}} (enabled 항목만 생성)"""
+        self._cfg = dict(notifiers_cfg or {})
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self._rebuild, self._cfg)
+
+    def _rebuild(self, cfg: dict):
+        """sink 목록 재구성 (루프 스레드). 설정이 그대로인 sink는 상태째 유지하고(연결·지연 표본 보존),
+        바뀐 sink만 새로 만들어 같은 이름의 통계를 이어서 누적"""
+        old = self._states
+        sinks = list(self._fixed)
+        for kind, sink_cfg in cfg.items():
+            cls = SINK_TYPES.get(kind)
+            if cls is None or not isinstance(sink_cfg, dict) or not sink_cfg.get("enabled", False):
+                continue
+            prev = old.get(kind)
+            if prev is not None and type(prev.sink) is cls and prev.sink.cfg == sink_cfg:
+                sinks.append(prev.sink)
+                continue
+            try:
+                sinks.append(cls(kind, sink_cfg))
+            except Exception as e:
+                _log.error("알림 채널 %s 설정 오류: %s", kind, e)
+        states = {}
+        for sink in sinks:
+            prev = old.get(sink.name)
+            if prev is not None and prev.sink is sink:
+                states[sink.name] = prev
+                continue
+            state = _SinkState(sink)
+            if prev is not None:
+                state.sent, state.failed = prev.sent, prev.failed
+                state.timeouts, state.dropped = prev.timeouts, prev.dropped
+                state.latency, state.last_error = list(prev.latency), prev.last_error
+                asyncio.ensure_future(prev.sink.close())
+            states[sink.name] = state
+        for name, prev in old.items():
+            if name not in states:
+                asyncio.ensure_future(prev.sink.close())
+        self._states = states
+
+    # ── 분배 ──────────────────────────────────────────────────────────────────
+
+    def publish(self, event: AlarmEvent):
+        """알림 1건 넣기 (감지 루프/GUI 스레드) — 즉시 반환"""
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return
+        loop.call_soon_threadsafe(self._enqueue, event)
+
+    def _enqueue(self, event: AlarmEvent):
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._queue_dropped += 1
+
+    async def _dispatch_loop(self):
+        while True:
+            event = await self._queue.get()
+            for state in self._states.values():
+                if not state.sink.accepts(event):
+                    continue
+                if state.pending >= state.sink.max_pending:
+                    state.record("dropped")
+                    continue
+                state.pending += 1
+                task = asyncio.ensure_future(self._deliver(state, event))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _deliver(self, state: _SinkState, event: AlarmEvent):
+        """sink 1개로 1건 전송 — sink별 세마포어로 동시 수 제한, 시간 제한은 전송 구간에만 적용"""
+        try:
+            async with state.semaphore:
+                t0 = time.perf_counter()
+                try:
+                    await asyncio.wait_for(state.sink.send(event), timeout=state.sink.timeout)
+                except asyncio.TimeoutError:
+                    state.record("timeout", error=f"{state.sink.timeout:.0f}초 초과 ({event.summary()})")
+                    return
+                except Exception as e:
+                    state.record("failed", error=f"{type(e).__name__}: {e}")
+                    return
+                state.record("sent", time.perf_counter() - t0)
+        finally:
+            state.pending -= 1
+
+    # ── 통계 ──────────────────────────────────────────────────────────────────
+
+    def get_stats(self, reset: bool = False) -> dict:
+        """heartbeat 로그용: {sink 이름: {"sent", "failed", "timeouts", "dropped", "pending", "last_error",
+        "p50", "p95"}} + "_queue": {"size", "dropped"} (지연은 초, 표본 없으면 None)"""
+        stats = {name: state.snapshot(reset) for name, state in list(self._states.items())}
+        stats["_queue"] = {
+            "size": self._queue.qsize() if self._queue is not None else 0,
+            "dropped": self._queue_dropped,
+        }
+        if reset:
+            self._queue_dropped = 0
+        return stats
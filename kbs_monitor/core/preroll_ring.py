@@ -0,0 +1,176 @@
+"""
+디스크(메모리 맵) 사고 전 버퍼
+고정 크기 파일을 슬롯 N개로 나눠 (순번, 타임스탬프, JPEG) 를 순환 기록한다.
+RAM 사용량은 사고 전 구간 길이와 무관하게 일정하고 (페이지 캐시는 OS가 관리),
+파일이 남아 있으므로 예약 재시작 후에도 직전 사고 전 구간을 그대로 쓸 수 있다.
+
+파일 구조 (little-endian):
+  헤더  : magic(8) slots(u32) slot_bytes(u32) head(u64)        — head = 누적 기록 수
+  슬롯 i: seq(u64) ts(f64) length(u32) reserved(u32) data(slot_bytes)
+기록(O(1)): seq=0 으로 표시 → 데이터/ts/길이 기록 → seq=순번 → head 갱신.
+읽기: snapshot()은 슬롯 헤더만 읽어 (ts, slot, seq) 목록을 만들고, view()는 복사 없이 memoryview를 돌려준다.
+기록 스레드가 그 슬롯을 덮어썼는지는 사용 후 valid()로 seq를 다시 비교해 확인한다 (seqlock).
+설정 변경으로 닫힌 뒤 호출되면(ValueError) 빈 결과를 돌려준다.
+"""
+import logging
+import mmap
+import os
+import struct
+from typing import Optional
+
+_log = logging.getLogger(__name__)
+
+_MAGIC = b"KBSPRE01"
+_HEADER = struct.Struct("<8sIIQ")
+_SLOT_HEADER = struct.Struct("<QdII")
+_HEAD_OFFSET = 16                    # 헤더 내 head 필드 위치
+
+
+class MmapPrerollRing:
+    """메모리 맵 파일 기반 고정 슬롯 순환 버퍼 (기록 스레드 1개 + 읽기 스레드 여러 개)"""
+
+    def __init__(self, path: str, slots: int, slot_bytes: int):
+        self.path = path
+        self.slots = max(1, int(slots))
+        self.slot_bytes = max(1024, int(slot_bytes))
+        self._stride = _SLOT_HEADER.size + self.slot_bytes
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+        self._head = 0
+        self.oversize = 0                # 슬롯보다 커서 기록하지 못한 프레임 수
+
+    # ── 열기/닫기 ─────────────────────────────────────────────────────────────
+
+    def open(self) -> bool:
+        """파일 열기. 구조(슬롯 수/크기)가 같으면 기존 내용을 이어 쓰고, 다르면 새로 만든다"""
+        size = _HEADER.size + self.slots * self._stride
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            reuse = False
+            if os.path.isfile(self.path) and os.path.getsize(self.path) == size:
+                with open(self.path, "rb") as f:
+                    magic, slots, slot_bytes, head = _HEADER.unpack(f.read(_HEADER.size))
+                reuse = (magic, slots, slot_bytes) == (_MAGIC, self.slots, self.slot_bytes)
+            if not reuse:
+                with open(self.path, "wb") as f:
+                    f.truncate(size)       # 슬롯 seq=0 (비어 있음)
+                    f.seek(0)
+                    f.write(_HEADER.pack(_MAGIC, self.slots, self.slot_bytes, 0))
+                head = 0
+            self._file = open(self.path, "r+b")
+            self._mm = mmap.mmap(self._file.fileno(), size)
+            self._head = head
+        except (OSError, ValueError, struct.error) as e:
+            _log.error("디스크 사고 전 버퍼 열기 실패 (%s): %s", self.path, e)
+            self.close()
+            return False
+        if reuse and head:
+            _log.info("디스크 사고 전 버퍼 복원 — 누적 %d프레임 (%s)", head, self.path)
+        return True
+
+    def close(self):
+        if self._mm is not None:
+            try:
+                self._mm.flush()
+                self._mm.close()
+            except (OSError, ValueError, BufferError):
+                pass     # 읽기 중인 memoryview가 남아 있으면 해제는 GC에 맡긴다
+            self._mm = None
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    # ── 기록 (인코더 스레드 전용) ─────────────────────────────────────────────
+
+    def append(self, ts: float, data) -> bool:
+        """JPEG 1장 기록 (O(1)). data: bytes-like. 슬롯보다 크면 버리고 False"""
+        mm = self._mm
+        if mm is None:
+            return False
+        n = len(data)
+        if n > self.slot_bytes:
+            self.oversize += 1
+            return False
+        seq = self._head + 1
+        off = _HEADER.size + (self._head % self.slots) * self._stride
+        try:
+            _SLOT_HEADER.pack_into(mm, off, 0, 0.0, 0, 0)            # 기록 중 표시
+            data_off = off + _SLOT_HEADER.size
+            mm[data_off:data_off + n] = data
+            _SLOT_HEADER.pack_into(mm, off, seq, ts, n, 0)
+            struct.pack_into("<Q", mm, _HEAD_OFFSET, seq)
+        except ValueError:
+            return False
+        self._head = seq
+        return True
+
+    def flush(self):
+        """변경 내용을 파일에 반영 (예약 재시작 전)"""
+        mm = self._mm
+        if mm is not None:
+            try:
+                mm.flush()
+            except (OSError, ValueError):
+                pass
+
+    # ── 읽기 ──────────────────────────────────────────────────────────────────
+
+    def snapshot(self, since: float = 0.0) -> list:
+        """since 이후 프레임의 (ts, slot, seq) 목록 (오래된 순). 데이터는 복사하지 않는다"""
+        mm = self._mm
+        if mm is None:
+            return []
+        items = []
+        try:
+            for slot in range(self.slots):
+                seq, ts, length, _r = _SLOT_HEADER.unpack_from(mm, _HEADER.size + slot * self._stride)
+                if seq and length and ts >= since:
+                    items.append((seq, ts, slot))
+        except ValueError:
+            return []
+        items.sort()
+        return [(ts, slot, seq) for seq, ts, slot in items]
+
+    def view(self, slot: int, seq: int) -> Optional[memoryview]:
+        """슬롯 데이터의 memoryview (복사 없음). 이미 덮어써졌으면 None"""
+        mm = self._mm
+        if mm is None:
+            return None
+        off = _HEADER.size + slot * self._stride
+        try:
+            cur, _ts, length, _r = _SLOT_HEADER.unpack_from(mm, off)
+            if cur != seq:
+                return None
+            data_off = off + _SLOT_HEADER.size
+            return memoryview(mm)[data_off:data_off + length]
+        except ValueError:
+            return None
+
+    def valid(self, slot: int, seq: int) -> bool:
+        """view()로 읽은 뒤 기록 스레드가 그 슬롯을 덮어쓰지 않았는지 확인"""
+        mm = self._mm
+        if mm is None:
+            return False
+        try:
+            return struct.unpack_from("<Q", mm, _HEADER.size + slot * self._stride)[0] == seq
+        except ValueError:
+            return False
+
+    def usage(self, since: float = 0.0) -> tuple:
+        """(프레임 수, 총 바이트) — heartbeat 로그용"""
+        mm = self._mm
+        if mm is None:
+            return 0, 0
+        frames = total = 0
+        try:
+            for slot in range(self.slots):
+                seq, ts, length, _r = _SLOT_HEADER.unpack_from(mm, _HEADER.size + slot * self._stride)
+                if seq and ts >= since:
+                    frames += 1
+                    total += length
+        except ValueError:
+            return 0, 0
+        return frames, total
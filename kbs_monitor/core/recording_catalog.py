@@ -0,0 +1,307 @@
+"""
+녹화 카탈로그
+녹화 파일이 완성될 때마다 경로/크기/입력/레이블/알림 종류/시간 구간을 SQLite(저장 폴더의 catalog.sqlite3)에 기록.
+
+- 보관 정책: 보관 일수 + 총 용량 한도. 생성 시각 인덱스로 오래된 것부터 필요한 만큼만 읽어 삭제하므로
+  폴더 전체를 훑지 않는다 (삭제 건수에 비례). 총 용량은 메모리에 누적 관리.
+- 조회: 입력(채널)·시간 구간 인덱스로 UI 목록을 바로 반환.
+- 카탈로그가 새로 만들어지면 저장 폴더의 기존 MP4를 1회 가져온다 (이전 버전에서 만든 녹화 포함).
+- 사고(incident) 키: 같은 사고의 전체 화면 클립과 감지영역(ROI) 크롭 클립을 묶는다.
+  crop은 크롭 클립의 원본 좌표 영역 "x,y,w,h" (전체 화면 클립은 빈 문자열).
+  이전 버전 카탈로그는 열 때 열을 추가한다 (기존 행은 빈 값).
+"""
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+_log = logging.getLogger(__name__)
+
+CATALOG_FILE = "catalog.sqlite3"
+ROI_CLIP_SUFFIX = ".roi"   # 감지영역 크롭 클립 파일명 접미사 (확장자 앞) — 예: ..._블랙.roi.mp4
+_EVICT_BATCH = 64          # 보관 정책 삭제 시 한 번에 읽는 행 수
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recordings (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    path        TEXT NOT NULL UNIQUE,
+    channel     TEXT NOT NULL DEFAULT '',
+    label       TEXT NOT NULL DEFAULT '',
+    alarm_type  TEXT NOT NULL DEFAULT '',
+    media       TEXT NOT NULL DEFAULT '',
+    start_ts    REAL NOT NULL,
+    end_ts      REAL NOT NULL,
+    size        INTEGER NOT NULL DEFAULT 0,
+    created     REAL NOT NULL,
+    incident    TEXT NOT NULL DEFAULT '',
+    crop        TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_recordings_created ON recordings(created);
+CREATE INDEX IF NOT EXISTS idx_recordings_channel_start ON recordings(channel, start_ts);
+CREATE INDEX IF NOT EXISTS idx_recordings_start ON recordings(start_ts);
+"""
+
+# 이전 버전 카탈로그에 추가하는 열 (열 이름, 정의) — 인덱스는 열 추가 후 생성
+_MIGRATIONS = (
+    ("incident", "TEXT NOT NULL DEFAULT ''"),
+    ("crop", "TEXT NOT NULL DEFAULT ''"),
+)
+_POST_MIGRATION = "CREATE INDEX IF NOT EXISTS idx_recordings_incident ON recordings(incident);"
+
+_COLUMNS = ("id", "path", "channel", "label", "alarm_type", "media", "start_ts", "end_ts", "size", "created",
+            "incident", "crop")
+
+
+class RecordingCatalog:
+    """녹화 파일 색인 + 보관 정책 (스레드 안전 — 녹화 작업자/정리 스레드/GUI에서 공용)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._dir: str = ""
+        self._total_bytes: int = 0
+        self._evicted: int = 0
+
+    # ── 열기/닫기 ─────────────────────────────────────────────────────────────
+
+    def open(self, save_dir: str):
+        """저장 폴더의 카탈로그 열기 (같은 폴더면 무시, 폴더가 바뀌면 다시 연다)"""
+        save_dir = os.path.abspath(save_dir)
+        with self._lock:
+            if self._conn is not None and save_dir == self._dir:
+                return
+            self._close_locked()
+            try:
+                os.makedirs(save_dir, exist_ok=True)
+                path = os.path.join(save_dir, CATALOG_FILE)
+                conn = sqlite3.connect(path, check_same_thread=False, timeout=10.0)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(_SCHEMA)
+                self._migrate(conn)
+                self._conn = conn
+                self._dir = save_dir
+                self._total_bytes = conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM recordings"
+                ).fetchone()[0]
+                empty = conn.execute("SELECT 1 FROM recordings LIMIT 1").fetchone() is None
+            except (OSError, sqlite3.Error) as e:
+                _log.error("녹화 카탈로그 열기 실패 (%s): %s", save_dir, e)
+                self._conn = None
+                return
+        if empty:
+            self._import_existing(save_dir)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """이전 버전 스키마에 없는 열 추가"""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(recordings)")}
+        for name, decl in _MIGRATIONS:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE recordings ADD COLUMN {name} {decl}")
+                _log.info("녹화 카탈로그: '%s' 열 추가", name)
+        conn.executescript(_POST_MIGRATION)
+        conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._close_locked()
+
+    def _close_locked(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+        self._conn = None
+        self._dir = ""
+        self._total_bytes = 0
+
+    # ── 기록 ──────────────────────────────────────────────────────────────────
+
+    def add(self, path: str, channel: str, label: str, alarm_type: str, media: str,
+            start: float, end: float, created: Optional[float] = None,
+            incident: str = "", crop: str = "") -> Optional[int]:
+        """녹화 파일 1건 등록 (같은 경로가 있으면 갱신). 반환: 행 id (실패 시 None)
+        incident: 사고 키 (전체 화면/크롭 클립 연결), crop: 크롭 클립의 원본 영역 (x,y,w,h 문자열)"""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return None
+        created = time.time() if created is None else created
+        with self._lock:
+            if self._conn is None:
+                return None
+            try:
+                old = self._conn.execute(
+                    "SELECT size FROM recordings WHERE path = ?", (path,)
+                ).fetchone()
+                cur = self._conn.execute(
+                    "INSERT INTO recordings (path, channel, label, alarm_type, media, start_ts, end_ts, size, created, "
+                    "incident, crop) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET channel=excluded.channel, label=excluded.label, "
+                    "alarm_type=excluded.alarm_type, media=excluded.media, start_ts=excluded.start_ts, "
+                    "end_ts=excluded.end_ts, size=excluded.size, created=excluded.created, "
+                    "incident=excluded.incident, crop=excluded.crop",
+                    (path, channel, label, alarm_type, media, start, end, size, created, incident, crop),
+                )
+                self._conn.commit()
+                self._total_bytes += size - (old[0] if old else 0)
+                row_id = cur.lastrowid
+                if old:
+                    row_id = self._conn.execute(
+                        "SELECT id FROM recordings WHERE path = ?", (path,)
+                    ).fetchone()[0]
+                return row_id
+            except sqlite3.Error as e:
+                _log.error("녹화 카탈로그 기록 실패: %s", e)
+                return None
+
+    # ── 보관 정책 ─────────────────────────────────────────────────────────────
+
+    def enforce(self, max_keep_days: int, max_total_bytes: int) -> int:
+        """보관 일수 초과 + 총 용량 한도 초과분을 오래된 것부터 삭제. 반환: 삭제 건수
+        max_total_bytes <= 0 이면 용량 한도 없음."""
+        cutoff = time.time() - max_keep_days * 86400
+        removed = 0
+        while True:
+            with self._lock:
+                if self._conn is None:
+                    return removed
+                over = max_total_bytes > 0 and self._total_bytes > max_total_bytes
+                try:
+                    if over:
+                        rows = self._conn.execute(
+                            "SELECT id, path, size FROM recordings ORDER BY created LIMIT ?",
+                            (_EVICT_BATCH,),
+                        ).fetchall()
+                    else:
+                        rows = self._conn.execute(
+                            "SELECT id, path, size FROM recordings WHERE created < ? "
+                            "ORDER BY created LIMIT ?",
+                            (cutoff, _EVICT_BATCH),
+                        ).fetchall()
+                except sqlite3.Error as e:
+                    _log.error("녹화 카탈로그 조회 실패: %s", e)
+                    return removed
+                if not rows:
+                    return removed
+                victims = []
+                for row_id, path, size in rows:
+                    if over and self._total_bytes <= max_total_bytes:
+                        break      # 한도 이하 — 다음 반복부터 보관 일수 기준으로만 판단
+                    victims.append((row_id, path, size))
+                    self._total_bytes -= size
+                try:
+                    self._conn.executemany(
+                        "DELETE FROM recordings WHERE id = ?", [(v[0],) for v in victims]
+                    )
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    _log.error("녹화 카탈로그 삭제 실패: %s", e)
+                    return removed
+            for _row_id, path, _size in victims:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass           # 사용자가 이미 지운 파일 — 색인만 정리
+                except OSError as e:
+                    _log.warning("녹화 파일 삭제 실패: %s (%s)", e, path)
+            removed += len(victims)
+            self._evicted += len(victims)
+
+    # ── 조회 ──────────────────────────────────────────────────────────────────
+
+    def query(self, channel: Optional[str] = None, since: Optional[float] = None,
+              until: Optional[float] = None, limit: int = 200,
+              incident: Optional[str] = None) -> list:
+        """입력/시간 구간/사고 키 조건으로 최근 녹화 목록 (시작 시각 내림차순)"""
+        where, args = [], []
+        if incident is not None:
+            where.append("incident = ?")
+            args.append(incident)
+        if channel is not None:
+            where.append("channel = ?")
+            args.append(channel)
+        if since is not None:
+            where.append("end_ts >= ?")
+            args.append(since)
+        if until is not None:
+            where.append("start_ts <= ?")
+            args.append(until)
+        sql = "SELECT %s FROM recordings" % ", ".join(_COLUMNS)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY start_ts DESC LIMIT ?"
+        args.append(int(limit))
+        with self._lock:
+            if self._conn is None:
+                return []
+            try:
+                rows = self._conn.execute(sql, args).fetchall()
+            except sqlite3.Error as e:
+                _log.error("녹화 카탈로그 조회 실패: %s", e)
+                return []
+        return [dict(zip(_COLUMNS, r)) for r in rows]
+
+    def get_stats(self, reset: bool = False) -> dict:
+        """heartbeat 로그용: {"files", "bytes", "evicted"}"""
+        with self._lock:
+            files = 0
+            if self._conn is not None:
+                try:
+                    files = self._conn.execute("SELECT COUNT(*) FROM recordings").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+            stats = {"files": files, "bytes": self._total_bytes, "evicted": self._evicted}
+            if reset:
+                self._evicted = 0
+        return stats
+
+    # ── 기존 파일 가져오기 ────────────────────────────────────────────────────
+
+    def add_file(self, path: str) -> Optional[int]:
+        """파일명(시각_레이블_..._종류.mp4)만으로 등록 — 기존 파일 가져오기/비정상 종료 후 복구한 녹화용"""
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        stem = os.path.basename(path)[:-4]
+        crop = ""
+        if stem.endswith(ROI_CLIP_SUFFIX):
+            stem = stem[:-len(ROI_CLIP_SUFFIX)]
+            crop = "?"                 # 크롭 클립이지만 영역은 알 수 없음
+        parts = stem.split("_")
+        start = mtime
+        label, alarm_type, media = "", "", ""
+        if len(parts) >= 5:
+            try:
+                start = datetime.datetime.strptime(
+                    f"{parts[0]}_{parts[1]}", "%Y%m%d_%H%M%S"
+                ).timestamp()
+            except ValueError:
+                pass
+            label = parts[3]
+            alarm_type = parts[-1]
+            media = "_".join(parts[4:-1])
+        return self.add(path, "", label, alarm_type, media, start, mtime, created=mtime,
+                        incident=stem, crop=crop)
+
+    def _import_existing(self, save_dir: str):
+        """카탈로그 생성 시 1회: 저장 폴더의 MP4를 파일명 기준으로 등록"""
+        count = 0
+        try:
+            names = os.listdir(save_dir)
+        except OSError:
+            return
+        for fname in names:
+            if not fname.lower().endswith(".mp4") or fname.endswith(("_vtmp.mp4", "_ptmp.mp4")):
+                continue
+            if self.add_file(os.path.join(save_dir, fname)) is not None:
+                count += 1
+        if count:
+            _log.info("녹화 카탈로그: 기존 파일 %d개 등록 (%s)", count, save_dir)
@@ -0,0 +1,209 @@
+"""
+녹화 작업 스케줄러
+알림 1건 = 녹화 작업(RecordingJob) 1건. 사고 후 구간이 열려 있는 동안 들어온 알림은 같은 작업에 병합하고,
+이전 작업이 합성/추출 중이어도 새 작업을 시작한다 (알림을 건너뛰지 않음).
+
+작업 단계:
+  capturing : 사고 후 프레임/오디오 수집 (작업별 스레드 — 실시간이므로 대기열에 넣지 않음)
+  queued    : 합성/추출 대기 (전 입력 공유 작업자 풀이 가득 참)
+  muxing    : ffmpeg 합성(2단계 방식) 또는 세그먼트 링 클립 추출
+  done / failed
+ffmpeg 합성/추출은 CPU·디스크를 많이 쓰므로 전 입력이 공유하는 고정 크기 작업자 풀에서만 실행한다.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+_log = logging.getLogger(__name__)
+
+JOB_CAPTURING = "capturing"
+JOB_QUEUED = "queued"
+JOB_MUXING = "muxing"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+_RECENT_JOBS = 50          # 상태 조회용으로 보관하는 종료 작업 수
+_WORKER_IDLE_SEC = 30.0    # 일감 없는 작업자 스레드 종료 대기
+
+
+@dataclass
+class RecordingJob:
+    """녹화 작업 1건 (알림 병합 구간 단위)"""
+    job_id: int
+    owner: str                       # 입력 식별용 (로그/상태 표시)
+    filepath: str
+    trigger_time: float
+    end: float                       # 사고 후 구간 종료 시각 (병합 시 연장)
+    start: float = 0.0               # 클립 시작 시각 (사고 전 구간 포함)
+    label: str = ""
+    alarm_type: str = ""
+    media: str = ""
+    incident: str = ""               # 사고 키 (같은 사고의 전체 화면/크롭 클립 연결)
+    crop: Optional[tuple] = None     # 감지영역 크롭 클립: 원본 좌표 (x1, y1, x2, y2), 전체 화면이면 None
+    src_size: tuple = (0, 0)         # 크롭 기준 원본 해상도 (w, h)
+    width: int = 0                   # 출력 해상도
+    height: int = 0
+    partial: str = ""                # 기록 중인 fragmented MP4 임시 파일 (완료 전까지 이어 읽기용)
+    frames: Optional[queue.Queue] = field(default=None, repr=False)   # 사고 후 (ts, frame)
+    audio: deque = field(default_factory=deque, repr=False)          # 사고 후 (ts, raw PCM)
+    capturing: bool = True           # 사고 후 구간 수집 중 (push_frame/push_audio 대상)
+    triggers: int = 1                # 병합된 알림 수
+    dropped: int = 0                 # 큐 포화로 버린 사고 후 프레임 수
+    next_slot: int = 0               # 사고 후 큐에 넣을 다음 출력 프레임 번호 (start 기준 출력 FPS 격자)
+    decimated: int = 0               # 출력 FPS보다 빨라 큐에 넣지 않은 프레임 수
+    status: str = JOB_CAPTURING
+    error: str = ""
+    finished: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "owner": self.owner,
+            "file": self.filepath,
+            "partial": self.partial,
+            "trigger_time": self.trigger_time,
+            "start": self.start,
+            "end": self.end,
+            "label": self.label,
+            "alarm_type": self.alarm_type,
+            "incident": self.incident,
+            "crop": self.crop,
+            "triggers": self.triggers,
+            "dropped": self.dropped,
+            "decimated": self.decimated,
+            "status": self.status,
+            "error": self.error,
+            "finished": self.finished,
+        }
+
+
+class RecordingScheduler:
+    """녹화 작업 등록/상태 관리 + 합성·추출용 고정 크기 작업자 풀"""
+
+    def __init__(self, max_workers: int = 2):
+        self._cond = threading.Condition()
+        self._pending: deque = deque()        # (job, fn) 합성/추출 대기
+        self._max_workers = max(1, int(max_workers))
+        self._workers = 0
+        self._next_id = 1
+        self._active: dict = {}               # job_id → RecordingJob (미종료)
+        self._recent: deque = deque(maxlen=_RECENT_JOBS)
+        self._merged = 0
+        self._done = 0
+        self._failed = 0
+
+    def set_max_workers(self, n: int):
+        with self._cond:
+            self._max_workers = max(1, int(n))
+            self._spawn_locked()
+
+    # ── 작업 등록/상태 ────────────────────────────────────────────────────────
+
+    def new_job(self, owner: str, filepath: str, trigger_time: float, end: float,
+                frames: Optional[queue.Queue], **meta) -> RecordingJob:
+        """meta: start / label / alarm_type / media / incident (카탈로그 기록용), crop / src_size / width / height"""
+        with self._cond:
+            job = RecordingJob(self._next_id, owner, filepath, trigger_time, end, frames=frames, **meta)
+            self._next_id += 1
+            self._active[job.job_id] = job
+        _log.info("녹화 작업 #%d 시작 (%s)", job.job_id, job.filepath)
+        return job
+
+    def merge(self, job: RecordingJob, end: float):
+        """사고 후 구간이 열린 작업에 알림 병합 (구간 연장)"""
+        with self._cond:
+            job.triggers += 1
+            if end > job.end:
+                job.end = end
+            self._merged += 1
+        _log.info("녹화 작업 #%d에 알림 병합 (%d건, 종료 +%.1f초)",
+                  job.job_id, job.triggers, max(0.0, job.end - time.time()))
+
+    def submit(self, job: RecordingJob, fn: Callable[[], bool]):
+        """합성/추출 단계 등록. fn() 반환값으로 성공 여부 판정"""
+        with self._cond:
+            job.status = JOB_QUEUED
+            self._pending.append((job, fn))
+            self._spawn_locked()
+            self._cond.notify()
+
+    def finish(self, job: RecordingJob, ok: bool, error: str = ""):
+        with self._cond:
+            if job.job_id not in self._active:
+                return
+            job.status = JOB_DONE if ok else JOB_FAILED
+            job.error = error
+            job.finished = time.time()
+            job.capturing = False
+            del self._active[job.job_id]
+            self._recent.append(job)
+            if ok:
+                self._done += 1
+            else:
+                self._failed += 1
+        if ok:
+            _log.info("녹화 작업 #%d 완료 (%s)", job.job_id, job.filepath)
+        else:
+            _log.error("녹화 작업 #%d 실패: %s (%s)", job.job_id, error or "-", job.filepath)
+
+    # ── 조회 ──────────────────────────────────────────────────────────────────
+
+    def jobs(self) -> list:
+        """진행 중 + 최근 종료 작업 상태 목록 (job_id 순)"""
+        with self._cond:
+            items = list(self._recent) + list(self._active.values())
+        return [j.to_dict() for j in sorted(items, key=lambda j: j.job_id)]
+
+    def active_files(self) -> set:
+        """미종료 작업의 최종 파일 경로(절대 경로) — 기록 중인 임시 파일을 고아로 오인하지 않도록"""
+        with self._cond:
+            return {os.path.abspath(j.filepath) for j in self._active.values()}
+
+    def get_stats(self, reset: bool = False) -> dict:
+        """heartbeat 로그용: {"capturing", "queued", "muxing", "workers", "merged", "done", "failed"}"""
+        with self._cond:
+            states = [j.status for j in self._active.values()]
+            stats = {
+                "capturing": states.count(JOB_CAPTURING),
+                "queued": states.count(JOB_QUEUED),
+                "muxing": states.count(JOB_MUXING),
+                "workers": self._workers,
+                "merged": self._merged,
+                "done": self._done,
+                "failed": self._failed,
+            }
+            if reset:
+                self._merged = self._done = self._failed = 0
+        return stats
+
+    # ── 작업자 풀 ─────────────────────────────────────────────────────────────
+
+    def _spawn_locked(self):
+        if self._pending and self._workers < self._max_workers:
+            self._workers += 1
+            threading.Thread(target=self._worker, daemon=True, name="RecorderMux").start()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                deadline = time.time() + _WORKER_IDLE_SEC
+                while not self._pending and self._workers <= self._max_workers:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._pending or self._workers > self._max_workers:
+                    self._workers -= 1
+                    return
+                job, fn = self._pending.popleft()
+                job.status = JOB_MUXING
+            try:
+                ok, error = bool(fn()), ""
+            except Exception as e:
+                ok, error = False, str(e)
+            self.finish(job, ok, error)
@@ -50,11 +50,23 @@ class ROI:
 class ROIManager:
     """감지영역 목록을 관리하는 클래스"""
 
-    MAX_SIZE = (500, 300)  # 최대 감지영역 크기
+    MAX_SIZE = (500, 300)  # 최대 감지영역 크기 (1920×1080 기준)
+    REFERENCE_WIDTH = 1920  # MAX_SIZE 기준 프레임 폭
 
     def __init__(self):
         self._video_rois: List[ROI] = []
         self._audio_rois: List[ROI] = []
+        self.max_size: tuple = self.MAX_SIZE  # 현재 입력 해상도 기준 최대 크기
+
+    @classmethod
+    def max_size_for(cls, frame_w: int) -> tuple:
+        """프레임 폭에 비례한 최대 감지영역 크기 (ROI 좌표는 원본 해상도 기준 — UHD는 2배)"""
+        k = max(1.0, frame_w / cls.REFERENCE_WIDTH)
+        return int(cls.MAX_SIZE[0] * k), int(cls.MAX_SIZE[1] * k)
+
+    def set_frame_size(self, frame_w: int, frame_h: int):
+        """입력 해상도 변경 시 호출 — 최대 감지영역 크기 갱신"""
+        self.max_size = self.max_size_for(frame_w)
 
     @property
     def video_rois(self) -> List[ROI]:
@@ -67,8 +79,8 @@ class ROIManager:
     def add_video_roi(self, x: int, y: int, w: int, h: int, media_name: str = "") -> ROI:
         """영상 감지영역 추가"""
         idx = len(self._video_rois) + 1
-        w = min(w, self.MAX_SIZE[0])
-        h = min(h, self.MAX_SIZE[1])
+        w = min(w, self.max_size[0])
+        h = min(h, self.max_size[1])
         roi = ROI(label=f"V{idx}", media_name=media_name, x=x, y=y, w=w, h=h, roi_type="video")
         self._video_rois.append(roi)
         self._relabel_video()
@@ -77,8 +89,8 @@ class ROIManager:
     def add_audio_roi(self, x: int, y: int, w: int, h: int, media_name: str = "") -> ROI:
         """오디오 레벨미터 감지영역 추가"""
         idx = len(self._audio_rois) + 1
-        w = min(w, self.MAX_SIZE[0])
-        h = min(h, self.MAX_SIZE[1])
+        w = min(w, self.max_size[0])
+        h = min(h, self.max_size[1])
         roi = ROI(label=f"A{idx}", media_name=media_name, x=x, y=y, w=w, h=h, roi_type="audio")
         self._audio_rois.append(roi)
         self._relabel_audio()
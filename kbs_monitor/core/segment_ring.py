@@ -0,0 +1,434 @@
+"""
+상시 세그먼트 녹화 링
+녹화 출력 해상도/FPS 프레임과 PCM을 ffmpeg 1개 프로세스(segment 먹서)에 계속 흘려
+짧은 고정 길이 MPEG-TS 세그먼트(기본 10초)를 디스크 링에 기록한다.
+
+- 세그먼트 목록은 ffmpeg가 닫을 때마다 쓰는 CSV 목록 파일을 따라 읽어 메모리 인덱스로 유지
+  (파일명, 시작/끝 벽시계 시각, 크기). 링 길이(초)를 넘는 가장 오래된 세그먼트부터 삭제.
+- 사고 클립은 구간을 덮는 세그먼트를 concat 데먹서 + 스트림 복사(-c copy)로 이어 붙여 생성
+  — 재인코딩이 없어 수 분 길이의 사고 전 구간도 수백 ms 안에 추출된다.
+- 키프레임을 1초마다 강제하므로 클립 시작/끝 오차는 1초 이내.
+- 세그먼트는 프로세스 재시작 시 버린다 (인덱스가 메모리에만 있으므로 시작 시 링 폴더 정리).
+- 출력 형식(해상도/FPS/세그먼트 길이)이 바뀌어 세션을 다시 시작하면 이전 형식 세그먼트도 버린다.
+  스트림 복사는 형식이 같은 세그먼트끼리만 이을 수 있으므로 클립 추출도 세션 1개 안에서만 한다.
+"""
+import logging
+import os
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from core.ffmpeg_pipe import FRAGMENTED_MP4_ARGS, FfmpegPipeWriter
+
+_log = logging.getLogger(__name__)
+
+_FRAME_QUEUE = 8               # 세그먼트 기록 대기 프레임 (밀리면 최신 프레임부터 버림)
+_AUDIO_PENDING_CHUNKS = 2000   # 기록 대기 오디오 청크 상한 (1024샘플 기준 약 46초)
+_AUDIO_MAX_LAG = 1.0           # 오디오가 영상보다 이만큼(초) 늦으면 무음으로 채움 (오디오 입력 끊김)
+_IDLE_FILL_SEC = 1.0           # 프레임 입력이 끊긴 채 이 시간이 지나면 마지막 프레임 반복
+_LIST_POLL_SEC = 0.5           # 세그먼트 목록 파일 확인 주기
+_RESTART_DELAY = 5.0           # ffmpeg 세션 실패 후 재시작 대기
+_EXTRACT_TIMEOUT = 60          # 클립 추출(concat 스트림 복사) 제한 시간 (초)
+
+
+class _Segment:
+    __slots__ = ("path", "start", "end", "size", "session")
+
+    def __init__(self, path: str, start: float, end: float, size: int, session: int):
+        self.path = path
+        self.session = session
+        self.start = start
+        self.end = end
+        self.size = size
+
+
+class SegmentRing:
+    """ffmpeg segment 먹서 기반 상시 녹화 디스크 링 + 메모리 인덱스"""
+
+    def __init__(self):
+        self._enabled: bool = False
+        self._dir: str = ""
+        self._seg_seconds: int = 10
+        self._ring_seconds: float = 600.0
+        self._w: int = 960
+        self._h: int = 540
+        self._fps: int = 10
+        self._sr: int = 44100
+        self._ch: int = 2
+        self._ffmpeg: str = "ffmpeg"
+
+        self._frames: queue.Queue = queue.Queue(maxsize=_FRAME_QUEUE)
+        self._audio: deque = deque(maxlen=_AUDIO_PENDING_CHUNKS)
+        self._lock = threading.Lock()
+        self._segments: deque = deque()       # _Segment (시작 시각 순)
+        self._bytes: int = 0
+        self._pinned: int = 0                 # 추출 중인 작업 수 — 0보다 크면 삭제 보류
+
+        self._thread: Optional[threading.Thread] = None
+        self._running: bool = False
+        self._restart: bool = False           # 설정 변경 → 세션 재시작 요청
+        self._format_changed: bool = False    # 재시작 사유가 출력 형식 변경 (이전 세그먼트 폐기)
+        self._session_ok: bool = False
+        self._dropped: int = 0
+        self._sessions: int = 0
+
+    # ── 설정/생명주기 ─────────────────────────────────────────────────────────
+
+    def configure(self, enabled: bool, ring_dir: str, segment_seconds: int, ring_seconds: float,
+                  width: int, height: int, fps: int, sample_rate: int, channels: int, ffmpeg: str):
+        """설정 반영. 출력 형식이 바뀌면 다음 프레임부터 새 세션으로 기록"""
+        fmt = (ring_dir, int(segment_seconds), int(width), int(height), int(fps))
+        changed = fmt != (self._dir, self._seg_seconds, self._w, self._h, self._fps)
+        self._dir = ring_dir
+        self._seg_seconds = max(2, int(segment_seconds))
+        self._ring_seconds = max(float(ring_seconds), self._seg_seconds * 2.0)
+        self._w, self._h, self._fps = int(width), int(height), max(1, int(fps))
+        self._sr, self._ch = int(sample_rate), int(channels)
+        self._ffmpeg = ffmpeg
+
+        if enabled and not self._running:
+            self._enabled = True
+            self._running = True
+            self._purge_dir()
+            self._thread = threading.Thread(
+                target=self._writer_loop, daemon=True, name="SegmentRingWriter"
+            )
+            self._thread.start()
+        elif not enabled and self._running:
+            self.stop()
+        elif changed and self._running:
+            self._format_changed = True
+            self._restart = True
+
+    def stop(self):
+        """기록 종료 (진행 중인 세그먼트는 ffmpeg가 마무리)"""
+        self._enabled = False
+        self._running = False
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=10.0)
+        self._thread = None
+
+    @property
+    def segment_seconds(self) -> int:
+        return self._seg_seconds
+
+    @property
+    def running(self) -> bool:
+        """기록 스레드 동작 중 (오디오/프레임 입력을 받는 상태)"""
+        return self._running
+
+    @property
+    def active(self) -> bool:
+        """클립 추출에 쓸 수 있는 상태 (세션 정상 + 닫힌 세그먼트 1개 이상)"""
+        with self._lock:
+            return self._enabled and self._session_ok and bool(self._segments)
+
+    # ── 입력 (녹화기 스레드에서 호출) ─────────────────────────────────────────
+
+    def push_frame(self, ts: float, frame: np.ndarray):
+        """출력 해상도 프레임 전달. 대기열이 차면(ffmpeg 지연) 버리고 드롭 계수"""
+        if not self._running:
+            return
+        try:
+            self._frames.put_nowait((ts, frame))
+        except queue.Full:
+            self._dropped += 1
+
+    def push_audio(self, ts: float, raw: bytes):
+        if self._running:
+            self._audio.append((ts, raw))
+
+    # ── 인덱스 조회/클립 추출 ─────────────────────────────────────────────────
+
+    def covered_range(self) -> tuple:
+        """닫힌 세그먼트가 덮는 (시작, 끝) 벽시계 시각. 없으면 (0.0, 0.0)"""
+        with self._lock:
+            if not self._segments:
+                return 0.0, 0.0
+            return self._segments[0].start, self._segments[-1].end
+
+    def extract(self, start: float, end: float, output: str) -> bool:
+        """[start, end) 구간을 덮는 세그먼트를 재인코딩 없이 이어 붙여 MP4 생성"""
+        with self._lock:
+            segs = [s for s in self._segments if s.end > start and s.start < end]
+            if not segs:
+                return False
+            # 세션이 바뀐 구간은 이어 붙이지 않음 — 사고 시점(끝)에 가까운 세션만 사용
+            segs = [s for s in segs if s.session == segs[-1].session]
+            self._pinned += 1
+        listpath = os.path.splitext(output)[0] + "_ctmp.txt"
+        try:
+            with open(listpath, "w", encoding="utf-8") as f:
+                for s in segs:
+                    f.write("file '%s'\n" % os.path.abspath(s.path).replace("'", "'\\''"))
+            offset = max(0.0, start - segs[0].start)
+            duration = max(0.1, end - max(start, segs[0].start))
+            cmd = [
+                self._ffmpeg, "-y", "-hide_banner", "-loglevel", "error",
+                "-f", "concat", "-safe", "0",
+                "-ss", f"{offset:.3f}", "-i", listpath,
+                "-t", f"{duration:.3f}",
+                "-map", "0", "-c", "copy", "-bsf:a", "aac_adtstoasc",
+                *FRAGMENTED_MP4_ARGS, output,
+            ]
+            t0 = time.perf_counter()
+            result = subprocess.run(
+                cmd, capture_output=True, timeout=_EXTRACT_TIMEOUT,
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            )
+            if result.returncode != 0:
+                _log.warning(
+                    "세그먼트 클립 추출 실패 (rc=%s): %s", result.returncode,
+                    result.stderr.decode("utf-8", "replace").strip()[-300:],
+                )
+                return False
+            _log.info(
+                "세그먼트 클립 추출 완료 — 세그먼트 %d개, %.1f초, %.0fms (%s)",
+                len(segs), duration, (time.perf_counter() - t0) * 1000.0, os.path.basename(output),
+            )
+            return True
+        except Exception as e:
+            _log.warning("세그먼트 클립 추출 오류: %s", e)
+            return False
+        finally:
+            with self._lock:
+                self._pinned -= 1
+            try:
+                os.remove(listpath)
+            except OSError:
+                pass
+
+    def get_stats(self, reset: bool = False) -> dict:
+        """heartbeat 로그용: {"segments", "seconds", "bytes", "dropped", "sessions"}"""
+        with self._lock:
+            n = len(self._segments)
+            seconds = self._segments[-1].end - self._segments[0].start if n else 0.0
+            stats = {
+                "segments": n,
+                "seconds": seconds,
+                "bytes": self._bytes,
+                "dropped": self._dropped,
+                "sessions": self._sessions,
+            }
+        if reset:
+            self._dropped = 0
+        return stats
+
+    # ── 기록 스레드 ───────────────────────────────────────────────────────────
+
+    def _writer_loop(self):
+        while self._running:
+            try:
+                ok = self._run_session()
+            except Exception as e:
+                _log.error("상시 세그먼트 녹화 오류: %s", e)
+                ok = False
+            self._session_ok = False
+            if self._running and not ok and not self._restart:
+                # ffmpeg 실패 — 잠시 후 새 세션 (그동안 입력은 버림)
+                deadline = time.time() + _RESTART_DELAY
+                while self._running and time.time() < deadline:
+                    time.sleep(0.2)
+                    self._discard_input()
+            if self._format_changed:
+                self._format_changed = False
+                self._drop_segments()
+            self._restart = False
+
+    def _run_session(self) -> bool:
+        """세션 1개: 첫 프레임 시각을 기준(t0)으로 ffmpeg segment 먹서에 기록.
+        반환: False = ffmpeg 시작/기록 실패 (재시작 대기 필요)"""
+        try:
+            ts, first = self._frames.get(timeout=1.0)
+        except queue.Empty:
+            return True
+        os.makedirs(self._dir, exist_ok=True)
+        sid = int(ts * 1000)
+        session = self._sessions + 1
+        pattern = os.path.join(self._dir, f"seg_{sid}_%06d.ts")
+        listpath = os.path.join(self._dir, f"seg_{sid}.csv")
+        pipe = FfmpegPipeWriter(
+            self._ffmpeg, pattern, self._w, self._h, self._fps, True, self._sr, self._ch,
+            output_args=[
+                "-force_key_frames", "expr:gte(t,n_forced*1)",
+                "-f", "segment", "-segment_time", str(self._seg_seconds),
+                "-segment_format", "mpegts",
+                "-segment_list", listpath, "-segment_list_type", "csv",
+                "-segment_list_flags", "+live",
+            ],
+        )
+        if not pipe.open():
+            return False
+        self._sessions += 1
+        self._session_ok = True
+        _log.info("상시 세그먼트 녹화 시작 — %d초 세그먼트, 링 %.0f초 (%s)",
+                  self._seg_seconds, self._ring_seconds, self._dir)
+
+        t0 = ts
+        fps = self._fps
+        slot = 0
+        last = None
+        audio_skip = None          # None = 첫 오디오 청크 정렬 전
+        audio_samples = 0
+        list_pos = 0
+        next_poll = time.time() + _LIST_POLL_SEC
+        frame_bytes = self._ch * 2
+
+        def emit(t: float, frm: np.ndarray):
+            nonlocal slot, last
+            target = int((t - t0) * fps + 0.5)
+            while slot <= target and pipe.write_video(frm):
+                slot += 1
+            last = frm
+
+        def feed_audio():
+            nonlocal audio_skip, audio_samples
+            while self._audio:
+                ats, raw = self._audio.popleft()
+                if audio_skip is None:
+                    offset = ats - t0
+                    nbytes = int(abs(offset) * self._sr) * frame_bytes
+                    if offset > 0:
+                        pipe.write_audio(bytes(nbytes))
+                        audio_samples += nbytes // frame_bytes
+                        audio_skip = 0
+                    else:
+                        audio_skip = nbytes
+                if audio_skip:
+                    cut = min(audio_skip, len(raw))
+                    audio_skip -= cut
+                    raw = raw[cut:]
+                if raw:
+                    pipe.write_audio(raw)
+                    audio_samples += len(raw) // frame_bytes
+            # 오디오 입력이 끊기면 무음으로 채워 세그먼트가 영상만큼 진행되게 한다
+            lag = slot / fps - audio_samples / self._sr
+            if lag > _AUDIO_MAX_LAG:
+                pad = int((lag - 0.2) * self._sr)
+                pipe.write_audio(bytes(pad * frame_bytes))
+                audio_samples += pad
+                if audio_skip is None:
+                    audio_skip = 0
+
+        try:
+            emit(ts, first)
+            last_input = time.time()
+            while self._running and not self._restart and not pipe.failed:
+                try:
+                    ts, frm = self._frames.get(timeout=0.2)
+                    emit(ts, frm)
+                    last_input = time.time()
+                except queue.Empty:
+                    now = time.time()
+                    if last is not None and now - last_input > _IDLE_FILL_SEC:
+                        emit(now - _IDLE_FILL_SEC, last)   # 입력 끊김 — 마지막 프레임 유지
+                feed_audio()
+                if time.time() >= next_poll:
+                    next_poll = time.time() + _LIST_POLL_SEC
+                    list_pos = self._read_list(listpath, list_pos, t0, session)
+        finally:
+            self._session_ok = False
+            failed = pipe.failed
+            if failed:
+                pipe.abort()
+            else:
+                pipe.close()
+            self._read_list(listpath, list_pos, t0, session)
+            try:
+                os.remove(listpath)
+            except OSError:
+                pass
+        return not failed
+
+    def _read_list(self, listpath: str, pos: int, t0: float, session: int) -> int:
+        """ffmpeg 세그먼트 목록(CSV: 파일명,시작,끝)의 새 줄을 인덱스에 추가. 반환: 읽은 위치"""
+        try:
+            with open(listpath, "rb") as f:
+                f.seek(pos)
+                data = f.read()
+        except OSError:
+            return pos
+        consumed = data.rfind(b"\n") + 1
+        added = []
+        for line in data[:consumed].decode("utf-8", "replace").splitlines():
+            parts = line.rsplit(",", 2)
+            if len(parts) != 3:
+                continue
+            path = os.path.join(self._dir, os.path.basename(parts[0].strip('"')))
+            try:
+                size = os.path.getsize(path)
+                added.append(_Segment(path, t0 + float(parts[1]), t0 + float(parts[2]), size, session))
+            except (OSError, ValueError):
+                continue
+        if added:
+            with self._lock:
+                for seg in added:
+                    self._segments.append(seg)
+                    self._bytes += seg.size
+            self._evict()
+        return pos + consumed
+
+    def _evict(self):
+        """링 길이를 넘는 오래된 세그먼트 삭제 (추출 중에는 보류)"""
+        victims = []
+        with self._lock:
+            if self._pinned:
+                return
+            while (len(self._segments) > 1
+                   and self._segments[-1].end - self._segments[1].start > self._ring_seconds):
+                seg = self._segments.popleft()
+                self._bytes -= seg.size
+                victims.append(seg.path)
+        for path in victims:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _drop_segments(self):
+        """출력 형식 변경 — 이전 세션 세그먼트를 인덱스와 디스크에서 삭제 (추출 중이면 끝날 때까지 대기)"""
+        deadline = time.time() + _EXTRACT_TIMEOUT
+        while self._pinned and time.time() < deadline:
+            time.sleep(0.1)
+        with self._lock:
+            victims = [seg.path for seg in self._segments]
+            self._segments.clear()
+            self._bytes = 0
+        for path in victims:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        if victims:
+            _log.info("상시 세그먼트 녹화 형식 변경 — 이전 세그먼트 %d개 삭제", len(victims))
+
+    def _discard_input(self):
+        while True:
+            try:
+                self._frames.get_nowait()
+            except queue.Empty:
+                break
+        self._audio.clear()
+
+    def _purge_dir(self):
+        """이전 실행의 세그먼트/목록 파일 정리 (인덱스는 메모리에만 있음)"""
+        with self._lock:
+            self._segments.clear()
+            self._bytes = 0
+        if not os.path.isdir(self._dir):
+            return
+        try:
+            for fname in os.listdir(self._dir):
+                if fname.startswith("seg_") and fname.endswith((".ts", ".csv")):
+                    try:
+                        os.remove(os.path.join(self._dir, fname))
+                    except OSError:
+                        pass
+        except OSError:
+            pass
@@ -29,7 +29,7 @@ import datetime
 import logging
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 from PySide6.QtCore import QObject, QTimer, Signal
 
@@ -163,8 +163,11 @@ class SignoffManager(QObject):
     # (group_id, message) — 로그/알림음 용
     event_occurred = Signal(int, str)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, auto_tick: bool = True):
         super().__init__(parent)
+        # 시각 공급 함수 — 오프라인 분석(analyze.py)은 미디어 타임스탬프 기준 시각으로 교체하고
+        # auto_tick=False로 생성하여 tick()을 프레임 진행에 맞춰 직접 호출한다.
+        self.clock: Callable[[], float] = time.time
         self._groups: Dict[int, SignoffGroup] = {}
         self._states: Dict[int, SignoffState] = {}
 
@@ -196,7 +199,12 @@ class SignoffManager(QObject):
         self._timer = QTimer(self)
         self._timer.setInterval(1000)
         self._timer.timeout.connect(self._tick)
-        self._timer.start()
+        if auto_tick:
+            self._timer.start()
+
+    def _now_dt(self) -> datetime.datetime:
+        """clock() 기준 현지 시각"""
+        return datetime.datetime.fromtimestamp(self.clock())
 
     # ── 그룹 설정 ─────────────────────────────────────────────────────────
 
@@ -234,7 +242,7 @@ class SignoffManager(QObject):
 
                 # 수동 오버라이드가 아닌 경우, 새 스케줄 기준으로 현재 상태 재검사
                 if not self._manual_override.get(gid, False):
-                    now = datetime.datetime.now()
+                    now = self._now_dt()
                     weekday = now.weekday()
                     current_time = now.strftime("%H:%M")
                     current_state = self._states.get(gid, SignoffState.IDLE)
@@ -314,7 +322,7 @@ class SignoffManager(QObject):
             self._transition_to(group_id, SignoffState.PREPARATION)
 
         elif current == SignoffState.PREPARATION:
-            now = datetime.datetime.now()
+            now = self._now_dt()
             group = self._groups.get(group_id)
             in_signoff = (
                 group is not None
@@ -399,7 +407,7 @@ class SignoffManager(QObject):
         if group is None:
             return 0.0
 
-        now = datetime.datetime.now()
+        now = self._now_dt()
 
         if state == SignoffState.IDLE:
             # 다음 정파준비 시작 시각 기준 잔여 시간
@@ -430,7 +438,7 @@ class SignoffManager(QObject):
             entered = self._signoff_entered_at.get(group_id)
             if entered is None:
                 return 0.0
-            return time.time() - entered
+            return self.clock() - entered
 
         return 0.0
 
@@ -439,7 +447,7 @@ class SignoffManager(QObject):
         group = self._groups.get(group_id)
         if group is None:
             return 0.0
-        now = datetime.datetime.now()
+        now = self._now_dt()
         end_h, end_m = map(int, group.end_time.split(":"))
         end_dt = now.replace(hour=end_h, minute=end_m, second=0, microsecond=0)
         if end_dt <= now:
@@ -453,7 +461,7 @@ class SignoffManager(QObject):
         entered = self._preparation_entered_at.get(group_id)
         if entered is None:
             return 0.0
-        return time.time() - entered
+        return self.clock() - entered
 
     def has_schedule_in_window(self, group_id: int) -> bool:
         """당일 09:00 ~ 익일 09:00 범위 내에 유효한 스케줄이 있는지 반환."""
@@ -465,7 +473,7 @@ class SignoffManager(QObject):
         if group.every_day:
             return True
 
-        now = datetime.datetime.now()
+        now = self._now_dt()
         start_h = int(group.start_time.split(":")[0])
         if start_h >= 9:
             check_weekday = now.weekday()
@@ -496,6 +504,10 @@ class SignoffManager(QObject):
 
     # ── 1초 주기 상태 점검 ────────────────────────────────────────────────
 
+    def tick(self):
+        """상태 점검 1회 수동 실행 (auto_tick=False 오프라인 분석용)"""
+        self._tick()
+
     def _tick(self):
         """매 1초 호출: 시간 기반 + 감지 결과 기반 상태 전환."""
         try:
@@ -505,7 +517,7 @@ class SignoffManager(QObject):
 
     def _tick_impl(self):
         """_tick() 실제 구현 — try-except로 분리하여 QTimer 안정성 보장."""
-        now = datetime.datetime.now()
+        now = self._now_dt()
         weekday = now.weekday()
         current_time = now.strftime("%H:%M")
 
@@ -567,7 +579,7 @@ class SignoffManager(QObject):
         if not v_label:
             return  # video_label 미설정 — 감지 기반 조기 전환 없음
 
-        now = time.time()
+        now = self.clock()
         is_still = self._latest_video.get(v_label, False)
         prev_still = self._dbg_prev_still.get(gid)
 
@@ -658,7 +670,7 @@ class SignoffManager(QObject):
         '종료 N분 전 이내인지'만 판별한다."""
         if group.exit_prep_minutes == 0:
             return False
-        now = datetime.datetime.now()
+        now = self._now_dt()
         end_h, end_m = map(int, group.end_time.split(":"))
         end_dt = now.replace(hour=end_h, minute=end_m, second=0, microsecond=0)
         if end_dt <= now:
@@ -676,7 +688,7 @@ class SignoffManager(QObject):
         if not v_label:
             return  # video_label 미설정 — 감지 기반 조기 해제 없음
 
-        now = time.time()
+        now = self.clock()
         is_still = self._latest_video.get(v_label, True)  # 기본값 True=스틸 상태
         is_not_still = not is_still
         prev_exit_still = self._dbg_prev_exit_still.get(gid)
@@ -757,11 +769,11 @@ class SignoffManager(QObject):
             self._reset_enter_timers(group_id)  # 이전 주기 진입 타이머 초기화 (stale 방지)
 
         if new_state == SignoffState.PREPARATION:
-            self._preparation_entered_at[group_id] = time.time()
+            self._preparation_entered_at[group_id] = self.clock()
             self._dbg_prev_still[group_id] = None          # 이전 주기 잔류값 초기화 (진단 로그 정확성)
 
         if new_state == SignoffState.SIGNOFF:
-            self._signoff_entered_at[group_id] = time.time()
+            self._signoff_entered_at[group_id] = self.clock()
             self._preparation_entered_at[group_id] = None
             self._reset_exit_timers(group_id)              # 이전 주기 퇴출 타이머 초기화 (stale 방지)
             self._dbg_prev_exit_still[group_id] = None     # 이전 주기 잔류값 초기화 (진단 로그 정확성)
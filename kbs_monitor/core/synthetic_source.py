@@ -0,0 +1,275 @@
+"""
+합성 멀티뷰 테스트 소스
+N×M 분할 멀티뷰 화면을 코드로 생성하여 캡처 카드/영상 파일 대신 입력으로 사용.
+벤치마크·알림 지연 측정·오프라인 분석을 실제 장비 없이 재현 가능하게 하기 위한 용도.
+
+화면 구성 (타일마다):
+  - 영상 영역: 무작위 텍스처가 스크롤 + 움직이는 박스 → 블랙/스틸 아님
+  - 우측 레벨미터 띠: 초록 막대 (기본 HSV 범위 H 40~95 / S 80~255 / V 60~255 안) 높이가 출렁임
+타일별 이벤트 스크립트:
+  - black  : 영상 영역 전체 0 (블랙)
+  - freeze : 영상 영역을 이벤트 시작 시점 화면으로 고정 (스틸)
+  - meter  : 레벨미터 막대 사라짐 (무음)
+
+프레임은 프레임 번호 → 가상 시각(t = n / fps)으로 결정되므로 실시간보다 빠르게 생성 가능
+(같은 설정이면 항상 같은 프레임). 캡처 스레드에서는 fps 간격으로 재생된다.
+
+소스 지정 문자열 (파일 입력과 같은 자리에 사용):
+  synthetic://4x4?size=1920x1080&fps=30&events=black:1@30-90,freeze:2@60-150,meter:3@30-90
+    4x4     : 분할 (열x행)
+    size    : 출력 해상도
+    fps     : 프레임 속도
+    events  : 종류:타일번호(1부터)@시작초-종료초 (종료 생략 시 끝까지), "none"이면 이벤트 없음
+    loop    : 이벤트 타임라인 반복 주기(초, 0=반복 없음)
+    seed    : 텍스처 난수 시드
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+from urllib.parse import urlparse, parse_qs
+
+import cv2
+import numpy as np
+
+from core.roi_manager import ROI
+
+SYNTHETIC_SCHEME = "synthetic://"
+DEFAULT_SYNTHETIC_SPEC = "synthetic://4x4?size=1920x1080&fps=30"
+
+# 기본 이벤트 스크립트 — 기본 감지 기준 시간(블랙/무음 20초, 스틸 60초)을 넘기도록 구성
+_DEFAULT_EVENTS = "black:1@30-90,freeze:2@60-150,meter:3@30-90"
+_DEFAULT_LOOP = 180.0
+
+_EVENT_TYPES = ("black", "freeze", "meter")
+_METER_COLOR = (0, 200, 0)       # BGR → HSV(60, 255, 200): 기본 레벨미터 HSV 범위 안
+_METER_BG = (20, 20, 20)         # 레벨미터 바탕 (HSV 범위 밖)
+_SCROLL_PX_PER_SEC = 120         # 텍스처 스크롤 속도
+
+
+def is_synthetic_source(source: str) -> bool:
+    """문자열이 합성 소스 지정이면 True"""
+    return bool(source) and source.strip().lower().startswith(SYNTHETIC_SCHEME)
+
+
+@dataclass
+class SyntheticEvent:
+    """타일 1개에 대한 스크립트 이벤트"""
+    kind: str                 # "black" / "freeze" / "meter"
+    tile: int                 # 0부터 시작하는 타일 인덱스
+    start: float              # 시작 시각(초)
+    end: Optional[float]      # 종료 시각(초, None=끝까지)
+
+    def active(self, t: float) -> bool:
+        return t >= self.start and (self.end is None or t < self.end)
+
+
+def parse_events(text: str) -> List[SyntheticEvent]:
+    """'black:1@30-90,meter:3@30' 형식 → 이벤트 목록 (형식 오류 항목은 무시)"""
+    events: List[SyntheticEvent] = []
+    if not text or text.strip().lower() == "none":
+        return events
+    for item in text.split(","):
+        try:
+            kind, rest = item.strip().split(":", 1)
+            tile_s, span = rest.split("@", 1)
+            start_s, _, end_s = span.partition("-")
+            kind = kind.strip().lower()
+            if kind not in _EVENT_TYPES:
+                continue
+            events.append(SyntheticEvent(
+                kind=kind,
+                tile=int(tile_s) - 1,
+                start=float(start_s),
+                end=float(end_s) if end_s else None,
+            ))
+        except ValueError:
+            continue
+    return events
+
+
+class SyntheticMultiview:
+    """N×M 분할 합성 멀티뷰 프레임 생성기"""
+
+    def __init__(self, width: int = 1920, height: int = 1080, cols: int = 4, rows: int = 4,
+                 fps: float = 30.0, events: Optional[List[SyntheticEvent]] = None,
+                 loop: float = _DEFAULT_LOOP, seed: int = 0):
+        self.width = int(width)
+        self.height = int(height)
+        self.cols = max(1, int(cols))
+        self.rows = max(1, int(rows))
+        self.fps = max(1.0, float(fps))
+        self.events = parse_events(_DEFAULT_EVENTS) if events is None else list(events)
+        self.loop = max(0.0, float(loop))
+        self.tile_w = self.width // self.cols
+        self.tile_h = self.height // self.rows
+        self.meter_w = max(4, self.tile_w // 16)
+        self.picture_w = self.tile_w - self.meter_w * 2
+
+        # 타일별 텍스처 (가로 2배 — 스크롤 시 슬라이스만으로 잘라냄, 프레임마다 생성 없음)
+        rng = np.random.default_rng(seed)
+        self._textures = []
+        for _ in range(self.cols * self.rows):
+            small = rng.integers(40, 220, (max(2, self.tile_h // 8), max(2, self.picture_w // 8), 3),
+                                 dtype=np.uint8)
+            tex = cv2.resize(small, (self.picture_w, self.tile_h), interpolation=cv2.INTER_LINEAR)
+            self._textures.append(np.concatenate([tex, tex], axis=1))
+        self._phases = rng.uniform(0.0, 2 * np.pi, self.cols * self.rows)
+
+    # ── 소스 지정 문자열 ──────────────────────────────────────────────────────
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "SyntheticMultiview":
+        """synthetic://CxR?size=WxH&fps=..&events=..&loop=..&seed=.. 해석"""
+        parsed = urlparse(spec.strip())
+        grid = (parsed.netloc or "4x4").lower()
+        q = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        try:
+            cols, rows = (int(v) for v in grid.split("x", 1))
+        except ValueError:
+            cols, rows = 4, 4
+        try:
+            width, height = (int(v) for v in q.get("size", "1920x1080").lower().split("x", 1))
+        except ValueError:
+            width, height = 1920, 1080
+        return cls(
+            width=width, height=height, cols=cols, rows=rows,
+            fps=float(q.get("fps", 30)),
+            events=parse_events(q.get("events", _DEFAULT_EVENTS)),
+            loop=float(q.get("loop", _DEFAULT_LOOP)),
+            seed=int(q.get("seed", 0)),
+        )
+
+    # ── 레이아웃 ──────────────────────────────────────────────────────────────
+
+    def tile_origin(self, tile: int) -> tuple:
+        return (tile % self.cols) * self.tile_w, (tile // self.cols) * self.tile_h
+
+    def tile_rois(self) -> tuple:
+        """레이아웃과 일치하는 감지영역 (원본 좌표). 반환: (video_rois, audio_rois)"""
+        video_rois: List[ROI] = []
+        audio_rois: List[ROI] = []
+        for tile in range(self.cols * self.rows):
+            x0, y0 = self.tile_origin(tile)
+            video_rois.append(ROI(
+                label=f"V{tile + 1}", media_name="", roi_type="video",
+                x=x0, y=y0, w=self.picture_w, h=self.tile_h,
+            ))
+            audio_rois.append(ROI(
+                label=f"A{tile + 1}", media_name="", roi_type="audio",
+                x=x0 + self.tile_w - self.meter_w, y=y0 + self.tile_h // 10,
+                w=self.meter_w, h=self.tile_h * 8 // 10,
+            ))
+        return video_rois, audio_rois
+
+    # ── 렌더링 ────────────────────────────────────────────────────────────────
+
+    def _timeline(self, t: float) -> float:
+        return t % self.loop if self.loop > 0 else t
+
+    def frame_at(self, index: int) -> np.ndarray:
+        """프레임 번호 → 프레임 (가상 시각 index / fps)"""
+        return self.render(index / self.fps)
+
+    def render(self, t: float) -> np.ndarray:
+        """가상 시각 t(초)의 멀티뷰 프레임 생성"""
+        tl = self._timeline(t)
+        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        active = {}
+        for ev in self.events:
+            if ev.active(tl):
+                active.setdefault(ev.tile, {})[ev.kind] = ev
+        for tile in range(self.cols * self.rows):
+            x0, y0 = self.tile_origin(tile)
+            tile_events = active.get(tile, {})
+            # 영상 영역
+            if "black" not in tile_events:
+                tt = tile_events["freeze"].start if "freeze" in tile_events else tl
+                self._draw_picture(frame, tile, x0, y0, tt)
+            # 레벨미터
+            level = 0.0 if "meter" in tile_events else self._meter_level(tile, tl)
+            self._draw_meter(frame, x0, y0, level)
+        return frame
+
+    def _draw_picture(self, frame: np.ndarray, tile: int, x0: int, y0: int, t: float):
+        pw, th = self.picture_w, self.tile_h
+        off = int(t * _SCROLL_PX_PER_SEC) % pw
+        frame[y0:y0 + th, x0:x0 + pw] = self._textures[tile][:, off:off + pw]
+        # 움직이는 박스 (타일마다 위상 다름)
+        bw, bh = max(4, pw // 6), max(4, th // 6)
+        ph = self._phases[tile]
+        bx = x0 + int((pw - bw) * (0.5 + 0.5 * np.sin(t * 1.3 + ph)))
+        by = y0 + int((th - bh) * (0.5 + 0.5 * np.cos(t * 0.9 + ph)))
+        cv2.rectangle(frame, (bx, by), (bx + bw, by + bh), (255, 255, 255), -1)
+
+    def _meter_level(self, tile: int, t: float) -> float:
+        """레벨미터 높이 비율 (0.3~0.9 출렁임 — 기본 감지 비율 5%보다 항상 큼)"""
+        return 0.6 + 0.3 * np.sin(t * 4.0 + self._phases[tile])
+
+    def _draw_meter(self, frame: np.ndarray, x0: int, y0: int, level: float):
+        mx = x0 + self.tile_w - self.meter_w
+        my = y0 + self.tile_h // 10
+        mh = self.tile_h * 8 // 10
+        frame[my:my + mh, mx:mx + self.meter_w] = _METER_BG
+        bar = int(mh * max(0.0, min(1.0, level)))
+        if bar > 0:
+            frame[my + mh - bar:my + mh, mx:mx + self.meter_w] = _METER_COLOR
+
+
+class SyntheticCapture:
+    """
+    cv2.VideoCapture 호환 래퍼 (VideoCaptureThread 루프에서 그대로 사용).
+    read() 호출마다 다음 프레임(가상 시각 +1/fps) 반환 — 재생 속도는 호출 측이 결정.
+    """
+
+    def __init__(self, spec: str):
+        self._source = SyntheticMultiview.from_spec(spec)
+        self._index = 0
+        self._opened = True
+
+    @property
+    def source(self) -> SyntheticMultiview:
+        return self._source
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def read(self):
+        if not self._opened:
+            return False, None
+        frame = self._source.frame_at(self._index)
+        self._index += 1
+        return True, frame
+
+    def grab(self) -> bool:
+        """다음 프레임으로 진행만 (렌더링은 retrieve 시점 — 오프라인 분석의 프레임 건너뛰기용)"""
+        if not self._opened:
+            return False
+        self._index += 1
+        return True
+
+    def retrieve(self):
+        if not self._opened or self._index == 0:
+            return False, None
+        return True, self._source.frame_at(self._index - 1)
+
+    def get(self, prop_id) -> float:
+        src = self._source
+        if prop_id == cv2.CAP_PROP_FPS:
+            return src.fps
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(src.width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(src.height)
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._index)
+        if prop_id == cv2.CAP_PROP_POS_MSEC:
+            return self._index / src.fps * 1000.0
+        return 0.0
+
+    def set(self, prop_id, value) -> bool:
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            self._index = max(0, int(value))
+            return True
+        return False
+
+    def release(self):
+        self._opened = False
@@ -2,17 +2,52 @@
 텔레그램 알림 모듈
 알림 발생 시 Bot API를 통해 메시지/이미지를 비동기 전송
 메인 감지 루프 블로킹 없이 내부 큐 + daemon 스레드로 처리
+스냅샷은 프레임 참조(복사 없음)만 큐에 넣고 워커에서 축소 + JPEG 인코딩.
+같은 프레임(프레임 id)의 인코딩 결과는 캐시해 한 감지 틱의 여러 알림이 1회 인코딩을 공유한다.
+
+전송은 워커 전용 keep-alive requests.Session(연결 풀)으로 하고, 실패 시 지터 지수 백오프로 재시도
+(429는 retry_after 이상 대기). 큐에서 max_delay를 넘긴 항목은 늦게 보내지 않고 지연 요약 1건으로 합친다.
+
+아웃박스: 워커는 큐 항목을 스냅샷 인코딩 후 디스크 아웃박스(core/notification_outbox.py)에 먼저 기록하고,
+전송이 끝난 항목만 지운다. 네트워크 장애 중에도 새 알림은 계속 기록되고,
+재시작하면 남은 항목을 순서대로 다시 보낸다. notify()는 메모리 큐에 넣기만 한다 (디스크 I/O 없음, 알림 분배기 스레드에서 호출).
+메모리 큐는 상한이 없어 쿨다운을 통과한 알림은 버려지지 않는다 (개수 상한은 아웃박스에서만 적용).
+
+묶음 전송: 워커는 가장 오래된 미처리 항목 발생 후 batch_seconds(기본 2초)까지 들어온 항목을 모아
+요약 메시지 1건(심각도 순, 복구는 종류별로 합침) + 스냅샷 sendMediaGroup(최대 10장, 같은 이미지 제외)로 보낸다.
+모인 항목이 1건이면 기존과 같은 단건 메시지/사진. 429 응답은 retry_after만큼 기다린 뒤 재시도.
+api_base를 바꾸면 Bot API를 흉내 내는 로컬 서버로 동작을 확인할 수 있다.
 """
+import os
 import threading
 import queue
 import time
 import datetime
-
-_SEND_RETRY_COUNT = 2      # 전송 실패 시 최대 재시도 횟수
-_SEND_RETRY_DELAY = 5.0    # 재시도 대기 시간(초)
+import json as _json
+import random
+from collections import OrderedDict, deque
+from typing import Optional
+
+_SEND_RETRY_COUNT = 3      # 전송 실패 시 최대 재시도 횟수
+_BACKOFF_BASE = 1.0        # 재시도 대기 기본값(초) — 1, 2, 4… 배로 늘리고 0.5~1.0 지터
+_BACKOFF_MAX = 30.0        # 재시도 대기 상한(초)
+_DEFAULT_MAX_DELAY = 120.0 # 항목 전송 기한(초) — 넘긴 알림은 늦게 보내지 않고 지연 요약 1건으로
+_LATENCY_SAMPLES = 500     # 지연 백분위 계산용 최근 표본 수
+_JPEG_QUALITY = 85
+_JPEG_CACHE_SIZE = 4       # 스냅샷 JPEG 캐시 (프레임 id, 폭) 항목 수 — 원본 프레임 참조도 함께 보관
+_BATCH_MAX_ITEMS = 50      # 묶음 1건 최대 항목 수
+_MEDIA_GROUP_MAX = 10      # sendMediaGroup 최대 사진 수 (Bot API 제한)
+_MESSAGE_MAX_CHARS = 4000  # 요약 메시지 길이 상한 (Bot API 4096자)
+_CAPTION_MAX_CHARS = 1000  # 사진 캡션 길이 상한 (Bot API 1024자)
+_DEFAULT_API_BASE = "https://api.telegram.org"
+
+# 묶음 요약 정렬 순서 (작을수록 심각 — 먼저 표시, 사진도 우선 첨부)
+_SEVERITY = {"시스템": 0, "블랙": 1, "정파": 2, "스틸": 3, "무음": 4, "오디오": 5}
 
 import cv2
-import numpy as np
+
+from core.frame_pyramid import FramePyramid
+from core.notification_outbox import NotificationOutbox
 
 try:
     import requests as _requests
@@ -27,13 +62,18 @@ class TelegramNotifier:
     내부 큐 + daemon 스레드로 HTTP 전송 — notify() 호출 즉시 반환.
     """
 
-    _API_BASE = "https://api.telegram.org/bot{token}"
+    _API_BASE = "{base}/bot{token}"
 
-    def __init__(self):
+    def __init__(self, outbox_dir: Optional[str] = None):
+        """outbox_dir: 아웃박스 폴더 (기본: 프로그램 폴더의 outbox)"""
         self._enabled: bool = False
         self._bot_token: str = ""
         self._chat_id: str = ""
         self._send_image: bool = True
+        self._image_width: int = 1280       # 스냅샷 최대 폭 (0 = 원본 해상도)
+        self._batch_seconds: float = 2.0    # 묶음 전송 대기 시간 (0 = 항목별 즉시 전송)
+        self._api_base: str = _DEFAULT_API_BASE
+        self._max_delay: float = _DEFAULT_MAX_DELAY  # 항목 전송 기한(초, 0 = 무제한)
         self._cooldown: float = 60.0        # 동일 채널 재발송 방지(초)
         self._notify_flags: dict = {        # 감지 타입별 전송 활성화
             "블랙": True,
@@ -44,13 +84,36 @@ class TelegramNotifier:
         }
         self._last_sent: dict = {}          # {key: timestamp}
 
-        self._queue: queue.Queue = queue.Queue(maxsize=50)
+        self._queue: queue.Queue = queue.Queue()     # 상한 없음 — 워커가 전송 중이어도 알림 손실 없음
         self._running: bool = False
         self._worker_lock = threading.Lock()  # 워커 스레드 재시작 원자성 보장
         self._worker_thread = threading.Thread(
             target=self._worker_loop, daemon=True, name="TelegramWorker"
         )
 
+        # 스냅샷 JPEG 캐시: (프레임 id, 폭) → (원본 프레임 참조, JPEG) — 워커 스레드 전용
+        self._jpeg_cache: OrderedDict = OrderedDict()
+        self._jpeg_encodes: int = 0
+        self._jpeg_hits: int = 0
+
+        # 디스크 아웃박스 — 워커가 큐 항목을 먼저 기록하고 전송 완료 후 지운다 (장애·재시작 중 보존)
+        if outbox_dir is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            outbox_dir = os.path.join(base_dir, "outbox")
+        self._outbox = NotificationOutbox(outbox_dir)
+        self._outbox_opened: bool = False
+        self._outage_failures: int = 0      # 일시 장애 연속 횟수 (재전송 백오프)
+        self._stopping: bool = False        # 종료 센티널 수신
+
+        # HTTP 세션 (워커 스레드 전용, 첫 전송 시 생성) + 전송 통계 (heartbeat 로그용)
+        self._session = None
+        self._stats_lock = threading.Lock()
+        self._http_latency: deque = deque(maxlen=_LATENCY_SAMPLES)   # 요청 1건 왕복 시간
+        self._e2e_latency: deque = deque(maxlen=_LATENCY_SAMPLES)    # 큐 삽입 → 전송 완료
+        self._sent: int = 0
+        self._retries: int = 0
+        self._stale: int = 0
+
         # 연속 실패 카운터 (워커 스레드에서만 읽기/쓰기)
         self._consecutive_failures: int = 0
         # 메인 스레드 → 워커 스레드 리셋 플래그 (configure 시 설정)
@@ -91,11 +154,8 @@ class TelegramNotifier:
     def stop(self):
         """워커 스레드 정지 (프로그램 종료 시 호출)"""
         self._running = False
-        try:
-            self._queue.put_nowait(None)    # 종료 센티널
-        except queue.Full:
-            pass
-        self._worker_thread.join(timeout=5.0)
+        self._queue.put(None)    # 종료 센티널
+        self._worker_thread.join(timeout=5.0)   # 세션은 워커가 종료하며 닫는다 (전송 중 닫지 않도록)
 
     # ── 설정 ──────────────────────────────────────────────────────────────────
 
@@ -111,12 +171,29 @@ class TelegramNotifier:
         notify_audio_level: bool = True,
         notify_embedded: bool = True,
         notify_signoff: bool = True,
+        image_width: int = 1280,
+        batch_seconds: float = 2.0,
+        api_base: str = _DEFAULT_API_BASE,
+        max_delay: float = _DEFAULT_MAX_DELAY,
+        outbox_max_items: int = 500,
+        outbox_max_mb: float = 100,
+        outbox_max_hours: float = 24,
     ):
-        """설정 반영 (메인 스레드에서 호출)"""
+        """설정 반영 (메인 스레드에서 호출). image_width: 스냅샷 최대 폭 (0 = 원본)
+        batch_seconds: 묶음 전송 대기 (0 = 즉시 단건 전송), api_base: Bot API 주소 (로컬 대역 서버 확인용)
+        max_delay: 항목 전송 기한(초, 0 = 무제한) — 넘긴 알림은 지연 요약으로 합침
+        outbox_*: 아웃박스 상한 (항목 수 / 스냅샷 용량 MB / 보관 시간, 0 = 시간 제한 없음)"""
         self._enabled = enabled
         self._bot_token = bot_token.strip()
         self._chat_id = chat_id.strip()
         self._send_image = send_image
+        self._image_width = max(0, int(image_width))
+        self._batch_seconds = max(0.0, float(batch_seconds))
+        self._api_base = (api_base or _DEFAULT_API_BASE).rstrip("/")
+        self._max_delay = max(0.0, float(max_delay))
+        self._outbox.max_items = max(1, int(outbox_max_items))
+        self._outbox.max_bytes = int(max(1.0, float(outbox_max_mb)) * 1024 * 1024)
+        self._outbox.max_age = max(0.0, float(outbox_max_hours)) * 3600
         self._cooldown = max(0.0, cooldown)
         self._notify_flags = {
             "블랙": notify_black,
@@ -135,13 +212,14 @@ class TelegramNotifier:
         alarm_type: str,
         label: str,
         media_name: str,
-        frame: np.ndarray = None,
+        frame=None,
         is_recovery: bool = False,
     ):
         """
-        알림 발생 또는 복구 시 호출 (메인 스레드).
+        알림 발생 또는 복구 시 호출 (알림 분배기 스레드 — core/notifier_hub.py TelegramSink).
+        frame: 스냅샷 원본 — np.ndarray 또는 FramePyramid (피라미드면 프레임 id로 인코딩 캐시, 축소본 공유)
         is_recovery=True이면 복구 메시지 전송 (쿨다운 미적용).
-        쿨다운 체크 → JPEG 인코딩 → 큐 삽입 후 즉시 반환.
+        쿨다운 체크 → 프레임 참조와 함께 큐 삽입 후 즉시 반환 (인코딩은 워커 스레드).
         """
         if not _REQUESTS_AVAILABLE:
             self._log("requests 라이브러리 미설치 — pip install requests", error=True)
@@ -172,32 +250,17 @@ class TelegramNotifier:
                 return
             self._last_sent[key] = now
 
-        # 스냅샷 JPEG 인코딩 (메인 스레드에서 복사본으로 처리)
-        jpeg_bytes = None
-        if self._send_image and frame is not None:
-            try:
-                success, buf = cv2.imencode(
-                    ".jpg", frame,
-                    [cv2.IMWRITE_JPEG_QUALITY, 85],
-                )
-                if success:
-                    jpeg_bytes = buf.tobytes()
-                else:
-                    self._log(f"JPEG 인코딩 실패 ({alarm_type} {label}) — 텍스트만 전송", error=True)
-            except Exception as e:
-                self._log(f"JPEG 인코딩 예외 ({alarm_type} {label}): {e} — 텍스트만 전송", error=True)
-
+        # 스냅샷은 참조만 전달 — 캡처 스레드가 매 프레임 새 배열을 만들고 소비자는 원본을 수정하지 않으므로 안전
         item = {
             "alarm_type": alarm_type,
             "label": label,
             "media_name": media_name or label,
-            "jpeg_bytes": jpeg_bytes,
+            "frame": frame if self._send_image else None,
+            "jpeg_bytes": None,
             "is_recovery": is_recovery,
+            "ts": time.time(),
         }
-        try:
-            self._queue.put_nowait(item)
-        except queue.Full:
-            self._log(f"알림 큐 가득참 (최대 50) — {alarm_type} {label} 알림 손실", error=True)
+        self._queue.put(item)
 
     # ── 연결 테스트 ───────────────────────────────────────────────────────────
 
@@ -213,7 +276,7 @@ class TelegramNotifier:
         if not token or not chat_id:
             return False, "Bot Token과 Chat ID를 입력하세요."
         try:
-            url = f"{self._API_BASE.format(token=token)}/sendMessage"
+            url = f"{self._API_BASE.format(base=self._api_base, token=token)}/sendMessage"
             resp = _requests.post(
                 url,
                 json={
@@ -241,28 +304,222 @@ class TelegramNotifier:
     # ── 워커 스레드 ───────────────────────────────────────────────────────────
 
     def _worker_loop(self):
-        """백그라운드 전송 워커 루프"""
-        while self._running:
+        """백그라운드 전송 워커 루프: 메모리 큐 → 아웃박스 기록, 아웃박스 미처리 항목을 묶음 전송"""
+        self._open_outbox()
+        while self._running and not self._stopping:
             # configure()에서 설정된 리셋 플래그 확인 (스레드 안전: 워커에서만 쓰기)
             if self._reset_failure_count:
                 self._consecutive_failures = 0
                 self._reset_failure_count = False
-            try:
-                item = self._queue.get(timeout=1.0)
-            except queue.Empty:
+            if not len(self._outbox) or not self._enabled:
+                self._idle(1.0)
+                continue
+            # 묶음 대기: 가장 오래된 미처리 항목 발생 후 batch_seconds까지 (재시작 후 복원분은 바로 전송)
+            first = self._outbox.pending(1)[0]
+            wait = (first["ts"] or 0) + self._batch_seconds - time.time()
+            self._idle(max(0.0, wait))
+            expired = self._outbox.expire()
+            if expired:
+                self._log(f"보관 시간 초과 알림 {expired}건 폐기 (아웃박스)", error=True)
+            records = self._outbox.pending(_BATCH_MAX_ITEMS)
+            if not records:
                 continue
-            if item is None:    # 종료 센티널
-                break
             try:
-                success = self._send(item)
-                if success:
-                    self._consecutive_failures = 0
+                delivered = self._deliver(records)
             except Exception as exc:
-                # _send() 내부 try-except가 놓친 예외 → 스레드 사망 방지
+                # _send() 내부 try-except가 놓친 예외 → 스레드 사망 방지. 같은 항목 반복 실패를 막기 위해 폐기
+                self._outbox.ack(rec["seq"] for rec in records)
                 self._consecutive_failures += 1
                 self._log_with_suppression(
-                    f"전송 처리 중 예외 (스레드 유지): {type(exc).__name__}: {exc}"
+                    f"전송 처리 중 예외 (스레드 유지, {len(records)}건 폐기): {type(exc).__name__}: {exc}"
                 )
+                continue
+            if delivered:
+                self._outage_failures = 0
+            else:
+                # 일시 장애 — 아웃박스에 남겨 두고 백오프 후 다시 전송 (그동안 새 알림은 계속 기록)
+                self._outage_failures += 1
+                self._idle(self._backoff(min(self._outage_failures, 5)))
+        # 종료 전 메모리 큐에 남은 알림을 아웃박스로 옮겨 다음 실행에서 전송
+        self._idle(0.0)
+        self._outbox.close()
+        self._reset_session()
+
+    def _open_outbox(self):
+        """아웃박스 복원 (워커 시작 시 1회 — 재시작된 워커는 건너뜀)"""
+        if self._outbox_opened:
+            return
+        self._outbox_opened = True
+        restored = self._outbox.open()
+        if restored:
+            self._log(f"아웃박스 미전송 알림 {restored}건 복원 — 순서대로 재전송")
+
+    def _idle(self, seconds: float):
+        """seconds 동안 메모리 큐 항목을 아웃박스로 옮기며 대기 (0이면 쌓인 항목만 옮기고 반환).
+        종료 센티널을 받으면 _stopping 설정 후 반환"""
+        deadline = time.time() + seconds
+        while True:
+            remaining = deadline - time.time()
+            try:
+                if remaining > 0 and self._running:
+                    item = self._queue.get(timeout=min(remaining, 0.5))
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                if remaining > 0 and self._running:
+                    continue
+                return
+            if item is None:    # 종료 센티널
+                self._stopping = True
+                continue
+            self._spool(item)
+
+    def _spool(self, item: dict):
+        """큐 항목 1건: 스냅샷 인코딩 후 아웃박스 기록 (프레임 참조는 여기서 놓음)"""
+        jpeg = self._encode_snapshot(item) if item.get("frame") is not None else None
+        dropped = self._outbox.add(item, jpeg)
+        if dropped:
+            self._log(f"아웃박스 상한 초과 — 오래된 알림 {dropped}건 폐기", error=True)
+
+    def _deliver(self, records: list) -> bool:
+        """아웃박스 항목 전송 + 처리 완료 표시. 일시 장애(재전송 대상)면 False"""
+        fresh, stale = self._split_stale(records)
+        if stale:
+            if self._send_stale_summary(stale) is None:
+                return False
+            self._outbox.ack(rec["seq"] for rec in stale)
+        if not fresh:
+            return True
+        if len(fresh) == 1:
+            fresh[0]["jpeg_bytes"] = self._outbox.load_jpeg(fresh[0])
+            result = self._send(fresh[0])
+        else:
+            result = self._send_batch(fresh)
+        if result is None:
+            return False
+        # 성공 또는 영구 실패(HTTP 4xx 등) — 재전송해도 같은 결과이므로 처리 완료
+        self._outbox.ack(rec["seq"] for rec in fresh)
+        if result:
+            self._consecutive_failures = 0
+            self._record_delivered(fresh)
+        return True
+
+    def _split_stale(self, batch: list) -> tuple:
+        """전송 기한(max_delay)을 넘긴 항목 분리. 반환: (기한 내 항목, 기한 초과 항목)"""
+        if not self._max_delay:
+            return batch, []
+        cutoff = time.time() - self._max_delay
+        fresh = [it for it in batch if it["ts"] >= cutoff]
+        stale = [it for it in batch if it["ts"] < cutoff]
+        return fresh, stale
+
+    def _send_stale_summary(self, stale: list) -> Optional[bool]:
+        """기한 초과 항목을 사진 없이 종류별 건수 요약 1건으로 전송"""
+        with self._stats_lock:
+            self._stale += len(stale)
+        first = datetime.datetime.fromtimestamp(min(it["ts"] for it in stale)).strftime("%H:%M:%S")
+        last = datetime.datetime.fromtimestamp(max(it["ts"] for it in stale)).strftime("%H:%M:%S")
+        lines = [f"[KBS Peacock \U000023F3 지연 알림 요약 {len(stale)}건 ({first}~{last})]"]
+        for alarm_type, items in self._group_by_type(
+                sorted(stale, key=lambda it: _SEVERITY.get(it["alarm_type"], len(_SEVERITY)))):
+            alarms = sum(1 for it in items if not it.get("is_recovery"))
+            recoveries = len(items) - alarms
+            channels = ", ".join(dict.fromkeys(it["label"] for it in items))
+            lines.append(f"{alarm_type}: 알림 {alarms} / 복구 {recoveries} — {channels}")
+        text = "\n".join(lines)
+        if len(text) > _MESSAGE_MAX_CHARS:
+            text = text[:_MESSAGE_MAX_CHARS - 20] + "\n… (이하 생략)"
+        ok = self._post("sendMessage", json={"chat_id": self._chat_id, "text": text})
+        if ok:
+            self._log(f"전송 기한({self._max_delay:.0f}초) 초과 알림 {len(stale)}건 요약 전송")
+        return ok
+
+    def _deadline(self, items: list) -> Optional[float]:
+        """재시도 기한 — 가장 최근 항목도 전송 기한을 넘기면 더 기다리지 않음"""
+        if not self._max_delay:
+            return None
+        return max(it["ts"] for it in items) + self._max_delay
+
+    def _encode_snapshot(self, item: dict):
+        """스냅샷 축소 + JPEG 인코딩 (워커 스레드). 같은 프레임·폭이면 캐시 재사용. 실패 시 None (텍스트만 전송)"""
+        frame = item.pop("frame", None)
+        if frame is None:
+            return None
+        if isinstance(frame, FramePyramid):
+            pyramid, src, frame_id = frame, frame.frame, frame.frame_id
+        else:
+            # 피라미드 없이 넘어온 배열: 객체 id + 참조 동일성으로 식별 (캐시가 참조를 보관하므로 id 재사용 없음)
+            pyramid, src, frame_id = None, frame, id(frame)
+        width = self._image_width
+        key = (frame_id, width)
+        cached = self._jpeg_cache.get(key)
+        if cached is not None and cached[0] is src:
+            self._jpeg_cache.move_to_end(key)
+            self._jpeg_hits += 1
+            return cached[1]
+        try:
+            h, w = src.shape[:2]
+            img = src
+            if width and w > width:
+                th = max(1, int(round(h * width / w)))
+                if pyramid is not None:
+                    img = pyramid.resized(width, th)
+                else:
+                    img = cv2.resize(src, (width, th), interpolation=cv2.INTER_AREA)
+            success, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, _JPEG_QUALITY])
+        except Exception as e:
+            self._log(f"JPEG 인코딩 예외 ({item['alarm_type']} {item['label']}): {e} — 텍스트만 전송",
+                      error=True)
+            return None
+        if not success:
+            self._log(f"JPEG 인코딩 실패 ({item['alarm_type']} {item['label']}) — 텍스트만 전송", error=True)
+            return None
+        jpeg = buf.tobytes()
+        self._jpeg_encodes += 1
+        self._jpeg_cache[key] = (src, jpeg)
+        while len(self._jpeg_cache) > _JPEG_CACHE_SIZE:
+            self._jpeg_cache.popitem(last=False)
+        return jpeg
+
+    def _record_latency(self, samples: deque, seconds: float):
+        with self._stats_lock:
+            samples.append(seconds)
+
+    def _record_delivered(self, items: list):
+        """전송 완료 항목의 큐 삽입 → 완료 지연 기록"""
+        now = time.time()
+        with self._stats_lock:
+            self._sent += len(items)
+            for it in items:
+                self._e2e_latency.append(now - it["ts"])
+
+    @staticmethod
+    def _percentiles(samples: list) -> dict:
+        """{"p50", "p95", "p99"} (초, 최근접 순위) — 표본이 없으면 빈 dict"""
+        if not samples:
+            return {}
+        ordered = sorted(samples)
+        n = len(ordered)
+        return {f"p{q}": ordered[min(n - 1, max(0, -(-q * n // 100) - 1))] for q in (50, 95, 99)}
+
+    def get_stats(self, reset: bool = False) -> dict:
+        """heartbeat 로그용: {"encodes", "cache_hits", "sent", "retries", "stale", "outbox", "http", "e2e"}
+        encodes/cache_hits: 스냅샷 JPEG 인코딩 수 / 캐시 재사용 수, sent: 전송 완료 항목 수, outbox: 미전송 항목 수,
+        http/e2e: 요청 왕복 / 큐 삽입→완료 지연 백분위 {"p50", "p95", "p99"} (초)"""
+        with self._stats_lock:
+            http, e2e = list(self._http_latency), list(self._e2e_latency)
+            stats = {
+                "encodes": self._jpeg_encodes, "cache_hits": self._jpeg_hits,
+                "sent": self._sent, "retries": self._retries, "stale": self._stale,
+                "outbox": len(self._outbox),
+                "http": self._percentiles(http), "e2e": self._percentiles(e2e),
+            }
+            if reset:
+                self._jpeg_encodes = self._jpeg_hits = 0
+                self._sent = self._retries = self._stale = 0
+                self._http_latency.clear()
+                self._e2e_latency.clear()
+        return stats
 
     @staticmethod
     def _classify_error(exc: Exception) -> str:
@@ -287,21 +544,24 @@ class TelegramNotifier:
             # 4~9, 11~19...: 파일 로그만
             self._log(msg, error=False)
 
-    def _send(self, item: dict) -> bool:
-        """실제 HTTP 전송 (워커 스레드에서 실행). 성공 시 True, 최종 실패 시 False."""
+    @staticmethod
+    def _channel_str(item: dict) -> str:
+        channel_str = f"{item['label']}"
+        if item["media_name"] != item["label"]:
+            channel_str += f" ({item['media_name']})"
+        return channel_str
+
+    def _send(self, item: dict) -> Optional[bool]:
+        """단건 HTTP 전송 (워커 스레드에서 실행). 성공 True, 영구 실패 False, 일시 장애 None (재전송 대상)"""
         if not _REQUESTS_AVAILABLE:
             return False
 
-        now_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        now_str = datetime.datetime.fromtimestamp(item.get("ts", time.time())).strftime("%Y-%m-%d %H:%M:%S")
         alarm_type = item["alarm_type"]
-        label = item["label"]
-        media_name = item["media_name"]
         is_recovery = item.get("is_recovery", False)
 
         # 이모지는 Python f-string 4바이트 코드포인트(\U)로만 사용
-        channel_str = f"{label}"
-        if media_name != label:
-            channel_str += f" ({media_name})"
+        channel_str = self._channel_str(item)
 
         if is_recovery:
             text = (
@@ -318,67 +578,225 @@ class TelegramNotifier:
                 f"\U000026A0 감지: {alarm_type}"
             )
 
-        base = self._API_BASE.format(token=self._bot_token)
+        deadline = self._deadline([item])
+        if item.get("jpeg_bytes"):
+            ok = self._post(
+                "sendPhoto",
+                data={"chat_id": self._chat_id, "caption": text},
+                files={"photo": ("snapshot.jpg", item["jpeg_bytes"], "image/jpeg")},
+                deadline=deadline,
+            )
+        else:
+            ok = self._post("sendMessage", json={"chat_id": self._chat_id, "text": text},
+                            deadline=deadline)
+        if ok:
+            kind = "복구" if is_recovery else "알림"
+            self._log(f"{alarm_type} {kind} 전송 완료 ({channel_str})")
+        return ok
+
+    def _send_batch(self, batch: list) -> Optional[bool]:
+        """묶음 전송: 요약 메시지 1건 + 알림 스냅샷 sendMediaGroup (사진 1장이면 sendPhoto 캡션).
+        반환은 _send()와 같음 — 요약 전송 결과 기준 (사진 앨범 실패는 재전송하지 않음)"""
+        if not _REQUESTS_AVAILABLE:
+            return False
+
+        # 같은 (종류, 채널, 알림/복구) 중복 제거 — 첫 발생만 유지
+        seen = set()
+        alarms, recoveries = [], []
+        for item in batch:
+            key = (item["alarm_type"], item["label"], item.get("is_recovery", False))
+            if key in seen:
+                continue
+            seen.add(key)
+            (recoveries if key[2] else alarms).append(item)
+        alarms.sort(key=lambda it: (_SEVERITY.get(it["alarm_type"], len(_SEVERITY)), it["ts"]))
+
+        text = self._batch_text(alarms, recoveries)
+
+        # 알림 스냅샷만 첨부 (복구는 제외). 같은 스냅샷 파일(같은 프레임)은 1장만
+        photos, photo_names = [], set()
+        for item in alarms:
+            if len(photos) >= _MEDIA_GROUP_MAX:
+                break
+            name = item.get("jpeg", "")
+            if not name or name in photo_names:
+                continue
+            jpeg = self._outbox.load_jpeg(item)
+            if not jpeg:
+                continue
+            photo_names.add(name)
+            photos.append((item, jpeg))
+
+        deadline = self._deadline(batch)
+        if len(photos) == 1 and len(text) <= _CAPTION_MAX_CHARS:
+            ok = self._post(
+                "sendPhoto",
+                data={"chat_id": self._chat_id, "caption": text},
+                files={"photo": ("snapshot.jpg", photos[0][1], "image/jpeg")},
+                deadline=deadline,
+            )
+        else:
+            ok = self._post("sendMessage", json={"chat_id": self._chat_id, "text": text},
+                            deadline=deadline)
+            if ok and photos:
+                self._send_media_group(photos, deadline)
+        if ok:
+            self._log(
+                f"묶음 전송 완료 (알림 {len(alarms)}건, 복구 {len(recoveries)}건, 사진 {len(photos)}장)"
+            )
+        return ok
+
+    def _batch_text(self, alarms: list, recoveries: list) -> str:
+        """묶음 요약 메시지 — 알림은 종류별(심각도 순) 채널 목록, 복구는 종류별로 합친 채널 목록"""
+        first_ts = min(it["ts"] for it in alarms + recoveries)
+        now_str = datetime.datetime.fromtimestamp(first_ts).strftime("%Y-%m-%d %H:%M:%S")
+        lines = [
+            f"[KBS Peacock \U0001F6A8 알림 {len(alarms)}건 / \U00002705 복구 {len(recoveries)}건]",
+            f"\U000023F0 시각: {now_str}",
+        ]
+        for alarm_type, items in self._group_by_type(alarms):
+            lines.append(f"\U000026A0 {alarm_type} ({len(items)}): "
+                         + ", ".join(self._channel_str(it) for it in items))
+        for alarm_type, items in self._group_by_type(recoveries):
+            lines.append(f"\U00002714 {alarm_type} 정상 ({len(items)}): "
+                         + ", ".join(self._channel_str(it) for it in items))
+        text = "\n".join(lines)
+        if len(text) > _MESSAGE_MAX_CHARS:
+            text = text[:_MESSAGE_MAX_CHARS - 20] + "\n… (이하 생략)"
+        return text
+
+    @staticmethod
+    def _group_by_type(items: list) -> list:
+        """[(종류, [항목…])] — 입력 순서(알림은 심각도 순)를 유지"""
+        groups: dict = {}
+        for it in items:
+            groups.setdefault(it["alarm_type"], []).append(it)
+        return list(groups.items())
+
+    def _send_media_group(self, photos: list, deadline: Optional[float] = None) -> bool:
+        """스냅샷 2~10장을 앨범 1건으로 전송 (사진 1장이면 sendPhoto). 장별 캡션: 종류 + 채널"""
+        if len(photos) == 1:
+            item, jpeg = photos[0]
+            return self._post(
+                "sendPhoto",
+                data={"chat_id": self._chat_id,
+                      "caption": f"{item['alarm_type']} — {self._channel_str(item)}"},
+                files={"photo": ("snapshot.jpg", jpeg, "image/jpeg")},
+                deadline=deadline,
+            )
+        media, files = [], {}
+        for n, (item, jpeg) in enumerate(photos):
+            name = f"photo{n}"
+            media.append({
+                "type": "photo",
+                "media": f"attach://{name}",
+                "caption": f"{item['alarm_type']} — {self._channel_str(item)}"[:_CAPTION_MAX_CHARS],
+            })
+            files[name] = (f"snapshot{n}.jpg", jpeg, "image/jpeg")
+        return self._post(
+            "sendMediaGroup",
+            data={"chat_id": self._chat_id, "media": _json.dumps(media, ensure_ascii=False)},
+            files=files,
+            deadline=deadline,
+        )
+
+    def _get_session(self):
+        """워커 전용 keep-alive 세션 (연결 풀 재사용 — 알림마다 TCP/TLS 연결을 새로 맺지 않음)"""
+        if self._session is None:
+            session = _requests.Session()
+            adapter = _requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def _reset_session(self):
+        """네트워크 오류 후 세션 폐기 — 끊긴 keep-alive 연결을 재사용하지 않도록"""
+        session, self._session = self._session, None
+        if session is not None:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """지터 포함 지수 백오프: base × 2^attempt (상한 _BACKOFF_MAX) × [0.5, 1.0)"""
+        delay = min(_BACKOFF_MAX, _BACKOFF_BASE * (2 ** attempt))
+        return delay * (0.5 + random.random() * 0.5)
+
+    def _post(self, endpoint: str, data=None, json=None, files=None,
+              deadline: Optional[float] = None) -> Optional[bool]:
+        """Bot API POST 1건 + 재시도 (지터 지수 백오프, 429는 retry_after 이상 대기).
+        deadline(epoch 초)을 넘기게 되는 재시도는 하지 않는다.
+        반환: 성공 True / 재시도해도 같은 HTTP 오류(4xx 등) False / 네트워크·Rate Limit 소진 None"""
+        base = self._API_BASE.format(base=self._api_base, token=self._bot_token)
         timeout = (5.0, 15.0)  # (connect_timeout, read_timeout) — DNS는 별도 적용 안됨
 
         for attempt in range(1 + _SEND_RETRY_COUNT):
+            last = attempt >= _SEND_RETRY_COUNT
             try:
-                if item.get("jpeg_bytes"):
-                    resp = _requests.post(
-                        f"{base}/sendPhoto",
-                        data={"chat_id": self._chat_id, "caption": text},
-                        files={
-                            "photo": ("snapshot.jpg", item["jpeg_bytes"], "image/jpeg")
-                        },
-                        timeout=timeout,
-                    )
-                else:
-                    resp = _requests.post(
-                        f"{base}/sendMessage",
-                        json={"chat_id": self._chat_id, "text": text},
-                        timeout=timeout,
-                    )
+                t0 = time.perf_counter()
+                resp = self._get_session().post(
+                    f"{base}/{endpoint}", data=data, json=json, files=files, timeout=timeout,
+                )
+                self._record_latency(self._http_latency, time.perf_counter() - t0)
                 if resp.status_code == 200:
-                    kind = "복구" if is_recovery else "알림"
-                    self._log(f"{alarm_type} {kind} 전송 완료 ({channel_str})")
                     return True
                 elif resp.status_code == 429:
-                    # Rate Limit — 응답의 retry_after만큼 대기 후 재시도
+                    # Rate Limit — 응답의 retry_after 이상 대기 후 재시도
                     try:
-                        retry_after = resp.json()["parameters"]["retry_after"]
+                        retry_after = float(resp.json()["parameters"]["retry_after"])
                     except Exception:
-                        retry_after = 10
+                        retry_after = 10.0
+                    wait = max(retry_after, self._backoff(attempt))
+                    if last or not self._can_wait(wait, deadline):
+                        break
                     self._log(
-                        f"전송 실패 429 (Rate Limit, {retry_after}초 후 재시도): "
+                        f"{endpoint} 실패 429 (Rate Limit, {wait:.1f}초 후 재시도): "
                         f"{resp.text[:80]}",
                         error=True,
                     )
-                    time.sleep(retry_after + 1)
+                    with self._stats_lock:
+                        self._retries += 1
+                    self._idle(wait)    # 대기 중에도 새 알림은 아웃박스에 기록
+                    if not self._running:
+                        return None
                     # attempt 루프를 계속 진행하여 재시도
                 else:
                     self._consecutive_failures += 1
                     self._log_with_suppression(
-                        f"전송 실패 {resp.status_code}: {resp.text[:120]}"
+                        f"{endpoint} 실패 {resp.status_code}: {resp.text[:120]}"
                     )
                     return False  # 그 외 HTTP 오류는 재시도 없이 종료
             except Exception as exc:
+                self._reset_session()
                 error_desc = self._classify_error(exc)
-                if attempt < _SEND_RETRY_COUNT:
+                wait = self._backoff(attempt)
+                if not last and self._can_wait(wait, deadline):
                     # 중간 재시도 오류는 파일 전용 — 재시도 후 성공하면 UI에 빨간 로그 불필요
                     retry_msg = (
-                        f"전송 오류 (재시도 {attempt + 1}/{_SEND_RETRY_COUNT}): "
+                        f"전송 오류 (재시도 {attempt + 1}/{_SEND_RETRY_COUNT}, {wait:.1f}초 후): "
                         f"{error_desc} — {exc}"
                     )
                     self._log(retry_msg, error=False)
-                    time.sleep(_SEND_RETRY_DELAY)
+                    with self._stats_lock:
+                        self._retries += 1
+                    self._idle(wait)
+                    if not self._running:
+                        return None
                 else:
-                    # 마지막 재시도도 실패 — 카운터 기반 로그
+                    # 재시도 소진 또는 기한 초과 — 카운터 기반 로그
                     self._consecutive_failures += 1
                     self._log_with_suppression(
-                        f"전송 실패 (재시도 소진): {error_desc} — {exc}"
+                        f"전송 실패 (재시도 소진, 아웃박스 보관): {error_desc} — {exc}"
                     )
-                    return False
-        # 429 재시도 루프 모두 소진
+                    return None
+        # 429 재시도 소진 또는 기한 초과
         self._consecutive_failures += 1
-        self._log_with_suppression("전송 실패 (Rate Limit 재시도 소진)")
-        return False
+        self._log_with_suppression(f"{endpoint} 실패 (Rate Limit 재시도 소진, 아웃박스 보관)")
+        return None
+
+    @staticmethod
+    def _can_wait(wait: float, deadline: Optional[float]) -> bool:
+        return deadline is None or time.time() + wait < deadline
@@ -1,14 +1,136 @@
 """
 비디오 캡처 스레드 모듈
-OpenCV를 사용하여 USB 캡처 카드에서 영상을 읽어 UI에 전달
+OpenCV를 사용하여 USB 캡처 카드 / 영상 파일 / 네트워크 스트림(RTSP·SRT·UDP MPEG-TS) / 합성 테스트 소스에서
+영상을 읽어 UI에 전달
+
+네트워크 스트림 로컬 테스트 (루프백):
+  ffmpeg -re -f lavfi -i testsrc2=size=1920x1080:rate=30 -c:v libx264 -tune zerolatency \
+         -f mpegts "udp://127.0.0.1:5000?pkt_size=1316"
+  → 스트림 URL: udp://127.0.0.1:5000
 """
 import logging
+import os
+import threading
+import time
 import cv2
 import numpy as np
+from typing import Optional
 from PySide6.QtCore import QThread, Signal, QMutex, QMutexLocker
 
+from core.synthetic_source import SyntheticCapture, is_synthetic_source
+
 _log = logging.getLogger(__name__)
 
+# 네트워크 스트림으로 취급할 URL 스킴
+_STREAM_SCHEMES = ("rtsp://", "rtsps://", "srt://", "udp://", "rtp://", "tcp://",
+                   "http://", "https://")
+
+# FFmpeg 저지연 옵션 (OpenCV FFMPEG 백엔드 — "키;값|키;값" 형식)
+#   rtsp_transport=tcp : RTSP 패킷 손실 방지 (UDP 재정렬 지연 제거)
+#   fflags=nobuffer / flags=low_delay : 디먹서·디코더 내부 버퍼링 최소화
+#   max_delay=500000 : 디먹서 최대 지연 0.5초
+#   threads=0 : 디코더 스레드 수 자동 (멀티스레드 디코딩)
+_STREAM_FFMPEG_OPTIONS = (
+    "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay|max_delay;500000|threads;0"
+)
+_FFMPEG_OPTIONS_ENV = "OPENCV_FFMPEG_CAPTURE_OPTIONS"
+_STREAM_OPEN_TIMEOUT_MS = 5000   # 스트림 연결 타임아웃
+_STREAM_READ_TIMEOUT_MS = 5000   # 프레임 수신 타임아웃 (초과 시 read 실패)
+_STREAM_MAX_FAILURES = 3         # 스트림 연속 read 실패 허용 횟수 (타임아웃 포함)
+_RECONNECT_BACKOFF_MIN = 1.0     # 재연결 대기 시작값(초)
+_RECONNECT_BACKOFF_MAX = 30.0    # 재연결 대기 상한(초)
+_STATS_LOG_INTERVAL = 30.0       # 스트림 통계 로그 주기(초)
+
+# 캡처 카드 요청 해상도 (멀티뷰어 출력에 맞춰 설정 — 장치가 지원하지 않으면 장치 기본값 사용)
+CAPTURE_SIZES = {
+    "1920x1080": (1920, 1080),   # HD
+    "3840x2160": (3840, 2160),   # UHD
+}
+DEFAULT_CAPTURE_SIZE = (1920, 1080)
+
+# OpenCV FFMPEG 백엔드는 열 때 프로세스 전역 환경변수에서 옵션을 읽는다 (params로는 전달 불가).
+# 입력마다 캡처 스레드가 있으므로 열기 전체를 잠그고, 스트림 옵션은 열기 동안에만 설정 후 원래 값으로 복원.
+_open_lock = threading.Lock()
+
+
+def is_stream_url(source: str) -> bool:
+    """문자열이 네트워크 스트림 URL이면 True"""
+    return bool(source) and source.strip().lower().startswith(_STREAM_SCHEMES)
+
+
+def _open_ffmpeg_capture(source: str, params: Optional[list] = None,
+                         options: Optional[str] = None) -> cv2.VideoCapture:
+    """FFMPEG 백엔드로 열기. options("키;값|…")는 이 열기에만 적용 — 다른 입력/파일 열기에 새지 않음"""
+    with _open_lock:
+        prev = os.environ.get(_FFMPEG_OPTIONS_ENV)
+        if options is not None:
+            os.environ[_FFMPEG_OPTIONS_ENV] = options
+        try:
+            if params:
+                return cv2.VideoCapture(source, cv2.CAP_FFMPEG, params)
+            return cv2.VideoCapture(source)
+        finally:
+            if options is not None:
+                if prev is None:
+                    os.environ.pop(_FFMPEG_OPTIONS_ENV, None)
+                else:
+                    os.environ[_FFMPEG_OPTIONS_ENV] = prev
+
+
+class StreamStats:
+    """네트워크 스트림 수신 통계 (캡처 스레드에서만 갱신, 스냅샷은 mutex로 보호)"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.frames = 0              # 수신 프레임 수
+        self.read_failures = 0       # read 실패(타임아웃 포함) 누적
+        self.dropped_frames = 0      # PTS 간격으로 추정한 손실 프레임 수
+        self.reconnects = 0          # 재연결 횟수
+        self.bitrate_kbps = 0.0      # 백엔드 보고 비트레이트
+        self.fps = 0.0               # 스트림 공칭 FPS
+        self._decode_ms_sum = 0.0
+        self._decode_ms_max = 0.0
+        self._decode_n = 0
+        self._last_pts_ms = -1.0
+
+    def add_decode(self, ms: float):
+        self._decode_ms_sum += ms
+        self._decode_n += 1
+        if ms > self._decode_ms_max:
+            self._decode_ms_max = ms
+
+    def add_pts(self, pts_ms: float):
+        """프레임 PTS(ms)로 손실 프레임 추정 — 공칭 간격의 1.5배 이상 벌어지면 손실로 계산"""
+        if pts_ms <= 0 or self.fps <= 0:
+            return
+        if self._last_pts_ms > 0:
+            interval = 1000.0 / self.fps
+            gap = pts_ms - self._last_pts_ms
+            if gap > interval * 1.5:
+                self.dropped_frames += int(round(gap / interval)) - 1
+        self._last_pts_ms = pts_ms
+
+    def snapshot(self) -> dict:
+        avg = self._decode_ms_sum / self._decode_n if self._decode_n else 0.0
+        return {
+            "frames": self.frames,
+            "read_failures": self.read_failures,
+            "dropped_frames": self.dropped_frames,
+            "reconnects": self.reconnects,
+            "bitrate_kbps": self.bitrate_kbps,
+            "fps": self.fps,
+            "decode_ms_avg": avg,
+            "decode_ms_max": self._decode_ms_max,
+        }
+
+    def reset_window(self):
+        """디코딩 시간 집계 구간 초기화 (주기 로그 후 호출)"""
+        self._decode_ms_sum = 0.0
+        self._decode_ms_max = 0.0
+        self._decode_n = 0
+
 
 class VideoCaptureThread(QThread):
     """OpenCV 영상 캡처를 별도 스레드에서 실행하는 클래스"""
@@ -18,34 +140,80 @@ class VideoCaptureThread(QThread):
     connected = Signal()           # 연결 성공
     disconnected = Signal()        # 연결 끊김
 
-    def __init__(self, port: int = 0, parent=None):
+    def __init__(self, port: int = 0, capture_size: tuple = DEFAULT_CAPTURE_SIZE, parent=None):
         super().__init__(parent)
         self._port = port
-        self._video_file: str = ""   # MP4 파일 경로 (비어있으면 포트 사용)
+        self._capture_size = tuple(capture_size)  # 캡처 카드 요청 해상도 (w, h)
+        self._video_file: str = ""   # MP4 파일 경로 (비어있으면 스트림/포트 사용)
+        self._stream_url: str = ""   # 네트워크 스트림 URL (비어있으면 포트 사용)
         self._reconnect = False      # 소스 변경 시 강제 재연결 플래그
         self._running = False
         self._mutex = QMutex()
         self._cap = None
         self._target_fps = 30
+        self._stats = StreamStats()
 
     def set_port(self, port: int):
         """캡처 포트(카메라 인덱스) 변경"""
         with QMutexLocker(self._mutex):
             self._port = port
             self._video_file = ""
+            self._stream_url = ""
             self._reconnect = True
 
     def set_video_file(self, path: str):
-        """영상 파일 소스 변경 (빈 문자열이면 포트 소스로 복귀)"""
+        """영상 파일 소스 변경 (빈 문자열이면 스트림/포트 소스로 복귀)"""
         with QMutexLocker(self._mutex):
             self._video_file = path
             self._reconnect = True
 
+    def set_stream_url(self, url: str):
+        """네트워크 스트림 소스 변경 (빈 문자열이면 포트 소스로 복귀)"""
+        with QMutexLocker(self._mutex):
+            self._stream_url = url.strip()
+            self._video_file = ""
+            self._reconnect = True
+
+    def set_capture_size(self, width: int, height: int):
+        """캡처 카드 요청 해상도 변경 (포트 소스일 때만 재연결)"""
+        with QMutexLocker(self._mutex):
+            if self._capture_size == (width, height):
+                return
+            self._capture_size = (width, height)
+            if not self._video_file and not self._stream_url:
+                self._reconnect = True
+
+    def get_stream_stats(self) -> dict:
+        """현재 스트림 통계 스냅샷 (스트림 소스가 아니면 빈 dict)"""
+        with QMutexLocker(self._mutex):
+            if not self._stream_url or self._video_file:
+                return {}
+            return self._stats.snapshot()
+
     def stop(self):
         """스레드 정지"""
         self._running = False
         self.wait(3000)
 
+    def _sleep_interruptible(self, seconds: float):
+        """정지/소스 변경 시 즉시 깨어나는 대기 (재연결 backoff용)"""
+        deadline = time.monotonic() + seconds
+        while self._running and not self._reconnect and time.monotonic() < deadline:
+            self.msleep(100)
+
+    def _open_stream(self, url: str):
+        """저지연 FFMPEG 옵션으로 네트워크 스트림 열기"""
+        params = [
+            cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, _STREAM_OPEN_TIMEOUT_MS,
+            cv2.CAP_PROP_READ_TIMEOUT_MSEC, _STREAM_READ_TIMEOUT_MS,
+        ]
+        n_threads = getattr(cv2, "CAP_PROP_N_THREADS", None)
+        if n_threads is not None:
+            params += [n_threads, os.cpu_count() or 1]
+        cap = _open_ffmpeg_capture(url, params, _STREAM_FFMPEG_OPTIONS)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+
     def run(self):
         """스레드 메인 루프: 프레임 읽기 및 신호 발송"""
         self._running = True
@@ -54,15 +222,21 @@ class VideoCaptureThread(QThread):
         consecutive_failures = 0
         frame_count = 0
         max_failures = 30  # 30프레임 연속 실패 시 재연결 시도
+        backoff = _RECONNECT_BACKOFF_MIN
+        last_stats_log = time.monotonic()
 
         while self._running:
             try:
                 with QMutexLocker(self._mutex):
                     current_port = self._port
                     current_file = self._video_file
+                    current_url = self._stream_url
+                    capture_w, capture_h = self._capture_size
                     reconnect = self._reconnect
                     if reconnect:
                         self._reconnect = False
+                        self._stats.reset()
+                is_stream = bool(current_url) and not current_file
 
                 # 소스 변경 시 현재 캡처 강제 종료
                 if reconnect and cap is not None:
@@ -74,16 +248,25 @@ class VideoCaptureThread(QThread):
                     was_connected = False
                     consecutive_failures = 0
                     frame_count = 0
+                if reconnect:
+                    backoff = _RECONNECT_BACKOFF_MIN
 
                 # 연결이 없는 경우 새 소스 열기
                 if cap is None:
-                    if current_file:
-                        cap = cv2.VideoCapture(current_file)
+                    if is_synthetic_source(current_file):
+                        # 합성 멀티뷰 테스트 소스 (파일 입력 자리에 synthetic://… 지정)
+                        cap = SyntheticCapture(current_file)
+                        source_name = f"합성 소스: {current_file}"
+                    elif current_file:
+                        cap = _open_ffmpeg_capture(current_file)   # 스트림 열기와 겹치지 않도록 잠금
                         source_name = f"파일: {current_file}"
+                    elif is_stream:
+                        cap = self._open_stream(current_url)
+                        source_name = f"스트림: {current_url}"
                     else:
                         cap = cv2.VideoCapture(current_port, cv2.CAP_DSHOW)
-                        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1920)
-                        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 1080)
+                        cap.set(cv2.CAP_PROP_FRAME_WIDTH, capture_w)
+                        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, capture_h)
                         cap.set(cv2.CAP_PROP_FPS, self._target_fps)
                         cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                         source_name = f"포트 {current_port}"
@@ -91,8 +274,16 @@ class VideoCaptureThread(QThread):
                     if cap.isOpened():
                         was_connected = True
                         consecutive_failures = 0
+                        backoff = _RECONNECT_BACKOFF_MIN
+                        if is_stream:
+                            with QMutexLocker(self._mutex):
+                                self._stats.fps = float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
                         self.connected.emit()
-                        self.status_changed.emit(f"{source_name} 연결 성공")
+                        # 실제 협상된 해상도 표시 (UHD 요청이 장치에서 거부된 경우 확인용)
+                        aw = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
+                        ah = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
+                        res = f" ({aw}×{ah})" if aw > 0 and ah > 0 else ""
+                        self.status_changed.emit(f"{source_name} 연결 성공{res}")
                     else:
                         if was_connected:
                             was_connected = False
@@ -103,14 +294,28 @@ class VideoCaptureThread(QThread):
                         except Exception:
                             pass
                         cap = None
-                        self.msleep(1000)
+                        if is_stream:
+                            # 스트림: 지수 backoff (1→2→4…→30초) — 송출 측 재시작 시 연결 폭주 방지
+                            _log.debug("스트림 연결 실패 — %.0f초 후 재시도 (%s)", backoff, current_url)
+                            self._sleep_interruptible(backoff)
+                            backoff = min(_RECONNECT_BACKOFF_MAX, backoff * 2)
+                        else:
+                            self.msleep(1000)
                         continue
 
                 # 프레임 읽기
+                t_read = time.perf_counter()
                 ret, frame = cap.read()
+                read_ms = (time.perf_counter() - t_read) * 1000.0
                 if ret and frame is not None and frame.size > 0:
                     consecutive_failures = 0
                     frame_count += 1
+                    if is_stream:
+                        with QMutexLocker(self._mutex):
+                            self._stats.frames += 1
+                            self._stats.add_decode(read_ms)
+                            self._stats.add_pts(float(cap.get(cv2.CAP_PROP_POS_MSEC) or 0.0))
+                            self._stats.bitrate_kbps = float(cap.get(cv2.CAP_PROP_BITRATE) or 0.0)
                     if frame_count % 500 == 0:
                         _log.debug(
                             "VIDEO-HB port=%s frames=%d fails=%d",
@@ -123,17 +328,41 @@ class VideoCaptureThread(QThread):
                         cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
                     else:
                         consecutive_failures += 1
-                        if consecutive_failures >= max_failures:
+                        if is_stream:
+                            with QMutexLocker(self._mutex):
+                                self._stats.read_failures += 1
+                        limit = _STREAM_MAX_FAILURES if is_stream else max_failures
+                        if consecutive_failures >= limit:
                             # 연결 끊김으로 판단
                             try:
                                 cap.release()
                             except Exception:
                                 pass
                             cap = None
+                            if is_stream:
+                                with QMutexLocker(self._mutex):
+                                    self._stats.reconnects += 1
                             if was_connected:
                                 was_connected = False
                                 self.disconnected.emit()
-                                self.status_changed.emit(f"포트 {current_port} 신호 없음")
+                                if is_stream:
+                                    self.status_changed.emit(f"스트림 {current_url} 신호 없음")
+                                else:
+                                    self.status_changed.emit(f"포트 {current_port} 신호 없음")
+
+                # 스트림 통계 주기 로그 (파일 전용)
+                if is_stream and time.monotonic() - last_stats_log >= _STATS_LOG_INTERVAL:
+                    last_stats_log = time.monotonic()
+                    with QMutexLocker(self._mutex):
+                        st = self._stats.snapshot()
+                        self._stats.reset_window()
+                    _log.info(
+                        "VIDEO-STREAM url=%s frames=%d bitrate=%.0fkbps fps=%.1f "
+                        "decode=%.1f/%.1fms(avg/max) dropped=%d read_fail=%d reconnects=%d",
+                        current_url, st["frames"], st["bitrate_kbps"], st["fps"],
+                        st["decode_ms_avg"], st["decode_ms_max"], st["dropped_frames"],
+                        st["read_failures"], st["reconnects"],
+                    )
 
             except Exception as e:
                 # 예외 발생 시 스레드 크래시 방지 — cap 상태 초기화 후 재연결 시도
@@ -151,8 +380,13 @@ class VideoCaptureThread(QThread):
                 self.msleep(1000)
                 continue
 
-            # FPS 제어 (대략 30fps)
-            self.msleep(33)
+            # FPS 제어 (대략 30fps) — 스트림은 read()가 수신 속도에 맞춰 블로킹하므로
+            # 추가 대기 시 디코더 버퍼에 프레임이 쌓여 지연이 누적됨 → 생략
+            if isinstance(cap, SyntheticCapture):
+                # 합성 소스: 지정 fps로 재생 (가상 시각이 실제 시각과 같게 흐름)
+                self.msleep(max(1, int(1000 / cap.source.fps)))
+            elif not is_stream:
+                self.msleep(33)
 
         # 정리
         if cap is not None:
@@ -0,0 +1,11 @@
+"""
+테스트 공통 설정
+패키지 루트가 없는 구조(core/ui/utils 최상위 import)이므로 kbs_monitor 폴더를 import 경로에 추가한다.
+실행: kbs_monitor 폴더에서 python -m pytest -q
+"""
+import os
+import sys
+
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _BASE_DIR not in sys.path:
+    sys.path.insert(0, _BASE_DIR)
@@ -0,0 +1,48 @@
+"""
+오프라인 분석(analyze.py) — 합성 소스 기본 이벤트 스크립트로 incident가 실제로 나오는지 확인
+"""
+import copy
+import datetime
+
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("numpy")
+pytest.importorskip("PySide6")
+
+from analyze import OfflineAnalyzer, run_analysis                 # noqa: E402
+from core.synthetic_source import SyntheticMultiview              # noqa: E402
+from utils.config_manager import DEFAULT_CONFIG                   # noqa: E402
+
+# 기본 이벤트(black:1@30-90, freeze:2@60-150, meter:3@30-90) — 작은 해상도로 1주기(180초) 분석
+SOURCE = "synthetic://2x2?size=640x360&fps=10"
+# 정파/정파준비 시간대(기본 새벽)와 겹치지 않는 시각을 파일 0초로 사용
+BASE_EPOCH = datetime.datetime(2026, 1, 7, 12, 0, 0).timestamp()
+
+
+def _config_for(source: str) -> dict:
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    video_rois, audio_rois = SyntheticMultiview.from_spec(source).tile_rois()
+    config["inputs"] = [{
+        "name": "IN1", "port": 0, "stream_url": source,
+        "rois": {
+            "video": [r.to_dict() for r in video_rois],
+            "audio": [r.to_dict() for r in audio_rois],
+        },
+    }]
+    return config
+
+
+def test_synthetic_default_events_produce_incidents():
+    analyzer = OfflineAnalyzer(_config_for(SOURCE), base_epoch=BASE_EPOCH)
+    stats = run_analysis(analyzer, SOURCE)
+    rows = analyzer.finish()
+
+    incidents = {(r["type"], r["label"]) for r in rows if r["event"] == "incident"}
+    assert stats["detections"] > 0
+    assert stats["incidents"] == len([r for r in rows if r["event"] == "incident"])
+    assert ("블랙", "V1") in incidents
+    assert ("스틸", "V2") in incidents
+    assert ("오디오", "A3") in incidents
+    # 이벤트가 없는 타일은 알림 없음
+    assert not any(label == "V4" for _kind, label in incidents)
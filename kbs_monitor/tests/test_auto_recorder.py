@@ -0,0 +1,44 @@
+"""
+자동 녹화기(core/auto_recorder.py) — 저장 폴더 고아 임시 파일 복구가 진행 중인 녹화를 건드리지 않는지 확인
+"""
+import os
+
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("numpy")
+
+from core.auto_recorder import AutoRecorder   # noqa: E402
+
+
+def _touch(path: str, data: bytes = b"\0" * 16):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_orphan_recovery_skips_active_job_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(AutoRecorder, "_ffmpeg_ok", False)        # 스트림 복사 없이 이름만 변경
+    monkeypatch.setattr(AutoRecorder, "_recovered_dirs", set())
+    save_dir = str(tmp_path)
+    live = os.path.join(save_dir, "20260101_120000_V1_블랙_1TV.mp4")
+    live_ptmp = live[:-4] + "_ptmp.mp4"
+    live_list = live[:-4] + "_ptmp_ctmp.txt"                      # 세그먼트 클립 추출 concat 목록
+    live_vtmp = live[:-4] + "_vtmp.mp4"
+    orphan_ptmp = os.path.join(save_dir, "20260101_110000_V2_스틸_2TV_ptmp.mp4")
+    orphan_list = os.path.join(save_dir, "20260101_110000_V2_스틸_2TV_ctmp.txt")
+    for path in (live_ptmp, live_list, live_vtmp, orphan_ptmp, orphan_list):
+        _touch(path)
+
+    job = AutoRecorder.scheduler.new_job("IN1", live, 0.0, 0.0, None)
+    try:
+        AutoRecorder._recover_orphan_files(save_dir)
+    finally:
+        AutoRecorder.scheduler.finish(job, False, "test")
+
+    assert os.path.exists(live_ptmp)
+    assert os.path.exists(live_list)
+    assert os.path.exists(live_vtmp)
+    assert not os.path.exists(live)
+    assert not os.path.exists(orphan_ptmp)
+    assert not os.path.exists(orphan_list)
+    assert os.path.exists(orphan_ptmp[:-len("_ptmp.mp4")] + ".mp4")
@@ -0,0 +1,130 @@
+"""
+알림 아웃박스(core/notification_outbox.py) — 재시작 후 순서 복원, 잘린 줄, 스냅샷 공유 참조 수,
+항목 수/용량/보관 시간 상한, 완료 표시 누적 후 재작성 확인
+"""
+import os
+
+import pytest
+
+from core import notification_outbox
+from core.notification_outbox import OUTBOX_FILE, NotificationOutbox
+
+
+def _item(label: str, ts: float = 1000.0) -> dict:
+    return {"ts": ts, "alarm_type": "블랙", "label": label, "media_name": "1TV", "is_recovery": False}
+
+
+def _labels(box: NotificationOutbox) -> list:
+    return [rec["label"] for rec in box.pending(1000)]
+
+
+def _jpgs(directory) -> list:
+    return sorted(n for n in os.listdir(directory) if n.endswith(".jpg"))
+
+
+def _line_count(directory) -> int:
+    with open(os.path.join(directory, OUTBOX_FILE), encoding="utf-8") as f:
+        return sum(1 for _ in f)
+
+
+@pytest.fixture
+def box(tmp_path):
+    b = NotificationOutbox(str(tmp_path))
+    b.open()
+    yield b
+    b.close()
+
+
+def test_reopen_restores_pending_in_order(tmp_path, box):
+    for label in ("V1", "V2", "V3", "V4"):
+        box.add(_item(label), b"jpeg-" + label.encode())
+    box.ack([box.pending(10)[1]["seq"]])       # V2 완료
+    box.close()
+
+    again = NotificationOutbox(str(tmp_path))
+    assert again.open() == 3
+    try:
+        assert _labels(again) == ["V1", "V3", "V4"]
+        assert again.load_jpeg(again.pending(1)[0]) == b"jpeg-V1"
+        assert len(_jpgs(tmp_path)) == 3      # 완료된 V2 스냅샷은 삭제
+        again.add(_item("V5"))
+        assert again.pending(10)[-1]["seq"] == 5   # 번호는 복원한 최대값 다음부터
+    finally:
+        again.close()
+
+
+def test_truncated_last_line_is_skipped(tmp_path, box):
+    box.add(_item("V1"))
+    box.add(_item("V2"))
+    box.close()
+    with open(os.path.join(tmp_path, OUTBOX_FILE), "a", encoding="utf-8") as f:
+        f.write('{"seq": 3, "ts": 1000.0, "alarm_type": "블')    # 기록 중 종료
+
+    again = NotificationOutbox(str(tmp_path))
+    assert again.open() == 2
+    try:
+        assert _labels(again) == ["V1", "V2"]
+        assert _line_count(tmp_path) == 2     # 열 때 재작성으로 잘린 줄 제거
+    finally:
+        again.close()
+
+
+def test_shared_sidecar_released_after_last_ack(tmp_path, box):
+    box.add(_item("V1"), b"same-frame")
+    box.add(_item("V2"), b"same-frame")
+    first, second = box.pending(10)
+    assert first["jpeg"] == second["jpeg"]
+    assert len(_jpgs(tmp_path)) == 1
+
+    box.ack([first["seq"]])
+    assert _jpgs(tmp_path) == [second["jpeg"]]
+    assert box.load_jpeg(second) == b"same-frame"
+    box.ack([second["seq"]])
+    assert _jpgs(tmp_path) == []
+
+
+def test_max_items_drops_oldest(box):
+    box.max_items = 3
+    dropped = [box.add(_item(f"V{i}")) for i in range(1, 6)]
+    assert dropped == [0, 0, 0, 1, 1]
+    assert _labels(box) == ["V3", "V4", "V5"]
+
+
+def test_max_bytes_drops_oldest_with_snapshot(tmp_path, box):
+    box.max_bytes = 250
+    box.add(_item("V1"), b"a" * 100)
+    box.add(_item("V2"), b"b" * 100)
+    assert box.add(_item("V3"), b"c" * 100) == 1
+    assert _labels(box) == ["V2", "V3"]
+    assert len(_jpgs(tmp_path)) == 2
+
+
+def test_expire_drops_items_past_max_age(box):
+    box.max_age = 60
+    box.add(_item("V1", ts=1000.0))
+    box.add(_item("V2", ts=1030.0))
+    box.add(_item("V3", ts=1090.0))
+    assert box.expire(now=1100.0) == 2
+    assert _labels(box) == ["V3"]
+
+
+def test_compaction_after_acks(tmp_path, box):
+    total = notification_outbox._COMPACT_ACKS + 5
+    for i in range(total):
+        box.add(_item(f"V{i}"))
+    seqs = [rec["seq"] for rec in box.pending(total)]
+
+    box.ack(seqs[:notification_outbox._COMPACT_ACKS - 1])
+    assert _line_count(tmp_path) == total + notification_outbox._COMPACT_ACKS - 1
+    box.ack([seqs[notification_outbox._COMPACT_ACKS - 1]])    # 누적 완료 표시가 기준에 도달
+    assert _line_count(tmp_path) == 5
+    assert len(box) == 5
+
+    box.add(_item("after"))                  # 재작성 후에도 추가 쓰기 계속
+    box.close()
+    again = NotificationOutbox(str(tmp_path))
+    try:
+        assert again.open() == 6
+        assert _labels(again)[-1] == "after"
+    finally:
+        again.close()
@@ -0,0 +1,212 @@
+"""
+알림 분배기(core/notifier_hub.py) — 로컬 루프백 서버로 sink별 전송과 동시 수/시간 제한/폐기 확인
+"""
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.notifier_hub import SINK_TYPES, AlarmEvent, NotifierHub, NotifierSink
+
+
+def _wait_until(cond, timeout: float = 3.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if cond():
+            return True
+        time.sleep(0.02)
+    return cond()
+
+
+@pytest.fixture
+def hub():
+    h = NotifierHub()
+    yield h
+    h.stop()
+
+
+@pytest.fixture
+def http_server():
+    """POST 본문을 기록하는 로컬 HTTP 서버. 반환: (포트, 수신 목록, 응답 코드 설정 dict)"""
+    received = []
+    reply = {"status": 200}
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append((self.path, self.headers.get("X-Token"), json.loads(body)))
+            self.send_response(reply["status"])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_port, received, reply
+    server.shutdown()
+    server.server_close()
+
+
+class _BlockingSink(NotifierSink):
+    """전송마다 delay초를 붙잡는 sink — 동시 수/시간 제한/대기 상한 확인용"""
+
+    kind = "blocking"
+
+    def __init__(self, name: str, cfg: dict):
+        super().__init__(name, cfg)
+        self.delay = float(cfg.get("delay", 0))
+        self.active = 0
+        self.peak = 0
+
+    async def send(self, event: AlarmEvent):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+
+
+def test_webhook_posts_event_json(hub, http_server):
+    port, received, _reply = http_server
+    hub.configure({"webhook": {
+        "enabled": True, "url": f"http://127.0.0.1:{port}/hook?src=kbs", "headers": {"X-Token": "t1"},
+    }})
+    hub.start()
+    hub.publish(AlarmEvent("블랙", "V1", "1TV"))
+    hub.publish(AlarmEvent("블랙", "V1", "1TV", is_recovery=True))
+
+    assert _wait_until(lambda: len(received) == 2)
+    # sink 동시 전송 — 도착 순서는 보장되지 않으므로 복구 여부로 정렬
+    received.sort(key=lambda r: r[2]["recovery"])
+    path, token, body = received[0]
+    assert path == "/hook?src=kbs"
+    assert token == "t1"
+    assert body["alarm_type"] == "블랙"
+    assert body["label"] == "V1"
+    assert body["media_name"] == "1TV"
+    assert body["recovery"] is False
+    assert received[1][2]["recovery"] is True
+    assert _wait_until(lambda: hub.get_stats()["webhook"]["sent"] == 2)
+    assert hub.get_stats()["webhook"]["p50"] is not None
+
+
+def test_webhook_non_2xx_counts_as_failure(hub, http_server):
+    port, received, reply = http_server
+    reply["status"] = 500
+    hub.configure({"webhook": {"enabled": True, "url": f"http://127.0.0.1:{port}/"}})
+    hub.start()
+    hub.publish(AlarmEvent("스틸", "V2"))
+
+    assert _wait_until(lambda: hub.get_stats()["webhook"]["failed"] == 1)
+    stats = hub.get_stats()["webhook"]
+    assert stats["sent"] == 0
+    assert "HTTP 500" in stats["last_error"]
+
+
+def test_syslog_sends_rfc5424_datagram(hub):
+    udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    udp.bind(("127.0.0.1", 0))
+    udp.settimeout(3.0)
+    try:
+        hub.configure({"syslog": {"enabled": True, "host": "127.0.0.1", "port": udp.getsockname()[1]}})
+        hub.start()
+        hub.publish(AlarmEvent("오디오", "A3", "FM"))
+        alarm = udp.recv(2048).decode("utf-8")
+        hub.publish(AlarmEvent("오디오", "A3", "FM", is_recovery=True))
+        recovery = udp.recv(2048).decode("utf-8")
+    finally:
+        udp.close()
+    # local0(16) × 8 + warning(4) / notice(5)
+    assert alarm.startswith("<132>1 ")
+    assert " kbs_monitor - - - " in alarm
+    assert alarm.endswith("[알림] 오디오 A3 (FM)")
+    assert recovery.startswith("<133>1 ")
+    assert recovery.endswith("[복구] 오디오 A3 (FM)")
+
+
+def test_file_drop_writes_json_for_selected_types(hub, tmp_path):
+    directory = str(tmp_path / "drop")
+    hub.configure({"file_drop": {
+        "enabled": True, "directory": directory, "types": ["블랙"], "recoveries": False,
+    }})
+    hub.start()
+    hub.publish(AlarmEvent("블랙", "IN2-V1", "2TV"))
+    hub.publish(AlarmEvent("스틸", "V2"))                          # 종류 필터로 제외
+    hub.publish(AlarmEvent("블랙", "IN2-V1", is_recovery=True))    # 복구 제외
+
+    assert _wait_until(lambda: hub.get_stats()["file_drop"]["sent"] == 1)
+    time.sleep(0.1)
+    names = os.listdir(directory)
+    assert len(names) == 1
+    assert names[0].endswith("_블랙_IN2-V1_alarm.json")
+    with open(os.path.join(directory, names[0]), encoding="utf-8") as f:
+        body = json.load(f)
+    assert body["label"] == "IN2-V1"
+    assert body["media_name"] == "2TV"
+
+
+def test_concurrency_and_timeout_limits(hub, monkeypatch):
+    monkeypatch.setitem(SINK_TYPES, _BlockingSink.kind, _BlockingSink)
+    hub.configure({"blocking": {
+        "enabled": True, "delay": 0.5, "timeout": 0.2, "concurrency": 1, "max_pending": 10,
+    }})
+    hub.start()
+    for i in range(3):
+        hub.publish(AlarmEvent("블랙", f"V{i + 1}"))
+
+    assert _wait_until(lambda: hub.get_stats()["blocking"]["timeouts"] == 3)
+    stats = hub.get_stats()["blocking"]
+    assert stats["sent"] == 0
+    assert stats["pending"] == 0
+    assert hub._states["blocking"].sink.peak == 1
+
+
+def test_max_pending_drops_excess_events(hub, monkeypatch):
+    monkeypatch.setitem(SINK_TYPES, _BlockingSink.kind, _BlockingSink)
+    hub.configure({"blocking": {
+        "enabled": True, "delay": 0.3, "timeout": 5, "concurrency": 1, "max_pending": 2,
+    }})
+    hub.start()
+    for i in range(5):
+        hub.publish(AlarmEvent("블랙", f"V{i + 1}"))
+
+    assert _wait_until(lambda: hub.get_stats()["blocking"]["sent"] == 2)
+    stats = hub.get_stats()["blocking"]
+    assert stats["dropped"] == 3
+    assert stats["pending"] == 0
+
+
+def test_configure_keeps_unchanged_sinks(hub, tmp_path, monkeypatch):
+    monkeypatch.setitem(SINK_TYPES, _BlockingSink.kind, _BlockingSink)
+    cfg = {
+        "blocking": {"enabled": True, "delay": 0},
+        "file_drop": {"enabled": True, "directory": str(tmp_path)},
+    }
+    hub.configure(cfg)
+    hub.start()
+    hub.publish(AlarmEvent("블랙", "V1"))
+    assert _wait_until(lambda: hub.get_stats()["file_drop"]["sent"] == 1)
+    assert _wait_until(lambda: hub.get_stats()["blocking"]["sent"] == 1)
+    state = hub._states["blocking"]
+    drop_sink = hub._states["file_drop"].sink
+
+    # 같은 설정으로 다시 적용 — sink/상태 유지 (지연 표본 보존)
+    hub.configure(json.loads(json.dumps(cfg)))
+    time.sleep(0.2)
+    assert hub._states["blocking"] is state
+    assert hub.get_stats()["blocking"]["p50"] is not None
+
+    # file_drop만 변경 — blocking은 그대로, file_drop은 새 sink로 교체되고 통계는 이어서 누적
+    cfg["file_drop"] = {"enabled": True, "directory": str(tmp_path / "other")}
+    hub.configure(cfg)
+    assert _wait_until(lambda: hub._states["file_drop"].sink is not drop_sink)
+    assert hub._states["blocking"] is state
+    assert hub.get_stats()["file_drop"]["sent"] == 1
@@ -0,0 +1,148 @@
+"""
+텔레그램 알림(core/telegram_notifier.py) — api_base를 로컬 Bot API 대역 서버로 돌려
+묶음 요약(심각도 순), sendMediaGroup 10장 제한, 429 retry_after 대기를 확인한다.
+"""
+import json
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("requests")
+
+from core.telegram_notifier import TelegramNotifier   # noqa: E402
+
+
+def _wait_until(cond, timeout: float = 10.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if cond():
+            return True
+        time.sleep(0.05)
+    return cond()
+
+
+def _form_fields(content_type: str, body: bytes) -> dict:
+    """multipart/form-data → {이름: 값(텍스트) 또는 바이트(파일)}"""
+    msg = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+    )
+    fields = {}
+    for part in msg.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        payload = part.get_payload(decode=True)
+        fields[name] = payload if part.get_filename() else payload.decode("utf-8")
+    return fields
+
+
+@pytest.fixture
+def bot_api():
+    """Bot API 대역 서버. 반환: (api_base, 호출 목록 [(시각, 메서드, 본문 dict)], 429 응답 설정 dict)"""
+    calls = []
+    limit = {"sendMessage": 0, "retry_after": 1}
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            method = self.path.rsplit("/", 1)[-1]
+            ctype = self.headers.get("Content-Type", "")
+            fields = json.loads(body) if ctype.startswith("application/json") else _form_fields(ctype, body)
+            calls.append((time.time(), method, fields))
+            if limit.get(method):
+                limit[method] -= 1
+                self._reply(429, {"ok": False, "error_code": 429,
+                                  "parameters": {"retry_after": limit["retry_after"]}})
+                return
+            self._reply(200, {"ok": True, "result": {}})
+
+        def _reply(self, status: int, obj: dict):
+            data = json.dumps(obj).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", calls, limit
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def notifier(tmp_path):
+    tg = TelegramNotifier(outbox_dir=str(tmp_path / "outbox"))
+    yield tg
+    tg.stop()
+
+
+def _frame(value: int):
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+def _configure(tg: TelegramNotifier, api_base: str, batch_seconds: float):
+    tg.configure(True, "TOKEN", "42", True, 0, api_base=api_base, batch_seconds=batch_seconds)
+
+
+def test_batch_summary_media_group_and_429_wait(notifier, bot_api):
+    api_base, calls, limit = bot_api
+    limit["sendMessage"] = 1              # 첫 요약 전송은 429 (retry_after 1초)
+    _configure(notifier, api_base, batch_seconds=1.0)
+    notifier.start()
+
+    for i in range(11):
+        notifier.notify("스틸", f"V{i + 1}", f"CH{i + 1}", _frame(10 + i))
+    notifier.notify("블랙", "V20", "KBS1", _frame(200))
+    notifier.notify("오디오", "A1", "", is_recovery=True)
+    notifier.notify("오디오", "A2", "", is_recovery=True)
+
+    assert _wait_until(lambda: any(m == "sendMediaGroup" for _t, m, _f in calls))
+    messages = [(t, f) for t, m, f in calls if m == "sendMessage"]
+    assert len(messages) == 2                          # 429 1회 + 재시도 성공
+    assert messages[1][0] - messages[0][0] >= 0.9      # retry_after 이상 대기
+
+    text = messages[1][1]["text"]
+    assert messages[1][1]["chat_id"] == "42"
+    assert "알림 12건" in text and "복구 2건" in text
+    lines = text.splitlines()
+    black = next(i for i, line in enumerate(lines) if "블랙 (1)" in line)
+    still = next(i for i, line in enumerate(lines) if "스틸 (11)" in line)
+    assert black < still                               # 심각도 순 (블랙 > 스틸)
+    assert "KBS1" in lines[black]
+    assert any("오디오 정상 (2)" in line and "A1" in line and "A2" in line for line in lines)
+
+    group = next(f for _t, m, f in calls if m == "sendMediaGroup")
+    media = json.loads(group["media"])
+    assert len(media) == 10                            # Bot API 앨범 상한
+    assert media[0]["caption"].startswith("블랙")
+    assert all(item["media"] in (f"attach://{k}" for k in group) for item in media)
+    assert all(isinstance(group[f"photo{n}"], bytes) for n in range(10))
+
+    assert _wait_until(lambda: notifier.get_stats()["outbox"] == 0)
+    stats = notifier.get_stats()
+    assert stats["sent"] == 14
+    assert stats["retries"] == 1
+
+
+def test_single_alarm_sends_photo_with_caption(notifier, bot_api):
+    api_base, calls, _limit = bot_api
+    _configure(notifier, api_base, batch_seconds=0.2)
+    notifier.start()
+    notifier.notify("블랙", "V1", "KBS1", _frame(50))
+
+    assert _wait_until(lambda: any(m == "sendPhoto" for _t, m, _f in calls))
+    fields = next(f for _t, m, f in calls if m == "sendPhoto")
+    assert fields["chat_id"] == "42"
+    assert "감지: 블랙" in fields["caption"]
+    assert "V1 (KBS1)" in fields["caption"]
+    assert fields["photo"][:2] == b"\xff\xd8"          # JPEG
+    assert not any(m == "sendMessage" for _t, m, _f in calls)
@@ -0,0 +1,82 @@
+"""
+네트워크 스트림 입력(core/video_capture.py) — 로컬 ffmpeg가 testsrc를 udp://127.0.0.1 MPEG-TS로 송출
+수신 통계, 송출 중단 후 재연결, 스트림 옵션 환경변수 복원을 확인한다.
+"""
+import os
+import shutil
+import socket
+import subprocess
+import time
+
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("numpy")
+pytest.importorskip("PySide6")
+
+from core.video_capture import VideoCaptureThread, _FFMPEG_OPTIONS_ENV   # noqa: E402
+
+FFMPEG = shutil.which("ffmpeg")
+pytestmark = pytest.mark.skipif(FFMPEG is None, reason="ffmpeg 없음")
+
+
+def _free_udp_port() -> int:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def _start_sender(port: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [FFMPEG, "-hide_banner", "-loglevel", "error", "-re",
+         "-f", "lavfi", "-i", "testsrc=size=320x240:rate=25",
+         "-c:v", "mpeg2video", "-g", "10", "-f", "mpegts", f"udp://127.0.0.1:{port}?pkt_size=1316"],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def _stop_sender(proc: subprocess.Popen):
+    proc.kill()
+    proc.wait(timeout=5)
+
+
+def _wait_until(cond, timeout: float) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if cond():
+            return True
+        time.sleep(0.1)
+    return cond()
+
+
+def test_udp_stream_stats_and_reconnect():
+    port = _free_udp_port()
+    env_before = os.environ.get(_FFMPEG_OPTIONS_ENV)
+    sender = _start_sender(port)
+    thread = VideoCaptureThread()
+    thread.set_stream_url(f"udp://127.0.0.1:{port}")
+    thread.start()
+    try:
+        assert _wait_until(lambda: thread.get_stream_stats().get("frames", 0) >= 25, 20.0)
+        stats = thread.get_stream_stats()
+        assert stats["reconnects"] == 0
+        assert stats["decode_ms_avg"] > 0
+        assert stats["fps"] > 0
+        # 스트림 저지연 옵션은 열기 동안에만 적용 — 이후 파일/다른 입력 열기에 남지 않음
+        assert os.environ.get(_FFMPEG_OPTIONS_ENV) == env_before
+
+        # 송출 중단 → read 시간 초과 누적으로 끊김 판단 후 재연결
+        _stop_sender(sender)
+        assert _wait_until(lambda: thread.get_stream_stats()["reconnects"] >= 1, 30.0)
+        assert thread.get_stream_stats()["read_failures"] >= 1
+
+        # 송출 재개 → 같은 스레드가 다시 연결해 수신 계속
+        frames = thread.get_stream_stats()["frames"]
+        sender = _start_sender(port)
+        assert _wait_until(lambda: thread.get_stream_stats()["frames"] >= frames + 25, 40.0)
+    finally:
+        thread.stop()
+        if sender.poll() is None:
+            _stop_sender(sender)
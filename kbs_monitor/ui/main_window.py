@@ -10,6 +10,8 @@ import subprocess
 import sys
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import Optional
 
 _log = logging.getLogger("kbs_monitor")
@@ -29,14 +31,16 @@ from ui.log_widget import LogWidget
 from ui.settings_dialog import SettingsDialog
 from ui.roi_editor import ROIEditorCanvas
 from core.video_capture import VideoCaptureThread
+from core.synthetic_source import is_synthetic_source
 from core.audio_monitor import AudioMonitorThread
-from core.roi_manager import ROIManager
-from core.detector import Detector
+from core.input_channel import InputChannel
+from core.auto_recorder import AutoRecorder
+from core.frame_pyramid import FramePyramid, get_stats as get_pyramid_stats
 from core.alarm import AlarmSystem
 from core.telegram_notifier import TelegramNotifier
-from core.auto_recorder import AutoRecorder
+from core.notifier_hub import AlarmEvent, NotifierHub, TelegramSink
 from core.signoff_manager import SignoffManager, SignoffState
-from utils.config_manager import ConfigManager, DEFAULT_CONFIG
+from utils.config_manager import ConfigManager, DEFAULT_CONFIG, migrate_inputs
 from utils.logger import AppLogger
 
 
@@ -54,9 +58,18 @@ class MainWindow(QMainWindow):
         # 핵심 컴포넌트 초기화
         self._config_manager = ConfigManager()
         self._config = self._config_manager.load()
-        self._roi_manager = ROIManager()
-        self._roi_manager.from_dict(self._config.get("rois", {}))
-        self._detector = Detector()
+        # 입력 채널 목록 (입력별 캡처 소스 + ROI 세트 + 감지기 + 녹화기)
+        # 화면 표시/ROI 편집 대상은 _active_input_idx 입력, 정파·임베디드 오디오는 입력 1 기준
+        self._inputs: list = [
+            InputChannel.from_dict(i, d)
+            for i, d in enumerate(migrate_inputs(self._config))
+        ]
+        self._active_input_idx: int = 0
+        # 입력별 감지를 CPU 코어에 분산 (numpy/OpenCV 연산은 GIL 해제)
+        self._detect_pool = ThreadPoolExecutor(
+            max_workers=max(1, min(len(self._inputs), os.cpu_count() or 1)),
+            thread_name_prefix="DetectWorker",
+        )
         self._apply_detection_config(self._config.get("detection", {}))
         # 성능 설정 (감지 항목별 활성화 플래그 초기값)
         self._audio_detect_enabled = True
@@ -67,10 +80,14 @@ class MainWindow(QMainWindow):
         self._apply_alarm_config(self._config.get("alarm", {}))
         self._telegram = TelegramNotifier()
         self._apply_telegram_config(self._config.get("telegram", {}))
-        self._telegram.start()
-        self._recorder = AutoRecorder()
+        # 알림 분배기: 감지 루프는 알림 1건당 이벤트 1개만 넣고, 텔레그램/웹훅/syslog/파일 드롭으로 분배
+        self._notifier_hub = NotifierHub()
+        self._notifier_hub.add_sink(TelegramSink(self._telegram))
+        self._notifier_hub.configure(self._config.get("notifiers", {}))
+        self._notifier_hub.start()
         self._apply_recording_config(self._config.get("recording", {}))
-        self._recorder.start()
+        for ch in self._inputs:
+            ch.recorder.start()
         self._logger = AppLogger()
         self._alarm.set_logger(self._logger)  # 로그 위젯에 알림음 재생 상태 출력
 
@@ -115,8 +132,11 @@ class MainWindow(QMainWindow):
         self._last_detection_time: float = time.time()
         self._health_alarm_logged: bool = False
 
-        # 현재 연결 중인 캡처 포트 (connected 시점에 고정 — 포트 변경 타이밍 혼동 방지)
-        self._active_capture_port: int = self._config.get("port", 0)
+        # 화면 표시 fps 계산용 직전 카운터 (수신 수, 표시 수, 시각)
+        self._display_fps_prev: tuple = (0, 0, time.time())
+
+        # 입력별 현재 연결 중인 캡처 포트 (connected 시점에 고정 — 포트 변경 타이밍 혼동 방지)
+        self._active_capture_ports: dict = {ch.index: ch.port for ch in self._inputs}
 
         # UI 구성
         self._setup_ui()
@@ -161,6 +181,82 @@ class MainWindow(QMainWindow):
                 self._restart_done_slots.add(f"{today}_{restarted_time}")
 
         self._logger.info("SYSTEM - 프로그램 시작")
+        if len(self._inputs) > 1:
+            names = ", ".join(ch.name for ch in self._inputs)
+            self._logger.info(f"SYSTEM - 다중 입력 {len(self._inputs)}개: {names}")
+
+    # ── 입력 채널 ──────────────────────────────────────
+
+    @property
+    def _active_input(self) -> InputChannel:
+        """화면 표시 / ROI 편집 대상 입력"""
+        return self._inputs[self._active_input_idx]
+
+    @property
+    def _roi_manager(self):
+        """표시 중인 입력의 ROI 세트 (ROI 편집기·설정창·비디오 위젯 공용)"""
+        return self._active_input.roi_manager
+
+    @property
+    def _detector(self):
+        """입력 1 감지기 — 감지 파라미터는 전 입력 공통, 임베디드 오디오 상태는 입력 1에만 유지"""
+        return self._inputs[0].detector
+
+    @property
+    def _latest_frame(self):
+        """표시 중인 입력의 최신 프레임"""
+        return self._active_input.latest_frame
+
+    def _input_of(self, thread) -> Optional[InputChannel]:
+        """시그널 발신 캡처 스레드 → 입력 채널"""
+        for ch in self._inputs:
+            if ch.capture_thread is thread:
+                return ch
+        return None
+
+    def _input_prefix(self, ch: InputChannel) -> str:
+        """다중 입력일 때만 로그 앞에 입력명 표시"""
+        return f"[{ch.name}] " if len(self._inputs) > 1 else ""
+
+    def _on_active_input_changed(self, index: int):
+        """표시/편집 대상 입력 전환 (설정창 입력 선택 또는 Ctrl+숫자)"""
+        if index == self._active_input_idx or not (0 <= index < len(self._inputs)):
+            return
+        if self._roi_overlay is not None:
+            self._finish_halfscreen_edit()
+        # 이전 입력의 알림 표시 해제 — 다음 감지 주기에 새 입력 기준으로 다시 설정됨
+        for roi in chain(self._roi_manager.video_rois, self._roi_manager.audio_rois):
+            self._video_widget.set_alert_state(roi.label, False)
+        self._active_input_idx = index
+        ch = self._active_input
+        if ch.latest_frame is not None:
+            self._video_widget.update_frame(ch.latest_frame, ch.latest_pyramid)
+        else:
+            self._video_widget.clear_signal()
+        self._video_widget.set_rois(ch.roi_manager.video_rois, ch.roi_manager.audio_rois)
+        if self._settings_dialog:
+            self._settings_dialog.set_active_input(index, ch.roi_manager, ch.port, ch.stream_url)
+        self._logger.info(f"SYSTEM - 표시 입력 전환: {ch.name}")
+
+    def _store_inputs_to_config(self):
+        """입력 목록을 config에 기록 (입력 1은 단일 입력 키에도 기록 — 구버전 호환)"""
+        primary = self._inputs[0]
+        self._config["inputs"] = [ch.to_dict() for ch in self._inputs]
+        self._config["rois"] = primary.roi_manager.to_dict()
+        self._config["port"] = primary.port
+        self._config["stream_url"] = primary.stream_url
+
+    def _apply_inputs_config(self, config: dict):
+        """불러온/초기화된 config의 입력별 ROI 세트 적용 (입력 개수 변경은 재시작 후 반영)"""
+        inputs_cfg = migrate_inputs(config)
+        for ch, d in zip(self._inputs, inputs_cfg):
+            ch.roi_manager.from_dict(d.get("rois", {}))
+            ch.detector.reset_all()
+        if len(inputs_cfg) != len(self._inputs):
+            self._logger.warning(
+                f"SYSTEM - 입력 개수 변경({len(self._inputs)}→{len(inputs_cfg)})은 "
+                f"프로그램 재시작 후 적용됩니다"
+            )
 
     # ── UI 구성 ────────────────────────────────────────
 
@@ -181,6 +277,7 @@ class MainWindow(QMainWindow):
 
         self._video_widget = VideoWidget()
         self._video_widget.setObjectName("videoArea")
+        self._video_widget.set_display_fps(self._config.get("performance", {}).get("display_fps", 30))
         self._splitter.addWidget(self._video_widget)
 
         self._log_widget = LogWidget()
@@ -214,21 +311,26 @@ class MainWindow(QMainWindow):
 
         # 텔레그램 로거 주입 (전송 성공은 파일에만, 오류는 UI에도 표시)
         self._telegram.set_logger(self._logger.file_only, self._logger.error)
+        self._telegram.start()   # 로거 주입 후 시작 — 워커의 아웃박스 복원 로그가 빠지지 않도록
         self._telegram_test_done.connect(self._on_telegram_test_done)
 
     # ── 스레드 시작 ────────────────────────────────────
 
     def _start_threads(self):
-        port = self._config.get("port", 0)
-
-        self._capture_thread = VideoCaptureThread(port=port)
-        self._capture_thread.frame_ready.connect(self._on_frame_ready)
-        self._capture_thread.connected.connect(self._on_capture_connected)
-        self._capture_thread.disconnected.connect(self._on_capture_disconnected)
-        self._capture_thread.status_changed.connect(
-            lambda msg: self._logger.info(f"SYSTEM - {msg}")
+        capture_size = (
+            int(self._config.get("capture_width", 1920)),
+            int(self._config.get("capture_height", 1080)),
         )
-        self._capture_thread.start()
+        for ch in self._inputs:
+            capture_thread = VideoCaptureThread(port=ch.port, capture_size=capture_size)
+            if ch.stream_url:
+                capture_thread.set_stream_url(ch.stream_url)
+            capture_thread.frame_ready.connect(self._on_frame_ready)
+            capture_thread.connected.connect(self._on_capture_connected)
+            capture_thread.disconnected.connect(self._on_capture_disconnected)
+            capture_thread.status_changed.connect(self._on_capture_status)
+            ch.capture_thread = capture_thread
+            capture_thread.start()
 
         self._audio_thread = AudioMonitorThread()
         self._audio_thread.level_updated.connect(self._top_bar.update_audio_levels)
@@ -239,7 +341,7 @@ class MainWindow(QMainWindow):
         )
         # 녹화용 raw 오디오 → AutoRecorder (DirectConnection: 이벤트 루프 우회, 스레드 안전)
         self._audio_thread.audio_chunk.connect(
-            lambda tup: self._recorder.push_audio(tup[0], tup[1]),
+            self._on_audio_chunk,
             Qt.DirectConnection,
         )
         # 초기 볼륨을 패스스루 출력에도 적용
@@ -263,28 +365,53 @@ class MainWindow(QMainWindow):
         self._restart_timer.timeout.connect(self._check_scheduled_restart)
         self._restart_timer.start()
 
-        self._latest_frame = None
-
     # ── 캡처 스레드 슬롯 ────────────────────────────────
 
     def _on_capture_connected(self):
         """캡처 스레드 연결 성공 — 연결 시점의 포트 번호를 고정 기록"""
-        self._active_capture_port = self._config.get("port", 0)
+        ch = self._input_of(self.sender()) or self._inputs[0]
+        self._active_capture_ports[ch.index] = ch.port
 
     def _on_capture_disconnected(self):
-        """캡처 스레드 연결 끊김 — 연결 당시 포트 번호로 오류 로그"""
-        self._logger.error(f"SYSTEM - 포트 {self._active_capture_port} 연결 실패")
+        """캡처 스레드 연결 끊김 — 연결 당시 포트 번호(스트림이면 URL)로 오류 로그"""
+        ch = self._input_of(self.sender()) or self._inputs[0]
+        prefix = self._input_prefix(ch)
+        if ch.stream_url:
+            self._logger.error(f"SYSTEM - {prefix}스트림 {ch.stream_url} 연결 끊김 (자동 재연결 대기)")
+        else:
+            port = self._active_capture_ports.get(ch.index, ch.port)
+            self._logger.error(f"SYSTEM - {prefix}포트 {port} 연결 실패")
+
+    def _on_capture_status(self, msg: str):
+        ch = self._input_of(self.sender()) or self._inputs[0]
+        self._logger.info(f"SYSTEM - {self._input_prefix(ch)}{msg}")
+
+    def _on_audio_chunk(self, tup):
+        """녹화용 raw 오디오 → 전 입력 AutoRecorder (오디오 스레드에서 직접 호출)"""
+        for ch in self._inputs:
+            ch.recorder.push_audio(tup[0], tup[1])
 
     # ── 프레임/감지 ────────────────────────────────────
 
     def _on_frame_ready(self, frame):
-        self._latest_frame = frame.copy()  # 캡처 스레드 버퍼 공유 방지
-        if self._roi_overlay is None:
-            self._video_widget.update_frame(frame)
-        self._recorder.push_frame(frame)
+        ch = self._input_of(self.sender()) or self._inputs[0]
+        # cap.read()는 매 호출 새 배열을 반환하고 하위 소비자(감지/표시/녹화)는 원본을 수정하지 않으므로
+        # 복사 생략 (UHD 프레임 1장 ≈ 24MB — 30fps 복사 시 GUI 스레드 부하 큼)
+        prev = ch.latest_frame
+        if prev is None or prev.shape != frame.shape:
+            h, w = frame.shape[:2]
+            ch.roi_manager.set_frame_size(w, h)
+            self._logger.info(f"SYSTEM - {self._input_prefix(ch)}입력 해상도 {w}×{h}")
+        # 프레임별 해상도 피라미드: 감지/표시/녹화가 같은 크기 축소본을 1회만 만들어 공유
+        pyramid = FramePyramid(frame)
+        ch.latest_frame = frame
+        ch.latest_pyramid = pyramid
+        if ch.index == self._active_input_idx and self._roi_overlay is None:
+            self._video_widget.update_frame(frame, pyramid)
+        ch.recorder.push_frame(frame, pyramid)
 
     def _run_detection(self):
-        if self._latest_frame is None:
+        if all(ch.latest_frame is None for ch in self._inputs):
             return
         if self._roi_overlay is not None:
             return  # 편집 중 감지 중단
@@ -337,8 +464,13 @@ class MainWindow(QMainWindow):
 
             # ── DIAG-V ──────────────────────────────────────────────────────────────
             try:
-                for lbl, raw in self._detector._last_raw.items():
-                    still_state = self._detector._still_states.get(lbl)
+                diag_items = [
+                    (ch, lbl, raw)
+                    for ch in self._inputs
+                    for lbl, raw in ch.detector._last_raw.items()
+                ]
+                for ch, lbl, raw in diag_items:
+                    still_state = ch.detector._still_states.get(lbl)
                     dark_r = raw.get("dark_ratio", -1.0)
                     changed_r = raw.get("changed_ratio", -1.0)
                     still_timer = still_state.alert_duration if still_state else 0.0
@@ -357,7 +489,7 @@ class MainWindow(QMainWindow):
                     _log.info(
                         "DIAG - %s: black=%.1f%%[기준%.0f%%] still_timer=%.1fs[기준%.0fs]%s %s"
                         " [%s/resolve=%d/start=%s]",
-                        lbl, dark_r, self._detector.black_dark_ratio,
+                        ch.qualify(lbl), dark_r, self._detector.black_dark_ratio,
                         still_timer, self._detector.still_duration,
                         changed_str, reset_ago_str,
                         alerting_str, resolve_cnt, "Y" if has_start else "N",
@@ -409,10 +541,91 @@ class MainWindow(QMainWindow):
                 else:
                     _log.error("DIAG-ALARM 오류 반복 (감지 계속): %s", _e)
 
+            # ── DIAG-RENDER ─────────────────────────────────────────────────────────
+            try:
+                rs = self._video_widget.get_render_stats(reset=True)
+                last = rs["last"]
+                ps = get_pyramid_stats(reset=True)     # 감지/표시/녹화 공유 축소본 (전 입력 합계)
+                _log.info(
+                    "DIAG-RENDER - %d회 평균 %.1fms 최대 %.1fms 오버레이재생성=%d 프레임 표시/수신=%d/%d "
+                    "(직전: 축소 %.1f / 오버레이 %.1f / 표시 %.1fms) 피라미드 리사이즈=%d 재사용=%d",
+                    rs["count"], rs["avg_ms"], rs["max_ms"], rs["overlay_rebuilds"],
+                    rs["frames_rendered"], rs["frames_received"],
+                    last.get("resize_ms", 0.0), last.get("overlay_ms", 0.0), last.get("display_ms", 0.0),
+                    ps["resizes"], ps["reused"],
+                )
+                self._diag_last_errors.pop("DIAG-RENDER", None)
+            except Exception as _e:
+                _etype = type(_e).__name__
+                if _etype != self._diag_last_errors.get("DIAG-RENDER"):
+                    self._diag_last_errors["DIAG-RENDER"] = _etype
+                    try:
+                        _log.error("DIAG-RENDER 오류 (감지 계속): %s\n%s",
+                                   _e, traceback.format_exc())
+                    except Exception as _log_e:
+                        try:
+                            print(f"[FATAL] DIAG-RENDER 로깅 실패: {_e} / {_log_e}",
+                                  file=sys.stderr, flush=True)
+                        except Exception:
+                            pass
+                else:
+                    _log.error("DIAG-RENDER 오류 반복 (감지 계속): %s", _e)
+
+            # ── DIAG-REC ───────────────────────────────────────────────────────────
+            try:
+                for ch in self._inputs:
+                    if not ch.recorder.enabled:
+                        continue
+                    es = ch.recorder.get_encoder_stats(reset=True)
+                    _log.info(
+                        "DIAG-REC - %s 사고전버퍼 인코딩=%d 드롭=%d p50=%.1fms p95=%.1fms max=%.1fms "
+                        "버퍼=%d프레임/%.1fMB",
+                        ch.name, es["encoded"], es["dropped"],
+                        es["p50_ms"], es["p95_ms"], es["max_ms"],
+                        es["buffer_frames"], es["buffer_bytes"] / (1024 * 1024),
+                    )
+                    rs = ch.recorder.get_ring_stats(reset=True)
+                    if rs is not None:
+                        _log.info(
+                            "DIAG-REC - %s 세그먼트링 세그먼트=%d 구간=%.0f초 디스크=%.1fMB "
+                            "드롭=%d 세션=%d",
+                            ch.name, rs["segments"], rs["seconds"], rs["bytes"] / (1024 * 1024),
+                            rs["dropped"], rs["sessions"],
+                        )
+                js = AutoRecorder.scheduler.get_stats(reset=True)
+                if js["capturing"] or js["queued"] or js["muxing"] or js["done"] or js["failed"]:
+                    _log.info(
+                        "DIAG-REC - 녹화작업 수집=%d 대기=%d 합성=%d 작업자=%d 병합=%d 완료=%d 실패=%d",
+                        js["capturing"], js["queued"], js["muxing"], js["workers"],
+                        js["merged"], js["done"], js["failed"],
+                    )
+                if any(ch.recorder.enabled for ch in self._inputs):
+                    cs = AutoRecorder.catalog.get_stats(reset=True)
+                    _log.info(
+                        "DIAG-REC - 카탈로그 파일=%d 용량=%.2fGB 정리=%d",
+                        cs["files"], cs["bytes"] / (1024 ** 3), cs["evicted"],
+                    )
+                self._diag_last_errors.pop("DIAG-REC", None)
+            except Exception as _e:
+                _etype = type(_e).__name__
+                if _etype != self._diag_last_errors.get("DIAG-REC"):
+                    self._diag_last_errors["DIAG-REC"] = _etype
+                    try:
+                        _log.error("DIAG-REC 오류 (감지 계속): %s\n%s",
+                                   _e, traceback.format_exc())
+                    except Exception as _log_e:
+                        try:
+                            print(f"[FATAL] DIAG-REC 로깅 실패: {_e} / {_log_e}",
+                                  file=sys.stderr, flush=True)
+                        except Exception:
+                            pass
+                else:
+                    _log.error("DIAG-REC 오류 반복 (감지 계속): %s", _e)
+
             # ── DIAG-SIGNOFF ──────────────────────────────────────────────────────────
             try:
                 signoff_parts = []
-                video_name_map_hb = {r.label: r.media_name for r in self._roi_manager.video_rois}
+                video_name_map_hb = {r.label: r.media_name for r in self._inputs[0].roi_manager.video_rois}
                 for gid, group in self._signoff_manager.get_groups().items():
                     state = self._signoff_manager.get_state(gid)
                     enter_lbl = group.enter_roi.get("video_label", "-")
@@ -446,16 +659,17 @@ class MainWindow(QMainWindow):
             try:
                 audio_diag_parts = []
                 if self._audio_detect_enabled:
-                    for lbl, a_state in self._detector._audio_level_states.items():
-                        buf = self._detector._audio_ratio_buffer.get(lbl)
-                        avg_r = (sum(buf) / len(buf)) if buf else -1.0
-                        a_alert_str = "알람" if a_state.is_alerting else "정상"
-                        audio_diag_parts.append(
-                            f"{lbl}:ratio={avg_r:.1f}%[기준{self._detector.audio_pixel_ratio:.0f}%]"
-                            f" timer={a_state.alert_duration:.1f}s[기준{self._detector.audio_level_duration:.0f}s]"
-                            f" {a_alert_str}"
-                        )
-                    if not self._detector._audio_level_states:
+                    for ch in self._inputs:
+                        for lbl, a_state in ch.detector._audio_level_states.items():
+                            buf = ch.detector._audio_ratio_buffer.get(lbl)
+                            avg_r = (sum(buf) / len(buf)) if buf else -1.0
+                            a_alert_str = "알람" if a_state.is_alerting else "정상"
+                            audio_diag_parts.append(
+                                f"{ch.qualify(lbl)}:ratio={avg_r:.1f}%[기준{self._detector.audio_pixel_ratio:.0f}%]"
+                                f" timer={a_state.alert_duration:.1f}s[기준{self._detector.audio_level_duration:.0f}s]"
+                                f" {a_alert_str}"
+                            )
+                    if not any(ch.detector._audio_level_states for ch in self._inputs):
                         audio_diag_parts.append("오디오ROI없음")
                 else:
                     audio_diag_parts.append("오디오레벨미터감지 비활성")
@@ -496,11 +710,27 @@ class MainWindow(QMainWindow):
                 tg_enabled = self._telegram._enabled
                 tg_worker_alive = self._telegram._worker_thread.is_alive()
                 tg_queue_size = self._telegram._queue.qsize()
-                if tg_enabled and (not tg_worker_alive or tg_queue_size >= 1):
+                tg_stats = self._telegram.get_stats(reset=True)
+                if tg_enabled and (not tg_worker_alive or tg_queue_size >= 1 or tg_stats["outbox"]):
                     _log.warning(
-                        "DIAG-TELEGRAM - worker=%s queue=%d",
+                        "DIAG-TELEGRAM - worker=%s queue=%d outbox=%d",
                         "alive" if tg_worker_alive else "DEAD",
-                        tg_queue_size,
+                        tg_queue_size, tg_stats["outbox"],
+                    )
+                if tg_stats["encodes"] or tg_stats["cache_hits"]:
+                    _log.info(
+                        "DIAG-TELEGRAM - 스냅샷 인코딩=%d 캐시재사용=%d",
+                        tg_stats["encodes"], tg_stats["cache_hits"],
+                    )
+                if tg_stats["http"]:
+                    _http, _e2e = tg_stats["http"], tg_stats["e2e"]
+                    _log.info(
+                        "DIAG-TELEGRAM - 전송=%d 재시도=%d 기한초과=%d "
+                        "요청 p50/p95/p99=%.2f/%.2f/%.2fs 알림지연 p50/p95/p99=%s",
+                        tg_stats["sent"], tg_stats["retries"], tg_stats["stale"],
+                        _http["p50"], _http["p95"], _http["p99"],
+                        "/".join(f"{_e2e[k]:.2f}" for k in ("p50", "p95", "p99")) + "s"
+                        if _e2e else "-",
                     )
                 if tg_enabled:
                     self._telegram.ensure_worker_alive()
@@ -520,39 +750,98 @@ class MainWindow(QMainWindow):
                             pass
                 else:
                     _log.error("DIAG-TELEGRAM 오류 반복 (감지 계속): %s", _e)
+
+            # ── DIAG-NOTIFY ────────────────────────────────────────────────────────────────
+            try:
+                hub_stats = self._notifier_hub.get_stats(reset=True)
+                hub_queue = hub_stats.pop("_queue")
+                for sink_name, st in hub_stats.items():
+                    if not (st["sent"] or st["failed"] or st["timeouts"] or st["dropped"] or st["pending"]):
+                        continue
+                    _log_fn = _log.warning if (st["failed"] or st["timeouts"] or st["dropped"]) else _log.info
+                    _log_fn(
+                        "DIAG-NOTIFY - %s 전송=%d 실패=%d 시간초과=%d 폐기=%d 대기=%d p50/p95=%s%s",
+                        sink_name, st["sent"], st["failed"], st["timeouts"], st["dropped"], st["pending"],
+                        f"{st['p50']:.3f}/{st['p95']:.3f}s" if st["p50"] is not None else "-",
+                        f" 마지막오류={st['last_error']}" if st["last_error"] else "",
+                    )
+                if hub_queue["size"] or hub_queue["dropped"]:
+                    _log.warning("DIAG-NOTIFY - 분배 대기=%d 폐기=%d", hub_queue["size"], hub_queue["dropped"])
+                self._diag_last_errors.pop("DIAG-NOTIFY", None)
+            except Exception as _e:
+                _etype = type(_e).__name__
+                if _etype != self._diag_last_errors.get("DIAG-NOTIFY"):
+                    self._diag_last_errors["DIAG-NOTIFY"] = _etype
+                    try:
+                        _log.error("DIAG-NOTIFY 오류 (감지 계속): %s\n%s",
+                                   _e, traceback.format_exc())
+                    except Exception as _log_e:
+                        try:
+                            print(f"[FATAL] DIAG-NOTIFY 로깅 실패: {_e} / {_log_e}",
+                                  file=sys.stderr, flush=True)
+                        except Exception:
+                            pass
+                else:
+                    _log.error("DIAG-NOTIFY 오류 반복 (감지 계속): %s", _e)
         self._last_detection_time = time.time()
 
         try:
-            video_rois = self._roi_manager.video_rois
-            audio_rois = self._roi_manager.audio_rois
-
-            # ── 오디오 ROI 사전 계산 (SignoffManager + 알림 처리 공유) ──
-            audio_results = {}
-            if audio_rois and self._audio_detect_enabled:
-                audio_results = self._detector.detect_audio_roi(self._latest_frame, audio_rois)
-
-            # ── 비디오 ROI 블랙/스틸 감지 ──
             # SignoffManager enter_roi label은 still_detection_enabled와 무관하게 스틸 계산 필요.
-            # force_still_labels로 전달하면 detector가 해당 label만 강제 계산한다.
+            # force_still_labels로 전달하면 detector가 해당 label만 강제 계산한다. (입력 1 전용)
             signoff_enter_labels: set = {
                 group.enter_roi.get("video_label", "")
                 for group in self._signoff_manager.get_groups().values()
                 if group.enter_roi.get("video_label")
             }
-            need_still_for_signoff = bool(video_rois and signoff_enter_labels)
-            video_results = {}
-            if video_rois and (self._detector.black_detection_enabled
-                               or self._detector.still_detection_enabled
-                               or need_still_for_signoff):
-                video_results = self._detector.detect_frame(
-                    self._latest_frame, video_rois,
-                    force_still_labels=signoff_enter_labels if need_still_for_signoff else None,
-                )
 
-            # ── SignoffManager 업데이트 (스틸 감지 결과 전달) ──
-            # still_detection_enabled=True : 전체 ROI 스틸 결과 전달
-            # still_detection_enabled=False: SignoffManager enter_roi label만 전달
-            #   (force_still_labels로 강제 계산됨 → 정파 진입/해제 감지 정상 동작)
+            # ── 입력별 감지 (오디오 레벨미터 + 비디오 블랙/스틸) ──
+            # 입력이 2개 이상이면 감지 워커 풀에서 병렬 실행 후 결과 수집.
+            # GUI 스레드가 결과를 기다리는 동안 ROI 목록 변경이 없으므로 입력별 상태는 워커 전용.
+            jobs = []
+            for ch in self._inputs:
+                if ch.latest_frame is None:
+                    continue
+                force = None
+                if ch.is_primary and ch.roi_manager.video_rois and signoff_enter_labels:
+                    force = signoff_enter_labels
+                jobs.append((ch, force))
+
+            if len(jobs) == 1:
+                ch, force = jobs[0]
+                results = [(ch, ch.detect(self._audio_detect_enabled, force))]
+            else:
+                futures = [
+                    (ch, self._detect_pool.submit(ch.detect, self._audio_detect_enabled, force))
+                    for ch, force in jobs
+                ]
+                results = [(ch, fut.result()) for ch, fut in futures]
+
+            for ch, (video_results, audio_results) in results:
+                try:
+                    self._process_detection_results(
+                        ch, video_results, audio_results, signoff_enter_labels,
+                    )
+                except Exception as e:
+                    self._logger.error(
+                        f"SYSTEM - {self._input_prefix(ch)}감지 결과 처리 오류 (silent fail 방지): {e}"
+                    )
+
+        except Exception as e:
+            self._logger.error(f"SYSTEM - 감지 루프 오류 (silent fail 방지): {e}")
+
+    def _process_detection_results(self, ch: InputChannel, video_results: dict,
+                                   audio_results: dict, signoff_enter_labels: set):
+        """입력 1개의 감지 결과 → SignoffManager / 알림 / 텔레그램 / 녹화 / 화면 표시.
+        알림·로그·녹화에는 입력명이 붙은 전역 레이블(ch.qualify)을 사용한다.
+        """
+        is_active = ch.index == self._active_input_idx
+        frame = ch.latest_pyramid     # 텔레그램 스냅샷 — 워커가 프레임 id 기준으로 1회만 축소/인코딩
+
+        # ── SignoffManager 업데이트 (입력 1 스틸 감지 결과 전달) ──
+        # still_detection_enabled=True : 전체 ROI 스틸 결과 전달
+        # still_detection_enabled=False: SignoffManager enter_roi label만 전달
+        #   (force_still_labels로 강제 계산됨 → 정파 진입/해제 감지 정상 동작)
+        if ch.is_primary:
             if self._detector.still_detection_enabled:
                 still_results = {
                     label: state.get("still", False)
@@ -569,139 +858,133 @@ class MainWindow(QMainWindow):
 
             self._signoff_manager.update_detection(still_results=still_results)
 
-            # ── 비디오 ROI 알림 처리 ──
-            if video_results:
-                # label → media_name 매핑 캐시
-                video_name_map = {r.label: r.media_name for r in video_rois}
-                results = video_results
-
-                for label, state in results.items():
-                    # SIGNOFF 중인 그룹 소속 → 알림/로그 억제
-                    if self._signoff_manager.is_signoff_label(label):
-                        if label not in self._signoff_suppressed_logged:
-                            _log.debug("SIGNOFF - %s 알림 억제 시작 (정파 중)", label)
-                            self._signoff_suppressed_logged.add(label)
-                        self._alarm.resolve("블랙", label)
-                        self._alarm.resolve("스틸", label)
-                        self._black_logged.discard(label)
-                        self._still_logged.discard(label)
+        # ── 비디오 ROI 알림 처리 ──
+        if video_results:
+            # label → media_name / 원본 좌표 영역(감지영역 크롭 클립용) 매핑 캐시
+            video_name_map = {r.label: r.media_name for r in ch.roi_manager.video_rois}
+            video_rect_map = {r.label: (r.x, r.y, r.w, r.h) for r in ch.roi_manager.video_rois}
+
+            for label, state in video_results.items():
+                glabel = ch.qualify(label)
+                # SIGNOFF 중인 그룹 소속 → 알림/로그 억제 (정파는 입력 1 기준)
+                if ch.is_primary and self._signoff_manager.is_signoff_label(label):
+                    if label not in self._signoff_suppressed_logged:
+                        _log.debug("SIGNOFF - %s 알림 억제 시작 (정파 중)", label)
+                        self._signoff_suppressed_logged.add(label)
+                    self._alarm.resolve("블랙", label)
+                    self._alarm.resolve("스틸", label)
+                    self._black_logged.discard(label)
+                    self._still_logged.discard(label)
+                    if is_active:
                         self._video_widget.set_alert_state(label, False)
-                        continue
+                    continue
 
-                    black_alert    = state.get("black_alerting", False)
-                    still_alert    = state.get("still_alerting", False)
-                    black_resolved = state.get("black_resolved", False)
-                    still_resolved = state.get("still_resolved", False)
-                    media = video_name_map.get(label, "")
-                    name = media or label                          # 텔레그램/알람용
-                    log_prefix = f"{label}. {media}" if media else label  # 로그용
-
-                    # PREPARATION 상태: 스틸 알림만 억제 (블랙 알림은 계속)
-                    is_in_prep = self._signoff_manager.is_prep_label(label)
-                    if is_in_prep:
-                        self._alarm.resolve("스틸", label)
-                        self._still_logged.discard(label)
-
-                    # ── 블랙 ──
-                    if black_alert:
-                        if label not in self._black_logged:
-                            self._logger.error(f"{log_prefix} - 블랙 감지")
-                            tg = self._config.get("telegram", {})
-                            if tg.get("notify_black", True):
-                                self._telegram.notify("블랙", label, name, self._latest_frame)
-                            self._recorder.trigger("블랙", label, media)
-                        self._alarm.trigger("블랙", label, self._detector.black_alarm_duration)
-                        self._black_logged.add(label)
+                black_alert    = state.get("black_alerting", False)
+                still_alert    = state.get("still_alerting", False)
+                black_resolved = state.get("black_resolved", False)
+                still_resolved = state.get("still_resolved", False)
+                media = video_name_map.get(label, "")
+                name = media or glabel                          # 텔레그램/알람용
+                log_prefix = f"{glabel}. {media}" if media else glabel  # 로그용
+
+                # PREPARATION 상태: 스틸 알림만 억제 (블랙 알림은 계속)
+                is_in_prep = ch.is_primary and self._signoff_manager.is_prep_label(label)
+                if is_in_prep:
+                    self._alarm.resolve("스틸", label)
+                    self._still_logged.discard(label)
+
+                # ── 블랙 ──
+                if black_alert:
+                    if glabel not in self._black_logged:
+                        self._logger.error(f"{log_prefix} - 블랙 감지")
+                        self._publish_alarm("블랙", glabel, name, frame)
+                        ch.recorder.trigger("블랙", glabel, media, video_rect_map.get(label))
+                    self._alarm.trigger("블랙", glabel, ch.detector.black_alarm_duration)
+                    self._black_logged.add(glabel)
+                else:
+                    if black_resolved and glabel in self._black_logged:
+                        last_dur = state.get("black_last_duration", 0)
+                        self._logger.error(f"{log_prefix} - 블랙 {last_dur:.0f}초")
+                        self._logger.info(f"{log_prefix} - 블랙 정상 복구")
+                        self._publish_alarm("블랙", glabel, name, frame, is_recovery=True)
+                    self._alarm.resolve("블랙", glabel)
+                    self._black_logged.discard(glabel)
+
+                # ── 스틸 (PREPARATION 상태에서는 억제) ──
+                if not is_in_prep:
+                    if still_alert:
+                        if glabel not in self._still_logged:
+                            self._logger.still_error(f"{log_prefix} - 스틸 감지")
+                            self._publish_alarm("스틸", glabel, name, frame)
+                            ch.recorder.trigger("스틸", glabel, media, video_rect_map.get(label))
+                        self._alarm.trigger("스틸", glabel, ch.detector.still_alarm_duration)
+                        self._still_logged.add(glabel)
                     else:
-                        if black_resolved and label in self._black_logged:
-                            last_dur = state.get("black_last_duration", 0)
-                            self._logger.error(f"{log_prefix} - 블랙 {last_dur:.0f}초")
-                            self._logger.info(f"{log_prefix} - 블랙 정상 복구")
-                            tg = self._config.get("telegram", {})
-                            if tg.get("notify_black", True):
-                                self._telegram.notify("블랙", label, name, self._latest_frame, is_recovery=True)
-                        self._alarm.resolve("블랙", label)
-                        self._black_logged.discard(label)
-
-                    # ── 스틸 (PREPARATION 상태에서는 억제) ──
-                    if not is_in_prep:
-                        if still_alert:
-                            if label not in self._still_logged:
-                                self._logger.still_error(f"{log_prefix} - 스틸 감지")
-                                tg = self._config.get("telegram", {})
-                                if tg.get("notify_still", True):
-                                    self._telegram.notify("스틸", label, name, self._latest_frame)
-                                self._recorder.trigger("스틸", label, media)
-                            self._alarm.trigger("스틸", label, self._detector.still_alarm_duration)
-                            self._still_logged.add(label)
-                        else:
-                            if still_resolved and label in self._still_logged:
-                                last_dur = state.get("still_last_duration", 0)
-                                self._logger.still_error(f"{log_prefix} - 스틸 {last_dur:.0f}초")
-                                self._logger.info(f"{log_prefix} - 스틸 정상 복구")
-                                tg = self._config.get("telegram", {})
-                                if tg.get("notify_still", True):
-                                    self._telegram.notify("스틸", label, name, self._latest_frame, is_recovery=True)
-                            self._alarm.resolve("스틸", label)
-                            self._still_logged.discard(label)
-
-                    self._video_widget.set_alert_state(label, black_alert or (still_alert and not is_in_prep))
-
-            # ── 오디오 ROI 레벨미터 처리 (사전 계산된 audio_results 재사용) ──
-            if audio_rois and self._audio_detect_enabled and audio_results:
-                # label → media_name 매핑 캐시
-                audio_name_map = {r.label: r.media_name for r in audio_rois}
-
-                for label, state in audio_results.items():
-                    # SIGNOFF 중인 그룹 소속 → 알림/로그 억제
-                    if self._signoff_manager.is_signoff_label(label):
-                        if label not in self._signoff_suppressed_logged:
-                            _log.debug("SIGNOFF - %s 오디오 알림 억제 시작 (정파 중)", label)
-                            self._signoff_suppressed_logged.add(label)
-                        self._alarm.resolve("오디오", label)
-                        self._audio_level_logged.discard(label)
+                        if still_resolved and glabel in self._still_logged:
+                            last_dur = state.get("still_last_duration", 0)
+                            self._logger.still_error(f"{log_prefix} - 스틸 {last_dur:.0f}초")
+                            self._logger.info(f"{log_prefix} - 스틸 정상 복구")
+                            self._publish_alarm("스틸", glabel, name, frame, is_recovery=True)
+                        self._alarm.resolve("스틸", glabel)
+                        self._still_logged.discard(glabel)
+
+                if is_active:
+                    self._video_widget.set_alert_state(
+                        label, black_alert or (still_alert and not is_in_prep)
+                    )
+
+        # ── 오디오 ROI 레벨미터 처리 ──
+        if self._audio_detect_enabled and audio_results:
+            # label → media_name 매핑 캐시
+            audio_name_map = {r.label: r.media_name for r in ch.roi_manager.audio_rois}
+
+            for label, state in audio_results.items():
+                glabel = ch.qualify(label)
+                # SIGNOFF 중인 그룹 소속 → 알림/로그 억제 (정파는 입력 1 기준)
+                if ch.is_primary and self._signoff_manager.is_signoff_label(label):
+                    if label not in self._signoff_suppressed_logged:
+                        _log.debug("SIGNOFF - %s 오디오 알림 억제 시작 (정파 중)", label)
+                        self._signoff_suppressed_logged.add(label)
+                    self._alarm.resolve("오디오", label)
+                    self._audio_level_logged.discard(label)
+                    if is_active:
                         self._video_widget.set_alert_state(label, False)
-                        continue
+                    continue
 
-                    alerting = state.get("alerting", False)
-                    resolved = state.get("resolved", False)
-                    media = audio_name_map.get(label, "")
-                    name = media or label                              # 텔레그램/알람용
-                    log_prefix = f"{label}. {media}" if media else label  # 로그용
-
-                    if alerting:
-                        if label not in self._audio_level_logged:
-                            self._logger.audio_error(f"{log_prefix} - 무음 감지")
-                            tg = self._config.get("telegram", {})
-                            if tg.get("notify_audio_level", True):
-                                self._telegram.notify("오디오", label, name, self._latest_frame)
-                            self._recorder.trigger("오디오", label, media)
-                        self._alarm.trigger(
-                            "오디오", label, self._detector.audio_level_alarm_duration
+                alerting = state.get("alerting", False)
+                resolved = state.get("resolved", False)
+                media = audio_name_map.get(label, "")
+                name = media or glabel                              # 텔레그램/알람용
+                log_prefix = f"{glabel}. {media}" if media else glabel  # 로그용
+
+                if alerting:
+                    if glabel not in self._audio_level_logged:
+                        self._logger.audio_error(f"{log_prefix} - 무음 감지")
+                        self._publish_alarm("오디오", glabel, name, frame)
+                        ch.recorder.trigger("오디오", glabel, media)
+                    self._alarm.trigger(
+                        "오디오", glabel, ch.detector.audio_level_alarm_duration
+                    )
+                    self._audio_level_logged.add(glabel)
+                else:
+                    if resolved and glabel in self._audio_level_logged:
+                        last_dur = state.get("last_duration", 0)
+                        self._logger.audio_error(
+                            f"{log_prefix} - 무음 {last_dur:.0f}초"
                         )
-                        self._audio_level_logged.add(label)
-                    else:
-                        if resolved and label in self._audio_level_logged:
-                            last_dur = state.get("last_duration", 0)
-                            self._logger.audio_error(
-                                f"{log_prefix} - 무음 {last_dur:.0f}초"
-                            )
-                            self._logger.info(f"{log_prefix} - 무음 정상 복구")
-                            tg = self._config.get("telegram", {})
-                            if tg.get("notify_audio_level", True):
-                                self._telegram.notify("오디오", label, name, self._latest_frame, is_recovery=True)
-                        self._alarm.resolve("오디오", label)
-                        self._audio_level_logged.discard(label)
+                        self._logger.info(f"{log_prefix} - 무음 정상 복구")
+                        self._publish_alarm("오디오", glabel, name, frame, is_recovery=True)
+                    self._alarm.resolve("오디오", glabel)
+                    self._audio_level_logged.discard(glabel)
 
+                if is_active:
                     self._video_widget.set_alert_state(label, alerting)
 
-        except Exception as e:
-            self._logger.error(f"SYSTEM - 감지 루프 오류 (silent fail 방지): {e}")
-
     def _update_summary(self):
         try:
-            v_count = len(self._roi_manager.video_rois)
-            a_count = len(self._roi_manager.audio_rois)
+            # 다중 입력: 전 입력 감지영역 합계 표시
+            v_count = sum(len(ch.roi_manager.video_rois) for ch in self._inputs)
+            a_count = sum(len(ch.roi_manager.audio_rois) for ch in self._inputs)
             self._top_bar.update_summary(
                 v_count, a_count,
                 self._embedded_detect_enabled,
@@ -712,6 +995,16 @@ class MainWindow(QMainWindow):
                 self._roi_manager.video_rois,
                 self._roi_manager.audio_rois,
             )
+            # 화면 표시 fps / 수신 fps (표시 주기 제한 효과 확인용)
+            received, rendered = self._video_widget.get_display_counters()
+            prev_recv, prev_rend, prev_t = self._display_fps_prev
+            now_t = time.time()
+            dt = now_t - prev_t
+            if dt > 0:
+                self._top_bar.update_display_fps(
+                    (rendered - prev_rend) / dt, (received - prev_recv) / dt,
+                )
+            self._display_fps_prev = (received, rendered, now_t)
             # 정파 상태 패널 갱신 (1초마다)
             for gid, group in self._signoff_manager.get_groups().items():
                 state = self._signoff_manager.get_state(gid)
@@ -749,9 +1042,9 @@ class MainWindow(QMainWindow):
                     f"py_threads={threading.active_count()}"
                 )
                 try:
-                    self._telegram.notify("시스템", "WATCHDOG", f"감지중단{elapsed_d:.0f}초", self._latest_frame)
+                    self._publish_alarm("시스템", "WATCHDOG", f"감지중단{elapsed_d:.0f}초", self._latest_frame)
                 except Exception as _tg_e:
-                    _log.error("watchdog 텔레그램 알림 실패: %s", _tg_e)
+                    _log.error("watchdog 알림 실패: %s", _tg_e)
                 self._health_alarm_logged = True
             elif not detect_stale and self._health_alarm_logged:
                 self._logger.info("SYSTEM - 감지 루프 정상 복구")
@@ -775,10 +1068,15 @@ class MainWindow(QMainWindow):
         try:
             if self._settings_dialog is None:
                 self._settings_dialog = SettingsDialog(
-                    self._config, self._roi_manager, parent=self
+                    self._config, self._roi_manager, parent=self,
+                    signoff_roi_manager=self._inputs[0].roi_manager,
+                    active_input=self._active_input_idx,
                 )
+                self._settings_dialog.active_input_changed.connect(self._on_active_input_changed)
                 self._settings_dialog.port_changed.connect(self._on_port_changed)
                 self._settings_dialog.video_file_changed.connect(self._on_video_file_changed)
+                self._settings_dialog.stream_url_changed.connect(self._on_stream_url_changed)
+                self._settings_dialog.capture_size_changed.connect(self._on_capture_size_changed)
                 self._settings_dialog.halfscreen_edit_requested.connect(self._start_halfscreen_edit)
                 self._settings_dialog.halfscreen_edit_finished.connect(self._finish_halfscreen_edit)
                 self._settings_dialog.detection_params_changed.connect(self._apply_detection_params)
@@ -812,33 +1110,69 @@ class MainWindow(QMainWindow):
     def _on_settings_closed(self):
         if self._settings_dialog:
             self._config = self._settings_dialog.get_config()
+            self._store_inputs_to_config()
             self._settings_dialog.deleteLater()
         self._settings_dialog = None
 
     def _on_port_changed(self, port: int):
-        self._config["port"] = port
-        self._capture_thread.set_port(port)
+        """표시 중인 입력의 캡처 포트 변경"""
+        ch = self._active_input
+        ch.port = port
+        ch.stream_url = ""
+        self._store_inputs_to_config()
+        ch.capture_thread.set_port(port)
         self._video_widget.clear_signal()
-        self._logger.info(f"SYSTEM - 포트 {port}로 변경")
+        self._logger.info(f"SYSTEM - {self._input_prefix(ch)}포트 {port}로 변경")
 
     def _on_video_file_changed(self, path: str):
-        """영상 파일 소스 변경"""
+        """표시 중인 입력의 영상 파일 소스 변경"""
+        ch = self._active_input
+        prefix = self._input_prefix(ch)
         if path:
-            self._capture_thread.set_video_file(path)
+            ch.capture_thread.set_video_file(path)
             self._video_widget.clear_signal()
-            self._logger.info(f"SYSTEM - 파일 소스로 변경: {os.path.basename(path)}")
+            if is_synthetic_source(path):
+                self._logger.info(f"SYSTEM - {prefix}합성 테스트 소스로 변경: {path}")
+            else:
+                self._logger.info(f"SYSTEM - {prefix}파일 소스로 변경: {os.path.basename(path)}")
+        elif ch.stream_url:
+            ch.capture_thread.set_video_file("")
+            self._video_widget.clear_signal()
+            self._logger.info(f"SYSTEM - {prefix}파일 소스 해제, 스트림으로 복귀")
         else:
-            port = self._config.get("port", 0)
-            self._capture_thread.set_port(port)
+            ch.capture_thread.set_port(ch.port)
             self._video_widget.clear_signal()
-            self._logger.info(f"SYSTEM - 파일 소스 해제, 포트 {port}로 복귀")
+            self._logger.info(f"SYSTEM - {prefix}파일 소스 해제, 포트 {ch.port}로 복귀")
+
+    def _on_stream_url_changed(self, url: str):
+        """표시 중인 입력의 네트워크 스트림 소스 변경 (빈 문자열이면 포트로 복귀)"""
+        ch = self._active_input
+        prefix = self._input_prefix(ch)
+        ch.stream_url = url
+        self._store_inputs_to_config()
+        if url:
+            ch.capture_thread.set_stream_url(url)
+            self._logger.info(f"SYSTEM - {prefix}스트림 소스로 변경: {url}")
+        else:
+            ch.capture_thread.set_port(ch.port)
+            self._logger.info(f"SYSTEM - {prefix}스트림 소스 해제, 포트 {ch.port}로 복귀")
+        self._video_widget.clear_signal()
+
+    def _on_capture_size_changed(self, width: int, height: int):
+        """캡처 카드 요청 해상도 변경 — 전 입력 공통 (포트 소스만 재연결)"""
+        self._config["capture_width"] = width
+        self._config["capture_height"] = height
+        for ch in self._inputs:
+            ch.capture_thread.set_capture_size(width, height)
+        self._logger.info(f"SYSTEM - 입력 해상도 요청 {width}×{height}로 변경")
 
     def _apply_detection_params(self, params: dict):
         """감지 파라미터 Detector에 즉시 반영 후 상태 초기화.
         스틸/톤 기준 시간이 변경될 수 있으므로 SignoffManager도 재적용.
         """
         self._apply_detection_config(params)
-        self._detector.reset_all()
+        for ch in self._inputs:
+            ch.detector.reset_all()
         # 감도설정 변경 시 정파 기준 시간도 갱신
         self._apply_signoff_config(self._config.get("signoff", {}))
 
@@ -852,44 +1186,18 @@ class MainWindow(QMainWindow):
         """성능 설정을 Detector 및 타이머에 반영"""
         self._audio_detect_enabled = perf.get("audio_detection_enabled", True)
         self._embedded_detect_enabled = perf.get("embedded_detection_enabled", True)
-        self._detector.scale_factor = perf.get("scale_factor", 1.0)
-        self._detector.black_detection_enabled = perf.get("black_detection_enabled", True)
-        self._detector.still_detection_enabled = perf.get("still_detection_enabled", True)
+        for ch in self._inputs:
+            ch.detector.apply_performance(perf)
+        if hasattr(self, "_video_widget"):
+            self._video_widget.set_display_fps(perf.get("display_fps", 30))
         # 타이머가 이미 생성된 경우에만 주기 변경
         if hasattr(self, "_detect_timer"):
             self._detect_timer.setInterval(perf.get("detection_interval", 200))
 
     def _apply_detection_config(self, det: dict):
         """config dict에서 감지 파라미터 적용"""
-        self._detector.black_threshold = det.get("black_threshold", 5)
-        self._detector.black_dark_ratio = det.get("black_dark_ratio", 98.0)
-        self._detector.black_duration = det.get("black_duration", 20)
-        self._detector.black_alarm_duration = det.get("black_alarm_duration", 60)
-        self._detector.black_motion_suppress_ratio = det.get("black_motion_suppress_ratio", 0.2)
-        self._detector.still_threshold = det.get("still_threshold", 4)
-        self._detector.still_block_threshold = det.get("still_block_threshold", 15.0)
-        self._detector.still_duration = det.get("still_duration", 60.0)
-        self._detector.still_alarm_duration = det.get("still_alarm_duration", 60)
-        self._detector.still_reset_frames = int(det.get("still_reset_frames", 3))
-        # 오디오 레벨미터 HSV
-        self._detector.audio_hsv_h_min = det.get("audio_hsv_h_min", 40)
-        self._detector.audio_hsv_h_max = det.get("audio_hsv_h_max", 95)
-        self._detector.audio_hsv_s_min = det.get("audio_hsv_s_min", 80)
-        self._detector.audio_hsv_s_max = det.get("audio_hsv_s_max", 255)
-        self._detector.audio_hsv_v_min = det.get("audio_hsv_v_min", 60)
-        self._detector.audio_hsv_v_max = det.get("audio_hsv_v_max", 255)
-        self._detector.audio_pixel_ratio = det.get("audio_pixel_ratio", 5.0)
-        self._detector.audio_level_duration = det.get("audio_level_duration", 20.0)
-        self._detector.audio_level_alarm_duration = det.get("audio_level_alarm_duration", 60)
-        self._detector.audio_level_recovery_seconds = det.get("audio_level_recovery_seconds", 2.0)
-        # 임베디드 오디오
-        self._detector.embedded_silence_threshold = det.get("embedded_silence_threshold", -50)
-        self._detector.embedded_silence_duration = det.get("embedded_silence_duration", 20.0)
-        self._detector.embedded_alarm_duration = det.get("embedded_alarm_duration", 60)
-        # 정파용 오디오 톤 감지
-        self._detector.audio_tone_std_threshold = det.get("audio_tone_std_threshold", 3.0)
-        self._detector.audio_tone_duration      = det.get("audio_tone_duration", 60.0)
-        self._detector.audio_tone_min_level     = det.get("audio_tone_min_level", 5.0)
+        for ch in self._inputs:
+            ch.detector.apply_config(det)
 
     # ── 임베디드 오디오 감지 ───────────────────────────
 
@@ -903,10 +1211,9 @@ class MainWindow(QMainWindow):
             self._embedded_log_sent = True
             self._logger.embedded_error("Embedded Audio - 무음감지")
             self._alarm.trigger("무음", "Embedded Audio", self._detector.embedded_alarm_duration)
-            tg = self._config.get("telegram", {})
-            if tg.get("notify_embedded", True):
-                self._telegram.notify("무음", "Embedded", "Embedded Audio", self._latest_frame)
-            self._recorder.trigger("무음", "Embedded", "Embedded Audio")
+            self._publish_alarm("무음", "Embedded", "Embedded Audio", self._inputs[0].latest_frame)
+            # 임베디드 오디오는 입력 1 기준 → 입력 1 녹화기로 기록
+            self._inputs[0].recorder.trigger("무음", "Embedded", "Embedded Audio")
 
     def _on_audio_level_for_silence(self, l_db: float, r_db: float):
         """level_updated 수신 — 정상 오디오 수신 시 임베디드 감지 리셋"""
@@ -922,9 +1229,8 @@ class MainWindow(QMainWindow):
                     self._embedded_log_sent = False
                     self._logger.embedded_error(f"Embedded Audio - 무음 {last_seconds:.0f}초")
                     self._logger.info("Embedded Audio - 정상 복구")
-                    tg = self._config.get("telegram", {})
-                    if tg.get("notify_embedded", True):
-                        self._telegram.notify("무음", "Embedded", "Embedded Audio", self._latest_frame, is_recovery=True)
+                    self._publish_alarm("무음", "Embedded", "Embedded Audio", self._inputs[0].latest_frame,
+                                        is_recovery=True)
             # 알람 발생 여부와 무관하게 항상 무음 상태 리셋
             # (이전 무음 구간 시작 기록이 남아 다음 무음에서 오산되는 버그 방지)
             self._detector.reset_embedded_silence()
@@ -1024,6 +1330,11 @@ class MainWindow(QMainWindow):
 
     # ── 텔레그램 알림 ─────────────────────────────────
 
+    def _publish_alarm(self, alarm_type: str, label: str, media_name: str, frame=None,
+                       is_recovery: bool = False):
+        """알림/복구 1건을 알림 분배기에 넣기 (즉시 반환). 종류별 전송 여부는 채널별 설정에서 거름"""
+        self._notifier_hub.publish(AlarmEvent(alarm_type, label, media_name, frame, is_recovery))
+
     def _apply_telegram_config(self, tg: dict):
         """텔레그램 설정을 TelegramNotifier에 반영"""
         self._telegram.configure(
@@ -1037,6 +1348,13 @@ class MainWindow(QMainWindow):
             notify_audio_level=bool(tg.get("notify_audio_level", True)),
             notify_embedded=bool(tg.get("notify_embedded", True)),
             notify_signoff=bool(tg.get("notify_signoff", True)),
+            image_width=int(tg.get("image_width", 1280)),
+            batch_seconds=float(tg.get("batch_seconds", 2)),
+            max_delay=float(tg.get("max_delay", 120)),
+            outbox_max_items=int(tg.get("outbox_max_items", 500)),
+            outbox_max_mb=float(tg.get("outbox_max_mb", 100)),
+            outbox_max_hours=float(tg.get("outbox_max_hours", 24)),
+            api_base=tg.get("api_base", "https://api.telegram.org"),
         )
 
     def _on_telegram_settings_changed(self, params: dict):
@@ -1087,17 +1405,34 @@ class MainWindow(QMainWindow):
     # ── 자동 녹화 ─────────────────────────────────────
 
     def _apply_recording_config(self, rec: dict):
-        """녹화 설정을 AutoRecorder에 반영"""
-        self._recorder.configure(
-            enabled=bool(rec.get("enabled", False)),
-            save_dir=rec.get("save_dir", "recordings"),
-            pre_seconds=float(rec.get("pre_seconds", 5)),
-            post_seconds=float(rec.get("post_seconds", 15)),
-            max_keep_days=int(rec.get("max_keep_days", 7)),
-            output_width=int(rec.get("output_width", 960)),
-            output_height=int(rec.get("output_height", 540)),
-            output_fps=int(rec.get("output_fps", 10)),
-        )
+        """녹화 설정을 입력별 AutoRecorder에 반영 (저장 폴더 공유, 파일명에 전역 레이블 사용)"""
+        for ch in self._inputs:
+            ch.recorder.configure(
+                enabled=bool(rec.get("enabled", False)),
+                save_dir=rec.get("save_dir", "recordings"),
+                pre_seconds=float(rec.get("pre_seconds", 5)),
+                post_seconds=float(rec.get("post_seconds", 15)),
+                max_keep_days=int(rec.get("max_keep_days", 7)),
+                max_total_gb=float(rec.get("max_total_gb", 0)),
+                preroll_store=rec.get("preroll_store", "memory"),
+                preroll_path=os.path.join(
+                    rec.get("save_dir", "recordings"), ".preroll", f"in{ch.index + 1}.ring"
+                ),
+                output_width=int(rec.get("output_width", 960)),
+                output_height=int(rec.get("output_height", 540)),
+                output_fps=int(rec.get("output_fps", 10)),
+                encoder=rec.get("encoder", "pipe"),
+                roi_clip=rec.get("roi_clip", "off"),
+                continuous=bool(rec.get("continuous", False)),
+                continuous_dir=os.path.join(
+                    rec.get("save_dir", "recordings"), ".ring", f"in{ch.index + 1}"
+                ),
+                segment_seconds=int(rec.get("segment_seconds", 10)),
+                ring_minutes=float(rec.get("ring_minutes", 10)),
+                continuous_pre_seconds=float(rec.get("continuous_pre_seconds", 60)),
+                mux_workers=int(rec.get("mux_workers", 2)),
+                owner=ch.name,
+            )
 
     def _on_recording_settings_changed(self, params: dict):
         """SettingsDialog 녹화 설정 변경"""
@@ -1110,7 +1445,7 @@ class MainWindow(QMainWindow):
         """현재 설정을 지정된 경로에 저장"""
         if self._settings_dialog:
             self._config = self._settings_dialog.get_config()
-        self._config["rois"] = self._roi_manager.to_dict()
+        self._store_inputs_to_config()
         success = self._config_manager.save_to_path(self._config, filepath)
         if success:
             self._logger.info(f"SYSTEM - 설정 저장 완료: {os.path.basename(filepath)}")
@@ -1123,12 +1458,11 @@ class MainWindow(QMainWindow):
             config = self._config_manager.load_from_path(filepath)
             self._config = config
 
-            # ROI 적용
-            self._roi_manager.from_dict(config.get("rois", {}))
+            # 입력별 ROI 적용 (감지 상태 초기화 포함)
+            self._apply_inputs_config(config)
 
             # 감지 파라미터 적용
             self._apply_detection_config(config.get("detection", {}))
-            self._detector.reset_all()
 
             # 성능 파라미터 적용
             self._apply_performance_config(config.get("performance", {}))
@@ -1140,6 +1474,7 @@ class MainWindow(QMainWindow):
 
             # 텔레그램/녹화 설정 적용
             self._apply_telegram_config(config.get("telegram", {}))
+            self._notifier_hub.configure(config.get("notifiers", {}))
             self._apply_recording_config(config.get("recording", {}))
 
             # 정파 설정 적용
@@ -1164,13 +1499,15 @@ class MainWindow(QMainWindow):
         config = copy.deepcopy(DEFAULT_CONFIG)
         self._config = config
 
-        # ROI 초기화
-        self._roi_manager.replace_video_rois([])
-        self._roi_manager.replace_audio_rois([])
+        # ROI 초기화 (입력 목록은 유지, 입력별 ROI만 비움)
+        for ch in self._inputs:
+            ch.roi_manager.replace_video_rois([])
+            ch.roi_manager.replace_audio_rois([])
+            ch.detector.reset_all()
+        self._store_inputs_to_config()
 
         # 감지 파라미터 초기화
         self._apply_detection_config(config.get("detection", {}))
-        self._detector.reset_all()
 
         # 성능 파라미터 초기화
         self._apply_performance_config(config.get("performance", {}))
@@ -1182,6 +1519,7 @@ class MainWindow(QMainWindow):
 
         # 텔레그램/녹화 초기화
         self._apply_telegram_config(config.get("telegram", {}))
+        self._notifier_hub.configure(config.get("notifiers", {}))
         self._apply_recording_config(config.get("recording", {}))
 
         # 정파 설정 초기화
@@ -1218,7 +1556,8 @@ class MainWindow(QMainWindow):
 
     def _sync_signoff_media_names(self):
         """ROI 매체명 매핑을 SignoffManager에 동기화. ROI 변경 시에도 호출한다."""
-        name_map = {r.label: r.media_name for r in self._roi_manager.video_rois}
+        # 정파 그룹은 입력 1 ROI 기준
+        name_map = {r.label: r.media_name for r in self._inputs[0].roi_manager.video_rois}
         self._signoff_manager.update_media_names(name_map)
 
     def _on_signoff_settings_changed(self, params: dict):
@@ -1272,11 +1611,10 @@ class MainWindow(QMainWindow):
             f"SIGNOFF-TG state={state.name} enabled={self._telegram._enabled} "
             f"notify_signoff={notify_signoff_flag}"
         )
-        if notify_signoff_flag:
-            if state == SignoffState.SIGNOFF:
-                self._telegram.notify("정파", group_name, group_name, self._latest_frame)
-            elif state == SignoffState.IDLE:
-                self._telegram.notify("정파", group_name, group_name, self._latest_frame, is_recovery=True)
+        if state == SignoffState.SIGNOFF:
+            self._publish_alarm("정파", group_name, group_name, self._inputs[0].latest_frame)
+        elif state == SignoffState.IDLE:
+            self._publish_alarm("정파", group_name, group_name, self._inputs[0].latest_frame, is_recovery=True)
 
     def _on_signoff_button_clicked(self, group_id: int):
         """정파 버튼 클릭: IDLE→PREPARATION→SIGNOFF→IDLE 순서로 상태 로테이션. 소리 없음."""
@@ -1354,6 +1692,10 @@ class MainWindow(QMainWindow):
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_F11:
             self._toggle_fullscreen()
+        elif (event.modifiers() & Qt.ControlModifier
+              and Qt.Key_1 <= event.key() <= Qt.Key_9):
+            # Ctrl+1~9: 표시 입력 전환
+            self._on_active_input_changed(event.key() - Qt.Key_1)
         else:
             super().keyPressEvent(event)
 
@@ -1428,7 +1770,7 @@ class MainWindow(QMainWindow):
         # 설정 저장
         if self._settings_dialog:
             self._config = self._settings_dialog.get_config()
-        self._config["rois"] = self._roi_manager.to_dict()
+        self._store_inputs_to_config()
         self._config["ui_state"] = {
             "detection_enabled": self._detection_enabled,
             "roi_visible": self._top_bar._btn_roi.isChecked(),
@@ -1445,14 +1787,18 @@ class MainWindow(QMainWindow):
         self._restart_timer.stop()
         if hasattr(self, "_tg_test_timer"):
             self._tg_test_timer.stop()
-        if hasattr(self, "_capture_thread"):
-            self._capture_thread.stop()
-            self._capture_thread.wait(5000)
+        for ch in self._inputs:
+            if ch.capture_thread is not None:
+                ch.capture_thread.stop()
+                ch.capture_thread.wait(5000)
         if hasattr(self, "_audio_thread"):
             self._audio_thread.stop()
             self._audio_thread.wait(5000)
+        self._notifier_hub.stop()
         self._telegram.stop()
-        self._recorder.stop()
+        for ch in self._inputs:
+            ch.recorder.stop()
+        self._detect_pool.shutdown(wait=False)
 
         self._logger.info("SYSTEM - 프로그램 종료")
         event.accept()
@@ -233,6 +233,12 @@ class ROIEditorCanvas(QWidget):
         oy = (h - dh) / 2
         self._frame_rect = QRectF(ox, oy, dw, dh)
 
+    def _max_roi_size(self) -> tuple:
+        """편집 프레임 해상도 기준 최대 감지영역 크기 (UHD 프레임은 원본 좌표로 2배)"""
+        if self._frame is None:
+            return self._roi_manager.max_size
+        return ROIManager.max_size_for(self._frame.shape[1])
+
     def _w2f(self, wx: float, wy: float) -> tuple:
         """위젯 좌표 → 프레임 좌표"""
         if self._frame is None or self._frame_rect.isEmpty():
@@ -641,8 +647,9 @@ class ROIEditorCanvas(QWidget):
             if (abs(event.position().x() - self._drag_start_w.x()) >= self.MIN_ROI_PX and
                     abs(event.position().y() - self._drag_start_w.y()) >= self.MIN_ROI_PX and
                     rw > 0 and rh > 0):
-                rw = min(rw, 500)
-                rh = min(rh, 300)
+                max_w, max_h = self._max_roi_size()
+                rw = min(rw, max_w)
+                rh = min(rh, max_h)
                 new_roi = ROI(
                     label="",
                     media_name="",
@@ -692,10 +699,11 @@ class ROIEditorCanvas(QWidget):
             x2 = min(x2, fw)
             y2 = min(y2, fh)
 
-        if x2 - x1 > 500:
-            x2 = x1 + 500
-        if y2 - y1 > 300:
-            y2 = y1 + 300
+        max_w, max_h = self._max_roi_size()
+        if x2 - x1 > max_w:
+            x2 = x1 + max_w
+        if y2 - y1 > max_h:
+            y2 = y1 + max_h
 
         roi.x, roi.y = x1, y1
         roi.w, roi.h = x2 - x1, y2 - y1
@@ -748,8 +756,9 @@ class ROIEditorCanvas(QWidget):
             # 크기 조정 (우하단 기준)
             roi.w = max(2, roi.w + dx)
             roi.h = max(2, roi.h + dy)
-            roi.w = min(roi.w, 500)
-            roi.h = min(roi.h, 300)
+            max_w, max_h = self._max_roi_size()
+            roi.w = min(roi.w, max_w)
+            roi.h = min(roi.h, max_h)
         else:
             # 이동
             roi.x = max(0, roi.x + dx)
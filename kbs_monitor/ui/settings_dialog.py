@@ -6,8 +6,7 @@
 """
 import os
 import time
-import numpy as np
-import cv2
+from typing import Optional
 
 from utils.config_manager import DEFAULT_CONFIG
 
@@ -23,7 +22,16 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal, QEvent, QTimer
 
 from core.roi_manager import ROIManager
+from core.video_capture import is_stream_url, CAPTURE_SIZES
+from core.detector import Detector
+from core.synthetic_source import (
+    SyntheticMultiview, is_synthetic_source, DEFAULT_SYNTHETIC_SPEC,
+)
+from core.benchmark import (
+    run_benchmark, run_grid_benchmark, make_bench_frames, HD_SIZE, UHD_SIZE, DETECTION_BUDGET_MS,
+)
 from ui.dual_slider import DualSlider
+from ui.video_widget import DEFAULT_DISPLAY_FPS, DISPLAY_FPS_CHOICES
 
 # 버튼 높이 통일 상수 (QLineEdit/QComboBox min-height와 동일하게 유지)
 _BTN_H = 30
@@ -277,7 +285,7 @@ _PERF_GUIDE_MD = """\
 
 ## 2. 감지 해상도
 
-**선택 옵션:** 원본 1920×1080 / 50% 960×540 / 25% 480×270
+**선택 옵션:** 원본 / 50% / 25% (입력 해상도 기준 — 1080p: 1920×1080 / 960×540 / 480×270)
 
 ### 기술적 설명
 
@@ -304,6 +312,13 @@ OpenCV로 프레임을 분석할 때 **실제 처리 픽셀 수**를 줄이는 
 **핵심:** 감지 정확도 손실 없이 CPU를 아낄 수 있는 **가장 안전한 절감 방법**입니다.
 PC 성능이 낮다면 50%부터 먼저 시도해보세요.
 
+### UHD (3840×2160) 입력
+
+감지영역 좌표는 항상 **입력 원본 해상도** 기준입니다.
+감지 시에는 감지영역마다 잘라낸 뒤 축소하므로 전체 프레임을 축소하지 않습니다.
+감지영역 1개가 1080p 16분할 한 칸(480×270)보다 크면 **자동으로 그 크기까지 축소**되어,
+UHD 입력도 1080p와 거의 같은 CPU 부하로 감지합니다.
+
 ---
 
 ## 3. 비디오 감지 (블랙/스틸 감지 활성화)
@@ -657,6 +672,8 @@ class SettingsDialog(QDialog):
 
     port_changed = Signal(int)
     video_file_changed = Signal(str)          # MP4 파일 소스 변경 (빈 문자열=포트 사용)
+    stream_url_changed = Signal(str)          # 네트워크 스트림 소스 변경 (빈 문자열=포트 사용)
+    capture_size_changed = Signal(int, int)   # 캡처 카드 요청 해상도 변경 (w, h)
     halfscreen_edit_requested = Signal(str)   # "video" or "audio" (편집 시작)
     halfscreen_edit_finished = Signal()        # 편집 완료
     detection_params_changed = Signal(dict)
@@ -673,11 +690,16 @@ class SettingsDialog(QDialog):
     reset_config_requested = Signal()         # 기본값 초기화 요청
     signoff_settings_changed = Signal(dict)   # 정파 설정 변경
     system_settings_changed = Signal(dict)    # 시스템 설정 변경 (자동 재시작)
+    active_input_changed = Signal(int)        # 표시/편집 대상 입력 전환 (입력 인덱스)
 
-    def __init__(self, config: dict, roi_manager: ROIManager, parent=None):
+    def __init__(self, config: dict, roi_manager: ROIManager, parent=None,
+                 signoff_roi_manager: Optional[ROIManager] = None, active_input: int = 0):
         super().__init__(parent)
         self._config = dict(config)
-        self._roi_manager = roi_manager
+        self._roi_manager = roi_manager              # 표시 중인 입력의 ROI (편집 대상)
+        # 정파 그룹은 입력 1 ROI 기준 — 다른 입력 편집 중에도 정파 ROI 선택은 입력 1 목록 사용
+        self._signoff_roi_manager = signoff_roi_manager or roi_manager
+        self._active_input = active_input
         self.setWindowTitle("설정")
         self.setMinimumWidth(1000)
         self.setMinimumHeight(700)
@@ -731,6 +753,30 @@ class SettingsDialog(QDialog):
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(10)
 
+        # ── 입력 선택 그룹 (다중 입력) ──
+        group_input = QGroupBox("입력 선택")
+        input_row = QHBoxLayout(group_input)
+
+        lbl_input = QLabel("편집 대상 입력:")
+        lbl_input.setAlignment(Qt.AlignVCenter)
+        input_row.addWidget(lbl_input)
+
+        self._combo_input = QComboBox()
+        inputs = self._config.get("inputs") or [{"name": "IN1"}]
+        for i, d in enumerate(inputs):
+            self._combo_input.addItem(d.get("name") or f"IN{i + 1}", i)
+        self._combo_input.setFixedWidth(120)
+        self._combo_input.setEnabled(len(inputs) > 1)
+        self._combo_input.setToolTip(
+            "화면 표시·감지영역 편집·소스 변경 대상 입력 (Ctrl+1~9)\n"
+            "입력 추가/삭제는 설정 파일의 inputs 항목 편집 후 재시작"
+        )
+        self._combo_input.currentIndexChanged.connect(self._on_input_selected)
+        input_row.addWidget(self._combo_input)
+        input_row.addStretch()
+
+        layout.addWidget(group_input)
+
         # ── 캡처 포트 그룹 ──
         group = QGroupBox("캡처 포트")
         port_row = QHBoxLayout(group)
@@ -746,6 +792,23 @@ class SettingsDialog(QDialog):
         self._combo_port.setToolTip("0~5 고정 선택 / 선택 즉시 소스 변경")
         self._combo_port.currentIndexChanged.connect(self._on_port_changed)
         port_row.addWidget(self._combo_port)
+
+        port_row.addSpacing(20)
+        lbl_size = QLabel("입력 해상도:")
+        lbl_size.setAlignment(Qt.AlignVCenter)
+        port_row.addWidget(lbl_size)
+
+        self._combo_capture_size = QComboBox()
+        for key, name in zip(CAPTURE_SIZES, ("HD", "UHD")):
+            w, h = CAPTURE_SIZES[key]
+            self._combo_capture_size.addItem(f"{w}×{h} ({name})", key)
+        self._combo_capture_size.setFixedWidth(160)
+        self._combo_capture_size.setToolTip(
+            "캡처 카드에 요청할 해상도 (멀티뷰어 출력과 동일하게 선택)\n"
+            "감지영역 좌표는 입력 원본 해상도 기준 — 해상도 변경 시 감지영역 재설정 필요"
+        )
+        self._combo_capture_size.currentIndexChanged.connect(self._on_capture_size_changed)
+        port_row.addWidget(self._combo_capture_size)
         port_row.addStretch()
 
         layout.addWidget(group)
@@ -783,8 +846,70 @@ class SettingsDialog(QDialog):
         file_row.addWidget(btn_clear_file, 0, Qt.AlignVCenter)
 
         file_layout.addLayout(file_row)
+
+        # 합성 멀티뷰 테스트 소스 (장비 없이 블랙/스틸/무음 이벤트 재현)
+        synth_row = QHBoxLayout()
+        self._edit_synthetic_spec = QLineEdit(DEFAULT_SYNTHETIC_SPEC)
+        self._edit_synthetic_spec.setFixedHeight(_BTN_H)
+        self._edit_synthetic_spec.setToolTip(
+            "synthetic://열x행?size=WxH&fps=30&events=black:1@30-90,freeze:2@60-150,meter:3@30-90\n"
+            "events: 종류(black/freeze/meter):타일번호@시작초-종료초, none=이벤트 없음"
+        )
+        synth_row.addWidget(self._edit_synthetic_spec, 1, Qt.AlignVCenter)
+
+        btn_apply_synth = QPushButton("합성 소스")
+        btn_apply_synth.setMinimumWidth(80)
+        btn_apply_synth.setFixedHeight(_BTN_H)
+        btn_apply_synth.setToolTip("합성 멀티뷰 테스트 화면을 소스로 사용")
+        btn_apply_synth.clicked.connect(self._apply_synthetic_source)
+        synth_row.addWidget(btn_apply_synth, 0, Qt.AlignVCenter)
+
+        btn_synth_rois = QPushButton("영역 자동 배치")
+        btn_synth_rois.setMinimumWidth(100)
+        btn_synth_rois.setFixedHeight(_BTN_H)
+        btn_synth_rois.setToolTip("합성 화면 분할에 맞춰 비디오/오디오 감지영역을 다시 배치 (기존 영역 대체)")
+        btn_synth_rois.clicked.connect(self._place_synthetic_rois)
+        synth_row.addWidget(btn_synth_rois, 0, Qt.AlignVCenter)
+
+        file_layout.addLayout(synth_row)
         layout.addWidget(group_file)
 
+        # ── 네트워크 스트림 입력 그룹 ──
+        group_stream = QGroupBox("네트워크 스트림 입력")
+        stream_layout = QVBoxLayout(group_stream)
+        stream_layout.setSpacing(8)
+
+        desc_stream = QLabel(
+            "RTSP / SRT / UDP(MPEG-TS) 스트림 URL을 입력하면 포트 대신 스트림을 수신합니다.\n"
+            "예) rtsp://192.168.0.10/live, srt://192.168.0.10:9000, udp://239.0.0.1:5000\n"
+            "연결이 끊기면 1초부터 최대 30초 간격으로 자동 재연결합니다."
+        )
+        desc_stream.setObjectName("paramDescLabel")
+        desc_stream.setWordWrap(True)
+        stream_layout.addWidget(desc_stream)
+
+        stream_row = QHBoxLayout()
+        self._edit_stream_url = QLineEdit()
+        self._edit_stream_url.setPlaceholderText("(스트림 사용 안 함 — 포트 사용)")
+        self._edit_stream_url.setFixedHeight(_BTN_H)
+        self._edit_stream_url.returnPressed.connect(self._apply_stream_url)
+        stream_row.addWidget(self._edit_stream_url, 1, Qt.AlignVCenter)
+
+        btn_apply_stream = QPushButton("적용")
+        btn_apply_stream.setMinimumWidth(72)
+        btn_apply_stream.setFixedHeight(_BTN_H)
+        btn_apply_stream.clicked.connect(self._apply_stream_url)
+        stream_row.addWidget(btn_apply_stream, 0, Qt.AlignVCenter)
+
+        btn_clear_stream = QPushButton("초기화")
+        btn_clear_stream.setMinimumWidth(72)
+        btn_clear_stream.setFixedHeight(_BTN_H)
+        btn_clear_stream.clicked.connect(self._clear_stream_url)
+        stream_row.addWidget(btn_clear_stream, 0, Qt.AlignVCenter)
+
+        stream_layout.addLayout(stream_row)
+        layout.addWidget(group_stream)
+
         layout.addWidget(self._make_separator())
 
         # ── 자동 녹화 그룹 ──
@@ -828,10 +953,10 @@ class SettingsDialog(QDialog):
         range_layout.setSpacing(8)
 
         range_layout.addWidget(QLabel("사고 전 버퍼(초):"), 0, 0)
-        self._edit_pre_seconds = _NumEdit(5, 1, 30)
+        self._edit_pre_seconds = _NumEdit(5, 1, 300)
         self._edit_pre_seconds.editingFinished.connect(self._save_recording_params)
         range_layout.addWidget(self._edit_pre_seconds, 0, 1)
-        range_layout.addWidget(QLabel("(1~30, 기본값 5)"), 0, 2)
+        range_layout.addWidget(QLabel("(1~300, 기본값 5 — 30초 이상은 디스크 버퍼 권장)"), 0, 2)
 
         range_layout.addWidget(QLabel("사고 후 녹화(초):"), 1, 0)
         self._edit_post_seconds = _NumEdit(15, 1, 60)
@@ -839,6 +964,15 @@ class SettingsDialog(QDialog):
         range_layout.addWidget(self._edit_post_seconds, 1, 1)
         range_layout.addWidget(QLabel("(1~60, 기본값 15)"), 1, 2)
 
+        range_layout.addWidget(QLabel("사고 전 버퍼 저장:"), 2, 0)
+        self._combo_preroll_store = QComboBox()
+        self._combo_preroll_store.addItem("메모리 (RAM)", "memory")
+        self._combo_preroll_store.addItem("디스크 (메모리 맵 파일)", "disk")
+        self._combo_preroll_store.setCurrentIndex(0)  # 메모리 기본
+        self._combo_preroll_store.currentIndexChanged.connect(self._on_rec_output_changed)
+        range_layout.addWidget(self._combo_preroll_store, 2, 1)
+        range_layout.addWidget(QLabel("(디스크: RAM 사용량 일정, 재시작 후에도 유지)"), 2, 2)
+
         range_layout.setColumnStretch(2, 1)
         layout.addWidget(group_range)
 
@@ -852,6 +986,12 @@ class SettingsDialog(QDialog):
         self._edit_max_days.editingFinished.connect(self._save_recording_params)
         mgmt_layout.addWidget(self._edit_max_days, 0, 1)
         mgmt_layout.addWidget(QLabel("(1~365, 보관 기간 초과 파일은 자동 삭제)"), 0, 2)
+
+        mgmt_layout.addWidget(QLabel("최대 총 용량(GB):"), 1, 0)
+        self._edit_max_total_gb = _NumEdit(0, 0, 10000)
+        self._edit_max_total_gb.editingFinished.connect(self._save_recording_params)
+        mgmt_layout.addWidget(self._edit_max_total_gb, 1, 1)
+        mgmt_layout.addWidget(QLabel("(0~10000, 0=제한 없음 — 초과 시 오래된 녹화부터 삭제)"), 1, 2)
         mgmt_layout.setColumnStretch(2, 1)
         layout.addWidget(group_mgmt)
 
@@ -881,9 +1021,63 @@ class SettingsDialog(QDialog):
         self._combo_rec_fps.currentIndexChanged.connect(self._on_rec_output_changed)
         output_layout.addWidget(self._combo_rec_fps, 1, 1)
 
+        output_layout.addWidget(QLabel("인코딩 방식:"), 2, 0)
+        self._combo_rec_encoder = QComboBox()
+        self._combo_rec_encoder.addItem("단일 패스 (ffmpeg H.264/AAC)", "pipe")
+        self._combo_rec_encoder.addItem("2단계 (mp4v + ffmpeg 합성)", "twopass")
+        self._combo_rec_encoder.setCurrentIndex(0)  # 단일 패스 기본
+        self._combo_rec_encoder.currentIndexChanged.connect(self._on_rec_output_changed)
+        output_layout.addWidget(self._combo_rec_encoder, 2, 1)
+
+        output_layout.addWidget(QLabel("동시 합성 작업:"), 3, 0)
+        self._edit_mux_workers = _NumEdit(2, 1, 8)
+        self._edit_mux_workers.editingFinished.connect(self._save_recording_params)
+        output_layout.addWidget(self._edit_mux_workers, 3, 1)
+        output_layout.addWidget(QLabel("(1~8, 전 입력 공유 — ffmpeg 합성/클립 추출)"), 3, 2)
+
+        output_layout.addWidget(QLabel("감지영역 클립:"), 4, 0)
+        self._combo_roi_clip = QComboBox()
+        self._combo_roi_clip.addItem("사용 안 함 (전체 화면만)", "off")
+        self._combo_roi_clip.addItem("전체 화면 + 감지영역", "also")
+        self._combo_roi_clip.addItem("감지영역만", "only")
+        self._combo_roi_clip.setCurrentIndex(0)  # 사용 안 함 기본
+        self._combo_roi_clip.currentIndexChanged.connect(self._save_recording_params)
+        output_layout.addWidget(self._combo_roi_clip, 4, 1)
+        output_layout.addWidget(QLabel("(블랙/스틸 알림 영역을 원본 해상도로 잘라 별도 클립 저장)"), 4, 2)
+
         output_layout.setColumnStretch(2, 1)
         layout.addWidget(group_output)
 
+        # ── 상시 세그먼트 녹화 그룹 ──
+        group_ring = QGroupBox("상시 세그먼트 녹화")
+        ring_layout = QGridLayout(group_ring)
+        ring_layout.setSpacing(8)
+
+        self._chk_rec_continuous = QCheckBox("상시 녹화 후 사고 구간 잘라내기 (ffmpeg 필요)")
+        self._chk_rec_continuous.stateChanged.connect(self._save_recording_params)
+        ring_layout.addWidget(self._chk_rec_continuous, 0, 0, 1, 3)
+
+        ring_layout.addWidget(QLabel("사고 전 구간(초):"), 1, 0)
+        self._edit_ring_pre_seconds = _NumEdit(60, 5, 1800)
+        self._edit_ring_pre_seconds.editingFinished.connect(self._save_recording_params)
+        ring_layout.addWidget(self._edit_ring_pre_seconds, 1, 1)
+        ring_layout.addWidget(QLabel("(5~1800, 상시 녹화 사용 시 적용)"), 1, 2)
+
+        ring_layout.addWidget(QLabel("세그먼트 길이(초):"), 2, 0)
+        self._edit_segment_seconds = _NumEdit(10, 2, 60)
+        self._edit_segment_seconds.editingFinished.connect(self._save_recording_params)
+        ring_layout.addWidget(self._edit_segment_seconds, 2, 1)
+        ring_layout.addWidget(QLabel("(2~60, 기본값 10)"), 2, 2)
+
+        ring_layout.addWidget(QLabel("링 보관 길이(분):"), 3, 0)
+        self._edit_ring_minutes = _NumEdit(10, 1, 240)
+        self._edit_ring_minutes.editingFinished.connect(self._save_recording_params)
+        ring_layout.addWidget(self._edit_ring_minutes, 3, 1)
+        ring_layout.addWidget(QLabel("(1~240, 초과분은 오래된 세그먼트부터 삭제)"), 3, 2)
+
+        ring_layout.setColumnStretch(2, 1)
+        layout.addWidget(group_ring)
+
         self._rec_info_lbl = QLabel()
         self._rec_info_lbl.setObjectName("settingsInfoLabel")
         self._rec_info_lbl.setStyleSheet("color: #808090; font-size: 11px;")
@@ -899,7 +1093,7 @@ class SettingsDialog(QDialog):
         btn_reset_input_tab = QPushButton("영상설정 전체 초기화")
         btn_reset_input_tab.setFixedHeight(_BTN_H)
         btn_reset_input_tab.setToolTip(
-            "포트, 파일 입력, 자동 녹화 설정을 모두 기본값으로 초기화합니다."
+            "포트, 파일/스트림 입력, 자동 녹화 설정을 모두 기본값으로 초기화합니다."
         )
         btn_reset_input_tab.clicked.connect(self._reset_input_tab)
         layout.addWidget(btn_reset_input_tab)
@@ -917,11 +1111,59 @@ class SettingsDialog(QDialog):
             self._edit_video_file.setCursorPosition(0)
             self.video_file_changed.emit(path)
 
+    def _apply_synthetic_source(self):
+        """합성 멀티뷰 테스트 소스 적용 (파일 입력 자리 사용)"""
+        spec = self._edit_synthetic_spec.text().strip() or DEFAULT_SYNTHETIC_SPEC
+        if not is_synthetic_source(spec):
+            QMessageBox.warning(self, "합성 소스 오류", "synthetic:// 로 시작해야 합니다.")
+            return
+        self._edit_video_file.setText(spec)
+        self._edit_video_file.setCursorPosition(0)
+        self.video_file_changed.emit(spec)
+
+    def _place_synthetic_rois(self):
+        """합성 소스 분할 레이아웃과 일치하는 감지영역으로 교체"""
+        spec = self._edit_synthetic_spec.text().strip() or DEFAULT_SYNTHETIC_SPEC
+        if not is_synthetic_source(spec):
+            return
+        reply = QMessageBox.question(
+            self, "감지영역 자동 배치",
+            "현재 입력의 비디오/오디오 감지영역을 합성 화면 분할에 맞춰 다시 배치합니다.\n"
+            "기존 감지영역은 삭제됩니다. 계속할까요?",
+        )
+        if reply != QMessageBox.Yes:
+            return
+        video_rois, audio_rois = SyntheticMultiview.from_spec(spec).tile_rois()
+        self._roi_manager.replace_video_rois(video_rois)
+        self._roi_manager.replace_audio_rois(audio_rois)
+        self.refresh_roi_tables()
+        self.roi_list_changed.emit("video")
+        self.roi_list_changed.emit("audio")
+
     def _clear_video_file(self):
         """영상 파일 초기화 (포트 소스로 복귀)"""
         self._edit_video_file.clear()
         self.video_file_changed.emit("")
 
+    def _apply_stream_url(self):
+        """입력된 스트림 URL 적용 (빈 값이면 포트 소스로 복귀)"""
+        url = self._edit_stream_url.text().strip()
+        if url and not is_stream_url(url):
+            QMessageBox.warning(
+                self, "스트림 URL 오류",
+                "지원하지 않는 URL 형식입니다.\n"
+                "rtsp://, srt://, udp://, rtp://, tcp://, http(s):// 로 시작해야 합니다.",
+            )
+            return
+        self._config["stream_url"] = url
+        self.stream_url_changed.emit(url)
+
+    def _clear_stream_url(self):
+        """스트림 URL 초기화 (포트 소스로 복귀)"""
+        self._edit_stream_url.clear()
+        self._config["stream_url"] = ""
+        self.stream_url_changed.emit("")
+
     # ── 탭 2: 비디오 감지 설정 ──────────────────────
 
     def _create_tab_video_roi(self) -> QWidget:
@@ -1362,9 +1604,9 @@ class SettingsDialog(QDialog):
         lbl_sf = QLabel("▪  감지 해상도:")
         lbl_sf.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         self._combo_scale_factor = QComboBox()
-        for label, val in [("원본 (1920×1080)", 1.0),
-                            ("50% (960×540)",   0.5),
-                            ("25% (480×270)",   0.25)]:
+        for label, val in [("원본 (입력 해상도)", 1.0),
+                            ("50%",              0.5),
+                            ("25%",              0.25)]:
             self._combo_scale_factor.addItem(label, val)
         self._combo_scale_factor.setCurrentIndex(0)  # 기본: 원본
         self._combo_scale_factor.setFixedWidth(160)
@@ -1375,6 +1617,21 @@ class SettingsDialog(QDialog):
         grid_p.addWidget(self._combo_scale_factor,  1, 1)
         grid_p.addWidget(desc_sf,                   1, 2)
 
+        lbl_dfps = QLabel("▪  화면 표시:")
+        lbl_dfps.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        self._combo_display_fps = QComboBox()
+        for val in DISPLAY_FPS_CHOICES:
+            self._combo_display_fps.addItem(f"{val}fps", val)
+        self._combo_display_fps.setCurrentIndex(
+            self._combo_display_fps.findData(DEFAULT_DISPLAY_FPS))
+        self._combo_display_fps.setFixedWidth(110)
+        self._combo_display_fps.currentIndexChanged.connect(self._save_performance_params)
+        desc_dfps = QLabel("화면 갱신 최대 속도 (감지와 무관, 15fps 시 화면 표시 CPU 부하 절반)")
+        desc_dfps.setObjectName("paramDescLabel")
+        grid_p.addWidget(lbl_dfps,                  6, 0)
+        grid_p.addWidget(self._combo_display_fps,   6, 1)
+        grid_p.addWidget(desc_dfps,                 6, 2)
+
         lbl_bde = QLabel("▪  블랙 감지:")
         lbl_bde.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         self._chk_black_detect = QCheckBox("블랙 감지 활성화")
@@ -1557,6 +1814,19 @@ class SettingsDialog(QDialog):
         self._chk_telegram_send_image.stateChanged.connect(self._save_telegram_params)
         tg_opt_layout.addWidget(self._chk_telegram_send_image)
 
+        image_row = QHBoxLayout()
+        image_row.addWidget(QLabel("이미지 크기:"))
+        self._combo_tg_image_width = QComboBox()
+        for text, width in [("원본", 0), ("1920 폭", 1920), ("1280 폭 (기본값)", 1280),
+                            ("960 폭", 960), ("640 폭", 640)]:
+            self._combo_tg_image_width.addItem(text, width)
+        self._combo_tg_image_width.setCurrentIndex(2)  # 1280 기본
+        self._combo_tg_image_width.currentIndexChanged.connect(self._save_telegram_params)
+        image_row.addWidget(self._combo_tg_image_width)
+        image_row.addWidget(QLabel("(입력이 더 크면 축소 후 전송)"))
+        image_row.addStretch()
+        tg_opt_layout.addLayout(image_row)
+
         self._chk_tg_black = QCheckBox("블랙 감지 알림")
         self._chk_tg_still = QCheckBox("스틸 감지 알림")
         self._chk_tg_audio = QCheckBox("오디오 레벨미터 감지 알림")
@@ -1575,6 +1845,24 @@ class SettingsDialog(QDialog):
         cooldown_row.addStretch()
         tg_opt_layout.addLayout(cooldown_row)
 
+        batch_row = QHBoxLayout()
+        batch_row.addWidget(QLabel("묶음 전송 대기(초):"))
+        self._edit_tg_batch = _NumEdit(2, 0, 10)
+        self._edit_tg_batch.editingFinished.connect(self._save_telegram_params)
+        batch_row.addWidget(self._edit_tg_batch)
+        batch_row.addWidget(QLabel("(N초 동안 모인 알림을 요약 1건 + 사진 앨범으로, 0=즉시 개별 전송)"))
+        batch_row.addStretch()
+        tg_opt_layout.addLayout(batch_row)
+
+        delay_row = QHBoxLayout()
+        delay_row.addWidget(QLabel("전송 기한(초):"))
+        self._edit_tg_max_delay = _NumEdit(120, 0, 3600)
+        self._edit_tg_max_delay.editingFinished.connect(self._save_telegram_params)
+        delay_row.addWidget(self._edit_tg_max_delay)
+        delay_row.addWidget(QLabel("(네트워크 장애로 N초 넘게 밀린 알림은 지연 요약 1건으로, 0=무제한)"))
+        delay_row.addStretch()
+        tg_opt_layout.addLayout(delay_row)
+
         layout.addWidget(group_tg_opt)
 
         layout.addWidget(self._make_separator())
@@ -1629,18 +1917,23 @@ class SettingsDialog(QDialog):
         self._lbl_telegram_test.setStyleSheet(f"color: {color};")
 
     def _get_telegram_params(self) -> dict:
-        """현재 텔레그램 설정 UI 값을 dict로 반환"""
-        return {
+        """현재 텔레그램 설정 UI 값을 dict로 반환 (UI 항목이 없는 설정 파일 값은 유지)"""
+        params = dict(self._config.get("telegram", {}))
+        params.update({
             "enabled": self._chk_telegram_enabled.isChecked(),
             "bot_token": self._edit_bot_token.text(),
             "chat_id": self._edit_chat_id.text(),
             "send_image": self._chk_telegram_send_image.isChecked(),
+            "image_width": self._combo_tg_image_width.currentData(),
             "cooldown": self._edit_tg_cooldown.get_value(),
+            "batch_seconds": self._edit_tg_batch.get_value(),
+            "max_delay": self._edit_tg_max_delay.get_value(),
             "notify_black": self._chk_tg_black.isChecked(),
             "notify_still": self._chk_tg_still.isChecked(),
             "notify_audio_level": self._chk_tg_audio.isChecked(),
             "notify_embedded": self._chk_tg_embedded.isChecked(),
-        }
+        })
+        return params
 
     def _save_telegram_params(self):
         """텔레그램 설정을 config에 저장하고 신호 발송"""
@@ -1653,6 +1946,7 @@ class SettingsDialog(QDialog):
         tg = config.get("telegram", {})
         self._chk_telegram_enabled.blockSignals(True)
         self._chk_telegram_send_image.blockSignals(True)
+        self._combo_tg_image_width.blockSignals(True)
         self._chk_tg_black.blockSignals(True)
         self._chk_tg_still.blockSignals(True)
         self._chk_tg_audio.blockSignals(True)
@@ -1662,7 +1956,11 @@ class SettingsDialog(QDialog):
         self._edit_bot_token.setText(tg.get("bot_token", ""))
         self._edit_chat_id.setText(tg.get("chat_id", ""))
         self._chk_telegram_send_image.setChecked(bool(tg.get("send_image", True)))
+        idx = self._combo_tg_image_width.findData(int(tg.get("image_width", 1280)))
+        self._combo_tg_image_width.setCurrentIndex(idx if idx >= 0 else 2)
         self._edit_tg_cooldown.setText(str(int(tg.get("cooldown", 60))))
+        self._edit_tg_batch.setText(str(int(tg.get("batch_seconds", 2))))
+        self._edit_tg_max_delay.setText(str(int(tg.get("max_delay", 120))))
         self._chk_tg_black.setChecked(bool(tg.get("notify_black", True)))
         self._chk_tg_still.setChecked(bool(tg.get("notify_still", True)))
         self._chk_tg_audio.setChecked(bool(tg.get("notify_audio_level", True)))
@@ -1670,6 +1968,7 @@ class SettingsDialog(QDialog):
 
         self._chk_telegram_enabled.blockSignals(False)
         self._chk_telegram_send_image.blockSignals(False)
+        self._combo_tg_image_width.blockSignals(False)
         self._chk_tg_black.blockSignals(False)
         self._chk_tg_still.blockSignals(False)
         self._chk_tg_audio.blockSignals(False)
@@ -1712,11 +2011,20 @@ class SettingsDialog(QDialog):
             "enabled": self._chk_recording_enabled.isChecked(),
             "save_dir": self._edit_rec_dir.text() or "recordings",
             "pre_seconds": self._edit_pre_seconds.get_value(),
+            "preroll_store": self._combo_preroll_store.currentData(),
             "post_seconds": self._edit_post_seconds.get_value(),
             "max_keep_days": self._edit_max_days.get_value(),
+            "max_total_gb": self._edit_max_total_gb.get_value(),
             "output_width": w,
             "output_height": h,
             "output_fps": self._combo_rec_fps.currentData(),
+            "encoder": self._combo_rec_encoder.currentData(),
+            "roi_clip": self._combo_roi_clip.currentData(),
+            "continuous": self._chk_rec_continuous.isChecked(),
+            "segment_seconds": self._edit_segment_seconds.get_value(),
+            "ring_minutes": self._edit_ring_minutes.get_value(),
+            "continuous_pre_seconds": self._edit_ring_pre_seconds.get_value(),
+            "mux_workers": self._edit_mux_workers.get_value(),
         }
 
     def _save_recording_params(self):
@@ -1726,7 +2034,7 @@ class SettingsDialog(QDialog):
         self.recording_settings_changed.emit(params)
 
     def _on_rec_output_changed(self):
-        """해상도/FPS 콤보박스 변경 시 정보 라벨 갱신 후 저장"""
+        """해상도/FPS/인코딩 콤보박스 변경 시 정보 라벨 갱신 후 저장"""
         self._update_rec_info_label()
         self._save_recording_params()
 
@@ -1740,20 +2048,28 @@ class SettingsDialog(QDialog):
             pre = self._edit_pre_seconds.get_value()
         except Exception:
             pre = 5
-        # JPEG 85% 기준 약 8:1 압축비로 버퍼 메모리 추정
+        # JPEG 85% 기준 약 8:1 압축비로 버퍼 메모리 추정 (디스크 버퍼는 슬롯 3배 여유로 파일 크기)
         buf_mb = (w * h * 3 / 8) * (pre * fps) / 1024 / 1024
+        if self._combo_preroll_store.currentData() == "disk":
+            buf_text = f"버퍼 파일: 약 {buf_mb * 3:.0f} MB (RAM 일정)"
+        else:
+            buf_text = f"버퍼 메모리: 약 {buf_mb:.1f} MB"
         post = 15
         try:
             post = self._edit_post_seconds.get_value()
         except Exception:
             pass
         duration = pre + post
-        # 파일 크기 추정: 비압축 대비 mp4v 약 1/15 압축
-        size_mb_low  = int(w * h * 3 * fps * duration / 15 / 1024 / 1024 * 0.7)
-        size_mb_high = int(w * h * 3 * fps * duration / 15 / 1024 / 1024 * 1.3)
+        # 파일 크기 추정: 비압축 대비 mp4v 약 1/15, H.264(crf 23) 약 1/50 압축
+        if self._combo_rec_encoder.currentData() == "twopass":
+            ratio, codec = 15, "mp4v"
+        else:
+            ratio, codec = 50, "H.264/AAC"
+        size_mb_low  = int(w * h * 3 * fps * duration / ratio / 1024 / 1024 * 0.7)
+        size_mb_high = int(w * h * 3 * fps * duration / ratio / 1024 / 1024 * 1.3)
         self._rec_info_lbl.setText(
-            f"출력 해상도: {w}×{h}  |  FPS: {fps}  |  버퍼 메모리: 약 {buf_mb:.1f} MB\n"
-            f"녹화 파일 크기: 약 {size_mb_low}~{size_mb_high} MB / {duration}초  |  코덱: mp4v"
+            f"출력 해상도: {w}×{h}  |  FPS: {fps}  |  {buf_text}\n"
+            f"녹화 파일 크기: 약 {size_mb_low}~{size_mb_high} MB / {duration}초  |  코덱: {codec}"
         )
 
     def _reset_input_tab(self):
@@ -1767,9 +2083,18 @@ class SettingsDialog(QDialog):
         self._combo_port.blockSignals(False)
         self.port_changed.emit(0)
 
+        # 입력 해상도 초기화 (1920×1080)
+        self._set_capture_size_combo(
+            DEFAULT_CONFIG.get("capture_width", 1920), DEFAULT_CONFIG.get("capture_height", 1080)
+        )
+        self._on_capture_size_changed(self._combo_capture_size.currentIndex())
+
         # 파일 입력 초기화
         self._clear_video_file()
 
+        # 스트림 입력 초기화
+        self._clear_stream_url()
+
         # 녹화 설정 초기화
         self._chk_recording_enabled.blockSignals(True)
         self._chk_recording_enabled.setChecked(bool(default_rec.get("enabled", False)))
@@ -1777,8 +2102,13 @@ class SettingsDialog(QDialog):
 
         self._edit_rec_dir.setText(default_rec.get("save_dir", "recordings"))
         self._edit_pre_seconds.setText(str(int(default_rec.get("pre_seconds", 5))))
+        self._combo_preroll_store.blockSignals(True)
+        idx = self._combo_preroll_store.findData(default_rec.get("preroll_store", "memory"))
+        self._combo_preroll_store.setCurrentIndex(max(0, idx))
+        self._combo_preroll_store.blockSignals(False)
         self._edit_post_seconds.setText(str(int(default_rec.get("post_seconds", 15))))
         self._edit_max_days.setText(str(int(default_rec.get("max_keep_days", 7))))
+        self._edit_max_total_gb.setText(str(int(default_rec.get("max_total_gb", 0))))
 
         # 해상도/FPS 초기화 (960×540, 10fps)
         default_w = default_rec.get("output_width", 960)
@@ -1786,6 +2116,18 @@ class SettingsDialog(QDialog):
         default_fps = default_rec.get("output_fps", 10)
         self._set_rec_resolution_combo(default_w, default_h)
         self._set_rec_fps_combo(default_fps)
+        self._set_rec_encoder_combo(default_rec.get("encoder", "pipe"))
+        self._combo_roi_clip.blockSignals(True)
+        idx = self._combo_roi_clip.findData(default_rec.get("roi_clip", "off"))
+        self._combo_roi_clip.setCurrentIndex(max(0, idx))
+        self._combo_roi_clip.blockSignals(False)
+        self._chk_rec_continuous.blockSignals(True)
+        self._chk_rec_continuous.setChecked(bool(default_rec.get("continuous", False)))
+        self._chk_rec_continuous.blockSignals(False)
+        self._edit_segment_seconds.setText(str(int(default_rec.get("segment_seconds", 10))))
+        self._edit_ring_minutes.setText(str(int(default_rec.get("ring_minutes", 10))))
+        self._edit_ring_pre_seconds.setText(str(int(default_rec.get("continuous_pre_seconds", 60))))
+        self._edit_mux_workers.setText(str(int(default_rec.get("mux_workers", 2))))
 
         self._update_rec_info_label()
         self._save_recording_params()
@@ -1807,6 +2149,11 @@ class SettingsDialog(QDialog):
                 return
         self._combo_rec_fps.setCurrentIndex(1)  # 10fps 기본
 
+    def _set_rec_encoder_combo(self, encoder: str):
+        """인코딩 방식 콤보박스 선택 (알 수 없는 값이면 단일 패스)"""
+        idx = self._combo_rec_encoder.findData(encoder)
+        self._combo_rec_encoder.setCurrentIndex(idx if idx >= 0 else 0)
+
     def _load_recording_config(self, config: dict):
         """녹화 설정 UI 로드"""
         rec = config.get("recording", {})
@@ -1815,18 +2162,37 @@ class SettingsDialog(QDialog):
         self._chk_recording_enabled.blockSignals(False)
         self._edit_rec_dir.setText(rec.get("save_dir", "recordings"))
         self._edit_pre_seconds.setText(str(int(rec.get("pre_seconds", 5))))
+        self._combo_preroll_store.blockSignals(True)
+        idx = self._combo_preroll_store.findData(rec.get("preroll_store", "memory"))
+        self._combo_preroll_store.setCurrentIndex(max(0, idx))
+        self._combo_preroll_store.blockSignals(False)
         self._edit_post_seconds.setText(str(int(rec.get("post_seconds", 15))))
         self._edit_max_days.setText(str(int(rec.get("max_keep_days", 7))))
+        self._edit_max_total_gb.setText(str(int(rec.get("max_total_gb", 0))))
         # 해상도/FPS 콤보 복원
         self._combo_rec_resolution.blockSignals(True)
         self._combo_rec_fps.blockSignals(True)
+        self._combo_rec_encoder.blockSignals(True)
         self._set_rec_resolution_combo(
             int(rec.get("output_width", 960)),
             int(rec.get("output_height", 540)),
         )
         self._set_rec_fps_combo(int(rec.get("output_fps", 10)))
+        self._set_rec_encoder_combo(rec.get("encoder", "pipe"))
         self._combo_rec_resolution.blockSignals(False)
         self._combo_rec_fps.blockSignals(False)
+        self._combo_rec_encoder.blockSignals(False)
+        self._combo_roi_clip.blockSignals(True)
+        idx = self._combo_roi_clip.findData(rec.get("roi_clip", "off"))
+        self._combo_roi_clip.setCurrentIndex(max(0, idx))
+        self._combo_roi_clip.blockSignals(False)
+        self._chk_rec_continuous.blockSignals(True)
+        self._chk_rec_continuous.setChecked(bool(rec.get("continuous", False)))
+        self._chk_rec_continuous.blockSignals(False)
+        self._edit_segment_seconds.setText(str(int(rec.get("segment_seconds", 10))))
+        self._edit_ring_minutes.setText(str(int(rec.get("ring_minutes", 10))))
+        self._edit_ring_pre_seconds.setText(str(int(rec.get("continuous_pre_seconds", 60))))
+        self._edit_mux_workers.setText(str(int(rec.get("mux_workers", 2))))
         self._update_rec_info_label()
 
     # ── 탭 8: 저장/불러오기 ──────────────────────────
@@ -1999,6 +2365,11 @@ class SettingsDialog(QDialog):
                 self._combo_detect_interval.setCurrentIndex(i)
                 self._combo_detect_interval.blockSignals(False)
                 break
+        fps_idx = self._combo_display_fps.findData(int(perf.get("display_fps", DEFAULT_DISPLAY_FPS)))
+        if fps_idx >= 0:
+            self._combo_display_fps.blockSignals(True)
+            self._combo_display_fps.setCurrentIndex(fps_idx)
+            self._combo_display_fps.blockSignals(False)
         scale = float(perf.get("scale_factor", 1.0))
         for i in range(self._combo_scale_factor.count()):
             if abs(self._combo_scale_factor.itemData(i) - scale) < 0.01:
@@ -2020,12 +2391,20 @@ class SettingsDialog(QDialog):
         self._chk_embedded_detect.blockSignals(False)
 
     def _load_config(self, config: dict):
-        port = config.get("port", 0)
+        # 다중 입력: 표시 중인 입력의 소스 설정을 표시
+        inputs = config.get("inputs") or []
+        src = inputs[self._active_input] if self._active_input < len(inputs) else config
+        port = src.get("port", 0)
         idx = self._combo_port.findData(port)
         if idx >= 0:
             self._combo_port.blockSignals(True)
             self._combo_port.setCurrentIndex(idx)
             self._combo_port.blockSignals(False)
+        self._edit_stream_url.setText(src.get("stream_url", ""))
+        self._edit_stream_url.setCursorPosition(0)
+        self._set_capture_size_combo(
+            config.get("capture_width", 1920), config.get("capture_height", 1080)
+        )
 
         self._apply_detection_params_to_ui(config.get("detection", {}))
         self._apply_performance_params_to_ui(config.get("performance", {}))
@@ -2079,6 +2458,23 @@ class SettingsDialog(QDialog):
         self._lbl_v_val.setText(f"{v_min} ~ {v_max}")
         self._save_detection_params()
 
+    def set_active_input(self, index: int, roi_manager: ROIManager,
+                         port: int, stream_url: str):
+        """표시 입력 전환 시 ROI 테이블/소스 표시를 해당 입력 기준으로 교체 (시그널 재발생 없음)"""
+        self._active_input = index
+        self._roi_manager = roi_manager
+        self._combo_input.blockSignals(True)
+        self._combo_input.setCurrentIndex(index)
+        self._combo_input.blockSignals(False)
+        idx = self._combo_port.findData(port)
+        if idx >= 0:
+            self._combo_port.blockSignals(True)
+            self._combo_port.setCurrentIndex(idx)
+            self._combo_port.blockSignals(False)
+        self._edit_stream_url.setText(stream_url)
+        self._edit_stream_url.setCursorPosition(0)
+        self.refresh_roi_tables()
+
     def refresh_roi_tables(self):
         """ROI 테이블을 현재 ROI 매니저 상태로 갱신"""
         self._fill_table(self._table_video, self._roi_manager.video_rois)
@@ -2250,6 +2646,7 @@ class SettingsDialog(QDialog):
         """현재 성능 설정 UI 값을 dict로 반환"""
         return {
             "detection_interval":        self._combo_detect_interval.currentData(),
+            "display_fps":               self._combo_display_fps.currentData(),
             "scale_factor":              self._combo_scale_factor.currentData(),
             "black_detection_enabled":   self._chk_black_detect.isChecked(),
             "still_detection_enabled":   self._chk_still_detect.isChecked(),
@@ -2290,64 +2687,22 @@ class SettingsDialog(QDialog):
 
         sf = self._combo_scale_factor.currentData()
 
-        # 1920×1080 더미 프레임 (실제 입력 해상도 기준)
-        frame_orig = np.random.randint(30, 200, (1080, 1920, 3), dtype=np.uint8)
-        if sf < 1.0:
-            frame = cv2.resize(frame_orig, None, fx=sf, fy=sf,
-                               interpolation=cv2.INTER_AREA)
-        else:
-            frame = frame_orig
-
-        fh, fw = frame.shape[:2]
-        # HSV 범위 (처리 시간 측정이 목적이므로 범위값은 무관)
-        lower = np.array([0, 30, 30], dtype=np.uint8)
-        upper = np.array([180, 255, 255], dtype=np.uint8)
-
-        N_ITER = 10
-        prev_frames: dict = {}
-
-        t0 = time.perf_counter()
-        for _ in range(N_ITER):
-            # 비디오 ROI — 블랙/스틸 감지 시뮬레이션
-            for roi in video_rois:
-                x1 = max(0, int(roi.x * sf))
-                y1 = max(0, int(roi.y * sf))
-                x2 = min(fw, int((roi.x + roi.w) * sf))
-                y2 = min(fh, int((roi.y + roi.h) * sf))
-                if x2 <= x1 or y2 <= y1:
-                    continue
-                crop = frame[y1:y2, x1:x2]
-                if black_on:
-                    float(np.mean(crop.mean(axis=2)))
-                if still_on:
-                    crop_f = crop.astype(np.float32)
-                    lbl = roi.label
-                    if lbl in prev_frames:
-                        prev = prev_frames[lbl]
-                        if prev.shape == crop_f.shape:
-                            float(np.mean(np.abs(crop_f - prev)))
-                    prev_frames[lbl] = crop_f
-
-            # 오디오 ROI — HSV 감지 시뮬레이션
-            if audio_on:
-                for roi in audio_rois:
-                    x1 = max(0, int(roi.x * sf))
-                    y1 = max(0, int(roi.y * sf))
-                    x2 = min(fw, int((roi.x + roi.w) * sf))
-                    y2 = min(fh, int((roi.y + roi.h) * sf))
-                    if x2 <= x1 or y2 <= y1:
-                        continue
-                    crop_bgr = frame[y1:y2, x1:x2]
-                    crop_hsv = cv2.cvtColor(crop_bgr, cv2.COLOR_BGR2HSV)
-                    mask = cv2.inRange(crop_hsv, lower, upper)
-                    int(np.sum(mask > 0))
-
-            # 임베디드 오디오 — 무음 감지 시뮬레이션 (update_embedded_silence와 동일한 연산)
-            if embedded_on:
-                _now = time.perf_counter()
-                _elapsed = _now - t0
-
-        elapsed_ms = (time.perf_counter() - t0) / N_ITER * 1000
+        # 실제 감지 경로(Detector)로 입력 해상도 프레임 측정 — ROI 좌표는 원본 해상도 기준
+        def _bench_detector() -> Detector:
+            det = Detector()
+            det.scale_factor = sf
+            det.black_detection_enabled = black_on
+            det.still_detection_enabled = still_on
+            return det
+
+        cap_w, cap_h = CAPTURE_SIZES.get(self._combo_capture_size.currentData(), HD_SIZE)
+        bench = run_benchmark(
+            _bench_detector(), make_bench_frames(cap_w, cap_h),
+            video_rois, audio_rois, iterations=10, audio_enabled=audio_on,
+        )
+        elapsed_ms = bench["avg_ms"]
+        # UHD 16분할 기준 (비디오 16 + 오디오 16) — 기본 감지 주기 예산 대비 여유 확인
+        uhd = run_grid_benchmark(UHD_SIZE, iterations=5, detector=_bench_detector())
 
         # 최적 주기 결정: 처리 시간이 주기의 50% 이하가 되는 최소 단계
         candidates = [100, 200, 300, 500, 1000]
@@ -2377,9 +2732,12 @@ class SettingsDialog(QDialog):
 
         detect_str = " + ".join(detect_parts)
         sf_pct = int(sf * 100)
+        uhd_ok = uhd["avg_ms"] <= DETECTION_BUDGET_MS
         result = (
-            f"[{detect_str} | 해상도 {sf_pct}%]  "
-            f"1회 처리 {elapsed_ms:.1f}ms → {target_interval}ms 주기 자동 적용"
+            f"[{detect_str} | {cap_w}×{cap_h} | 해상도 {sf_pct}%]  "
+            f"1회 처리 {elapsed_ms:.1f}ms → {target_interval}ms 주기 자동 적용\n"
+            f"UHD 16분할 기준: {uhd['avg_ms']:.1f}ms "
+            f"({'통과' if uhd_ok else '초과'} — 예산 {DETECTION_BUDGET_MS:.0f}ms)"
         )
         if elapsed_ms > 500:
             result += "  ※ 처리 부하가 높습니다. 해상도를 낮추거나 감지 항목을 줄이세요."
@@ -2393,12 +2751,35 @@ class SettingsDialog(QDialog):
         dlg = PerformanceGuideDialog(self)
         dlg.exec()
 
-    # ── 포트 변경 ─────────────────────────────────────
+    # ── 입력 선택 / 포트 변경 ───────────────────────────
+
+    def _on_input_selected(self, index: int):
+        if index >= 0:
+            self.active_input_changed.emit(index)
+
+    def _set_capture_size_combo(self, width: int, height: int):
+        """입력 해상도 콤보 선택 (시그널 발생 없음)"""
+        idx = self._combo_capture_size.findData(f"{int(width)}x{int(height)}")
+        if idx >= 0:
+            self._combo_capture_size.blockSignals(True)
+            self._combo_capture_size.setCurrentIndex(idx)
+            self._combo_capture_size.blockSignals(False)
+
+    def _on_capture_size_changed(self, index: int):
+        key = self._combo_capture_size.currentData()
+        if key in CAPTURE_SIZES:
+            w, h = CAPTURE_SIZES[key]
+            self._config["capture_width"] = w
+            self._config["capture_height"] = h
+            self.capture_size_changed.emit(w, h)
 
     def _on_port_changed(self, index: int):
         port = self._combo_port.currentData()
         if port is not None:
             self._config["port"] = port
+            # 포트 선택 시 스트림 소스 해제 (포트 우선)
+            self._config["stream_url"] = ""
+            self._edit_stream_url.clear()
             self.port_changed.emit(port)
 
     # ── 닫기 이벤트 (X 버튼) ─────────────────────────
@@ -2860,8 +3241,8 @@ class SettingsDialog(QDialog):
 
     def _open_signoff_roi_dialog(self, gid: int):
         """감지영역 선택 다이얼로그를 열고 결과를 저장한다."""
-        video_rois = [(r.label, r.media_name) for r in self._roi_manager.video_rois]
-        audio_rois = [(r.label, r.media_name) for r in self._roi_manager.audio_rois]
+        video_rois = [(r.label, r.media_name) for r in self._signoff_roi_manager.video_rois]
+        audio_rois = [(r.label, r.media_name) for r in self._signoff_roi_manager.audio_rois]
         enter_label = self._signoff_enter_label.get(gid, "")
         suppressed_labels = self._signoff_suppressed_labels.get(gid, [])
 
@@ -2880,8 +3261,8 @@ class SettingsDialog(QDialog):
             return
         enter_label = self._signoff_enter_label.get(gid, "")
         suppressed = self._signoff_suppressed_labels.get(gid, [])
-        label_to_media = {r.label: r.media_name for r in self._roi_manager.video_rois}
-        label_to_media.update({r.label: r.media_name for r in self._roi_manager.audio_rois})
+        label_to_media = {r.label: r.media_name for r in self._signoff_roi_manager.video_rois}
+        label_to_media.update({r.label: r.media_name for r in self._signoff_roi_manager.audio_rois})
         if enter_label:
             media = label_to_media.get(enter_label, "")
             trigger_text = f"{enter_label}  ({media})" if media else enter_label
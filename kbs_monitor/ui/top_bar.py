@@ -162,9 +162,16 @@ class SysMonitorWidget(QWidget):
         self._lbl_gpu.setAlignment(Qt.AlignCenter)
         self._lbl_gpu.setStyleSheet(_small_style)
 
+        # 화면 표시 fps: 표시/수신 (표시 주기 제한으로 수신보다 낮을 수 있음)
+        self._lbl_fps = QLabel("표시\n--")
+        self._lbl_fps.setAlignment(Qt.AlignCenter)
+        self._lbl_fps.setStyleSheet(_small_style)
+        self._lbl_fps.setToolTip("화면 표시 fps / 영상 수신 fps")
+
         hbox.addWidget(self._lbl_cpu)
         hbox.addWidget(self._lbl_ram)
         hbox.addWidget(self._lbl_gpu)
+        hbox.addWidget(self._lbl_fps)
         layout.addWidget(stats_widget)
 
     def _init_backends(self):
@@ -207,6 +214,10 @@ class SysMonitorWidget(QWidget):
 
         self._gpu_method = None  # GPU 없음 또는 감지 불가
 
+    def set_display_fps(self, rendered_fps: float, received_fps: float):
+        """화면 표시 fps / 영상 수신 fps 표시"""
+        self._lbl_fps.setText(f"표시\n{rendered_fps:.0f}/{received_fps:.0f}")
+
     def _start_timer(self):
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._update_stats)
@@ -737,6 +748,10 @@ class TopBar(QWidget):
         else:
             self._lbl_ea.setStyleSheet("color: gray;")
 
+    def update_display_fps(self, rendered_fps: float, received_fps: float):
+        """화면 표시 fps / 영상 수신 fps 업데이트"""
+        self._sys_monitor.set_display_fps(rendered_fps, received_fps)
+
     def set_detection_state(self, enabled: bool):
         """감지 On/Off 버튼 상태를 외부에서 설정 (시그널 발송 없이)"""
         self._btn_detection.blockSignals(True)
@@ -1,20 +1,37 @@
 """
 비디오 표시 위젯
 OpenCV 프레임을 QLabel에 표시, 감지영역 오버레이 지원
-NO SIGNAL 상태에서도 1920×1080 프레임 유지, ROI 항상 렌더링
+NO SIGNAL 상태에서도 마지막 입력 해상도(기본 1920×1080) 프레임 유지, ROI 항상 렌더링
+렌더 경로: 원본 → 라벨 표시 크기로 1회 리사이즈 → 재사용 RGB 버퍼(QImage 공유)로 색변환
+→ 캐시된 감지영역 오버레이(투명 QPixmap)를 합성. 전체 해상도 복사·변환·Qt 스케일링 없음.
+오버레이는 ROI 목록/알림 상태/깜빡임/표시 크기가 바뀔 때만 다시 그린다.
+표시 갱신은 캡처 속도와 분리: 상태 변경은 dirty 표시만 하고 표시 타이머(기본 30fps)가
+틱마다 최대 1회 렌더한다 (한 감지 주기의 여러 알림 변경도 1회 렌더로 병합).
 """
+import time
+
 import numpy as np
 import cv2
 from itertools import chain
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QSizePolicy
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap, QImage, QPainter, QFont, QColor
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QPixmap, QImage, QPainter, QFont, QColor, QPen
 from typing import List, Dict, Optional
 from core.roi_manager import ROI
+from core.frame_pyramid import FramePyramid
 
 _NO_SIGNAL_W = 1920
 _NO_SIGNAL_H = 1080
 
+DEFAULT_DISPLAY_FPS = 30
+DISPLAY_FPS_CHOICES = (15, 30)
+
+# 감지영역 오버레이 색상 (RGB)
+_VIDEO_ROI_COLOR = QColor(200, 0, 0)       # 비디오 ROI: 빨간색
+_AUDIO_ROI_COLOR = QColor(255, 165, 0)     # 오디오 ROI: 주황색
+_ALERT_ROI_COLOR = QColor(255, 0, 0)       # 알림 테두리: 밝은 빨간색
+_ALERT_FILL_COLOR = QColor(180, 0, 0, 77)  # 알림 채우기: 빨간색 30% 불투명
+
 
 class VideoWidget(QWidget):
     """16분할 멀티뷰 영상을 표시하는 위젯"""
@@ -22,12 +39,41 @@ class VideoWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._current_frame: Optional[np.ndarray] = None
+        self._current_pyramid: Optional[FramePyramid] = None
         self._show_rois = True
         self._video_rois: List[ROI] = []
         self._audio_rois: List[ROI] = []
         self._alert_labels: Dict[str, bool] = {}
         self._blink_on = False
         self._no_signal_frame: Optional[np.ndarray] = None  # 캐시
+        self._source_size: tuple = (_NO_SIGNAL_W, _NO_SIGNAL_H)  # 마지막 입력 해상도 (w, h)
+
+        # 표시 크기 RGB 버퍼 + 이를 공유하는 QImage (크기 변경 시에만 재생성)
+        self._rgb_buf: Optional[np.ndarray] = None
+        self._qimage: Optional[QImage] = None
+
+        # 감지영역 오버레이 캐시 (표시 크기 투명 QPixmap, 없으면 None)
+        self._overlay: Optional[QPixmap] = None
+        self._overlay_size: tuple = (0, 0)
+        self._overlay_dirty = True
+        self._overlay_rebuilds = 0
+        self._roi_signature: tuple = ()
+
+        # 렌더 시간 통계 (ms) — get_render_stats()로 조회
+        self._render_count = 0
+        self._render_total_ms = 0.0
+        self._render_max_ms = 0.0
+        self._render_last: Dict[str, float] = {}
+
+        # 표시 주기 제한 (dirty 플래그 + 표시 타이머)
+        self._dirty = True
+        self._frames_received = 0      # update_frame 호출 수 (누적)
+        self._frames_rendered = 0      # 새 프레임이 실제 화면에 표시된 수 (누적)
+        self._frame_seq = 0            # 마지막 수신 프레임 번호
+        self._shown_seq = 0            # 마지막 표시 프레임 번호
+        self._display_timer = QTimer(self)
+        self._display_timer.timeout.connect(self._on_display_tick)
+        self.set_display_fps(DEFAULT_DISPLAY_FPS)
         self._setup_ui()
 
     def _setup_ui(self):
@@ -44,173 +90,264 @@ class VideoWidget(QWidget):
         self._render()
 
     def _make_no_signal_frame(self) -> np.ndarray:
-        """1920×1080 NO SIGNAL INPUT 프레임 생성 (캐시 사용)"""
-        if self._no_signal_frame is not None:
+        """마지막 입력 해상도의 NO SIGNAL INPUT 프레임 생성 (캐시 사용)
+        UHD 입력이 끊겨도 ROI 좌표계(원본 해상도)가 유지되도록 입력 해상도를 따른다.
+        """
+        sw, sh = self._source_size
+        if self._no_signal_frame is not None and self._no_signal_frame.shape[:2] == (sh, sw):
             return self._no_signal_frame
 
-        img = np.zeros((_NO_SIGNAL_H, _NO_SIGNAL_W, 3), dtype=np.uint8)
+        img = np.zeros((sh, sw, 3), dtype=np.uint8)
         text = "NO SIGNAL INPUT"
         font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 3.0
-        thickness = 4
+        font_scale = 3.0 * sw / _NO_SIGNAL_W
+        thickness = max(1, int(4 * sw / _NO_SIGNAL_W))
         text_size, _ = cv2.getTextSize(text, font, font_scale, thickness)
-        tx = (_NO_SIGNAL_W - text_size[0]) // 2
-        ty = (_NO_SIGNAL_H + text_size[1]) // 2
+        tx = (sw - text_size[0]) // 2
+        ty = (sh + text_size[1]) // 2
         cv2.putText(img, text, (tx, ty), font, font_scale,
                     (80, 80, 80), thickness, cv2.LINE_AA)
         self._no_signal_frame = img
         return img
 
-    def update_frame(self, frame: np.ndarray):
-        """새 프레임 수신 시 호출"""
+    def update_frame(self, frame: np.ndarray, pyramid: Optional[FramePyramid] = None):
+        """새 프레임 수신 시 호출 (표시는 다음 표시 틱에서 — 틱 사이 프레임은 최신 것만 표시)
+        pyramid: frame의 해상도 피라미드 — 표시 크기 축소본을 다른 소비자와 공유 (오버레이만 바뀐 재렌더 포함)"""
         self._current_frame = frame
-        self._render()
+        self._current_pyramid = pyramid
+        h, w = frame.shape[:2]
+        self._source_size = (w, h)
+        self._frames_received += 1
+        self._frame_seq += 1
+        self._dirty = True
 
     def set_show_rois(self, show: bool):
-        self._show_rois = show
-        self._render()
+        if show != self._show_rois:
+            self._show_rois = show
+            self._overlay_dirty = True
+            self._dirty = True
 
     def set_rois(self, video_rois: List[ROI], audio_rois: List[ROI]):
         self._video_rois = video_rois
         self._audio_rois = audio_rois
-        self._render()
+        # 1초 주기 동기화 호출이 대부분 — 내용이 같으면 오버레이/렌더 유지
+        signature = tuple(
+            (r.label, r.media_name, r.x, r.y, r.w, r.h)
+            for r in chain(video_rois, audio_rois)
+        )
+        if signature != self._roi_signature:
+            self._roi_signature = signature
+            self._overlay_dirty = True
+            self._dirty = True
 
     def set_alert_state(self, label: str, alerting: bool):
         if self._alert_labels.get(label) == alerting:
             return
         self._alert_labels[label] = alerting
-        self._render()
+        self._overlay_dirty = True
+        self._dirty = True
 
     def set_blink_state(self, blink_on: bool):
-        self._blink_on = blink_on
-        self._render()
+        if blink_on != self._blink_on:
+            self._blink_on = blink_on
+            # 깜빡임은 알림 중인 ROI 모양만 바꿈
+            if any(self._alert_labels.values()):
+                self._overlay_dirty = True
+                self._dirty = True
 
     def clear_signal(self):
         """신호 없음 상태로 전환"""
         self._current_frame = None
-        self._render()
+        self._current_pyramid = None
+        self._dirty = True
 
-    def _render(self):
-        """현재 프레임(없으면 NO SIGNAL 1920×1080) + 감지영역 오버레이를 그려서 표시
-        show_rois가 False여도 알림 중인 ROI는 깜빡여야 하므로 별도 처리
-        """
-        frame = (self._current_frame.copy()
-                 if self._current_frame is not None
-                 else self._make_no_signal_frame().copy())
-        h, w = frame.shape[:2]
+    # ── 표시 주기 ─────────────────────────────────────────────────────────────
 
-        # show_rois=False여도 알림 중인 ROI가 있으면 표시 (알림 종료 시 자동으로 사라짐)
-        has_alerts = any(
-            self._alert_labels.get(r.label, False)
-            for r in chain(self._video_rois, self._audio_rois)
-        )
-        text_overlays = []
-        if self._show_rois or has_alerts:
-            text_overlays = self._draw_rois(frame, w, h)
+    def set_display_fps(self, fps: int):
+        """화면 표시 최대 fps (캡처 fps와 무관, 15/30 권장)"""
+        fps = max(1, min(60, int(fps or DEFAULT_DISPLAY_FPS)))
+        self._display_timer.start(int(1000 / fps))
+
+    def _on_display_tick(self):
+        if self._dirty:
+            self._dirty = False
+            self._render()
 
-        self._display_numpy(frame, text_overlays)
+    def get_display_counters(self) -> tuple:
+        """(수신 프레임 수, 표시 프레임 수) 누적값 — 호출 측에서 구간 차이로 fps 계산"""
+        return self._frames_received, self._frames_rendered
 
-    def _draw_rois(self, frame: np.ndarray, fw: int, fh: int) -> list:
-        """감지영역을 프레임 위에 그리기. 반환: [(fx, fy, text), ...] (QPainter용 텍스트 목록)
+    def _display_size(self, fw: int, fh: int) -> tuple:
+        """원본 프레임 → 라벨 안에 비율 유지로 맞춘 표시 크기 (w, h). 라벨 미배치 시 원본 크기."""
+        lw = self._label.width()
+        lh = self._label.height()
+        if lw <= 0 or lh <= 0:
+            return fw, fh
+        scale = min(lw / fw, lh / fh)
+        return max(1, int(fw * scale)), max(1, int(fh * scale))
+
+    def _render(self):
+        """현재 프레임(없으면 NO SIGNAL)을 표시 크기로 변환하고 감지영역 오버레이를 합성해 표시
+        원본을 표시 크기로 먼저 1회 리사이즈한다 (원본은 수정하지 않으므로 복사 불필요).
+        """
+        t0 = time.perf_counter()
+        src = (self._current_frame
+               if self._current_frame is not None
+               else self._make_no_signal_frame())
+        sh, sw = src.shape[:2]
+        dw, dh = self._display_size(sw, sh)
+        if (dw, dh) == (sw, sh):
+            frame = src
+        elif self._current_pyramid is not None and self._current_pyramid.frame is src:
+            frame = self._current_pyramid.resized(dw, dh)
+        else:
+            interp = cv2.INTER_AREA if dw < sw else cv2.INTER_LINEAR
+            frame = cv2.resize(src, (dw, dh), interpolation=interp)
+        t1 = time.perf_counter()
+
+        overlay = self._get_overlay(dw, dh, dw / sw)
+        t2 = time.perf_counter()
+
+        self._display_numpy(frame, overlay)
+        if self._frame_seq != self._shown_seq:
+            self._shown_seq = self._frame_seq
+            self._frames_rendered += 1
+        t3 = time.perf_counter()
+        self._record_render_time(t0, t1, t2, t3)
+
+    def _record_render_time(self, t0: float, t1: float, t2: float, t3: float):
+        total_ms = (t3 - t0) * 1000.0
+        self._render_count += 1
+        self._render_total_ms += total_ms
+        self._render_max_ms = max(self._render_max_ms, total_ms)
+        self._render_last = {
+            "resize_ms": (t1 - t0) * 1000.0,
+            "overlay_ms": (t2 - t1) * 1000.0,
+            "display_ms": (t3 - t2) * 1000.0,
+            "total_ms": total_ms,
+        }
+
+    def get_render_stats(self, reset: bool = False) -> dict:
+        """렌더 시간 통계 반환. reset=True이면 누적값(횟수/평균/최대) 초기화 (주기 로그용)
+        반환: {"count", "overlay_rebuilds", "frames_received", "frames_rendered"(누적), "avg_ms", "max_ms", "last": {"resize_ms", "overlay_ms", "display_ms", "total_ms"}}
+        """
+        count = self._render_count
+        stats = {
+            "count": count,
+            "overlay_rebuilds": self._overlay_rebuilds,
+            "frames_received": self._frames_received,
+            "frames_rendered": self._frames_rendered,
+            "avg_ms": self._render_total_ms / count if count else 0.0,
+            "max_ms": self._render_max_ms,
+            "last": dict(self._render_last),
+        }
+        if reset:
+            self._render_count = 0
+            self._render_total_ms = 0.0
+            self._render_max_ms = 0.0
+            self._overlay_rebuilds = 0
+        return stats
+
+    def _get_overlay(self, dw: int, dh: int, scale: float) -> Optional[QPixmap]:
+        """캐시된 감지영역 오버레이 반환. 상태 변경(dirty) 또는 표시 크기 변경 시에만 다시 그림"""
+        if self._overlay_dirty or self._overlay_size != (dw, dh):
+            self._overlay = self._build_overlay(dw, dh, scale)
+            self._overlay_size = (dw, dh)
+            self._overlay_dirty = False
+            self._overlay_rebuilds += 1
+        return self._overlay
+
+    def _build_overlay(self, fw: int, fh: int, scale: float) -> Optional[QPixmap]:
+        """감지영역 테두리/알림 채우기/레이블을 표시 크기 투명 pixmap에 그리기 (그릴 것이 없으면 None)
+        scale: 원본 ROI 좌표 → 표시 좌표 비율
         비디오 ROI: 빨간색, 오디오 ROI: 주황색 (정상) / 빨간색 채우기 (알림)
-        show_rois=False 시에는 알림 중인 ROI만 그림
+        show_rois=False여도 알림 중인 ROI는 깜빡여야 하므로 알림 중인 ROI만 그림
         """
         all_rois = ([("video", r) for r in self._video_rois] +
                     [("audio", r) for r in self._audio_rois])
-
-        text_overlays = []
-        for roi_type, roi in all_rois:
-            alerting = self._alert_labels.get(roi.label, False)
-
-            # 감지영역 버튼이 OFF 상태이면 알림 중인 ROI만 그림
-            if not self._show_rois and not alerting:
-                continue
-
-            x1 = max(0, min(roi.x, fw - 1))
-            y1 = max(0, min(roi.y, fh - 1))
-            x2 = max(0, min(roi.x + roi.w, fw))
-            y2 = max(0, min(roi.y + roi.h, fh))
-
-            # 타입별 색상 (BGR)
-            if roi_type == "video":
-                normal_color = (0, 0, 200)    # 빨간색
-                alert_color  = (0, 0, 255)    # 밝은 빨간색
-                fill_color   = (0, 0, 180)    # 알림 채우기
-            else:  # audio
-                normal_color = (0, 165, 255)  # 주황색 (BGR)
-                alert_color  = (0, 0, 255)    # 밝은 빨간색
-                fill_color   = (0, 0, 180)    # 알림 채우기 (빨간색)
+        visible = [
+            (roi_type, roi, self._alert_labels.get(roi.label, False))
+            for roi_type, roi in all_rois
+            if self._show_rois or self._alert_labels.get(roi.label, False)
+        ]
+        if not visible:
+            return None
+
+        pixmap = QPixmap(fw, fh)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        font = QFont()
+        font.setPixelSize(max(9, int(14 * scale)))
+        painter.setFont(font)
+
+        for roi_type, roi, alerting in visible:
+            x1 = max(0, min(int(roi.x * scale), fw - 1))
+            y1 = max(0, min(int(roi.y * scale), fh - 1))
+            x2 = max(0, min(int((roi.x + roi.w) * scale), fw))
+            y2 = max(0, min(int((roi.y + roi.h) * scale), fh))
 
             if alerting and self._blink_on:
-                overlay = frame.copy()
-                cv2.rectangle(overlay, (x1, y1), (x2, y2), fill_color, -1)
-                cv2.addWeighted(overlay, 0.3, frame, 0.7, 0, frame)
-                cv2.rectangle(frame, (x1, y1), (x2, y2), alert_color, 2)
+                painter.fillRect(x1, y1, x2 - x1, y2 - y1, _ALERT_FILL_COLOR)
+                color = _ALERT_ROI_COLOR
             else:
-                cv2.rectangle(frame, (x1, y1), (x2, y2), normal_color, 2)
-
-            # 텍스트는 cv2.putText 미지원(한글 깨짐) → QPainter로 처리
-            label_text = f"{roi.label} [{roi.media_name}]" if roi.media_name else roi.label
-            text_overlays.append((x1 + 3, y1 + 18, label_text))
-
-        return text_overlays
-
-    def _display_numpy(self, frame: np.ndarray, text_overlays: list = None):
-        """numpy BGR 배열을 QLabel에 표시. 한글 포함 텍스트는 QPainter로 오버레이"""
-        h, w, ch = frame.shape
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        # rgb.tobytes()로 복사본을 전달 → numpy 배열 gc 후 dangling pointer 방지
-        image = QImage(rgb.tobytes(), w, h, ch * w, QImage.Format_RGB888)
-
-        lw = self._label.width()
-        lh = self._label.height()
-        if lw > 0 and lh > 0:
-            pixmap = QPixmap.fromImage(image).scaled(
-                lw, lh,
-                Qt.KeepAspectRatio,
-                Qt.FastTransformation,
-            )
-        else:
-            pixmap = QPixmap.fromImage(image)
-
-        # cv2.putText 대신 QPainter로 텍스트 렌더링 (한글 유니코드 지원)
-        if text_overlays and w > 0:
-            scale = pixmap.width() / w
-            font = QFont()
-            font.setPixelSize(max(9, int(14 * scale)))
+                color = _VIDEO_ROI_COLOR if roi_type == "video" else _AUDIO_ROI_COLOR
+            painter.setPen(QPen(color, 2))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(x1, y1, x2 - x1, y2 - y1)
+
+            # 레이블 (한글 지원 위해 QPainter 텍스트) — 오프셋은 원본 기준 (3, 18)px을 표시 비율로 환산
+            text = f"{roi.label} [{roi.media_name}]" if roi.media_name else roi.label
+            px = int(x1 + 3 * scale)
+            py = int(y1 + 18 * scale)
+            # 검은 외곽선 (4방향)
+            painter.setPen(QColor(0, 0, 0))
+            for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                painter.drawText(px + dx, py + dy, text)
+            # 흰 텍스트
+            painter.setPen(QColor(255, 255, 255))
+            painter.drawText(px, py, text)
+
+        painter.end()
+        return pixmap
+
+    def _rgb_image(self, w: int, h: int) -> QImage:
+        """표시 크기 RGB 버퍼와 이를 공유하는 QImage 반환 (크기 변경 시에만 재할당)"""
+        if self._rgb_buf is None or self._rgb_buf.shape[:2] != (h, w):
+            self._rgb_buf = np.empty((h, w, 3), dtype=np.uint8)
+            # 버퍼는 self._rgb_buf가 유지하므로 QImage가 가리키는 메모리 수명 보장
+            self._qimage = QImage(self._rgb_buf.data, w, h, 3 * w, QImage.Format_RGB888)
+        return self._qimage
+
+    def _display_numpy(self, frame: np.ndarray, overlay: Optional[QPixmap] = None):
+        """표시 크기 BGR 배열을 QLabel에 표시 (감지영역 오버레이 pixmap이 있으면 합성)"""
+        h, w = frame.shape[:2]
+        image = self._rgb_image(w, h)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+        # fromImage가 픽셀을 복사하므로 다음 렌더에서 버퍼를 덮어써도 안전
+        pixmap = QPixmap.fromImage(image)
+        if overlay is not None:
             painter = QPainter(pixmap)
-            painter.setFont(font)
-            for fx, fy, text in text_overlays:
-                px = int(fx * scale)
-                py = int(fy * scale)
-                # 검은 외곽선 (4방향)
-                painter.setPen(QColor(0, 0, 0))
-                for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
-                    painter.drawText(px + dx, py + dy, text)
-                # 흰 텍스트
-                painter.setPen(QColor(255, 255, 255))
-                painter.drawText(px, py, text)
+            painter.drawPixmap(0, 0, overlay)
             painter.end()
-
         self._label.setPixmap(pixmap)
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        self._render()
+        self._dirty = True
 
     def get_frame_size(self) -> tuple:
         """현재 프레임의 실제 크기 반환 (w, h)"""
         if self._current_frame is not None:
             h, w = self._current_frame.shape[:2]
             return w, h
-        return _NO_SIGNAL_W, _NO_SIGNAL_H
+        return self._source_size
 
     def widget_to_frame_coords(self, wx: int, wy: int) -> tuple:
         """위젯 좌표 → 프레임 좌표 변환 (레터박스 고려)"""
         if self._current_frame is not None:
             fh, fw = self._current_frame.shape[:2]
         else:
-            fw, fh = _NO_SIGNAL_W, _NO_SIGNAL_H
+            fw, fh = self._source_size
 
         lw = self._label.width()
         lh = self._label.height()
@@ -11,6 +11,9 @@ from typing import Any
 
 DEFAULT_CONFIG = {
     "port": 0,
+    "stream_url": "",   # 네트워크 스트림 URL (RTSP/SRT/UDP, 빈 문자열=포트 사용)
+    "capture_width": 1920,   # 캡처 카드 요청 해상도 (UHD 멀티뷰어: 3840×2160)
+    "capture_height": 1080,  # ROI 좌표는 항상 입력 원본 해상도 기준
     "detection": {
         "black_threshold": 5,
         "black_dark_ratio": 98.0,
@@ -54,8 +57,13 @@ DEFAULT_CONFIG = {
         "video": [],
         "audio": [],
     },
+    # 다중 입력 목록 — 각 항목: {"name", "port", "stream_url", "rois": {"video", "audio"}}
+    # 빈 목록이면 위 단일 입력 키(port/stream_url/rois)에서 자동 마이그레이션.
+    # 저장 시 입력 1의 값은 port/stream_url/rois 에도 함께 기록 (구버전 호환)
+    "inputs": [],
     "performance": {
         "detection_interval":        200,   # ms, QTimer 감지 주기 (100~1000)
+        "display_fps":               30,    # 화면 표시 최대 fps (15 / 30, 캡처 fps와 무관)
         "scale_factor":              1.0,   # 감지 해상도 스케일 (1.0 / 0.5 / 0.25)
         "black_detection_enabled":   True,  # 블랙 감지 활성화
         "still_detection_enabled":   True,  # 스틸 감지 활성화
@@ -67,22 +75,73 @@ DEFAULT_CONFIG = {
         "bot_token": "",
         "chat_id": "",
         "send_image": True,
+        "image_width": 1280,       # 스냅샷 최대 폭 (0=원본) — 큰 입력은 축소 후 JPEG 인코딩
         "cooldown": 60,            # 동일 채널 재발송 방지 (초)
+        "batch_seconds": 2,        # 묶음 전송 대기 (초, 0=항목별 즉시 전송) — 요약 1건 + 사진 앨범
+        "max_delay": 120,          # 전송 기한 (초, 0=무제한) — 넘긴 알림은 지연 요약 1건으로
+        "outbox_max_items": 500,   # 아웃박스(디스크 전송 대기열) 최대 항목 수 — 넘으면 오래된 것부터 폐기
+        "outbox_max_mb": 100,      # 아웃박스 스냅샷 총 용량 (MB)
+        "outbox_max_hours": 24,    # 아웃박스 보관 시간 (시간, 0=무제한) — 넘긴 미전송 알림 폐기
+        "api_base": "https://api.telegram.org",  # Bot API 주소 (로컬 대역 서버로 확인 시 변경)
         "notify_black": True,
         "notify_still": True,
         "notify_audio_level": True,
         "notify_embedded": True,
         "notify_signoff": True,
     },
+    # 텔레그램 외 알림 채널 (알림 분배기 core/notifier_hub.py). 공통 항목:
+    # enabled, timeout(초), concurrency(동시 전송 수), max_pending(대기 상한), types(빈 목록=모든 종류), recoveries
+    "notifiers": {
+        "webhook": {
+            "enabled": False,
+            "url": "",             # JSON POST 주소 (http/https)
+            "headers": {},         # 추가 HTTP 헤더 (인증 토큰 등)
+            "timeout": 5,
+            "concurrency": 2,
+            "max_pending": 100,
+            "types": [],
+            "recoveries": True,
+        },
+        "syslog": {
+            "enabled": False,
+            "host": "127.0.0.1",
+            "port": 514,           # UDP
+            "facility": 16,        # local0
+            "timeout": 2,
+            "concurrency": 1,
+            "max_pending": 100,
+            "types": [],
+            "recoveries": True,
+        },
+        "file_drop": {
+            "enabled": False,
+            "directory": "notifications",  # 이벤트당 JSON 파일 1개 (프로그램 폴더 기준 상대 경로 가능)
+            "max_files": 1000,
+            "timeout": 5,
+            "concurrency": 1,
+            "max_pending": 100,
+            "types": [],
+            "recoveries": True,
+        },
+    },
     "recording": {
         "enabled": True,
         "save_dir": "recordings",  # 저장 폴더 경로
         "pre_seconds": 5,          # 사고 전 버퍼 시간(초)
+        "preroll_store": "memory", # 사고 전 버퍼 저장 위치: "memory"=RAM, "disk"=메모리 맵 파일(긴 구간/재시작 유지)
         "post_seconds": 15,        # 사고 후 녹화 시간(초)
         "max_keep_days": 7,        # 최대 보관 일수
+        "max_total_gb": 0,         # 녹화 총 용량 한도(GB, 0=제한 없음) — 넘으면 오래된 녹화부터 삭제
         "output_width": 960,       # 녹화 출력 가로 해상도
         "output_height": 540,      # 녹화 출력 세로 해상도
         "output_fps": 10,          # 녹화 출력 FPS
+        "encoder": "pipe",         # "pipe"=ffmpeg 단일 패스 H.264/AAC, "twopass"=mp4v+WAV 후 합성
+        "roi_clip": "off",         # 감지영역 크롭 클립: "off"=전체 화면만, "also"=전체+크롭, "only"=크롭만(비디오 감지영역 알림)
+        "continuous": False,       # 상시 세그먼트 녹화 (디스크 링에서 사고 클립 추출, ffmpeg 필요)
+        "segment_seconds": 10,     # 세그먼트 길이(초)
+        "ring_minutes": 10,        # 세그먼트 링 보관 길이(분)
+        "continuous_pre_seconds": 60,  # 상시 녹화 사용 시 사고 전 구간(초)
+        "mux_workers": 2,          # ffmpeg 합성/클립 추출 동시 작업 수 (전 입력 공유)
     },
     "ui_state": {
         "detection_enabled": True,
@@ -129,6 +188,19 @@ DEFAULT_CONFIG = {
 _BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
+def migrate_inputs(config: dict) -> list:
+    """config의 inputs 목록 반환. 없으면 단일 입력 키(port/stream_url/rois)로 1개 생성"""
+    inputs = config.get("inputs")
+    if isinstance(inputs, list) and inputs:
+        return inputs
+    return [{
+        "name": "IN1",
+        "port": config.get("port", 0),
+        "stream_url": config.get("stream_url", ""),
+        "rois": config.get("rois", {"video": [], "audio": []}),
+    }]
+
+
 class ConfigManager:
     """JSON 기반 설정 저장/불러오기"""
 
@@ -201,6 +273,8 @@ class ConfigManager:
             det.pop("still_changed_ratio")
             if "still_block_threshold" not in det:
                 det["still_block_threshold"] = 10.0
+        # 마이그레이션: 단일 입력(port/stream_url/rois) → inputs 목록
+        result["inputs"] = migrate_inputs(result)
         return result
 
     def _read_json(self, path: str) -> dict: